@@ -0,0 +1,154 @@
+"""
+AllureBuffer - 延迟写入的Allure步骤
+执行期间只在内存中记录步骤名称、起止时间、状态和附件，用例结束（或失败抛出异常）时一次性写入Allure，
+步骤保留实际的起止时间；并行/并发执行的变体各自记录，按原顺序合并，不会相互交错
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional
+from uuid import uuid4
+
+from allure_commons import plugin_manager
+from allure_commons.model2 import ExecutableItem, Status, StatusDetails, TestStepResult
+from allure_commons.reporter import AllureReporter
+from allure_commons.utils import format_exception, format_traceback
+
+
+# live（默认）: 执行时直接写入Allure；deferred: 用例结束时批量写入
+ALLURE_MODE_ENV = 'UI_ALLURE_MODE'
+ALLURE_MODES = ('live', 'deferred')
+
+
+def allure_report_mode() -> str:
+    """按环境变量 UI_ALLURE_MODE 获取报告模式"""
+    mode = os.environ.get(ALLURE_MODE_ENV, '').strip().lower()
+    return mode if mode in ALLURE_MODES else 'live'
+
+
+def _now() -> int:
+    return int(round(1000 * time.time()))
+
+
+@dataclass
+class BufferedAttachment:
+    name: Optional[str]
+    body: Any
+    attachment_type: Any = None
+
+
+@dataclass
+class BufferedStep:
+    name: str
+    start: int
+    stop: Optional[int] = None
+    status: Optional[str] = None
+    message: Optional[str] = None
+    trace: Optional[str] = None
+    steps: List['BufferedStep'] = field(default_factory=list)
+    attachments: List[BufferedAttachment] = field(default_factory=list)
+
+    def fail(self, message: str) -> None:
+        """标记步骤失败（处理方法返回失败时不会抛出异常）"""
+        self.status = Status.FAILED
+        self.message = message
+
+
+class AllureBuffer:
+    """单个执行器的步骤缓冲，只在一个线程/协程中使用"""
+
+    def __init__(self):
+        self.roots: List[BufferedStep] = []
+        self.attachments: List[BufferedAttachment] = []
+        self._stack: List[BufferedStep] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[BufferedStep]:
+        """记录一个步骤，代码块抛出异常时记为失败（断言）或中断（其他异常）"""
+        node = BufferedStep(name=name, start=_now())
+        (self._stack[-1].steps if self._stack else self.roots).append(node)
+        self._stack.append(node)
+        try:
+            yield node
+        except BaseException as e:
+            is_failure = isinstance(e, AssertionError) or type(e).__name__ == 'Failed'
+            node.status = Status.FAILED if is_failure else Status.BROKEN
+            node.message = format_exception(type(e), e)
+            node.trace = format_traceback(e.__traceback__)
+            raise
+        finally:
+            node.stop = _now()
+            if node.status is None:
+                node.status = Status.PASSED
+            self._stack.pop()
+
+    def attach(self, body: Any, name: Optional[str] = None, attachment_type: Any = None) -> None:
+        """在当前步骤（不在步骤中时为用例）上添加附件，body 为内存中的数据"""
+        attachment = BufferedAttachment(name, body, attachment_type)
+        (self._stack[-1].attachments if self._stack else self.attachments).append(attachment)
+
+    def take(self) -> 'AllureBuffer':
+        """取出已记录的内容（用于合并并行执行的变体），当前缓冲清空"""
+        taken = AllureBuffer()
+        taken.roots, taken.attachments = self.roots, self.attachments
+        self.roots, self.attachments = [], []
+        return taken
+
+    def adopt(self, other: 'AllureBuffer') -> None:
+        """把其他缓冲的内容合并到当前步骤下"""
+        if self._stack:
+            self._stack[-1].steps.extend(other.roots)
+            self._stack[-1].attachments.extend(other.attachments)
+        else:
+            self.roots.extend(other.roots)
+            self.attachments.extend(other.attachments)
+
+    def clear(self) -> None:
+        self.roots, self.attachments = [], []
+
+    def flush(self) -> int:
+        """
+        把记录的步骤和附件写入当前Allure用例（未在pytest+allure中运行时丢弃）
+
+        Returns:
+            写入的顶层步骤数
+        """
+        if self._stack or not (self.roots or self.attachments):
+            return 0
+        roots, attachments = self.roots, self.attachments
+        self.clear()
+        reporter = _current_reporter()
+        if reporter is None or reporter.get_last_item(ExecutableItem) is None:
+            return 0
+        for attachment in attachments:
+            _attach(reporter, attachment, None)
+        for node in roots:
+            _emit(reporter, node, None)
+        return len(roots)
+
+
+def _current_reporter() -> Optional[AllureReporter]:
+    """allure-pytest 插件使用的 AllureReporter"""
+    for plugin in plugin_manager.get_plugins():
+        reporter = getattr(plugin, 'allure_logger', None)
+        if isinstance(reporter, AllureReporter):
+            return reporter
+    return None
+
+
+def _attach(reporter: AllureReporter, attachment: BufferedAttachment, parent_uuid: Optional[str]) -> None:
+    reporter.attach_data(uuid4(), attachment.body, name=attachment.name,
+                         attachment_type=attachment.attachment_type, parent_uuid=parent_uuid)
+
+
+def _emit(reporter: AllureReporter, node: BufferedStep, parent_uuid: Optional[str]) -> None:
+    uuid = str(uuid4())
+    reporter.start_step(parent_uuid, uuid, TestStepResult(name=node.name, start=node.start))
+    for attachment in node.attachments:
+        _attach(reporter, attachment, uuid)
+    for child in node.steps:
+        _emit(reporter, child, uuid)
+    details = StatusDetails(message=node.message, trace=node.trace) if node.message else None
+    reporter.stop_step(uuid, stop=node.stop, status=node.status, statusDetails=details)
@@ -0,0 +1,1132 @@
+"""
+AsyncBaseExecutor类 - 基于 playwright.async_api 的UI自动化测试执行器
+与 BaseExecutor 使用相同的YAML用例格式、执行计划和操作/断言词汇（action_handlers、assertion_handlers），
+执行相关的方法均为协程，一个进程内可以在同一个事件循环中通过 asyncio.gather 同时驱动多个页面
+"""
+
+import asyncio
+from typing import Dict, Iterable, List, Any, Optional, Sequence, Tuple
+from playwright.async_api import Page
+from base.AsyncBasePage import AsyncBasePage
+from base.BaseAssert import Assertion, AsyncPageAssertion
+from base.BaseExecutor import BaseExecutor
+from base.RequestTracker import AsyncRequestTracker
+from base.Results import CaseResult, RunResult
+from base.StepPlan import CompiledStep, VariantPlan, variant_count
+from base.AllureBuffer import AllureBuffer
+from base.ScreenshotPipeline import capture_options, collect_errors, resolve_image_format
+from base.TraceRecorder import trace_span
+from utils.wait_savings import WAIT_SAVINGS, legacy_sleeps_enabled
+import time
+
+
+class AsyncBaseExecutor(BaseExecutor):
+    """
+    异步UI自动化测试执行器
+
+    用例加载、执行计划编译与缓存、定位器解析、智能等待/并行配置均继承自 BaseExecutor；
+    执行用例、步骤处理器、操作/断言处理器均为协程，需要 await 调用
+
+    注意: 多个用例在同一线程内并发执行时，Allure步骤会按实际开始顺序交错嵌套，
+    需要完整的步骤层级时建议每个测试只 await 一个用例
+    """
+
+    REQUEST_TRACKER_CLASS = AsyncRequestTracker
+
+    def __init__(self, page: Page, pages: Optional[Dict[str, str]] = None, locations_path: Optional[str] = None,
+                 locator_files: Optional[Dict[str, str]] = None):
+        """
+        初始化执行器
+
+        Args:
+            page: playwright.async_api 的Page对象
+            pages: 页面名称到URL的映射
+            locations_path: 默认定位器文件路径
+            locator_files: 具名定位器文件 {名称: 路径}，YAML中通过 Path(名称:页面.模块.元素) 引用
+        """
+        super().__init__(page, pages, locations_path=locations_path, locator_files=locator_files)
+        self.base_page = AsyncBasePage(page)
+        self.page_assertion = AsyncPageAssertion(page)
+        self._apply_trace_proxies()
+
+    async def execute_test_case(self, test_case_name: str, test_data: Dict[str, Any], variant: Optional[int] = None) -> RunResult:
+        """
+        执行指定的测试用例，返回结果格式与 BaseExecutor.execute_test_case 相同
+
+        Args:
+            test_case_name: 测试用例名称
+            test_data: 测试用例数据字典
+            variant: 数据驱动变体序号（从0开始），指定时只执行该变体
+
+        Returns:
+            执行结果 RunResult，可以按字典的方式读取，to_dict() 转换为字典
+        """
+        with trace_span(test_case_name, 'case', variant=variant):
+            try:
+                return await self._execute_test_case(test_case_name, test_data, variant)
+            finally:
+                # 等待后台截图写入完成，deferred 模式下用例结束（含异常退出）时批量写入Allure
+                await self.flush_screenshots()
+                self.flush_report()
+                if self.result_sink is not None:
+                    self.result_sink.flush()
+
+    async def _execute_test_case(self, test_case_name: str, test_data: Dict[str, Any], variant: Optional[int]) -> RunResult:
+        """执行测试用例，参数与返回值见 execute_test_case"""
+        start_time = time.time()
+        try:
+            plan = self._start_test_case(test_case_name, test_data)
+            if plan is None:
+                return self._case_error(f"未找到测试用例: {test_case_name}")
+
+            total = variant_count(plan.variants)
+            if variant is not None:
+                result = RunResult.from_case(await self._execute_variant(variant, total, plan.variants[variant]))
+            elif total is None or total > 1:
+                mode = self._variant_checkpoint_mode(plan)
+                with self._report_step("---遍历执行多条用例---"):
+                    if mode is not None:
+                        result = await self._execute_from_checkpoint(plan.variants, plan.prefix, mode)
+                    else:
+                        result = await self._execute_multiple_test_cases(plan.variants)
+            else:
+                self._current_variant = (plan.variants[0].case_name, '')
+                result = RunResult.from_case(self._finish_case(await self._execute_compiled_steps(plan.variants[0].steps)))
+
+            return self._end_test_case(test_case_name, result, start_time)
+
+        except Exception as e:
+            return self._case_error(f"执行测试用例失败: {e}", start_time)
+
+    async def execute_all_test_cases(self, yaml_file_path: str) -> Dict[str, RunResult]:
+        """
+        执行YAML文件中的所有测试用例（按顺序执行，共用当前页面）
+
+        Args:
+            yaml_file_path: YAML文件路径
+
+        Returns:
+            测试结果字典，键为测试用例名，值为执行结果 RunResult
+        """
+        try:
+            test_data = self.load_test_case(yaml_file_path)
+            results = {}
+
+            for test_case_name in test_data.keys():
+                self.logger.info("开始执行测试用例: {}", test_case_name)
+                result = await self.execute_test_case(test_case_name, test_data)
+                results[test_case_name] = result
+                self._log_case_outcome(test_case_name, result)
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"执行所有测试用例失败: {e}")
+            return {}
+
+    # ==================== 步骤执行 ====================
+
+    async def _run_compiled_step(self, step: CompiledStep) -> bool:
+        """
+        执行单个已编译步骤
+
+        Returns:
+            执行结果
+        """
+        if step.handler is None:
+            self.logger.error(f"不支持的动作: {step.action}")
+            return False
+        try:
+            return await step.handler(self, step.selector, step.value, step.expected, step.step_num) is not False
+        except Exception as e:
+            # 附带异常，失败日志中记录异常时的变量值
+            self.logger.opt(exception=e).error("步骤 {} 执行失败: {}", step.step_num, e)
+            return False
+
+    async def _execute_steps(self, steps: List[Dict[str, Any]]) -> bool:
+        """
+        执行步骤列表
+
+        Args:
+            steps: 步骤列表
+
+        Returns:
+            执行结果
+        """
+        for step in self._compile_steps(steps):
+            if step.error:
+                self.logger.error(step.error)
+                return False
+
+            with self._report_step(step.description), \
+                    trace_span(step.action, 'step', step_num=step.step_num, selector=step.selector):
+                if not await self._run_compiled_step(step):
+                    return False
+
+        return True
+
+    async def _execute_single_step(self, action: str, selector: str, value: Any, expected: Any, step_num: int) -> bool:
+        """
+        执行单个步骤
+
+        Args:
+            action: 操作类型
+            selector: 元素选择器
+            value: 操作值
+            expected: 期望值
+            step_num: 步骤编号
+
+        Returns:
+            执行结果
+        """
+        step = CompiledStep(step_num, action, selector, selector, value, expected,
+                            handler=self._get_step_handler(action))
+        return await self._run_compiled_step(step)
+
+    async def _execute_steps_with_details(self, steps: List[Dict[str, Any]]) -> RunResult:
+        """
+        执行步骤列表并返回详细信息，返回值与 BaseExecutor._execute_steps_with_details 相同
+
+        Args:
+            steps: 步骤列表
+
+        Returns:
+            执行结果，test_cases 中只有一个测试用例
+        """
+        return RunResult.from_case(await self._execute_compiled_steps(self._compile_steps(steps)))
+
+    async def _execute_compiled_steps(self, steps: tuple, case_name: str = 'single_case',
+                                      input_value: Any = '') -> CaseResult:
+        """
+        执行已编译的步骤并返回详细信息
+
+        Args:
+            steps: CompiledStep 元组
+            case_name: 测试用例名称
+            input_value: 数据驱动输入值
+
+        Returns:
+            测试用例结果，步骤失败时停止执行
+        """
+        start_time = time.time()
+        test_case_result = CaseResult(case_name, input_value)
+
+        for index, step in enumerate(steps):
+            step_start_time = time.time()
+            step_result = self._start_step(steps, index)
+
+            if not step.error:
+                try:
+                    with self._report_step(step.description) as report, \
+                            trace_span(step.action, 'step', step_num=step.step_num, selector=step.selector):
+                        if await self._run_compiled_step(step):
+                            step_result.success = True
+                        else:
+                            step_result.error_message = self._step_error(step.step_num)
+                            if report is not None:
+                                report.fail(step_result.error_message)
+                except Exception as e:
+                    step_result.error_message = self._step_error(step.step_num, e)
+
+            if not self._end_step(test_case_result, step_result, step_start_time):
+                break
+
+        test_case_result.duration_ms = (time.time() - start_time) * 1000
+        return test_case_result
+
+    # ==================== 步骤处理器 ====================
+    # 与 BaseExecutor 相同的签名 (selector, value, expected, step_num)，均为协程
+
+    async def _step_navigate(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 导航到 {}", step_num, selector or '页面')
+        url = self.pages_dict.get(selector, selector)
+        await self.base_page.navigate_to(url)
+
+    async def _step_click(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 点击元素 {}", step_num, selector)
+        await self.base_page.click(selector)
+
+    async def _step_hover(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 悬停元素 {}", step_num, selector)
+        await self.base_page.hover(selector)
+
+    async def _step_input(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 确保value是字符串类型
+        value_str = str(value) if value is not None else ""
+        self._step_log("步骤 {}: 输入到元素 {}，内容: {}", step_num, selector, value_str)
+        await self.base_page.input_text(selector, value_str)
+
+        # 等待输入事件处理完成
+        try:
+            if legacy_sleeps_enabled():
+                await self.base_page.wait_for_time(0.2)
+            else:
+                with WAIT_SAVINGS.measure('input', 0.2):
+                    await self._wait_for_input_settled(selector)
+        except Exception as e:
+            self.logger.warning(f"步骤 {step_num}: 等待输入事件处理时出现异常（继续执行）: {e}")
+
+    async def _step_wait(self, selector: str, value: Any, expected: Any, step_num: int):
+        wait_time = self._wait_time(selector, value)
+        self._step_log("步骤 {}: 等待 {} 毫秒", step_num, wait_time)
+        if self.enable_wait_audit:
+            await self._audited_wait(float(wait_time), step_num)
+        else:
+            await self.base_page.wait_for_time(float(wait_time)/1000)
+
+    async def _audited_wait(self, wait_ms: float, step_num: int):
+        """审计模式下的静态等待：等待时长不变，同时记录下一步骤的目标元素何时变为可操作"""
+        target = self._audit_target()
+        start = time.monotonic()
+        ready_ms = await self.base_page.wait_until_actionable(target, int(wait_ms)) if target else None
+        remaining = wait_ms / 1000 - (time.monotonic() - start)
+        if remaining > 0:
+            await self.base_page.wait_for_time(remaining)
+        self._record_wait_audit(wait_ms, step_num, ready_ms)
+
+    async def _step_wait_for_element(self, selector: str, value: Any, expected: Any, step_num: int):
+        timeout = int(value) if value else 30000
+        self._step_log("步骤 {}: 等待元素出现 {}，超时: {}ms", step_num, selector, timeout)
+        await self.base_page.wait_for_element(selector, timeout)
+
+    async def _step_wait_for_element_hidden(self, selector: str, value: Any, expected: Any, step_num: int):
+        timeout = int(value) if value else 30000
+        self._step_log("步骤 {}: 等待元素隐藏 {}，超时: {}ms", step_num, selector, timeout)
+        await self.base_page.wait_for_element_hidden(selector, timeout)
+
+    async def _step_take_screenshot(self, selector: str, value: Any, expected: Any, step_num: int):
+        shot = self._prepare_screenshot(selector, value)
+        self._step_log("步骤 {}: 截图保存到 {}", step_num, shot['path'])
+        image = await self.base_page.capture_screenshot(shot['element'], shot['clip'], shot['full_page'],
+                                                        shot['capture_type'], shot['capture_quality'])
+        self._store_screenshot(step_num, shot, image)
+
+    async def _step_press_key(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 处理按键操作
+        key = str(value) if value is not None else "Enter"  # 默认按键
+        self._step_log("步骤 {}: 按下按键 {}", step_num, key)
+        await self.base_page.press_key(key)
+
+        # 如果是 Enter 键，等待页面数据刷新
+        if key.lower() == 'enter':
+            await self._wait_after_enter(step_num)
+
+    async def _step_press_enter(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Enter键", step_num)
+        await self.base_page.press_enter()
+
+        # 按下Enter键后等待页面数据刷新
+        await self._wait_after_enter(step_num)
+
+    async def _wait_after_enter(self, step_num: int):
+        """按下Enter键后等待页面数据刷新"""
+        self._step_log("步骤 {}: 按下Enter键后等待页面数据刷新...", step_num)
+        try:
+            # 等待接口请求完成
+            await self._wait_for_requests_drained(step_num)
+
+            # 等待DOM更新完成
+            if legacy_sleeps_enabled():
+                await self.base_page.wait_for_time(0.3)
+            else:
+                with WAIT_SAVINGS.measure('enter', 0.3):
+                    await self.base_page.wait_for_next_frame()
+        except Exception as e:
+            self.logger.warning(f"步骤 {step_num}: 等待页面数据刷新时出现异常（继续执行）: {e}")
+
+    async def _wait_for_input_settled(self, selector: str):
+        """输入框的值已稳定（格式化、掩码输入框的值可能与输入内容不同），且输入触发的接口请求（如联想搜索）已返回"""
+        if not await self.base_page.wait_for_input_settled(selector):
+            self._step_log("输入框的值仍在变化，继续执行: {}", selector)
+        if self.request_tracker is not None and self.request_tracker.pending_count:
+            await self.request_tracker.wait_for_idle(self._request_tracking['timeout'], idle_ms=0)
+
+    async def _step_press_tab(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Tab键", step_num)
+        await self.base_page.press_tab()
+
+    async def _step_press_escape(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Escape键", step_num)
+        await self.base_page.press_escape()
+
+    async def _step_type_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 输入文本: {}", step_num, value)
+        await self.base_page.type_text(str(value) if value else "")
+
+    async def _step_clear_and_input(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 清空并输入文本到元素 {}，内容: {}", step_num, selector, value)
+        await self.base_page.clear_and_input(selector, str(value) if value else "")
+
+    async def _step_select_option_by_label(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 通过标签选择下拉框 {} 的选项: {}", step_num, selector, value)
+        await self.base_page.select_option_by_label(selector, str(value) if value else "")
+
+    async def _step_wait_for_network_idle(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 等待网络空闲", step_num)
+        await self.base_page.wait_for_network_idle()
+
+    async def _step_scroll_to_element(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到元素 {}", step_num, selector)
+        await self.base_page.scroll_to_element(selector)
+
+    async def _step_scroll_to_bottom(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到页面底部", step_num)
+        await self.base_page.scroll_to_bottom()
+
+    async def _step_scroll_to_top(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到页面顶部", step_num)
+        await self.base_page.scroll_to_top()
+
+    async def _step_execute_script(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 执行JavaScript脚本: {}", step_num, value)
+        await self.base_page.execute_script(str(value) if value else "")
+
+    async def _step_refresh_page(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 刷新页面", step_num)
+        await self.base_page.refresh_page()
+
+    async def _step_go_back(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 返回上一页", step_num)
+        await self.base_page.go_back()
+
+    async def _step_go_forward(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 前进到下一页", step_num)
+        await self.base_page.go_forward()
+
+    async def _step_get_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        text = await self.base_page.get_text(selector)
+        self._step_log("步骤 {}: 获取元素 {} 的文本: {}", step_num, selector, text)
+
+    async def _step_get_attribute(self, selector: str, value: Any, expected: Any, step_num: int):
+        attribute = await self.base_page.get_attribute(selector, str(value) if value else "")
+        self._step_log("步骤 {}: 获取元素 {} 的属性 {}: {}", step_num, selector, value, attribute)
+
+    async def _step_get_value(self, selector: str, value: Any, expected: Any, step_num: int):
+        actual_value = await self.base_page.get_value(selector)
+        self._step_log("步骤 {}: 获取元素 {} 的值: {}", step_num, selector, actual_value)
+
+    async def _step_is_visible(self, selector: str, value: Any, expected: Any, step_num: int):
+        visible = await self.base_page.is_visible(selector)
+        self._step_log("步骤 {}: 元素 {} 可见性: {}", step_num, selector, visible)
+
+    async def _step_is_enabled(self, selector: str, value: Any, expected: Any, step_num: int):
+        enabled = await self.base_page.is_enabled(selector)
+        self._step_log("步骤 {}: 元素 {} 启用状态: {}", step_num, selector, enabled)
+
+    async def _step_get_page_title(self, selector: str, value: Any, expected: Any, step_num: int):
+        title = await self.base_page.get_page_title()
+        self._step_log("步骤 {}: 页面标题: {}", step_num, title)
+
+    async def _step_get_current_url(self, selector: str, value: Any, expected: Any, step_num: int):
+        url = await self.base_page.get_current_url()
+        self._step_log("步骤 {}: 当前URL: {}", step_num, url)
+
+    async def _step_get_dialog_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        text = await self.base_page.get_dialog_text()
+        self._step_log("步骤 {}: 对话框文本: {}", step_num, text)
+
+    async def _step_assert(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 增强断言步骤的执行和日志记录
+        self._step_log("步骤 {}: 执行断言 - 选择器: {}, 期望: {}, 值: {}", step_num, selector, expected, value)
+
+        # 断言前智能等待：等待网络空闲和页面稳定
+        if expected in ['包含', '等于']:
+            try:
+                # 等待接口请求完成
+                await self._wait_for_requests_drained(step_num)
+
+                # 使用智能等待方法等待元素内容稳定
+                if expected == '包含' and value:
+                    await self._wait_for_element_content_stable(selector, expected_content=value)
+                else:
+                    await self._wait_for_element_content_stable(selector)
+            except Exception as e:
+                self.logger.warning(f"步骤 {step_num}: 等待页面稳定时出现异常（继续执行）: {e}")
+
+        # 支持多种断言格式
+        if expected == '属性':
+            # 断言属性包含：默认断言 class 属性包含 value 作为子串
+            locator = self.page.locator(selector)
+            substring = str(value) if value is not None else ''
+            await self.page_assertion.assert_element_attribute_contains(locator, 'class', substring)
+        elif expected == '包含':
+            actual_text = await self.base_page.get_text(selector)
+            self._step_log("步骤 {}: 断言元素文本包含 '{}', 实际文本: '{}'", step_num, value, actual_text)
+            Assertion.assert_in(value, actual_text, f"断言元素文本包含: {value}")
+        elif expected == '等于':
+            actual_text = await self.base_page.get_text(selector)
+            self._step_log("步骤 {}: 断言元素文本等于 '{}', 实际文本: '{}'", step_num, value, actual_text)
+            Assertion.assert_equal(actual_text, value, f"断言元素文本等于: {value}")
+        elif expected in self.LOCATOR_ASSERTIONS:
+            locator = self.page.locator(selector)
+            await getattr(self.page_assertion, self.LOCATOR_ASSERTIONS[expected])(locator)
+        else:
+            self.logger.error(f"不支持的断言类型: {expected}")
+            return False
+
+        self._step_log("步骤 {}: 断言执行成功", step_num)
+
+    async def _wait_for_requests_drained(self, step_num: int) -> bool:
+        """
+        等待当前页面的接口请求全部返回；未启用请求跟踪时等待 networkidle
+
+        Returns:
+            是否在超时前完成
+        """
+        if self.request_tracker is None:
+            await self.base_page.wait_for_network_idle()
+            return True
+
+        with trace_span('request_wait', 'smart_wait'):
+            drained = await self.request_tracker.wait_for_idle(self._request_tracking['timeout'])
+        if not drained:
+            self.logger.warning(f"步骤 {step_num}: 等待接口请求返回超时，未完成的请求: {self.request_tracker.pending_urls()}")
+        return drained
+
+    async def flush_screenshots(self, timeout: float = None) -> Dict[str, str]:
+        """
+        等待后台截图全部写入（不阻塞事件循环），execute_test_case 结束时自动调用
+        
+        Args:
+            timeout: 最长等待秒数，为None时一直等待
+            
+        Returns:
+            写入失败的截图 {路径: 错误信息}
+        """
+        pending = self.screenshot_pipeline.take_pending()
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(future) for _, future in pending], timeout=timeout)
+        errors = collect_errors(pending)
+        self._log_screenshot_errors(errors)
+        return errors
+
+    # ==================== 数据驱动变体 ====================
+
+    async def _execute_multiple_test_cases(self, test_cases: Iterable[VariantPlan], start_url: Optional[str] = None) -> RunResult:
+        """
+        执行多个测试用例（数据驱动测试）
+        启用并行模式（configure_parallel）时，各变体在当前浏览器的独立上下文中并发执行，结果按原顺序合并
+
+        Args:
+            test_cases: 已编译的测试用例变体列表，或按数据源逐条生成的 VariantStream
+            start_url: 并发执行时新页面先打开的URL（从检查点执行）
+
+        Returns:
+            合并后的执行结果（执行时长由 execute_test_case 记录）
+        """
+        total = variant_count(test_cases)
+        if (total is None or total > 1) and self._parallel_available():
+            test_case_results = await self._execute_variants_concurrently(test_cases, start_url)
+        else:
+            test_case_results = []
+            for i, variant in enumerate(test_cases):
+                test_case_results.append(await self._execute_variant(i, total, variant))
+        return self._summarize_variants(test_case_results)
+
+    async def _execute_from_checkpoint(self, test_cases: Iterable[VariantPlan], prefix: int, mode: str) -> RunResult:
+        """公共前置步骤只执行一次，各变体从检查点开始执行其余步骤，参数与返回值见 BaseExecutor._execute_from_checkpoint"""
+        first, remaining = self._split_first_variant(test_cases)
+        if first is None:
+            return RunResult.from_cases([])
+
+        self._current_variant = ('', '')
+        with self._report_step(f"执行公共前置步骤（{prefix} 步）"):
+            prefix_result = await self._execute_compiled_steps(first.steps[:prefix])
+        if not prefix_result.success:
+            self.logger.warning("公共前置步骤执行失败，各变体完整执行全部步骤: {}", prefix_result.error_message)
+            return await self._execute_multiple_test_cases(remaining)
+
+        checkpoint = await self._save_checkpoint()
+        self.logger.info("公共前置步骤 {} 步执行完成，各变体从检查点开始: {}", prefix, checkpoint['url'])
+        forked = self._fork_variants(remaining, prefix)
+        if self._parallel_available():
+            result = await self._execute_multiple_test_cases(forked, start_url=checkpoint['url'])
+        else:
+            total = variant_count(forked)
+            test_case_results = []
+            for i, variant in enumerate(forked):
+                test_case_results.append(await self._execute_forked_variant(i, total, variant, checkpoint, mode))
+            result = self._summarize_variants(test_case_results)
+        result.prefix_steps = prefix_result.steps
+        return result
+
+    async def _save_checkpoint(self) -> Dict[str, Any]:
+        """检查点：当前URL和上下文的 storage_state"""
+        return {'url': self.page.url, 'storage_state': await self.page.context.storage_state()}
+
+    async def _execute_forked_variant(self, index: int, total: Optional[int], variant: VariantPlan,
+                                      checkpoint: Dict[str, Any], mode: str) -> CaseResult:
+        """从检查点打开新页面执行变体，参数与返回值见 BaseExecutor._execute_forked_variant"""
+        browser = self.page.context.browser
+        context = None
+        try:
+            if mode == 'state' and browser is not None:
+                context = await browser.new_context(**self._variant_context_options(checkpoint['storage_state']))
+                page = await context.new_page()
+            else:
+                page = await self.page.context.new_page()
+            try:
+                await page.goto(checkpoint['url'])
+                executor = self._spawn_executor(page)
+                result = await executor._execute_variant(index, total, variant)
+                self._adopt_variant_output(executor.screenshot_files, executor.report_buffer.take())
+                return result
+            finally:
+                if context is None:
+                    await page.close()
+        except Exception as e:
+            return self._variant_failed(variant, e)
+        finally:
+            if context is not None:
+                await context.close()
+
+    async def _execute_variant(self, index: int, total: Optional[int], variant: VariantPlan) -> CaseResult:
+        """
+        执行单个数据驱动变体
+
+        Args:
+            index: 变体序号（从0开始）
+            total: 变体总数，数据源驱动时为None
+            variant: 已编译的变体
+
+        Returns:
+            该变体的测试用例结果
+        """
+        with self._report_step(self._start_variant(index, total, variant)), \
+                trace_span(variant.case_name, 'variant', input_value=str(variant.input_value)):
+            try:
+                test_case_result = await self._execute_compiled_steps(variant.steps, variant.case_name, variant.input_value)
+            except Exception as e:
+                return self._variant_failed(variant, e)
+
+        self._record_metrics(variant, test_case_result)
+        return self._finish_case(test_case_result)
+
+    async def _execute_variants_concurrently(self, test_cases: Iterable[VariantPlan],
+                                             start_url: Optional[str] = None) -> List[CaseResult]:
+        """
+        在当前浏览器的多个上下文中并发执行变体
+        异步API可以在一个事件循环中驱动多个页面，因此不再为每个工作线程启动浏览器，
+        parallel_workers 个工作协程依次从变体迭代器取变体执行（数据源驱动的变体边读取边执行），
+        parallel_launch_options 在异步模式下不使用
+
+        Args:
+            test_cases: 已编译的测试用例变体列表，或按数据源逐条生成的 VariantStream
+            start_url: 新页面先打开的URL（从检查点执行）
+
+        Returns:
+            按原顺序排列的测试用例结果列表
+        """
+        total = variant_count(test_cases)
+        browser = self.page.context.browser
+        context_options = self._variant_context_options(await self.page.context.storage_state())
+        workers = self.parallel_workers if total is None else min(self.parallel_workers, total)
+        # 各工作协程共享同一个迭代器，在事件循环中轮流取值，不需要加锁
+        jobs = enumerate(test_cases)
+        outcomes: Dict[int, Tuple[CaseResult, Dict[Any, str], Optional[AllureBuffer]]] = {}
+
+        async def run(index: int, variant: VariantPlan) -> Tuple[CaseResult, Dict[Any, str], Optional[AllureBuffer]]:
+            context = await browser.new_context(**context_options)
+            try:
+                page = await context.new_page()
+                if start_url:
+                    await page.goto(start_url)
+                executor = self._spawn_executor(page)
+                result = await executor._execute_variant(index, total, variant)
+                return result, executor.screenshot_files, executor.report_buffer.take()
+            except Exception as e:
+                return self._variant_failed(variant, e), {}, None
+            finally:
+                await context.close()
+
+        async def worker() -> None:
+            for index, variant in jobs:
+                outcomes[index] = await run(index, variant)
+
+        self.logger.info("并发执行 {} 个测试用例，同时打开的上下文数: {}",
+                         total if total is not None else '数据源中的', workers)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        merged = []
+        for index in sorted(outcomes):
+            result, screenshot_files, report = outcomes[index]
+            self._adopt_variant_output(screenshot_files, report)
+            merged.append(result)
+        return merged
+
+    # ==================== 旧格式操作/断言 ====================
+
+    async def _execute_action(self, action: Dict[str, Any], step_name: str, action_index: int) -> bool:
+        """
+        执行单个操作
+
+        Args:
+            action: 操作字典
+            step_name: 步骤名称
+            action_index: 操作索引
+
+        Returns:
+            执行结果
+        """
+        try:
+            action_type, target, value, expected, description, timeout = self._parse_action(action)
+            self._step_log("  执行操作 {}: {} - {}", action_index, action_type, description)
+
+            if action_type.startswith('assert'):
+                return await self._execute_assertion(action_type, target, expected, value, timeout, description)
+            else:
+                return await self._execute_operation(action_type, target, value, timeout, description)
+
+        except Exception as e:
+            self.logger.error(f"执行操作失败: {e}")
+            return False
+
+    async def _execute_operation(self, action_type: str, target: str, value: Any, timeout: int, description: str) -> bool:
+        """
+        执行操作
+
+        Args:
+            action_type: 操作类型
+            target: 目标元素
+            value: 操作值
+            timeout: 超时时间
+            description: 操作描述
+
+        Returns:
+            执行结果
+        """
+        try:
+            handler = self.action_handlers.get(action_type)
+            if handler:
+                await handler(target, value, timeout, description)
+                return True
+            else:
+                self.logger.error(f"不支持的操作类型: {action_type}")
+                return False
+        except Exception as e:
+            self.logger.error(f"执行操作 {action_type} 失败: {e}")
+            return False
+
+    async def _execute_assertion(self, assertion_type: str, target: str, expected: Any, value: Any, timeout: int, description: str) -> bool:
+        """
+        执行断言
+
+        Args:
+            assertion_type: 断言类型
+            target: 目标元素
+            expected: 期望值
+            value: 实际值
+            timeout: 超时时间
+            description: 断言描述
+
+        Returns:
+            执行结果
+        """
+        try:
+            handler = self.assertion_handlers.get(assertion_type)
+            if handler:
+                await handler(target, expected, value, timeout, description)
+                return True
+            else:
+                self.logger.error(f"不支持的断言类型: {assertion_type}")
+                return False
+        except Exception as e:
+            self.logger.error(f"执行断言 {assertion_type} 失败: {e}")
+            return False
+
+    # ==================== 操作处理器 ====================
+    
+    async def _handle_navigate(self, target: str, value: Any, timeout: int, description: str):
+        """处理导航操作"""
+        await self.base_page.navigate_to(target)
+    
+    async def _handle_click(self, target: str, value: Any, timeout: int, description: str):
+        """处理点击操作"""
+        await self.base_page.click(target, timeout)
+    
+    async def _handle_input(self, target: str, value: str, timeout: int, description: str):
+        """处理输入操作"""
+        await self.base_page.input_text(target, value, timeout)
+    
+    async def _handle_clear_and_input(self, target: str, value: str, timeout: int, description: str):
+        """处理清除并输入操作"""
+        await self.base_page.clear_and_input(target, value, timeout)
+    
+    async def _handle_select(self, target: str, value: str, timeout: int, description: str):
+        """处理选择操作"""
+        await self.base_page.select_option(target, value, timeout)
+    
+    async def _handle_select_option_by_label(self, target: str, value: str, timeout: int, description: str):
+        """处理根据标签选择选项操作"""
+        await self.base_page.select_option_by_label(target, value, timeout)
+    
+    async def _handle_check(self, target: str, value: Any, timeout: int, description: str):
+        """处理勾选操作"""
+        await self.base_page.check_checkbox(target, timeout)
+    
+    async def _handle_uncheck(self, target: str, value: Any, timeout: int, description: str):
+        """处理取消勾选操作"""
+        await self.base_page.uncheck_checkbox(target, timeout)
+    
+    async def _handle_upload(self, target: str, value: str, timeout: int, description: str):
+        """处理文件上传操作"""
+        await self.base_page.upload_file(target, value, timeout)
+    
+    async def _handle_hover(self, target: str, value: Any, timeout: int, description: str):
+        """处理悬停操作"""
+        await self.base_page.hover(target, timeout)
+    
+    async def _handle_double_click(self, target: str, value: Any, timeout: int, description: str):
+        """处理双击操作"""
+        await self.base_page.double_click(target, timeout)
+    
+    async def _handle_right_click(self, target: str, value: Any, timeout: int, description: str):
+        """处理右键点击操作"""
+        await self.base_page.right_click(target, timeout)
+    
+    async def _handle_wait(self, target: str, value: float, timeout: int, description: str):
+        """处理等待操作"""
+        await self.base_page.wait_for_time(value)
+    
+    async def _handle_wait_for_element(self, target: str, value: Any, timeout: int, description: str):
+        """处理等待元素操作"""
+        await self.base_page.wait_for_element(target, timeout)
+    
+    async def _handle_wait_for_element_hidden(self, target: str, value: Any, timeout: int, description: str):
+        """处理等待元素隐藏操作"""
+        await self.base_page.wait_for_element_hidden(target, timeout)
+    
+    async def _handle_wait_for_load_state(self, target: str, value: str, timeout: int, description: str):
+        """处理等待加载状态操作"""
+        await self.base_page.wait_for_load_state(value, timeout)
+    
+    async def _handle_wait_for_network_idle(self, target: str, value: Any, timeout: int, description: str):
+        """处理等待网络空闲操作"""
+        await self.base_page.wait_for_network_idle(timeout)
+    
+    async def _handle_scroll_to_element(self, target: str, value: Any, timeout: int, description: str):
+        """处理滚动到元素操作"""
+        await self.base_page.scroll_to_element(target, timeout)
+    
+    async def _handle_scroll_to_bottom(self, target: str, value: Any, timeout: int, description: str):
+        """处理滚动到底部操作"""
+        await self.base_page.scroll_to_bottom()
+    
+    async def _handle_scroll_to_top(self, target: str, value: Any, timeout: int, description: str):
+        """处理滚动到顶部操作"""
+        await self.base_page.scroll_to_top()
+    
+    async def _handle_press_key(self, target: str, value: str, timeout: int, description: str):
+        """处理按键操作"""
+        await self.base_page.press_key(value)
+    
+    async def _handle_press_enter(self, target: str, value: Any, timeout: int, description: str):
+        """处理按下Enter键操作"""
+        await self.base_page.press_enter()
+    
+    async def _handle_press_tab(self, target: str, value: Any, timeout: int, description: str):
+        """处理按下Tab键操作"""
+        await self.base_page.press_tab()
+    
+    async def _handle_press_escape(self, target: str, value: Any, timeout: int, description: str):
+        """处理按下Escape键操作"""
+        await self.base_page.press_escape()
+    
+    async def _handle_type_text(self, target: str, value: str, timeout: int, description: str):
+        """处理输入文本操作"""
+        await self.base_page.type_text(value)
+    
+    async def _handle_refresh_page(self, target: str, value: Any, timeout: int, description: str):
+        """处理刷新页面操作"""
+        await self.base_page.refresh_page()
+    
+    async def _handle_go_back(self, target: str, value: Any, timeout: int, description: str):
+        """处理返回操作"""
+        await self.base_page.go_back()
+    
+    async def _handle_go_forward(self, target: str, value: Any, timeout: int, description: str):
+        """处理前进操作"""
+        await self.base_page.go_forward()
+    
+    async def _handle_take_screenshot(self, target: str, value: str, timeout: int, description: str):
+        """处理截图操作"""
+        image_format = resolve_image_format(value)
+        image = await self.base_page.capture_screenshot(image_type=capture_options(image_format, None)[0])
+        self.screenshot_pipeline.submit(value, image, image_format)
+    
+    async def _handle_execute_script(self, target: str, value: str, timeout: int, description: str):
+        """处理执行脚本操作"""
+        await self.base_page.execute_script(value)
+    
+    async def _handle_accept_dialog(self, target: str, value: Any, timeout: int, description: str):
+        """处理接受对话框操作"""
+        await self.base_page.accept_dialog()
+    
+    async def _handle_dismiss_dialog(self, target: str, value: Any, timeout: int, description: str):
+        """处理取消对话框操作"""
+        await self.base_page.dismiss_dialog()
+    
+    async def _handle_get_dialog_text(self, target: str, value: Any, timeout: int, description: str):
+        """处理获取对话框文本操作"""
+        text = await self.base_page.get_dialog_text()
+        self._step_log("获取对话框文本: {}", text)
+        if value:
+            Assertion.assert_equal(text, value, description)
+    
+    # 获取信息类操作
+    async def _handle_get_text(self, target: str, value: Any, timeout: int, description: str):
+        """处理获取文本操作"""
+        text = await self.base_page.get_text(target)
+        self._step_log("获取文本 - 选择器: {}, 文本: {}", target, text)
+        if value:
+            Assertion.assert_equal(text, value, description)
+    
+    async def _handle_get_attribute(self, target: str, value: str, timeout: int, description: str):
+        """处理获取属性操作"""
+        attribute = await self.base_page.get_attribute(target, value)
+        self._step_log("获取属性 - 选择器: {}, 属性: {}", target, attribute)
+        if value:
+            Assertion.assert_equal(attribute, value, description)
+    
+    async def _handle_get_value(self, target: str, value: Any, timeout: int, description: str):
+        """处理获取值操作"""
+        actual_value = await self.base_page.get_value(target)
+        self._step_log("获取值 - 选择器: {}, 值: {}", target, actual_value)
+        if value:
+            Assertion.assert_equal(actual_value, value, description)
+    
+    async def _handle_is_visible(self, target: str, value: Any, timeout: int, description: str):
+        """处理断言元素可见操作"""
+        actual = await self.base_page.is_visible(target)
+        self._step_log("断言元素可见 - 选择器: {}, 实际: {}", target, actual)
+        Assertion.assert_true(actual, description)
+    
+    async def _handle_is_enabled(self, target: str, value: Any, timeout: int, description: str):
+        """处理断言元素启用操作"""
+        actual = await self.base_page.is_enabled(target)
+        self._step_log("断言元素启用 - 选择器: {}, 实际: {}", target, actual)
+        Assertion.assert_true(actual, description)
+    
+    async def _handle_get_page_title(self, target: str, value: Any, timeout: int, description: str):
+        """处理获取页面标题操作"""
+        title = await self.base_page.get_page_title()
+        self._step_log("获取页面标题: {}", title)
+        if value:
+            Assertion.assert_equal(title, value, description)
+    
+    async def _handle_get_current_url(self, target: str, value: Any, timeout: int, description: str):
+        """处理获取当前URL操作"""
+        url = await self.base_page.get_current_url()
+        self._step_log("获取当前URL: {}", url)
+        if value:
+            Assertion.assert_equal(url, value, description)
+    
+    # ==================== 断言处理器 ====================
+    
+    async def _handle_assert_element_visible(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素可见"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_visible(locator, description, timeout)
+    
+    async def _handle_assert_element_hidden(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素隐藏"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_hidden(locator, description, timeout)
+    
+    async def _handle_assert_text_contains(self, target: str, expected: str, value: Any, timeout: int, description: str):
+        """处理断言文本包含"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_text_contains(locator, expected, description, timeout)
+    
+    async def _handle_assert_text_equals(self, target: str, expected: str, value: Any, timeout: int, description: str):
+        """处理断言文本等于"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_text_equals(locator, expected, description, timeout)
+    
+    async def _handle_assert_value_equals(self, target: str, expected: str, value: Any, timeout: int, description: str):
+        """处理断言值等于"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_input_value_equals(locator, expected, description, timeout)
+    
+    async def _handle_assert_url_contains(self, target: str, expected: str, value: Any, timeout: int, description: str):
+        """处理断言URL包含"""
+        await self.page_assertion.assert_url_contains(expected, description, timeout)
+    
+    async def _handle_assert_title_contains(self, target: str, expected: str, value: Any, timeout: int, description: str):
+        """处理断言标题包含"""
+        await self.page_assertion.assert_title_contains(expected, description, timeout)
+    
+    async def _handle_assert_element_enabled(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素启用"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_enabled(locator, description, timeout)
+    
+    async def _handle_assert_element_disabled(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素禁用"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_disabled(locator, description, timeout)
+    
+    async def _handle_assert_element_checked(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素已勾选"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_checked(locator, description, timeout)
+    
+    async def _handle_assert_element_not_checked(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素未勾选"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_element_is_not_checked(locator, description, timeout)
+    
+    async def _handle_assert_count(self, target: str, expected: int, value: Any, timeout: int, description: str):
+        """处理断言元素数量"""
+        locator = self.page.locator(target)
+        await self.page_assertion.assert_count_of_elements(locator, expected, description, timeout)
+    
+    async def _handle_assert_equal(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言相等"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_equal(actual, expected, description)
+    
+    async def _handle_assert_not_equal(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言不相等"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_not_equal(actual, expected, description)
+    
+    async def _handle_assert_true(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言为真"""
+        actual = await self.base_page.is_visible(target) if target else value
+        Assertion.assert_true(actual, description)
+    
+    async def _handle_assert_false(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言为假"""
+        actual = await self.base_page.is_visible(target) if target else value
+        Assertion.assert_false(actual, description)
+    
+    async def _handle_assert_in(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言包含"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_in(actual, expected, description)
+    
+    async def _handle_assert_not_in(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言不包含"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_not_in(actual, expected, description)
+    
+    async def _handle_assert_is_none(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言为空"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_is_none(actual, description)
+    
+    async def _handle_assert_is_not_none(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言不为空"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_is_not_none(actual, description)
+    
+    async def _handle_assert_greater(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言大于"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_greater(actual, expected, description)
+    
+    async def _handle_assert_less(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言小于"""
+        actual = await self.base_page.get_text(target) if target else value
+        Assertion.assert_less(actual, expected, description)
+
+    async def _handle_assert_attribute_include(self, target: str, expected: Any, value: Any, timeout: int, description: str):
+        """处理断言元素属性包含子串
+        如果未明确给出属性名，则默认断言 class 属性包含 value
+        """
+        locator = self.page.locator(target)
+        attribute_name, substring = self._attribute_assertion_args(expected, value)
+        await self.page_assertion.assert_element_attribute_contains(locator, attribute_name, substring, description, timeout)
+    
+    async def _wait_for_element_content_stable(self, selector: str, expected_content: str = None, timeout: int = None, check_interval: float = None) -> bool:
+        """
+        智能等待元素内容稳定，等待期间让出事件循环，不阻塞其他页面
+
+        Args:
+            selector: 元素选择器
+            expected_content: 期望的内容（可选，如果提供则等待内容匹配）
+            timeout: 超时时间（毫秒），如果为None则使用配置值
+            check_interval: 检查间隔（秒），如果为None则使用配置值
+
+        Returns:
+            是否成功等待到内容稳定
+        """
+        if not self.enable_smart_wait:
+            self.logger.info("智能等待已禁用，跳过等待")
+            return True
+
+        timeout = timeout or self.smart_wait_timeout
+        check_interval = check_interval or self.smart_wait_interval
+
+        if self.smart_wait_mode == 'mutation':
+            self._step_log("开始等待元素内容稳定(mutation): {}, 超时: {}ms, 静默窗口: {}ms", selector, timeout, self.smart_wait_quiet_window)
+            try:
+                stable = await self.base_page.wait_for_content_stable(selector, expected_content, self.smart_wait_quiet_window, timeout)
+            except Exception as e:
+                self.logger.warning(f"MutationObserver等待不可用，回退为轮询: {e}")
+            else:
+                if not stable:
+                    self.logger.warning(f"等待元素内容稳定超时: {selector}")
+                return stable
+
+        with trace_span('content_stable_poll', 'smart_wait'):
+            return await self._poll_element_content_stable(selector, expected_content, timeout, check_interval)
+
+    async def _poll_element_content_stable(self, selector: str, expected_content: Optional[str], timeout: int, check_interval: float) -> bool:
+        """轮询 get_text，连续两次内容相同视为稳定"""
+        start_time = time.time()
+        last_content = None
+        stable_count = 0
+        required_stable_count = 2  # 需要连续2次内容相同才认为稳定
+
+        self._step_log("开始等待元素内容稳定: {}, 超时: {}ms, 检查间隔: {}s", selector, timeout, check_interval)
+
+        while (time.time() - start_time) * 1000 < timeout:
+            try:
+                current_content = await self.base_page.get_text(selector)
+
+                if expected_content and expected_content in current_content:
+                    self._step_log("元素内容已匹配期望值: {}", expected_content)
+                    return True
+
+                if current_content == last_content:
+                    stable_count += 1
+                    if stable_count >= required_stable_count:
+                        self._step_log("元素内容已稳定: {}", current_content)
+                        return True
+                else:
+                    stable_count = 0
+                    last_content = current_content
+
+                await asyncio.sleep(check_interval)
+
+            except Exception as e:
+                self.logger.warning(f"等待元素内容稳定时出现异常: {e}")
+                await asyncio.sleep(check_interval)
+
+        self.logger.warning(f"等待元素内容稳定超时: {selector}")
+        return False
+
+
+async def gather_test_cases(jobs: Sequence[Tuple[AsyncBaseExecutor, str, Dict[str, Any]]],
+                            concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    在同一个事件循环中并发执行多个互不依赖的用例
+
+    Args:
+        jobs: (执行器, 用例名称, 测试数据) 列表，每个执行器应绑定各自的页面
+        concurrency: 同时执行的用例数上限，None 表示不限制
+
+    Returns:
+        按 jobs 顺序排列的执行结果
+    """
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def run(executor: AsyncBaseExecutor, test_case_name: str, test_data: Dict[str, Any]) -> Dict[str, Any]:
+        if semaphore is None:
+            return await executor.execute_test_case(test_case_name, test_data)
+        async with semaphore:
+            return await executor.execute_test_case(test_case_name, test_data)
+
+    return await asyncio.gather(*(run(*job) for job in jobs))
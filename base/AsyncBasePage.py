@@ -0,0 +1,643 @@
+"""
+AsyncBasePage类 - 基于 playwright.async_api 的基础页面类
+与 BasePage 提供相同的操作，所有方法均为协程，可在同一个事件循环中驱动多个页面
+"""
+
+from playwright.async_api import Error, Page, expect, TimeoutError
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+from base.BasePage import (
+    CONTENT_STABLE_CLEANUP_SCRIPT, CONTENT_STABLE_SCRIPT, INPUT_SETTLED_SCRIPT, NEXT_FRAME_SCRIPT, add_page_listener,
+    dom_selector, element_clip, screenshot_options,
+)
+
+
+class AsyncBasePage:
+    """异步基础页面类，提供通用的UI自动化功能"""
+    
+    def __init__(self, page: Page):
+        """
+        初始化AsyncBasePage
+        
+        Args:
+            page: Playwright的Page对象
+        """
+        self.page = page
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    # ==================== 基础操作方法 ====================
+    
+    async def navigate_to(self, url: str) -> None:
+        """
+        导航到指定URL
+        
+        Args:
+            url: 目标URL
+        """
+        self.logger.info("导航到页面: %s", url)
+        await self.page.goto(url)
+    
+    async def click(self, selector: str, timeout: int = 30000) -> None:
+        """
+        点击元素
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("点击元素: %s", selector)
+        await self.page.click(selector, timeout=timeout)
+    
+    async def input_text(self, selector: str, text: str, timeout: int = 30000) -> None:
+        """
+        在输入框中输入文本
+        
+        Args:
+            selector: 元素选择器
+            text: 要输入的文本
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("在元素 %s 中输入文本: %s", selector, text)
+        await self.page.fill(selector, text, timeout=timeout)
+    
+    async def clear_and_input(self, selector: str, text: str, timeout: int = 30000) -> None:
+        """
+        清空输入框并输入文本
+        
+        Args:
+            selector: 元素选择器
+            text: 要输入的文本
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("清空并输入文本到元素 %s: %s", selector, text)
+        await self.page.fill(selector, "", timeout=timeout)
+        await self.page.fill(selector, text, timeout=timeout)
+    
+    async def select_option(self, selector: str, value: str, timeout: int = 30000) -> None:
+        """
+        选择下拉框选项
+        
+        Args:
+            selector: 下拉框选择器
+            value: 要选择的选项值
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("选择下拉框 %s 的选项: %s", selector, value)
+        await self.page.select_option(selector, value, timeout=timeout)
+    
+    async def select_option_by_label(self, selector: str, label: str, timeout: int = 30000) -> None:
+        """
+        通过标签选择下拉框选项
+        
+        Args:
+            selector: 下拉框选择器
+            label: 要选择的选项标签
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("通过标签选择下拉框 %s 的选项: %s", selector, label)
+        await self.page.select_option(selector, label=label, timeout=timeout)
+    
+    async def check_checkbox(self, selector: str, timeout: int = 30000) -> None:
+        """
+        勾选复选框
+        
+        Args:
+            selector: 复选框选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("勾选复选框: %s", selector)
+        await self.page.check(selector, timeout=timeout)
+    
+    async def uncheck_checkbox(self, selector: str, timeout: int = 30000) -> None:
+        """
+        取消勾选复选框
+        
+        Args:
+            selector: 复选框选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("取消勾选复选框: %s", selector)
+        await self.page.uncheck(selector, timeout=timeout)
+    
+    async def upload_file(self, selector: str, file_path: str, timeout: int = 30000) -> None:
+        """
+        上传文件
+        
+        Args:
+            selector: 文件输入框选择器
+            file_path: 文件路径
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("上传文件到 %s: %s", selector, file_path)
+        await self.page.set_input_files(selector, file_path, timeout=timeout)
+    
+    async def hover(self, selector: str, timeout: int = 30000) -> None:
+        """
+        鼠标悬停
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("鼠标悬停在元素: %s", selector)
+        await self.page.hover(selector, timeout=timeout)
+    
+    async def double_click(self, selector: str, timeout: int = 30000) -> None:
+        """
+        双击元素
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("双击元素: %s", selector)
+        await self.page.dblclick(selector, timeout=timeout)
+    
+    async def right_click(self, selector: str, timeout: int = 30000) -> None:
+        """
+        右键点击元素
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("右键点击元素: %s", selector)
+        await self.page.click(selector, button="right", timeout=timeout)
+    
+    # ==================== 等待方法 ====================
+    
+    async def wait_for_element(self, selector: str, timeout: int = 30000) -> None:
+        """
+        等待元素出现
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("等待元素出现: %s", selector)
+        await self.page.wait_for_selector(selector, timeout=timeout)
+    
+    async def wait_for_element_hidden(self, selector: str, timeout: int = 30000) -> None:
+        """
+        等待元素隐藏
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("等待元素隐藏: %s", selector)
+        await self.page.wait_for_selector(selector, state="hidden", timeout=timeout)
+    
+    async def wait_for_load_state(self, state: str = "networkidle", timeout: int = 30000) -> None:
+        """
+        等待页面加载状态
+        
+        Args:
+            state: 加载状态 ("load", "domcontentloaded", "networkidle")
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("等待页面加载状态: %s", state)
+        await self.page.wait_for_load_state(state, timeout=timeout)
+    
+    async def wait_for_time(self, seconds: float) -> None:
+        """
+        等待指定时间
+        
+        Args:
+            seconds: 等待秒数
+        """
+        self.logger.info("等待 %s 秒", seconds)
+        await asyncio.sleep(seconds)
+    
+    async def wait_for_content_stable(self, selector: str, expected_text: Optional[str] = None, quiet_ms: int = 500,
+                                      timeout: int = 10000, polling: int = 50) -> bool:
+        """
+        基于 MutationObserver 等待元素内容稳定
+        
+        Args:
+            selector: 元素选择器（CSS或XPath）
+            expected_text: 期望包含的文本，出现后立即返回
+            quiet_ms: 子树无变更持续多久视为稳定（毫秒）
+            timeout: 超时时间（毫秒）
+            polling: 页面内检查间隔（毫秒）
+            
+        Returns:
+            是否在超时前稳定
+            
+        Raises:
+            ValueError: 选择器无法在页面内解析
+        """
+        target = dom_selector(selector)
+        if target is None:
+            raise ValueError(f"选择器不支持页面内解析: {selector}")
+        try:
+            await self.page.wait_for_function(
+                CONTENT_STABLE_SCRIPT,
+                arg={'selector': target[0], 'xpath': target[1], 'expected': expected_text or '', 'quietMs': quiet_ms},
+                timeout=timeout,
+                polling=polling,
+            )
+            return True
+        except TimeoutError:
+            try:
+                await self.page.evaluate(CONTENT_STABLE_CLEANUP_SCRIPT, {'selector': target[0], 'xpath': target[1]})
+            except Error:
+                # 页面已跳转或关闭，观察器随原页面释放
+                pass
+            return False
+    
+    async def wait_for_input_settled(self, selector: str, quiet_ms: int = 50, timeout: int = 300) -> bool:
+        """
+        等待输入框的值稳定（输入事件处理完成），值在 quiet_ms 内不再变化即返回
+        
+        Args:
+            selector: 元素选择器
+            quiet_ms: 值保持不变的时间（毫秒）
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            是否在超时前稳定；选择器无法在页面内解析时等待下一帧后返回True
+        """
+        target = dom_selector(selector)
+        if target is None:
+            await self.wait_for_next_frame()
+            return True
+        try:
+            await self.page.wait_for_function(
+                INPUT_SETTLED_SCRIPT,
+                arg={'selector': target[0], 'xpath': target[1], 'quietMs': quiet_ms, 'token': str(time.monotonic_ns())},
+                timeout=timeout,
+                polling=25,
+            )
+            return True
+        except TimeoutError:
+            return False
+    
+    async def wait_for_next_frame(self) -> None:
+        """等待浏览器完成下一帧渲染（页面在后台不渲染时最多等待100毫秒）"""
+        await self.page.evaluate(NEXT_FRAME_SCRIPT)
+    
+    async def wait_until_actionable(self, selector: str, timeout: int) -> Optional[float]:
+        """
+        等待元素可操作（可见且启用）
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            元素变为可操作所用的毫秒数，超时或无法检测（选择器无效、元素被移除）时返回None
+        """
+        start = time.monotonic()
+        try:
+            element = await self.page.wait_for_selector(selector, state="visible", timeout=timeout)
+            while not await element.is_enabled():
+                if (time.monotonic() - start) * 1000 >= timeout:
+                    return None
+                await self.page.wait_for_timeout(50)
+        except Exception:
+            return None
+        return (time.monotonic() - start) * 1000
+    
+    # ==================== 获取元素信息 ====================
+    
+    async def get_text(self, selector: str, timeout: int = 30000) -> str:
+        """
+        获取元素文本内容
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            元素文本内容
+        """
+        self.logger.info("获取元素文本: %s", selector)
+        return await self.page.text_content(selector, timeout=timeout)
+    
+    async def get_attribute(self, selector: str, attribute: str, timeout: int = 30000) -> Optional[str]:
+        """
+        获取元素属性值
+        
+        Args:
+            selector: 元素选择器
+            attribute: 属性名
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            属性值
+        """
+        self.logger.info("获取元素 %s 的属性 %s", selector, attribute)
+        return await self.page.get_attribute(selector, attribute, timeout=timeout)
+
+    async def get_locator_attribute(self, selector: str, attribute: str, timeout: int = 30000) -> Optional[str]:
+        """
+        通过 Locator API 获取元素属性值（支持超时）
+        """
+        self.logger.info("通过Locator获取元素 %s 的属性 %s", selector, attribute)
+        locator = self.page.locator(selector)
+        return await locator.get_attribute(attribute, timeout=timeout)
+    
+    async def get_value(self, selector: str, timeout: int = 30000) -> str:
+        """
+        获取输入框的值
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            输入框的值
+        """
+        self.logger.info("获取输入框的值: %s", selector)
+        return await self.page.input_value(selector, timeout=timeout)
+    
+    async def is_visible(self, selector: str, timeout: int = 5000) -> bool:
+        """
+        检查元素是否可见
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            是否可见
+        """
+        try:
+            await self.page.wait_for_selector(selector, state="visible", timeout=timeout)
+            return True
+        except TimeoutError:
+            return False
+    
+    async def is_enabled(self, selector: str, timeout: int = 5000) -> bool:
+        """
+        检查元素是否启用
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            是否启用
+        """
+        try:
+            element = await self.page.wait_for_selector(selector, timeout=timeout)
+            return await element.is_enabled()
+        except TimeoutError:
+            return False
+    
+    # ==================== 断言方法 ====================
+    
+    async def assert_element_visible(self, selector: str, timeout: int = 30000) -> None:
+        """
+        断言元素可见
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("断言元素可见: %s", selector)
+        await expect(self.page.locator(selector)).to_be_visible(timeout=timeout)
+    
+    async def assert_element_hidden(self, selector: str, timeout: int = 30000) -> None:
+        """
+        断言元素隐藏
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("断言元素隐藏: %s", selector)
+        await expect(self.page.locator(selector)).to_be_hidden(timeout=timeout)
+    
+    async def assert_text_contains(self, selector: str, text: str, timeout: int = 30000) -> None:
+        """
+        断言元素文本包含指定内容
+        
+        Args:
+            selector: 元素选择器
+            text: 期望包含的文本
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("断言元素 %s 包含文本: %s", selector, text)
+        await expect(self.page.locator(selector)).to_contain_text(text, timeout=timeout)
+    
+    async def assert_text_equals(self, selector: str, text: str, timeout: int = 30000) -> None:
+        """
+        断言元素文本等于指定内容
+        
+        Args:
+            selector: 元素选择器
+            text: 期望的文本
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("断言元素 %s 文本等于: %s", selector, text)
+        await expect(self.page.locator(selector)).to_have_text(text, timeout=timeout)
+    
+    async def assert_value_equals(self, selector: str, value: str, timeout: int = 30000) -> None:
+        """
+        断言输入框的值等于指定内容
+        
+        Args:
+            selector: 元素选择器
+            value: 期望的值
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("断言元素 %s 的值等于: %s", selector, value)
+        await expect(self.page.locator(selector)).to_have_value(value, timeout=timeout)
+    
+    async def assert_url_contains(self, url_part: str) -> None:
+        """
+        断言当前URL包含指定部分
+        
+        Args:
+            url_part: URL的一部分
+        """
+        self.logger.info("断言URL包含: %s", url_part)
+        await expect(self.page).to_have_url(f"**{url_part}**")
+    
+    async def assert_title_contains(self, title_part: str) -> None:
+        """
+        断言页面标题包含指定部分
+        
+        Args:
+            title_part: 标题的一部分
+        """
+        self.logger.info("断言页面标题包含: %s", title_part)
+        await expect(self.page).to_have_title(f"**{title_part}**")
+    
+    # ==================== 键盘操作 ====================
+    
+    async def press_key(self, key: str) -> None:
+        """
+        按下键盘按键
+        
+        Args:
+            key: 按键名称
+        """
+        self.logger.info("按下按键: %s", key)
+        await self.page.keyboard.press(key)
+    
+    async def type_text(self, text: str) -> None:
+        """
+        输入文本（当前焦点位置）
+        
+        Args:
+            text: 要输入的文本
+        """
+        self.logger.info("输入文本: %s", text)
+        await self.page.keyboard.type(text)
+    
+    async def press_enter(self) -> None:
+        """按下回车键"""
+        await self.press_key("Enter")
+    
+    async def press_tab(self) -> None:
+        """按下Tab键"""
+        await self.press_key("Tab")
+    
+    async def press_escape(self) -> None:
+        """按下Escape键"""
+        await self.press_key("Escape")
+    
+    # ==================== 页面操作 ====================
+    
+    async def refresh_page(self) -> None:
+        """刷新页面"""
+        self.logger.info("刷新页面")
+        await self.page.reload()
+    
+    async def go_back(self) -> None:
+        """返回上一页"""
+        self.logger.info("返回上一页")
+        await self.page.go_back()
+    
+    async def go_forward(self) -> None:
+        """前进到下一页"""
+        self.logger.info("前进到下一页")
+        await self.page.go_forward()
+    
+    async def take_screenshot(self, path: str) -> bytes:
+        """
+        截图
+        
+        Args:
+            path: 截图保存路径
+            
+        Returns:
+            截图内容（同时已写入文件）
+        """
+        self.logger.info("截图保存到: %s", path)
+        return await self.page.screenshot(path=path)
+    
+    async def capture_screenshot(self, selector: str = None, clip: Dict[str, float] = None, full_page: bool = False,
+                           image_type: str = 'png', quality: int = None) -> bytes:
+        """
+        截图并返回图片数据，不写文件
+        
+        Args:
+            selector: 元素选择器，指定时只截取该元素
+            clip: 截取区域 {x, y, width, height}，同时指定selector时坐标相对于元素左上角
+            full_page: 截取整个页面（未指定selector和clip时有效）
+            image_type: png 或 jpeg
+            quality: jpeg质量（0-100）
+            
+        Returns:
+            图片数据
+        """
+        options = screenshot_options(image_type, quality)
+        if selector and clip:
+            clip = element_clip(selector, await self.page.locator(selector).bounding_box(), clip)
+            return await self.page.screenshot(clip=clip, **options)
+        if selector:
+            return await self.page.locator(selector).screenshot(**options)
+        if clip:
+            return await self.page.screenshot(clip=clip, **options)
+        return await self.page.screenshot(full_page=full_page, **options)
+
+    async def get_page_title(self) -> str:
+        """
+        获取页面标题
+        
+        Returns:
+            页面标题
+        """
+        return await self.page.title()
+    
+    async def get_current_url(self) -> str:
+        """
+        获取当前URL
+        
+        Returns:
+            当前URL
+        """
+        return self.page.url
+    
+    # ==================== 高级操作方法 ====================
+    
+    async def scroll_to_element(self, selector: str, timeout: int = 30000) -> None:
+        """
+        滚动到指定元素
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("滚动到元素: %s", selector)
+        await self.page.locator(selector).scroll_into_view_if_needed(timeout=timeout)
+    
+    async def scroll_to_bottom(self) -> None:
+        """滚动到页面底部"""
+        self.logger.info("滚动到页面底部")
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    
+    async def scroll_to_top(self) -> None:
+        """滚动到页面顶部"""
+        self.logger.info("滚动到页面顶部")
+        await self.page.evaluate("window.scrollTo(0, 0)")
+    
+    async def execute_script(self, script: str) -> any:
+        """
+        执行JavaScript脚本
+        
+        Args:
+            script: JavaScript脚本
+            
+        Returns:
+            脚本执行结果
+        """
+        self.logger.info("执行JavaScript脚本: %s", script)
+        return await self.page.evaluate(script)
+    
+    async def wait_for_network_idle(self, timeout: int = 30000) -> None:
+        """
+        等待网络空闲
+        
+        Args:
+            timeout: 超时时间（毫秒）
+        """
+        self.logger.info("等待网络空闲")
+        await self.page.wait_for_load_state("networkidle", timeout=timeout)
+    
+    async def accept_dialog(self) -> None:
+        """接受对话框"""
+        self.logger.info("接受对话框")
+        add_page_listener(self.page, "dialog", lambda dialog: dialog.accept())
+    
+    async def dismiss_dialog(self) -> None:
+        """取消对话框"""
+        self.logger.info("取消对话框")
+        add_page_listener(self.page, "dialog", lambda dialog: dialog.dismiss())
+    
+    async def get_dialog_text(self) -> str:
+        """
+        获取对话框文本
+        
+        Returns:
+            对话框文本
+        """
+        dialog_text = []
+        add_page_listener(self.page, "dialog", lambda dialog: dialog_text.append(dialog.message))
+        return dialog_text[0] if dialog_text else ""
@@ -1,5 +1,6 @@
 import pytest
 from playwright.sync_api import Page, Locator, expect
+from playwright.async_api import Page as AsyncPage, Locator as AsyncLocator, expect as async_expect
 
 
 class Assertion:
@@ -228,3 +229,140 @@ class PageAssertion:
             expect(text_locator).to_have_text(expected_text, timeout=timeout)
         except AssertionError as e:
             pytest.fail(f"{message} - {e}")
+
+
+class AsyncPageAssertion:
+    """异步页面断言类，基于 playwright.async_api 的expect，方法与 PageAssertion 一一对应"""
+
+    def __init__(self, page: AsyncPage):
+        self.page = page
+
+    async def assert_url_contains(self, substring: str, message="", timeout=5000):
+        try:
+            await async_expect(self.page).to_have_url(f".*{substring}.*", timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_url_equals(self, url: str, message="", timeout=5000):
+        try:
+            await async_expect(self.page).to_have_url(url, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_title_contains(self, substring: str, message="", timeout=5000):
+        try:
+            await async_expect(self.page).to_have_title(f".*{substring}.*", timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_title_equals(self, title: str, message="", timeout=5000):
+        try:
+            await async_expect(self.page).to_have_title(title, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_visible(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_visible(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_hidden(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_hidden(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_text_equals(self, locator: AsyncLocator, text: str, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_have_text(text, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_text_contains(self, locator: AsyncLocator, text: str, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_contain_text(text, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_has_attribute(self, locator: AsyncLocator, attribute: str, value, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_have_attribute(attribute, value, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_attribute_contains(self, locator: AsyncLocator, attribute: str = 'class', substring: str = '', message="", timeout=5000):
+        """
+        断言元素指定属性的值包含给定子串；attribute 默认 'class'
+        """
+        actual = None
+        try:
+            actual = await locator.get_attribute(attribute, timeout=timeout)
+            assert actual is not None and substring in actual
+        except AssertionError:
+            pytest.fail(f"{message} - 期望属性 {attribute} 包含 '{substring}', 实际: '{actual}'")
+
+    async def assert_element_is_enabled(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_enabled(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_disabled(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_disabled(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_count_of_elements(self, locator: AsyncLocator, count: int, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_have_count(count, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_screenshot(self, locator: AsyncLocator = None, name: str = "screenshot.png", threshold: float = 0.1, max_diff_pixels: int = None, message=""):
+
+        target = self.page if locator is None else locator
+        try:
+            await async_expect(target).to_have_screenshot(name, threshold=threshold, max_diff_pixels=max_diff_pixels)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_input_value_equals(self, locator: AsyncLocator, value: str, message="", timeout=5000):
+
+        try:
+            await async_expect(locator).to_have_value(value, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_checked(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_checked(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_not_checked(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).not_to_be_checked(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_editable(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).to_be_editable(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+    async def assert_element_is_not_editable(self, locator: AsyncLocator, message="", timeout=5000):
+        try:
+            await async_expect(locator).not_to_be_editable(timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
+
+
+    async def assert_hover_and_text_equals(self, hover_locator: AsyncLocator, text_locator: AsyncLocator, expected_text: str, message="", timeout=5000):
+        try:
+            await hover_locator.hover(timeout=timeout)
+            await async_expect(text_locator).to_have_text(expected_text, timeout=timeout)
+        except AssertionError as e:
+            pytest.fail(f"{message} - {e}")
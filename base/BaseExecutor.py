@@ -3,67 +3,181 @@ BaseExecutor类 - UI自动化测试执行器
 解析YAML测试用例并使用BasePage和BaseAssert执行UI自动化操作
 """
 
-import yaml
 import os
-from datetime import datetime
 from loguru import logger
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from playwright.sync_api import Page
 from base.BasePage import BasePage
 from base.BaseAssert import Assertion, PageAssertion
+from base.RequestTracker import DEFAULT_IDLE_MS, DEFAULT_RESOURCE_TYPES, RequestTracker, get_request_tracker
+from base.LocatorIndex import LocatorIndex, get_locator_index, get_registered_locator_files, split_locator_path
+from base.StepPlan import (
+    PLAN_CACHE, PATH_PATTERN, FORMAT_PATTERN, SELECTOR_REQUIRED_ACTIONS,
+    CasePlan, CompiledStep, VariantPlan, VariantStream, checkpoint_mode, checkpoint_unsafe_steps, common_prefix_length,
+    describe_step,
+    generate_test_cases, has_data_source, is_element_path, iter_test_cases, parse_step, variant_count, variant_progress,
+)
+from base.MetricsStore import MetricsStore, get_metrics_store, selector_key
+from base.ResultSink import DEFAULT_RESULT_DIR, ResultSink, get_result_sink
+from base.Results import CaseResult, RunResult, StepResult
+from base.AllureBuffer import ALLURE_MODES, AllureBuffer, allure_report_mode
+from base.ScreenshotPipeline import IMAGE_FORMATS, ScreenshotPipeline, capture_options, resolve_image_format, webp_supported
+from base.ScreenshotStore import SCREENSHOT_STORE_MODES, default_screenshot_store, get_screenshot_store
+from base.TraceRecorder import TRACE_RECORDER, TracedProxy, trace_span
+from base.WaitAudit import ELEMENT_ACTIONS, WAIT_AUDITOR, WaitAuditRecord, suggest_replacement, wait_audit_mode
+from utils.yaml_loader import load_yaml_file
+from utils.config_reader import WebUIConfReader
+from utils.log_config import STEP, setup_logging
+from utils.wait_savings import WAIT_SAVINGS, legacy_sleeps_enabled
 from pathlib import Path
-import re
+from dataclasses import replace
+from itertools import chain
 import allure
+import queue
+import sqlite3
+import threading
 import time
 
 
 class BaseExecutor:
     """UI自动化测试执行器"""
-    
-    def __init__(self, page: Page, pages: Optional[Dict[str, str]] = None, locations_path: Optional[str] = None):
+
+    # YAML步骤动作到处理方法名的映射，编译执行计划时绑定
+    STEP_HANDLERS = {
+        'navigate': '_step_navigate',
+        'click': '_step_click',
+        'hover': '_step_hover',
+        'input': '_step_input',
+        'wait': '_step_wait',
+        'wait_for_element': '_step_wait_for_element',
+        'wait_for_element_hidden': '_step_wait_for_element_hidden',
+        'take_screenshot': '_step_take_screenshot',
+        'press_key': '_step_press_key',
+        'press_enter': '_step_press_enter',
+        'press_tab': '_step_press_tab',
+        'press_escape': '_step_press_escape',
+        'type_text': '_step_type_text',
+        'clear_and_input': '_step_clear_and_input',
+        'select_option_by_label': '_step_select_option_by_label',
+        'wait_for_network_idle': '_step_wait_for_network_idle',
+        'scroll_to_element': '_step_scroll_to_element',
+        'scroll_to_bottom': '_step_scroll_to_bottom',
+        'scroll_to_top': '_step_scroll_to_top',
+        'execute_script': '_step_execute_script',
+        'refresh_page': '_step_refresh_page',
+        'go_back': '_step_go_back',
+        'go_forward': '_step_go_forward',
+        'get_text': '_step_get_text',
+        'get_attribute': '_step_get_attribute',
+        'get_value': '_step_get_value',
+        'is_visible': '_step_is_visible',
+        'is_enabled': '_step_is_enabled',
+        'get_page_title': '_step_get_page_title',
+        'get_current_url': '_step_get_current_url',
+        'get_dialog_text': '_step_get_dialog_text',
+        'assert': '_step_assert',
+    }
+
+    # assert步骤中基于Locator的断言类型到PageAssertion方法名的映射
+    LOCATOR_ASSERTIONS = {
+        '可见': 'assert_element_is_visible',
+        '不可见': 'assert_element_is_hidden',
+        '启用': 'assert_element_is_enabled',
+        '禁用': 'assert_element_is_disabled',
+        '已勾选': 'assert_element_is_checked',
+        '未勾选': 'assert_element_is_not_checked',
+        'assert_element_visible': 'assert_element_is_visible',
+    }
+
+    # 请求跟踪器类型，异步执行器使用 AsyncRequestTracker
+    REQUEST_TRACKER_CLASS = RequestTracker
+
+    def __init__(self, page: Page, pages: Optional[Dict[str, str]] = None, locations_path: Optional[str] = None,
+                 locator_files: Optional[Dict[str, str]] = None):
         """
         初始化执行器
 
+        Args:
+            page: Playwright的Page对象
+            pages: 页面名称到URL的映射
+            locations_path: 默认定位器文件路径
+            locator_files: 具名定位器文件 {名称: 路径}，YAML中通过 Path(名称:页面.模块.元素) 引用
         """
         self.page = page
         self.base_page = BasePage(page)
         self.page_assertion = PageAssertion(page)
         
-        # 修复日志配置
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test-results', 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f"executor_detail_{datetime.now().strftime('%Y%m%d')}.log")
-        
-        # 移除之前的日志处理器（如果存在）
-        logger.remove()
-        
-        # 重新配置日志
-        logger.add(
-            log_file, 
-            rotation="00:00", 
-            encoding="utf-8", 
-            retention="7 days", 
-            enqueue=True, 
-            level="INFO",
-            backtrace=True,
-            diagnose=True
-        )
-        
+        # 日志按进程配置一次（xdist 每个 worker 一次），不再在每个执行器中重建处理器
+        setup_logging()
+
         self.logger = logger.bind(name=self.__class__.__name__)
+        # 步骤详情日志，depth=1 使日志位置指向调用方
+        self._step_logger = self.logger.opt(depth=1)
         self.pages_dict = pages or {}
         self.current_input_value = ""  # 添加当前输入值跟踪
         self.screenshot_files = {}  # 添加截图文件路径跟踪
+        self._test_data_sources = {}  # id(test_data) -> (test_data, 文件路径, mtime)，用于执行计划缓存
+        self._current_case = ('', None)  # 当前执行的 (用例名, 用例文件)
+        self._current_variant = ('', '')  # 当前执行的 (变体名, 输入值)，写入结果文件时使用
+
+        # 静态等待审计（默认按环境变量 UI_WAIT_AUDIT 开启）
+        self.enable_wait_audit = wait_audit_mode() is not None
+        self._audit_step = None  # 审计模式下当前执行的步骤
+        self._audit_next_step = None  # 审计模式下当前步骤的下一步骤
+
+        # Allure报告模式（默认按环境变量 UI_ALLURE_MODE，live/deferred）
+        self.allure_mode = allure_report_mode()
+        self.report_buffer = AllureBuffer()
+
+        # 截图：浏览器只负责取回图片数据，格式转换和写文件在后台线程完成（默认按环境变量 UI_SCREENSHOT_BACKGROUND 开启），
+        # UI_SCREENSHOT_STORE=cas 时按内容哈希保存
+        self.screenshot_pipeline = ScreenshotPipeline(store=default_screenshot_store())
+        self.screenshot_format: Optional[str] = None  # 默认截图格式，为None时按文件扩展名
+        self.screenshot_quality: Optional[int] = None  # 默认 jpeg/webp 质量
+
+        # 步骤耗时历史（默认按环境变量 UI_METRICS_DB 开启）
+        self.metrics_store: Optional[MetricsStore] = get_metrics_store()
+        # 结果流式写入JSONL（默认按环境变量 UI_RESULT_SINK 开启），开启后返回的结果只保留摘要
+        self.result_sink: Optional[ResultSink] = get_result_sink()
+        self.compact_results = self.result_sink is not None
+        self._browser_name: Optional[str] = None
         
         # 智能等待配置
         self.enable_smart_wait = True  # 是否启用智能等待
         self.smart_wait_timeout = 10000  # 智能等待超时时间（毫秒）
         self.smart_wait_interval = 0.5  # 智能等待检查间隔（秒）
+        self.smart_wait_mode = 'mutation'  # 'mutation': 页面内MutationObserver；'poll': 轮询get_text
+        self.smart_wait_quiet_window = 500  # mutation模式下元素子树静默多久视为稳定（毫秒）
+
+        # 数据驱动变体并行执行配置（默认关闭）
+        self.enable_parallel = False  # 是否并行执行变体
+        self.parallel_workers = 4  # 并行工作线程数
+        self.parallel_launch_options = {}  # 工作线程启动浏览器的参数
+        self.parallel_context_options = {}  # 创建浏览器上下文的额外参数
+        # 公共前置步骤检查点（默认按环境变量 UI_VARIANT_CHECKPOINT，off/state/page）
+        self.variant_checkpoint = checkpoint_mode()
+
+        # 请求跟踪（代替networkidle等待），默认值来自 web_ui.conf 的 [request_tracker]
+        self.request_tracker = None
+        self._request_tracking = {
+            'enable': True,
+            'resource_types': list(DEFAULT_RESOURCE_TYPES),
+            'include': [],
+            'exclude': [],
+            'page_rules': {},
+            'idle_ms': DEFAULT_IDLE_MS,
+            'timeout': 30000,
+        }
+        self.configure_request_tracking(**self._read_request_tracking_config())
         
-        # 加载 adts_locations.yaml（现在通过参数传入）
+        # 加载 adts_locations.yaml（现在通过参数传入），同一进程内所有执行器共享解析结果
         if locations_path is None:
             locations_path = str(Path(__file__).parent.parent / 'config' / 'adts_locations.yaml')
-        with open(locations_path, 'r', encoding='utf-8') as f:
-            self.locations_dict = yaml.safe_load(f)
+        self.locations_path = locations_path
+        self.locator_index = get_locator_index(locations_path)
+        self.locations_dict = self.locator_index.tree
+        self.locator_files = get_registered_locator_files()
+        self.locator_files.update({name: os.path.abspath(path) for name, path in (locator_files or {}).items()})
         
         # 操作映射字典
         self.action_handlers = {
@@ -137,10 +251,14 @@ class BaseExecutor:
             # 新增：断言元素属性包含子串
             'attribute_include': self._handle_assert_attribute_include,
         }
+
+        # 开启耗时记录时，BasePage/PageAssertion 的调用记录为 browser/smart_wait/screenshot 阶段
+        self._apply_trace_proxies()
     
     def load_test_case(self, yaml_file_path: str) -> Dict[str, Any]:
         """
         加载YAML测试用例文件
+        同一进程内按 (路径, mtime) 缓存解析结果，返回的数据在多个测试之间共享，应视为只读
         
         Args:
             yaml_file_path: YAML文件路径
@@ -149,20 +267,26 @@ class BaseExecutor:
             测试用例数据字典
         """
         try:
-            with open(yaml_file_path, 'r', encoding='utf-8') as file:
-                test_data = yaml.safe_load(file)
-            self.logger.info(f"成功加载测试用例文件: {yaml_file_path}")
+            test_data = load_yaml_file(yaml_file_path)
+            self._remember_test_data_source(test_data, yaml_file_path)
+            self.logger.info("成功加载测试用例文件: {}", yaml_file_path)
             return test_data
         except Exception as e:
             self.logger.error(f"加载测试用例文件失败: {e}")
             raise
     
-    def execute_test_case(self, test_case_name: str, test_data: Dict[str, Any]) -> Dict[str, Any]:
+    def execute_test_case(self, test_case_name: str, test_data: Dict[str, Any], variant: Optional[int] = None) -> RunResult:
         """
         执行指定的测试用例（支持test_anliku.yml格式）
         
+        Args:
+            test_case_name: 测试用例名称
+            test_data: 测试用例数据字典
+            variant: 数据驱动变体序号（从0开始），指定时只执行该变体；
+                     配合 yaml_variant fixture 可将每个变体收集为独立的pytest用例
+        
         Returns:
-            包含执行结果的字典:
+            执行结果 RunResult，可以按字典的方式读取（result['success']），to_dict() 转换为以下结构的字典:
             {
                 'success': bool,  # 整体执行是否成功
                 'test_cases': [   # 每个测试用例的执行结果
@@ -188,709 +312,1518 @@ class BaseExecutor:
                 ],
                 'total_success': int,  # 成功的测试用例数量
                 'total_failed': int,  # 失败的测试用例数量
-                'error_message': str  # 整体错误信息
+                'error_message': str,  # 整体错误信息
+                'prefix_steps': list,  # 按检查点执行时只执行一次的公共前置步骤，每个变体的 steps 不含这些步骤
+                'result_file': str  # 开启结果流式写入（configure_result_sink）时的结果文件
             }
+            开启结果流式写入时步骤明细写入结果文件，test_cases 中每个测试用例只保留摘要：
+            steps 只包含失败的步骤，step_count 为执行的步骤数；
+            test_cases 中的测试用例为 CaseResult，steps 中的步骤为 StepResult，同样可以按字典的方式读取
         """
+        with trace_span(test_case_name, 'case', variant=variant):
+            try:
+                return self._execute_test_case(test_case_name, test_data, variant)
+            finally:
+                # 等待后台截图写入完成，deferred 模式下用例结束（含异常退出）时批量写入Allure
+                self.flush_screenshots()
+                self.flush_report()
+                if self.result_sink is not None:
+                    self.result_sink.flush()
+
+    def _execute_test_case(self, test_case_name: str, test_data: Dict[str, Any], variant: Optional[int]) -> RunResult:
+        """执行测试用例，参数与返回值见 execute_test_case"""
         start_time = time.time()
         try:
-            test_case = test_data.get(test_case_name)
-            if not test_case:
-                error_msg = f"未找到测试用例: {test_case_name}"
-                self.logger.error(error_msg)
-                return {
-                    'success': False,
-                    'test_cases': [],
-                    'total_success': 0,
-                    'total_failed': 0,
-                    'error_message': error_msg
-                }
-            
-            steps = test_case.get('steps', [])
-            
-            # 检查是否有需要循环的input步骤，生成独立的测试用例数据
-            test_cases = self._generate_test_cases(test_case_name, test_case)
-            
-            # 如果有多个测试用例（数据驱动），添加Allure步骤提示
-            if len(test_cases) > 1:
-                @allure.step("---遍历执行多条用例---")
-                def execute_multiple_cases():
-                    return self._execute_multiple_test_cases(test_cases)
-                
-                result = execute_multiple_cases()
+            # 编译执行计划（数据驱动的每个输入值对应一条变体），同一文件同一用例只编译一次
+            plan = self._start_test_case(test_case_name, test_data)
+            if plan is None:
+                return self._case_error(f"未找到测试用例: {test_case_name}")
+
+            total = variant_count(plan.variants)
+            if variant is not None:
+                # 只执行指定的变体
+                result = RunResult.from_case(self._execute_variant(variant, total, plan.variants[variant]))
+            # 如果有多个测试用例（数据驱动，数据源的行数在读完前未知），添加Allure步骤提示
+            elif total is None or total > 1:
+                mode = self._variant_checkpoint_mode(plan)
+                with self._report_step("---遍历执行多条用例---"):
+                    if mode is not None:
+                        result = self._execute_from_checkpoint(plan.variants, plan.prefix, mode)
+                    else:
+                        result = self._execute_multiple_test_cases(plan.variants)
             else:
                 # 单个测试用例，直接执行
-                case_data = test_cases[0]
-                case_steps = case_data['steps']
-                result = self._execute_steps_with_details(case_steps)
-            
-            # 计算总执行时长
-            total_duration = (time.time() - start_time) * 1000
-            
-            # 统计成功和失败数量
-            total_success = sum(1 for case in result['test_cases'] if case['success'])
-            total_failed = len(result['test_cases']) - total_success
-            
-            # 整体成功判断
-            overall_success = total_failed == 0
-            
-            return {
-                'success': overall_success,
-                'test_cases': result['test_cases'],
-                'total_success': total_success,
-                'total_failed': total_failed,
-                'error_message': result.get('error_message', ''),
-                'duration_ms': total_duration
-            }
-                
+                self._current_variant = (plan.variants[0].case_name, '')
+                result = RunResult.from_case(self._finish_case(self._execute_compiled_steps(plan.variants[0].steps)))
+
+            return self._end_test_case(test_case_name, result, start_time)
+
         except Exception as e:
-            error_msg = f"执行测试用例失败: {e}"
-            self.logger.error(error_msg)
-            return {
-                'success': False,
-                'test_cases': [],
-                'total_success': 0,
-                'total_failed': 0,
-                'error_message': error_msg,
-                'duration_ms': (time.time() - start_time) * 1000
-            }
-    
-    def _generate_test_cases(self, test_case_name: str, test_case: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return self._case_error(f"执行测试用例失败: {e}", start_time)
+
+    # 以下不涉及页面操作的方法由同步、异步执行器共用，异步执行器只重写需要 await 的部分
+
+    def _start_test_case(self, test_case_name: str, test_data: Dict[str, Any]) -> Optional[CasePlan]:
+        """
+        查找并编译测试用例，记录当前用例名和所属YAML文件
+
+        Returns:
+            执行计划，未找到测试用例时返回None
+        """
+        if not test_data.get(test_case_name):
+            return None
+        plan = self.compile_test_case(test_case_name, test_data)
+        source = self._test_data_sources.get(id(test_data))
+        self._current_case = (test_case_name, source[1] if source is not None and source[0] is test_data else None)
+        return plan
+
+    def _variant_checkpoint_mode(self, plan: CasePlan) -> Optional[str]:
+        """
+        多个变体从检查点执行时返回检查点模式（state/page），没有公共前置步骤或未开启时返回None
+
+        检查点只重现URL和 storage_state，公共前置步骤中有点击、输入等改变页面状态的步骤时
+        不使用检查点（用例中配置的 checkpoint 也一样），各变体完整执行
+        """
+        mode = plan.checkpoint or self.variant_checkpoint
+        if mode == 'off' or plan.prefix == 0:
+            return None
+        if plan.unsafe_prefix:
+            self.logger.warning("公共前置步骤中的 {} 不能由检查点重现（只重新打开URL、恢复storage_state），"
+                                "{} 不使用检查点，各变体完整执行", '、'.join(plan.unsafe_prefix), plan.name)
+            return None
+        return mode
+
+    def _end_test_case(self, test_case_name: str, result: RunResult, start_time: float) -> RunResult:
+        """记录总执行时长（成功和失败数量在合并各变体结果时已统计），写入 test_case 记录"""
+        result.duration_ms = (time.time() - start_time) * 1000
+        self._sink_summary(test_case_name, result)
+        return result
+
+    def _case_error(self, error_msg: str, start_time: Optional[float] = None) -> RunResult:
+        """记录错误日志，返回未能执行的用例结果"""
+        self.logger.error(error_msg)
+        return RunResult.failed(error_msg, (time.time() - start_time) * 1000 if start_time is not None else 0)
+
+    def _generate_test_cases(self, test_case_name: str, test_case: Dict[str, Any],
+                             base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         生成测试用例列表，处理input value为列表的情况，支持loop_steps
         
         Args:
             test_case_name: 测试用例名称
             test_case: 原始测试用例数据
+            base_dir: YAML文件所在目录，用于解析数据源的相对路径
             
         Returns:
             测试用例列表，每个元素是一个独立的测试用例
         """
-        steps = test_case.get('steps', [])
-        loop_steps_config = test_case.get('loop_steps', {})  # 获取loop_steps配置
-        test_cases = []
+        return generate_test_cases(test_case_name, test_case, self.logger, base_dir)
+
+    # ==================== 执行计划编译 ====================
+
+    def _remember_test_data_source(self, test_data: Any, yaml_file_path: str) -> None:
+        """记录测试数据来源文件及其mtime，供执行计划缓存使用"""
+        try:
+            abs_path = os.path.abspath(yaml_file_path)
+            self._test_data_sources[id(test_data)] = (test_data, abs_path, os.path.getmtime(abs_path))
+        except OSError:
+            pass
+
+    def compile_test_case(self, test_case_name: str, test_data: Dict[str, Any]) -> CasePlan:
+        """
+        将YAML用例编译为不可变的执行计划
+
+        通过 load_test_case 加载的数据按 (文件, mtime, 用例名) 在进程内缓存，
+        同一用例在多个测试、多个执行器之间只解析一次；
+        input value 引用外部数据源时变体为 VariantStream，执行时逐行读取、逐条编译，不缓存
+
+        Args:
+            test_case_name: 测试用例名称
+            test_data: 测试用例数据字典
+
+        Returns:
+            执行计划
+        """
+        source = self._test_data_sources.get(id(test_data))
+        cache_key = None
+        base_dir = None
+        test_case = test_data.get(test_case_name)
+        if source is not None and source[0] is test_data:
+            _, file_path, mtime = source
+            base_dir = os.path.dirname(file_path)
+            # 处理方法绑定到执行器类，selector 来自定位文件，二者也是缓存键的一部分
+            cache_key = (file_path, test_case_name, type(self), self._locator_signature())
+            plan = PLAN_CACHE.get(cache_key, mtime)
+            if plan is not None:
+                self.logger.debug("命中执行计划缓存: {}", test_case_name)
+                return plan
+
+        if not test_case:
+            raise KeyError(f"未找到测试用例: {test_case_name}")
+
+        prefix = common_prefix_length(test_case)
+        checkpoint = checkpoint_mode(test_case['checkpoint']) if test_case.get('checkpoint') is not None else None
+        unsafe_prefix = checkpoint_unsafe_steps(test_case)
+        if has_data_source(test_case):
+            # 数据源每次执行重新读取；流引用执行器，不放入进程级缓存
+            self.logger.info("编译执行计划: {}，变体来自数据源，执行时逐行读取", test_case_name)
+            return CasePlan(name=test_case_name, variants=VariantStream(
+                lambda: self._compile_variants(
+                    test_case_name, test_case, iter_test_cases(test_case_name, test_case, self.logger, base_dir))),
+                prefix=prefix, checkpoint=checkpoint, unsafe_prefix=unsafe_prefix)
+
+        with trace_span(test_case_name, 'compile'):
+            variants = tuple(self._compile_variants(
+                test_case_name, test_case, self._generate_test_cases(test_case_name, test_case, base_dir)))
+        plan = CasePlan(name=test_case_name, variants=variants, prefix=prefix, checkpoint=checkpoint,
+                        unsafe_prefix=unsafe_prefix)
+        self.logger.info("编译执行计划: {}，变体数量: {}", test_case_name, len(variants))
+
+        if cache_key is not None:
+            PLAN_CACHE.put(cache_key, mtime, plan)
+        return plan
+
+    def _compile_variants(self, test_case_name: str, test_case: Dict[str, Any], cases: Iterable[Dict[str, Any]]):
+        """
+        逐条编译变体
+        各变体中来自YAML的步骤（参数化步骤之外的步骤、loop_steps）是同一批字典，按 (步骤, 步骤编号) 只编译一次，
+        变体之间共享编译结果
+
+        Args:
+            test_case_name: 测试用例名称
+            test_case: 原始测试用例数据
+            cases: 生成的测试用例（generate_test_cases / iter_test_cases）
+
+        Returns:
+            VariantPlan 迭代器
+        """
+        shared = {id(step) for step in test_case.get('steps', [])}
+        for loop_steps in (test_case.get('loop_steps') or {}).values():
+            if isinstance(loop_steps, list):
+                shared.update(id(step) for step in loop_steps)
+        compiled: Dict[tuple, CompiledStep] = {}
+
+        for case_data in cases:
+            steps = []
+            for step_num, step in enumerate(case_data.get('steps', []), 1):
+                if id(step) not in shared:
+                    # 替换了取值的参数化步骤每个变体都不同
+                    steps.append(self._compile_step(step, step_num))
+                    continue
+                key = (id(step), step_num)
+                if key not in compiled:
+                    compiled[key] = self._compile_step(step, step_num)
+                steps.append(compiled[key])
+            yield VariantPlan(
+                case_name=case_data.get('case_name', test_case_name),
+                input_value=case_data.get('input_value', ''),
+                steps=tuple(steps),
+            )
+
+    def _compile_steps(self, steps: List[Dict[str, Any]]) -> tuple:
+        """
+        编译步骤列表
+
+        Args:
+            steps: 步骤列表
+
+        Returns:
+            CompiledStep 元组
+        """
+        return tuple(self._compile_step(step, i) for i, step in enumerate(steps, 1))
+
+    def _compile_step(self, step: Any, step_num: int) -> CompiledStep:
+        """
+        编译单个步骤：解析参数、解析Path路径、绑定处理方法
+        解析失败不会抛出异常，错误信息记录在 CompiledStep.error 中，执行到该步骤时再报告
+        """
+        if not isinstance(step, dict) or not step:
+            return CompiledStep(step_num, '', None, '', None, None, error=f"步骤格式错误: {step}")
+
+        action, element_path, value, expected = parse_step(step)
+        self.logger.debug("步骤 {}: action={}, element_path={}, value={}", step_num, action, element_path, value)
+
+        selector = None
+        if element_path and is_element_path(element_path):
+            try:
+                selector = self._resolve_element_path(element_path)
+            except Exception as e:
+                return CompiledStep(step_num, action, element_path, '', value, expected,
+                                    error=f"元素路径解析失败: {element_path}, 错误: {e}")
+        elif element_path:
+            # 对于非Path格式的元素路径，直接使用（如文件路径、页面名）
+            selector = element_path
+
+        # 检查selector是否为空
+        if action in SELECTOR_REQUIRED_ACTIONS and not selector:
+            return CompiledStep(step_num, action, element_path, selector, value, expected,
+                                error=f"步骤 {step_num}: {action} 操作的selector为空，element_path={element_path}")
+
+        return CompiledStep(step_num, action, element_path, selector, value, expected,
+                            handler=self._get_step_handler(action), source=step)
+
+    def _resolve_element_path(self, element_path: str) -> str:
+        """解析 Path(页面.模块.元素).f(参数) 形式的元素路径"""
+        t1 = PATH_PATTERN.search(element_path)
+        tmp_path = t1.group(1) if t1 else None
+        # 支持 .f(...) 形式动态传参
+        t2 = FORMAT_PATTERN.search(element_path)
+        tmp_value = t2.group(1) if t2 else None
+
+        # 支持 Path(名称:页面.模块.元素) 引用具名定位器文件
+        locator_name, locator_path = split_locator_path(tmp_path)
+        with trace_span(tmp_path, 'selector'):
+            index = self._get_locator_index(locator_name)
+            if tmp_value is not None:
+                selector = index.resolve(locator_path, tmp_value)
+            else:
+                selector = index.resolve(locator_path)
+        self.logger.debug("解析Path路径: {} -> {}", element_path, selector)
+        return selector
+
+    def _get_locator_index(self, locator_name: Optional[str] = None) -> LocatorIndex:
+        """获取定位器索引，未指定名称时使用默认定位器文件"""
+        if locator_name is None:
+            return get_locator_index(self.locations_path)
+        if locator_name not in self.locator_files:
+            raise KeyError(f"未注册的定位器文件: {locator_name}")
+        return get_locator_index(self.locator_files[locator_name])
+
+    def _locator_signature(self) -> tuple:
+        """当前使用的定位器文件及其mtime，作为执行计划缓存键的一部分"""
+        paths = [self.locations_path, *sorted(self.locator_files.values())]
+        return tuple((path, get_locator_index(path).mtime) for path in paths)
+
+    def _get_step_handler(self, action: str):
+        """获取步骤动作对应的处理方法（未绑定），不支持的动作返回None"""
+        handler_name = self.STEP_HANDLERS.get(action)
+        return getattr(type(self), handler_name, None) if handler_name else None
+
+    def _step_log(self, message: str, *args: Any) -> None:
+        """
+        记录步骤详情（STEP 级别，默认不输出，UI_LOG_LEVEL=STEP 时输出）
         
-        self.logger.info(f"开始生成测试用例: {test_case_name}")
-        self.logger.info(f"原始步骤数量: {len(steps)}")
-        self.logger.info(f"loop_steps配置: {loop_steps_config}")
+        Args:
+            message: 日志内容，参数占位符为 {}，低于输出级别时不格式化
+            args: 占位符参数
+        """
+        self._step_logger.log(STEP, message, *args)
+
+    def _run_compiled_step(self, step: CompiledStep) -> bool:
+        """
+        执行单个已编译步骤
+
+        Returns:
+            执行结果
+        """
+        if step.handler is None:
+            self.logger.error(f"不支持的动作: {step.action}")
+            return False
+        try:
+            return step.handler(self, step.selector, step.value, step.expected, step.step_num) is not False
+        except Exception as e:
+            # 附带异常，失败日志中记录异常时的变量值
+            self.logger.opt(exception=e).error("步骤 {} 执行失败: {}", step.step_num, e)
+            return False
+
+    def _execute_steps(self, steps: List[Dict[str, Any]]) -> bool:
+        """
+        执行步骤列表
+
+        Args:
+            steps: 步骤列表
+
+        Returns:
+            执行结果
+        """
+        for step in self._compile_steps(steps):
+            if step.error:
+                self.logger.error(step.error)
+                return False
+
+            # 使用allure.step记录每个步骤
+            with self._report_step(step.description), \
+                    trace_span(step.action, 'step', step_num=step.step_num, selector=step.selector):
+                if not self._run_compiled_step(step):
+                    return False
+
+        return True
+
+    def _get_step_description(self, action: str, selector: str, value: Any, expected: Any, step_num: int) -> str:
+        """
+        生成步骤描述，用于Allure报告
+
+        Args:
+            action: 操作类型
+            selector: 元素选择器
+            value: 操作值
+            expected: 期望值
+            step_num: 步骤编号
+
+        Returns:
+            步骤描述字符串
+        """
+        return describe_step(action, selector, value, expected, step_num)
+    
+    def _get_current_input_value(self) -> str:
+        """获取当前测试用例的输入值，用于生成唯一文件名"""
+        return self.current_input_value or "default"
+    
+    def get_screenshot_path(self, step_num: int = None, base_name: str = None) -> str:
+        """
+        获取截图文件路径
         
-        # 检查是否有需要循环的input步骤
-        input_loop_steps = []
-        for step in steps:
-            if isinstance(step, dict) and 'input' in step:
-                input_step = step['input']
-                if isinstance(input_step, dict) and 'value' in input_step:
-                    value = input_step['value']
-                    if isinstance(value, list):
-                        # 找到需要循环的步骤
-                        input_loop_steps.append((step, value))
-                        self.logger.info(f"找到循环input步骤，值列表: {value}")
+        Args:
+            step_num: 步骤编号，如果指定则返回该步骤的截图路径
+            base_name: 基础文件名，如果指定则返回匹配的截图路径
+            
+        Returns:
+            截图文件路径，如果未找到则返回None
+        """
+        # screenshot_files 记录YAML中的截图路径，按内容哈希保存时返回实际的 blob 路径
+        if step_num is not None:
+            return self.screenshot_pipeline.resolve(self.screenshot_files.get(step_num))
         
-        if input_loop_steps:
-            # 有循环步骤，为每个值生成独立的测试用例
-            for loop_step, values in input_loop_steps:
-                for i, value in enumerate(values):
-                    # 创建当前循环的测试用例
-                    case_copy = test_case.copy()
-                    case_copy['case_name'] = f"{test_case.get('case_name', test_case_name)}_{i+1}"
-                    case_copy['input_value'] = value  # 记录当前输入值
-                    
-                    self.logger.info(f"生成测试用例 {i+1}: {case_copy['case_name']}, 输入值: {value}")
-                    
-                    # 创建修改后的步骤，确保正确的执行顺序
-                    modified_steps = []
-                    input_step_index = steps.index(loop_step)
-                    
-                    # 1. 先添加input步骤之前的所有步骤
-                    for j in range(input_step_index):
-                        modified_steps.append(steps[j])
-                    
-                    # 2. 添加当前循环的input步骤（替换值为单个值）
-                    step_copy = loop_step.copy()
-                    step_copy['input'] = step_copy['input'].copy()
-                    step_copy['input']['value'] = value
-                    modified_steps.append(step_copy)
-                    
-                    # 3. 添加该循环值对应的loop_steps步骤
-                    if value in loop_steps_config:
-                        loop_steps_for_value = loop_steps_config[value]
-                        if isinstance(loop_steps_for_value, list):
-                            self.logger.info(f"为输入值 {value} 添加 {len(loop_steps_for_value)} 个loop_steps步骤")
-                            for step_idx, loop_step_item in enumerate(loop_steps_for_value):
-                                self.logger.info(f"  loop_step {step_idx + 1}: {loop_step_item}")
-                            modified_steps.extend(loop_steps_for_value)
-                        else:
-                            self.logger.warning(f"循环值 {value} 的loop_steps格式不正确，应为列表")
-                    else:
-                        self.logger.warning(f"未找到输入值 {value} 对应的loop_steps配置")
-                    
-                    # 4. 添加input步骤之后的所有剩余步骤
-                    for j in range(input_step_index + 1, len(steps)):
-                        modified_steps.append(steps[j])
-                    
-                    case_copy['steps'] = modified_steps
-                    self.logger.info(f"测试用例 {case_copy['case_name']} 最终步骤数量: {len(modified_steps)}")
-                    test_cases.append(case_copy)
-        else:
-            # 无循环步骤，直接使用原始测试用例
-            test_case['input_value'] = ''  # 无输入值
-            test_cases.append(test_case)
-            self.logger.info("无循环步骤，使用原始测试用例")
+        if base_name is not None:
+            # 根据基础文件名查找匹配的截图
+            for step_num, path in self.screenshot_files.items():
+                if base_name in path:
+                    return self.screenshot_pipeline.resolve(path)
         
-        self.logger.info(f"总共生成 {len(test_cases)} 个测试用例")
-        return test_cases
+        # 如果没有找到，返回最后一个截图路径
+        if self.screenshot_files:
+            return self.screenshot_pipeline.resolve(list(self.screenshot_files.values())[-1])
+        
+        return None
     
-    def _execute_steps(self, steps: List[Dict[str, Any]]) -> bool:
+    def get_screenshot_by_base_name(self, base_name: str) -> str:
         """
-        执行步骤列表
+        根据基础文件名获取截图路径
         
         Args:
-            steps: 步骤列表
+            base_name: 基础文件名（不包含扩展名），如 'search_task_CZtest06'
+            
+        Returns:
+            截图文件路径，如果未找到则返回None
+        """
+        key = f"{base_name}_path"
+        return self.screenshot_pipeline.resolve(self.screenshot_files.get(key))
+    
+    def verify_screenshot_exists(self, base_name: str) -> bool:
+        """
+        验证指定基础文件名的截图是否存在
+        
+        Args:
+            base_name: 基础文件名（不包含扩展名）
+            
+        Returns:
+            截图文件是否存在
+        """
+        # 等待后台写入完成（AsyncBaseExecutor 的 flush_screenshots 为协程，这里直接等待写入任务）
+        self._log_screenshot_errors(self.screenshot_pipeline.flush())
+        screenshot_path = self.get_screenshot_by_base_name(base_name)
+        if screenshot_path:
+            return os.path.exists(screenshot_path)
+        return False
+    
+    def get_all_screenshot_paths(self) -> Dict[int, str]:
+        """
+        获取所有截图文件路径
+        
+        Returns:
+            步骤编号到截图路径的映射字典
+        """
+        return {key: self.screenshot_pipeline.resolve(path) for key, path in self.screenshot_files.items()}
+    
+    def _execute_single_step(self, action: str, selector: str, value: Any, expected: Any, step_num: int) -> bool:
+        """
+        执行单个步骤（被allure.step装饰器包装）
+        
+        Args:
+            action: 操作类型
+            selector: 元素选择器
+            value: 操作值
+            expected: 期望值
+            step_num: 步骤编号
             
         Returns:
             执行结果
         """
-        for i, step in enumerate(steps, 1):
-            if not isinstance(step, dict):
-                self.logger.error(f"步骤格式错误: {step}")
-                return False
-            # 兼容 input: xxx + value: yyy 这种格式
-            if len(step) > 1:
-                action = list(step.keys())[0]
-                params = {k: v for k, v in step.items()}
+        step = CompiledStep(step_num, action, selector, selector, value, expected,
+                            handler=self._get_step_handler(action))
+        return self._run_compiled_step(step)
+
+    # ==================== 步骤处理器 ====================
+    # 签名统一为 (selector, value, expected, step_num)，返回 False 表示失败，抛出异常同样视为失败
+
+    def _step_navigate(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 导航到 {}", step_num, selector or '页面')
+        url = self.pages_dict.get(selector, selector)
+        self.base_page.navigate_to(url)
+
+    def _step_click(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 点击元素 {}", step_num, selector)
+        self.base_page.click(selector)
+
+    def _step_hover(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 悬停元素 {}", step_num, selector)
+        self.base_page.hover(selector)
+
+    def _step_input(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 确保value是字符串类型
+        value_str = str(value) if value is not None else ""
+        self._step_log("步骤 {}: 输入到元素 {}，内容: {}", step_num, selector, value_str)
+        self.base_page.input_text(selector, value_str)
+
+        # 等待输入事件处理完成
+        try:
+            if legacy_sleeps_enabled():
+                self.base_page.wait_for_time(0.2)
             else:
-                action, params = list(step.items())[0]
+                with WAIT_SAVINGS.measure('input', 0.2):
+                    self._wait_for_input_settled(selector)
+        except Exception as e:
+            self.logger.warning(f"步骤 {step_num}: 等待输入事件处理时出现异常（继续执行）: {e}")
 
-            # 处理参数
-            if isinstance(params, dict):
-                # 对于input操作，优先从selector字段获取元素路径
-                if action == 'input':
-                    element_path = params.get('selector') or params.get('element') or params.get('target') or params.get('locator')
-                else:
-                    element_path = params.get(action) or params.get('element') or params.get('target') or params.get('locator')
-                value = params.get('value')
-                expected = params.get('expected')
+    def _step_wait(self, selector: str, value: Any, expected: Any, step_num: int):
+        wait_time = self._wait_time(selector, value)
+        self._step_log("步骤 {}: 等待 {} 毫秒", step_num, wait_time)
+        if self.enable_wait_audit:
+            self._audited_wait(float(wait_time), step_num)
+        else:
+            self.base_page.wait_for_time(float(wait_time)/1000)
+
+    def _audited_wait(self, wait_ms: float, step_num: int):
+        """审计模式下的静态等待：等待时长不变，同时记录下一步骤的目标元素何时变为可操作"""
+        target = self._audit_target()
+        start = time.monotonic()
+        ready_ms = self.base_page.wait_until_actionable(target, int(wait_ms)) if target else None
+        remaining = wait_ms / 1000 - (time.monotonic() - start)
+        if remaining > 0:
+            self.base_page.wait_for_time(remaining)
+        self._record_wait_audit(wait_ms, step_num, ready_ms)
+
+    @staticmethod
+    def _wait_time(selector: str, value: Any) -> Any:
+        """wait 步骤的等待毫秒数：value，写成 wait: 毫秒数 时为 selector，默认等待1秒"""
+        # 修复wait步骤的value处理
+        if value is not None:
+            return value
+        if selector and selector.isdigit():
+            return selector
+        return 1000
+
+    def _audit_target(self) -> Optional[str]:
+        """静态等待审计检测的元素：下一步骤为元素操作时的选择器"""
+        next_step = self._audit_next_step
+        return next_step.selector if next_step is not None and next_step.action in ELEMENT_ACTIONS else None
+
+    def _record_wait_audit(self, wait_ms: float, step_num: int, ready_ms: Optional[float]) -> None:
+        """记录一次静态等待的审计结果，ready_ms 为下一步骤目标变为可操作所用的毫秒数"""
+        next_step = self._audit_next_step
+        wasted_ms = wait_ms - ready_ms if ready_ms is not None else 0
+        case_name, yaml_file = self._current_case
+        next_element = next_step.element_path if next_step is not None else None
+        WAIT_AUDITOR.record(WaitAuditRecord(
+            yaml_file=yaml_file,
+            case_name=case_name,
+            input_value=self.current_input_value,
+            step_num=step_num,
+            wait_ms=wait_ms,
+            next_action=next_step.action if next_step is not None else None,
+            next_element=next_element,
+            ready_ms=ready_ms,
+            wasted_ms=wasted_ms,
+            suggestion=suggest_replacement(wait_ms, next_step.action if next_step is not None else None, next_element, ready_ms),
+            source=self._audit_step.source if self._audit_step is not None else None,
+        ))
+        self._step_log("步骤 {}: 静态等待审计 - 等待 {}ms，下一步骤目标就绪 {}ms，浪费 {}ms", step_num, wait_ms, ready_ms, wasted_ms)
+
+    def _step_wait_for_element(self, selector: str, value: Any, expected: Any, step_num: int):
+        timeout = int(value) if value else 30000
+        self._step_log("步骤 {}: 等待元素出现 {}，超时: {}ms", step_num, selector, timeout)
+        self.base_page.wait_for_element(selector, timeout)
+
+    def _step_wait_for_element_hidden(self, selector: str, value: Any, expected: Any, step_num: int):
+        timeout = int(value) if value else 30000
+        self._step_log("步骤 {}: 等待元素隐藏 {}，超时: {}ms", step_num, selector, timeout)
+        self.base_page.wait_for_element_hidden(selector, timeout)
+
+    def _step_take_screenshot(self, selector: str, value: Any, expected: Any, step_num: int):
+        shot = self._prepare_screenshot(selector, value)
+        self._step_log("步骤 {}: 截图保存到 {}", step_num, shot['path'])
+        image = self.base_page.capture_screenshot(shot['element'], shot['clip'], shot['full_page'],
+                                                  shot['capture_type'], shot['capture_quality'])
+        self._store_screenshot(step_num, shot, image)
+
+    def _step_press_key(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 处理按键操作
+        key = str(value) if value is not None else "Enter"  # 默认按键
+        self._step_log("步骤 {}: 按下按键 {}", step_num, key)
+        self.base_page.press_key(key)
+
+        # 如果是 Enter 键，等待页面数据刷新
+        if key.lower() == 'enter':
+            self._wait_after_enter(step_num)
+
+    def _step_press_enter(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Enter键", step_num)
+        self.base_page.press_enter()
+
+        # 按下Enter键后等待页面数据刷新
+        self._wait_after_enter(step_num)
+
+    def _wait_after_enter(self, step_num: int):
+        """按下Enter键后等待页面数据刷新"""
+        self._step_log("步骤 {}: 按下Enter键后等待页面数据刷新...", step_num)
+        try:
+            # 等待接口请求完成
+            self._wait_for_requests_drained(step_num)
+
+            # 等待DOM更新完成
+            if legacy_sleeps_enabled():
+                self.base_page.wait_for_time(0.3)
             else:
-                element_path = params
-                value = step.get('value')
-                expected = step.get('expected')
+                with WAIT_SAVINGS.measure('enter', 0.3):
+                    self.base_page.wait_for_next_frame()
+        except Exception as e:
+            self.logger.warning(f"步骤 {step_num}: 等待页面数据刷新时出现异常（继续执行）: {e}")
+
+    def _wait_for_input_settled(self, selector: str):
+        """输入框的值已稳定（格式化、掩码输入框的值可能与输入内容不同），且输入触发的接口请求（如联想搜索）已返回"""
+        if not self.base_page.wait_for_input_settled(selector):
+            self._step_log("输入框的值仍在变化，继续执行: {}", selector)
+        if self.request_tracker is not None and self.request_tracker.pending_count:
+            self.request_tracker.wait_for_idle(self._request_tracking['timeout'], idle_ms=0)
+
+    def _step_press_tab(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Tab键", step_num)
+        self.base_page.press_tab()
+
+    def _step_press_escape(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 按下Escape键", step_num)
+        self.base_page.press_escape()
+
+    def _step_type_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 输入文本: {}", step_num, value)
+        self.base_page.type_text(str(value) if value else "")
+
+    def _step_clear_and_input(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 清空并输入文本到元素 {}，内容: {}", step_num, selector, value)
+        self.base_page.clear_and_input(selector, str(value) if value else "")
+
+    def _step_select_option_by_label(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 通过标签选择下拉框 {} 的选项: {}", step_num, selector, value)
+        self.base_page.select_option_by_label(selector, str(value) if value else "")
+
+    def _step_wait_for_network_idle(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 等待网络空闲", step_num)
+        self.base_page.wait_for_network_idle()
+
+    def _step_scroll_to_element(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到元素 {}", step_num, selector)
+        self.base_page.scroll_to_element(selector)
+
+    def _step_scroll_to_bottom(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到页面底部", step_num)
+        self.base_page.scroll_to_bottom()
+
+    def _step_scroll_to_top(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 滚动到页面顶部", step_num)
+        self.base_page.scroll_to_top()
+
+    def _step_execute_script(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 执行JavaScript脚本: {}", step_num, value)
+        self.base_page.execute_script(str(value) if value else "")
+
+    def _step_refresh_page(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 刷新页面", step_num)
+        self.base_page.refresh_page()
+
+    def _step_go_back(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 返回上一页", step_num)
+        self.base_page.go_back()
+
+    def _step_go_forward(self, selector: str, value: Any, expected: Any, step_num: int):
+        self._step_log("步骤 {}: 前进到下一页", step_num)
+        self.base_page.go_forward()
+
+    def _step_get_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        text = self.base_page.get_text(selector)
+        self._step_log("步骤 {}: 获取元素 {} 的文本: {}", step_num, selector, text)
+
+    def _step_get_attribute(self, selector: str, value: Any, expected: Any, step_num: int):
+        attribute = self.base_page.get_attribute(selector, str(value) if value else "")
+        self._step_log("步骤 {}: 获取元素 {} 的属性 {}: {}", step_num, selector, value, attribute)
+
+    def _step_get_value(self, selector: str, value: Any, expected: Any, step_num: int):
+        actual_value = self.base_page.get_value(selector)
+        self._step_log("步骤 {}: 获取元素 {} 的值: {}", step_num, selector, actual_value)
+
+    def _step_is_visible(self, selector: str, value: Any, expected: Any, step_num: int):
+        visible = self.base_page.is_visible(selector)
+        self._step_log("步骤 {}: 元素 {} 可见性: {}", step_num, selector, visible)
+
+    def _step_is_enabled(self, selector: str, value: Any, expected: Any, step_num: int):
+        enabled = self.base_page.is_enabled(selector)
+        self._step_log("步骤 {}: 元素 {} 启用状态: {}", step_num, selector, enabled)
+
+    def _step_get_page_title(self, selector: str, value: Any, expected: Any, step_num: int):
+        title = self.base_page.get_page_title()
+        self._step_log("步骤 {}: 页面标题: {}", step_num, title)
+
+    def _step_get_current_url(self, selector: str, value: Any, expected: Any, step_num: int):
+        url = self.base_page.get_current_url()
+        self._step_log("步骤 {}: 当前URL: {}", step_num, url)
+
+    def _step_get_dialog_text(self, selector: str, value: Any, expected: Any, step_num: int):
+        text = self.base_page.get_dialog_text()
+        self._step_log("步骤 {}: 对话框文本: {}", step_num, text)
+
+    def _step_assert(self, selector: str, value: Any, expected: Any, step_num: int):
+        # 增强断言步骤的执行和日志记录
+        self._step_log("步骤 {}: 执行断言 - 选择器: {}, 期望: {}, 值: {}", step_num, selector, expected, value)
+
+        # 断言前智能等待：等待网络空闲和页面稳定
+        if expected in ['包含', '等于']:
+            try:
+                # 等待接口请求完成
+                self._wait_for_requests_drained(step_num)
+
+                # 使用智能等待方法等待元素内容稳定
+                if expected == '包含' and value:
+                    self._wait_for_element_content_stable(selector, expected_content=value)
+                else:
+                    self._wait_for_element_content_stable(selector)
+            except Exception as e:
+                self.logger.warning(f"步骤 {step_num}: 等待页面稳定时出现异常（继续执行）: {e}")
+
+        # 支持多种断言格式
+        if expected == '属性':
+            # 断言属性包含：默认断言 class 属性包含 value 作为子串
+            locator = self.page.locator(selector)
+            substring = str(value) if value is not None else ''
+            self.page_assertion.assert_element_attribute_contains(locator, 'class', substring)
+        elif expected == '包含':
+            actual_text = self.base_page.get_text(selector)
+            self._step_log("步骤 {}: 断言元素文本包含 '{}', 实际文本: '{}'", step_num, value, actual_text)
+            Assertion.assert_in(value, actual_text, f"断言元素文本包含: {value}")
+        elif expected == '等于':
+            actual_text = self.base_page.get_text(selector)
+            self._step_log("步骤 {}: 断言元素文本等于 '{}', 实际文本: '{}'", step_num, value, actual_text)
+            Assertion.assert_equal(actual_text, value, f"断言元素文本等于: {value}")
+        elif expected in self.LOCATOR_ASSERTIONS:
+            locator = self.page.locator(selector)
+            getattr(self.page_assertion, self.LOCATOR_ASSERTIONS[expected])(locator)
+        else:
+            self.logger.error(f"不支持的断言类型: {expected}")
+            return False
+
+        self._step_log("步骤 {}: 断言执行成功", step_num)
+
+    def _execute_multiple_test_cases(self, test_cases: Iterable[VariantPlan], start_url: Optional[str] = None) -> RunResult:
+        """
+        执行多个测试用例（数据驱动测试）
+        启用并行模式（configure_parallel）时，各变体在独立的浏览器上下文中并发执行，结果按原顺序合并
+        
+        Args:
+            test_cases: 已编译的测试用例变体列表，或按数据源逐条生成的 VariantStream
+            start_url: 并行执行时新页面先打开的URL（从检查点执行）
             
-            # 调试日志
-            self.logger.debug(f"步骤 {i}: action={action}, element_path={element_path}, value={value}")
+        Returns:
+            合并后的执行结果（执行时长由 execute_test_case 记录）
+        """
+        total = variant_count(test_cases)
+        if (total is None or total > 1) and self._parallel_available():
+            test_case_results = self._execute_variants_in_parallel(test_cases, start_url)
+        else:
+            test_case_results = [self._execute_variant(i, total, variant) for i, variant in enumerate(test_cases)]
+        return self._summarize_variants(test_case_results)
+
+    @staticmethod
+    def _summarize_variants(test_case_results: List[CaseResult]) -> RunResult:
+        """合并各变体的结果和错误信息"""
+        error_messages = [
+            f"测试用例 {result.case_name} (输入值: {result.input_value}): {result.error_message}"
+            for result in test_case_results if not result.success
+        ]
+        return RunResult.from_cases(test_case_results, '; '.join(error_messages))
+
+    def _execute_variant(self, index: int, total: Optional[int], variant: VariantPlan) -> CaseResult:
+        """
+        执行单个数据驱动变体
+        
+        Args:
+            index: 变体序号（从0开始）
+            total: 变体总数，数据源驱动时为None
+            variant: 已编译的变体
+            
+        Returns:
+            该变体的测试用例结果
+        """
+        # 为每个测试用例添加Allure步骤
+        with self._report_step(self._start_variant(index, total, variant)), \
+                trace_span(variant.case_name, 'variant', input_value=str(variant.input_value)):
+            try:
+                # 执行当前测试用例的步骤
+                test_case_result = self._execute_compiled_steps(variant.steps, variant.case_name, variant.input_value)
+            except Exception as e:
+                return self._variant_failed(variant, e)
+
+        self._record_metrics(variant, test_case_result)
+        return self._finish_case(test_case_result)
+
+    def _start_variant(self, index: int, total: Optional[int], variant: VariantPlan) -> str:
+        """
+        开始执行变体：记录当前输入值（供截图等方法使用）和当前变体，输出进度日志
+
+        Returns:
+            该变体的Allure步骤标题
+        """
+        input_value = variant.input_value
+        self.current_input_value = str(input_value) if input_value else "default"
+        self._current_variant = (variant.case_name, input_value)
+
+        progress = variant_progress(index, total)
+        self.logger.info("执行第 {} 个测试用例，输入值: {}", progress, input_value)
+        return f"执行测试用例 {progress} (输入值: {input_value})"
+
+    def _variant_failed(self, variant: VariantPlan, error: Exception) -> CaseResult:
+        """变体执行异常（含新建页面失败）时记录错误日志，返回失败结果"""
+        error_msg = f"测试用例 {variant.case_name} (输入值: {variant.input_value}) 执行异常: {error}"
+        self.logger.error(error_msg)
+        return self._finish_case(CaseResult.failed(variant.case_name, variant.input_value, error_msg))
+
+    def _adopt_variant_output(self, screenshot_files: Dict[Any, str], report: Optional[AllureBuffer]) -> None:
+        """合并在其他页面执行的变体的截图记录与 deferred 模式的Allure步骤"""
+        self.screenshot_files.update(screenshot_files)
+        if report is not None:
+            self.report_buffer.adopt(report)
+
+    def _variant_context_options(self, storage_state: Dict[str, Any]) -> Dict[str, Any]:
+        """为变体新建浏览器上下文的参数：storage_state 加上 parallel_context_options"""
+        context_options = {'storage_state': storage_state}
+        context_options.update(self.parallel_context_options)
+        return context_options
+
+    # ==================== 结果流式写入 ====================
+
+    def configure_result_sink(self, result_dir: str = None, enable: bool = None, compact: bool = None) -> None:
+        """
+        配置结果流式写入
+        
+        每个步骤、每个测试用例（变体）执行完成时追加一行记录到 <结果目录>/results_<worker>.jsonl，
+        按条数/时间批量 fsync，进程异常退出时已完成的结果仍然保留；设置环境变量 UI_RESULT_SINK 时所有执行器默认开启
+        
+        Args:
+            result_dir: 结果目录，同一目录在进程内共用一个文件
+            enable: 是否写入结果文件，为True且未指定目录时使用环境变量 UI_RESULT_SINK 或项目根目录下的 results
+            compact: 返回的结果是否只保留摘要（开启写入时默认开启）
+        """
+        if enable is False:
+            self.result_sink = None
+        elif result_dir is not None or enable:
+            self.result_sink = get_result_sink(result_dir) or get_result_sink(DEFAULT_RESULT_DIR)
+            self.logger.info("结果写入文件: {}", self.result_sink.path)
+        if compact is not None:
+            self.compact_results = compact
+        elif enable is not None or result_dir is not None:
+            self.compact_results = self.result_sink is not None
+
+    def get_result_sink_config(self) -> dict:
+        """获取结果流式写入配置"""
+        return {
+            'result_file': str(self.result_sink.path) if self.result_sink is not None else None,
+            'compact_results': self.compact_results,
+        }
+
+    def _sink_step(self, step_result: StepResult) -> None:
+        """步骤完成时写入一条 step 记录"""
+        if self.result_sink is None:
+            return
+        variant_name, input_value = self._current_variant
+        self.result_sink.write({'type': 'step', 'case': self._current_case[0], 'variant': variant_name,
+                                'input_value': input_value, **step_result.to_dict(), 'time': round(time.time(), 3)})
+
+    def _finish_case(self, test_case_result: CaseResult) -> CaseResult:
+        """
+        测试用例（变体）完成时写入一条 case 记录
+
+        Returns:
+            开启精简结果时返回摘要（steps 只保留失败的步骤），否则原样返回
+        """
+        if self.result_sink is None:
+            return test_case_result
+        self.result_sink.write({'type': 'case', 'case': self._current_case[0], **test_case_result.summary_dict(),
+                                'time': round(time.time(), 3)})
+        return test_case_result.compact() if self.compact_results else test_case_result
+
+    def _sink_summary(self, test_case_name: str, summary: RunResult) -> None:
+        """YAML用例执行完成时写入一条 test_case 记录，并在返回结果中记录结果文件"""
+        if self.result_sink is None:
+            return
+        self.result_sink.write({
+            'type': 'test_case',
+            'case': test_case_name,
+            'success': summary.success,
+            'total_success': summary.total_success,
+            'total_failed': summary.total_failed,
+            'error_message': summary.error_message,
+            'duration_ms': summary.duration_ms,
+            'time': round(time.time(), 3),
+        })
+        summary.result_file = str(self.result_sink.path)
+
+    # ==================== Allure报告 ====================
+
+    def configure_allure(self, mode: str) -> None:
+        """
+        配置Allure报告模式
+        
+        Args:
+            mode: live - 执行时直接写入Allure（默认）；
+                  deferred - 执行时只在内存中记录步骤和截图，用例结束或异常退出时批量写入，
+                  并行/并发执行的变体不会相互交错
+        """
+        if mode not in ALLURE_MODES:
+            raise ValueError(f"不支持的Allure报告模式: {mode}，可选值: {', '.join(ALLURE_MODES)}")
+        self.allure_mode = mode
+        self.logger.info("Allure报告模式: {}", mode)
+
+    def _report_step(self, title: str):
+        """Allure步骤上下文，deferred 模式下返回内存记录的步骤（可调用 fail 标记失败），live 模式下为 allure.step"""
+        if self.allure_mode == 'deferred':
+            return self.report_buffer.step(title)
+        return allure.step(title)
+
+    def _report_attach_screenshot(self, image: Any, path: str, image_type: Optional[str] = None) -> None:
+        """把内存中的截图附加到当前Allure步骤，image_type 为图片数据的实际格式（png/jpeg），为None时按扩展名"""
+        if not isinstance(image, (bytes, bytearray)):
+            return
+        name = os.path.splitext(os.path.basename(path))[0]
+        if image_type is None:
+            image_type = 'jpeg' if path.lower().endswith(('.jpg', '.jpeg')) else 'png'
+        attachment_type = allure.attachment_type.JPG if image_type == 'jpeg' else allure.attachment_type.PNG
+        if self.allure_mode == 'deferred':
+            self.report_buffer.attach(bytes(image), name=name, attachment_type=attachment_type)
+        else:
+            allure.attach(bytes(image), name=name, attachment_type=attachment_type)
+
+    def flush_report(self) -> int:
+        """
+        把 deferred 模式下记录的步骤和截图写入Allure，execute_test_case 结束时自动调用
+        
+        Returns:
+            写入的顶层步骤数
+        """
+        return self.report_buffer.flush()
+
+    # ==================== 截图 ====================
+
+    def configure_screenshot(self, background: bool = None, image_format: str = None, quality: int = None,
+                             store: str = None) -> None:
+        """
+        配置截图
+        
+        Args:
+            background: 是否在后台线程写入截图，为None时不修改
+            image_format: 默认截图格式 png/jpeg/webp（webp 需要安装 Pillow），为None时按文件扩展名
+            quality: 默认 jpeg/webp 质量（0-100）
+            store: files - 按YAML中的路径保存；cas - 按内容哈希保存到 test-results/screenshot/blobs，
+                   内容相同的截图只写一次；为None时不修改
+        """
+        if store is not None and store not in SCREENSHOT_STORE_MODES:
+            raise ValueError(f"不支持的截图存储方式: {store}，可选值: {', '.join(SCREENSHOT_STORE_MODES)}")
+        if background is not None or store is not None:
+            previous = self.screenshot_pipeline
+            self._log_screenshot_errors(previous.flush())
+            if store is not None:
+                screenshot_store = get_screenshot_store() if store == 'cas' else None
+            else:
+                screenshot_store = previous.store
+            self.screenshot_pipeline = ScreenshotPipeline(previous.background if background is None else background,
+                                                          screenshot_store)
+            self.screenshot_pipeline.resolved.update(previous.resolved)
+        if image_format is not None:
+            resolve_image_format('', image_format)
+            self.screenshot_format = image_format
+        if quality is not None:
+            self.screenshot_quality = int(quality)
+        self.logger.info("截图配置: 后台写入={}, 按内容哈希保存={}, 格式={}, 质量={}", self.screenshot_pipeline.background,
+                         self.screenshot_pipeline.store is not None, self.screenshot_format or '按扩展名',
+                         self.screenshot_quality)
+
+    def _prepare_screenshot(self, selector: Any, value: Any) -> Dict[str, Any]:
+        """
+        解析截图步骤参数
+        
+        - `take_screenshot: xxx.png`：整页截图
+        - `take_screenshot: {value/path, selector, clip, format, quality, full_page}`：
+          指定selector时只截取该元素，clip 为截取区域（指定selector时相对于元素左上角）
+        
+        Returns:
+            截图参数字典
+        """
+        options = value if isinstance(value, dict) else {}
+        if options:
+            # 兼容 take_screenshot: xxx.png + quality: 80 这种写法
+            base_path = options.get('value') or options.get('path') or options.get('take_screenshot')
+            element = selector
+        else:
+            # 使用YAML文件中指定的文件路径，只处理相对路径转换
+            base_path = value if value is not None else selector
+            element = None
+        if not base_path:
+            raise ValueError("截图步骤缺少文件路径（value 或 path）")
+        base_path = str(base_path)
+
+        # 确保路径在 test-results/screenshot 下
+        if not base_path.startswith('test-results/'):
+            if base_path.startswith('screenshot/'):
+                path = base_path.replace('screenshot/', 'test-results/screenshot/')
+            else:
+                path = f"test-results/screenshot/{base_path}"
+        else:
+            path = base_path
+
+        image_format = resolve_image_format(path, options.get('format') or self.screenshot_format)
+        quality = options.get('quality', self.screenshot_quality)
+        if image_format == 'webp' and not webp_supported():
+            self.logger.warning("未安装 Pillow，无法保存WebP截图，改为保存JPEG: {}", path)
+            image_format = 'jpeg'
+            path = os.path.splitext(path)[0] + '.jpg'
+        capture_type, capture_quality = capture_options(image_format, quality)
+        return {
+            'base_path': base_path,
+            'path': path,
+            'element': element,
+            'clip': options.get('clip'),
+            'full_page': bool(options.get('full_page')),
+            'image_format': image_format,
+            'quality': quality,
+            'capture_type': capture_type,
+            'capture_quality': capture_quality,
+        }
+
+    def _store_screenshot(self, step_num: int, shot: Dict[str, Any], image: bytes) -> None:
+        """提交截图写入任务并记录路径，截图数据直接附加到Allure"""
+        path = shot['path']
+        self.screenshot_pipeline.submit(path, image, shot['image_format'], shot['quality'])
+        self.screenshot_files[step_num] = path  # 记录截图文件路径
+        # 直接附加内存中的截图，测试方法中无需再用 allure.attach.file 读取文件
+        self._report_attach_screenshot(image, path, shot['capture_type'])
+
+        # 记录基于基础文件名的路径，方便后续引用
+        if shot['base_path'].lower().endswith(tuple(IMAGE_FORMATS)):
+            base_name = os.path.splitext(os.path.basename(shot['base_path']))[0]
+            self.screenshot_files[f"{base_name}_path"] = path
+
+    def flush_screenshots(self, timeout: float = None) -> Dict[str, str]:
+        """
+        等待后台截图全部写入，execute_test_case 结束时自动调用
+        
+        Args:
+            timeout: 最长等待秒数，为None时一直等待
             
-            # 判断是否为元素路径
-            def is_element_path(path: str) -> bool:
-                return isinstance(path, str) and 'Path' in path
+        Returns:
+            写入失败的截图 {路径: 错误信息}
+        """
+        errors = self.screenshot_pipeline.flush(timeout)
+        self._log_screenshot_errors(errors)
+        return errors
+
+    def _log_screenshot_errors(self, errors: Dict[str, str]) -> None:
+        for path, error in errors.items():
+            self.logger.error("截图写入失败: {}，错误: {}", path, error)
+
+    # ==================== 耗时记录 ====================
+
+    def configure_trace(self, enable: bool = None, output_path: str = None) -> None:
+        """
+        配置 Chrome Trace Event 耗时记录（进程级，所有执行器写同一个文件）
+        
+        开启后用例、变体、步骤及定位器解析、智能等待、浏览器调用、截图的耗时写入
+        test-results/trace/trace_<worker>.json，可用 chrome://tracing 或 ui.perfetto.dev 打开；
+        设置环境变量 UI_TRACE=1 时默认开启
+        
+        Args:
+            enable: 是否开启记录
+            output_path: trace文件路径，需在记录第一个事件之前设置
+        """
+        if output_path is not None:
+            TRACE_RECORDER.output_path = Path(output_path)
+        if enable is not None:
+            TRACE_RECORDER.enabled = enable
+            self.logger.info("耗时记录已{}: {}", '启用' if enable else '禁用', TRACE_RECORDER.output_path)
+        self._apply_trace_proxies()
+
+    def _apply_trace_proxies(self) -> None:
+        """开启记录时为 base_page、page_assertion 套上计时代理"""
+        if not TRACE_RECORDER.enabled:
+            return
+        if not isinstance(self.base_page, TracedProxy):
+            self.base_page = TracedProxy(self.base_page)
+        if not isinstance(self.page_assertion, TracedProxy):
+            self.page_assertion = TracedProxy(self.page_assertion)
+
+    # ==================== 步骤耗时历史 ====================
+
+    def configure_metrics(self, enable: bool = None, db_path: str = None, run_id: str = None) -> None:
+        """
+        配置步骤耗时历史，每个变体执行完成后把步骤耗时追加到 SQLite 数据库
+        
+        统计分位数: MetricsStore.percentiles(by='action'/'selector')，
+        或命令行 python -m base.MetricsStore <数据库> --by selector
+        
+        Args:
+            enable: 是否开启，开启时需指定 db_path 或设置环境变量 UI_METRICS_DB
+            db_path: 数据库文件路径
+            run_id: 运行ID，默认同一次pytest运行（含各xdist worker）共用一个
+        """
+        if enable is False:
+            self.metrics_store = None
+        elif enable or db_path:
+            self.metrics_store = get_metrics_store(db_path)
+            if self.metrics_store is None:
+                raise ValueError("开启步骤耗时历史需要指定 db_path 或设置环境变量 UI_METRICS_DB")
+        if run_id and self.metrics_store is not None:
+            self.metrics_store.run_id = run_id
+        if self.metrics_store is not None:
+            self.logger.info("步骤耗时历史: {} (run_id: {})", self.metrics_store.db_path, self.metrics_store.run_id)
+
+    def _get_browser_name(self) -> Optional[str]:
+        """当前页面的浏览器名称（chromium/firefox/webkit）"""
+        if self._browser_name is None:
+            try:
+                self._browser_name = self.page.context.browser.browser_type.name
+            except Exception:
+                self._browser_name = ''
+        return self._browser_name or None
+
+    def _record_metrics(self, variant: VariantPlan, test_case_result: CaseResult) -> None:
+        """把变体的步骤耗时写入数据库，写入失败只记录警告"""
+        if self.metrics_store is None:
+            return
+        steps = [
+            {
+                'step_num': result.step_num,
+                'action': result.action,
+                'selector_key': selector_key(step.element_path, step.selector),
+                'success': result.success,
+                'duration_ms': result.duration_ms,
+            }
+            for step, result in zip(variant.steps, test_case_result.steps)
+        ]
+        try:
+            self.metrics_store.record_steps(variant.case_name, variant.input_value, steps, self._get_browser_name())
+        except sqlite3.Error as e:
+            self.logger.warning(f"写入步骤耗时失败: {e}")
+
+    # ==================== 静态等待审计 ====================
+
+    def configure_wait_audit(self, enable: bool = None) -> None:
+        """
+        配置静态等待审计
+        
+        开启后 wait 步骤的等待时长不变，同时检测下一步骤的目标元素何时可操作，结果记录在 base.WaitAudit.WAIT_AUDITOR；
+        设置环境变量 UI_WAIT_AUDIT=1 时所有执行器默认开启，测试结束时输出报告（UI_WAIT_AUDIT=rewrite 同时生成改写后的用例副本）
+        
+        Args:
+            enable: 是否开启审计
+        """
+        if enable is not None:
+            self.enable_wait_audit = enable
+            self.logger.info("静态等待审计已{}", '启用' if enable else '禁用')
+
+    # ==================== 请求跟踪 ====================
+
+    @staticmethod
+    def _read_request_tracking_config() -> Dict[str, Any]:
+        """读取 web_ui.conf 中的 [request_tracker] 配置，配置文件不可用时使用默认值"""
+        try:
+            return dict(WebUIConfReader().config.get('request_tracker', {}))
+        except Exception as e:
+            logger.warning(f"读取request_tracker配置失败，使用默认配置: {e}")
+            return {}
 
-            selector = None
-            if element_path and is_element_path(element_path):
-                try:
-                    t1 = re.search(r'Path\((.*?)\)', element_path)
-                    tmp_path = t1.group(1) if t1 else None
-                    # 支持 .f(...) 形式动态传参
-                    t2 = re.search(r'\.f\((.*?)\)', element_path)
-                    tmp_value = t2.group(1) if t2 else None
-
-                    selector = self.resolve_selector(self.locations_dict, tmp_path)
-                    if tmp_value is not None:
-                        selector = selector.format(tmp_value)
-                except Exception as e:
-                    self.logger.error(f"元素路径解析失败: {element_path}, 错误: {e}")
-                    return False
-            else:
-                selector = element_path  # 直接用原始值（如文件路径）
-            
-            # 检查selector是否为空
-            if action in ['click', 'hover', 'input', 'clear_and_input', 'select', 'select_option_by_label', 'check', 'uncheck', 'upload', 'double_click', 'right_click', 'wait_for_element', 'wait_for_element_hidden', 'scroll_to_element', 'execute_script', 'get_text', 'get_attribute', 'get_value', 'is_visible', 'is_enabled', 'assert'] and not selector:
-                self.logger.error(f"步骤 {i}: {action} 操作的selector为空，element_path={element_path}")
-                return False
-            
-            # 使用allure.step装饰器记录每个步骤
-            step_description = self._get_step_description(action, selector, value, expected, i)
-            
-            @allure.step(step_description)
-            def execute_single_step():
-                return self._execute_single_step(action, selector, value, expected, i)
-            
-            # 执行步骤
-            if not execute_single_step():
-                return False
-                
-        return True
-    
-    def _get_step_description(self, action: str, selector: str, value: Any, expected: Any, step_num: int) -> str:
+    def configure_request_tracking(self, enable: bool = None, resource_types: List[str] = None,
+                                   include: List[str] = None, exclude: List[str] = None,
+                                   page_rules: Dict[str, Dict[str, List[str]]] = None,
+                                   idle_ms: int = None, timeout: int = None) -> None:
         """
-        生成步骤描述，用于Allure报告
+        配置请求跟踪
+        
+        启用后，按Enter和断言前不再等待 networkidle，而是等待当前页面关心的 XHR/fetch 请求全部返回
         
         Args:
-            action: 操作类型
-            selector: 元素选择器
-            value: 操作值
-            expected: 期望值
-            step_num: 步骤编号
-            
-        Returns:
-            步骤描述字符串
+            enable: 是否启用请求跟踪，禁用时回退为 networkidle 等待
+            resource_types: 统计的资源类型，默认 ['xhr', 'fetch']
+            include: 默认包含的URL通配符，为空表示全部统计
+            exclude: 默认排除的URL通配符，如轮询、心跳接口
+            page_rules: 按页面配置的规则 {页面URL前缀: {'include': [...], 'exclude': [...]}}
+            idle_ms: 请求全部返回后保持静默的时间（毫秒）
+            timeout: 等待超时时间（毫秒）
         """
-        descriptions = {
-            'navigate': f"步骤{step_num}: 导航到 {selector or '页面'}",
-            'click': f"步骤{step_num}: 点击元素 {selector}",
-            'hover': f"步骤{step_num}: 悬停元素 {selector}",
-            'input': f"步骤{step_num}: 输入文本到元素 {selector}，内容: {value}",
-            'clear_and_input': f"步骤{step_num}: 清空并输入文本到元素 {selector}，内容: {value}",
-            'select': f"步骤{step_num}: 选择下拉框 {selector} 的选项: {value}",
-            'select_option_by_label': f"步骤{step_num}: 通过标签选择下拉框 {selector} 的选项: {value}",
-            'check': f"步骤{step_num}: 勾选复选框 {selector}",
-            'uncheck': f"步骤{step_num}: 取消勾选复选框 {selector}",
-            'upload': f"步骤{step_num}: 上传文件到 {selector}，文件: {value}",
-            'double_click': f"步骤{step_num}: 双击元素 {selector}",
-            'right_click': f"步骤{step_num}: 右键点击元素 {selector}",
-            'wait': f"步骤{step_num}: 等待 {value or 1000} 毫秒",
-            'wait_for_element': f"步骤{step_num}: 等待元素出现 {selector}",
-            'wait_for_element_hidden': f"步骤{step_num}: 等待元素隐藏 {selector}",
-            'wait_for_load_state': f"步骤{step_num}: 等待页面加载状态: {value}",
-            'wait_for_network_idle': f"步骤{step_num}: 等待网络空闲",
-            'scroll_to_element': f"步骤{step_num}: 滚动到元素 {selector}",
-            'scroll_to_bottom': f"步骤{step_num}: 滚动到页面底部",
-            'scroll_to_top': f"步骤{step_num}: 滚动到页面顶部",
-            'press_key': f"步骤{step_num}: 按下按键 {value or 'Enter'}",
-            'press_enter': f"步骤{step_num}: 按下Enter键",
-            'press_tab': f"步骤{step_num}: 按下Tab键",
-            'press_escape': f"步骤{step_num}: 按下Escape键",
-            'type_text': f"步骤{step_num}: 输入文本: {value}",
-            'refresh_page': f"步骤{step_num}: 刷新页面",
-            'go_back': f"步骤{step_num}: 返回上一页",
-            'go_forward': f"步骤{step_num}: 前进到下一页",
-            'take_screenshot': f"步骤{step_num}: 截图保存到 {value or selector}",
-            'execute_script': f"步骤{step_num}: 执行JavaScript脚本: {value}",
-            'accept_dialog': f"步骤{step_num}: 接受对话框",
-            'dismiss_dialog': f"步骤{step_num}: 取消对话框",
-            'get_dialog_text': f"步骤{step_num}: 获取对话框文本",
-            'get_text': f"步骤{step_num}: 获取元素 {selector} 的文本",
-            'get_attribute': f"步骤{step_num}: 获取元素 {selector} 的属性 {value}",
-            'get_value': f"步骤{step_num}: 获取元素 {selector} 的值",
-            'is_visible': f"步骤{step_num}: 检查元素 {selector} 是否可见",
-            'is_enabled': f"步骤{step_num}: 检查元素 {selector} 是否启用",
-            'get_page_title': f"步骤{step_num}: 获取页面标题",
-            'get_current_url': f"步骤{step_num}: 获取当前URL",
-            'assert': f"步骤{step_num}: 断言元素 {selector} {expected} {value or ''}",
+        options = {
+            'enable': enable,
+            'resource_types': resource_types,
+            'include': include,
+            'exclude': exclude,
+            'page_rules': page_rules,
+            'idle_ms': idle_ms,
+            'timeout': timeout,
         }
+        self._request_tracking.update({key: value for key, value in options.items() if value is not None})
+
+        config = self._request_tracking
+        if not config['enable']:
+            self.request_tracker = None
+            self.logger.info("请求跟踪已禁用，使用networkidle等待")
+            return
+
+        # 同一页面只挂载一次事件监听，多个执行器共享同一个跟踪器
+        self.request_tracker = get_request_tracker(
+            self.page,
+            self.REQUEST_TRACKER_CLASS,
+            resource_types=config['resource_types'],
+            include=config['include'],
+            exclude=config['exclude'],
+            page_rules=config['page_rules'],
+            idle_ms=config['idle_ms'],
+        )
+        self.logger.info("请求跟踪已启用，资源类型: {}，静默时间: {}ms", config['resource_types'], config['idle_ms'])
+
+    def get_request_tracking_config(self) -> dict:
+        """
+        获取请求跟踪配置
         
-        return descriptions.get(action, f"步骤{step_num}: 执行{action}操作")
-    
-    def _get_current_input_value(self) -> str:
-        """获取当前测试用例的输入值，用于生成唯一文件名"""
-        return self.current_input_value or "default"
-    
-    def get_screenshot_path(self, step_num: int = None, base_name: str = None) -> str:
+        Returns:
+            请求跟踪配置字典，可直接传给 configure_request_tracking
         """
-        获取截图文件路径
+        config = dict(self._request_tracking)
+        config['page_rules'] = {prefix: dict(rule) for prefix, rule in config['page_rules'].items()}
+        return config
+
+    def _wait_for_requests_drained(self, step_num: int) -> bool:
+        """
+        等待当前页面的接口请求全部返回；未启用请求跟踪时等待 networkidle
         
-        Args:
-            step_num: 步骤编号，如果指定则返回该步骤的截图路径
-            base_name: 基础文件名，如果指定则返回匹配的截图路径
-            
         Returns:
-            截图文件路径，如果未找到则返回None
+            是否在超时前完成
         """
-        if step_num is not None:
-            return self.screenshot_files.get(step_num)
+        if self.request_tracker is None:
+            self.base_page.wait_for_network_idle()
+            return True
+
+        with trace_span('request_wait', 'smart_wait'):
+            drained = self.request_tracker.wait_for_idle(self._request_tracking['timeout'])
+        if not drained:
+            self.logger.warning(f"步骤 {step_num}: 等待接口请求返回超时，未完成的请求: {self.request_tracker.pending_urls()}")
+        return drained
+
+    # ==================== 变体并行执行 ====================
+
+    def configure_parallel(self, enable: bool = None, workers: int = None, launch_options: Dict[str, Any] = None,
+                           context_options: Dict[str, Any] = None) -> None:
+        """
+        配置数据驱动变体的并行执行
         
-        if base_name is not None:
-            # 根据基础文件名查找匹配的截图
-            for step_num, path in self.screenshot_files.items():
-                if base_name in path:
-                    return path
+        Playwright同步API的对象只能在创建它的线程中使用，因此每个工作线程会启动自己的浏览器，
+        每个变体使用独立的浏览器上下文（及独立的BasePage、PageAssertion）
         
-        # 如果没有找到，返回最后一个截图路径
-        if self.screenshot_files:
-            return list(self.screenshot_files.values())[-1]
+        Args:
+            enable: 是否启用并行执行
+            workers: 工作线程数（每个线程一个浏览器）
+            launch_options: 传给 browser_type.launch 的参数，如 {'headless': False}
+            context_options: 传给 browser.new_context 的额外参数；默认复用当前页面的 storage_state（登录态）
+        """
+        if enable is not None:
+            self.enable_parallel = enable
+            self.logger.info("变体并行执行已{}", '启用' if enable else '禁用')
+
+        if workers is not None:
+            self.parallel_workers = max(1, int(workers))
+            self.logger.info("变体并行工作线程数设置为: {}", self.parallel_workers)
+
+        if launch_options is not None:
+            self.parallel_launch_options = dict(launch_options)
+
+        if context_options is not None:
+            self.parallel_context_options = dict(context_options)
+
+    def _parallel_available(self) -> bool:
+        """
+        是否并行执行变体：需要开启并行模式，且当前页面属于普通浏览器；
+        持久化上下文（launch_persistent_context）没有 browser，无法新建上下文，按顺序执行
+        """
+        if not self.enable_parallel:
+            return False
+        if self._get_browser_name() is None:
+            self.logger.warning("当前页面属于持久化上下文（没有 browser），数据驱动变体按顺序执行")
+            return False
+        return True
+
+    def get_parallel_config(self) -> dict:
+        """
+        获取变体并行执行配置
         
-        return None
-    
-    def get_screenshot_by_base_name(self, base_name: str) -> str:
+        Returns:
+            并行执行配置字典
         """
-        根据基础文件名获取截图路径
+        return {
+            'enable_parallel': self.enable_parallel,
+            'parallel_workers': self.parallel_workers,
+            'parallel_launch_options': dict(self.parallel_launch_options),
+            'parallel_context_options': dict(self.parallel_context_options),
+        }
+
+    def configure_checkpoint(self, mode: str = None) -> None:
+        """
+        配置数据驱动变体的公共前置步骤检查点
+        
+        各变体在第一个参数化步骤之前的步骤相同，开启后这些步骤只在当前页面执行一次，保存当前URL和
+        storage_state（检查点），每个变体从检查点打开新页面，只执行第一个参数化步骤及之后的步骤；
+        前置步骤失败时回退为每个变体完整执行。用例中的 checkpoint 配置优先
+
+        两种模式都是重新打开检查点URL，不复制页面DOM：前置步骤只有跳转、等待和只读操作时才能重现，
+        有点击、输入等步骤时不使用检查点（见 _variant_checkpoint_mode）
         
         Args:
-            base_name: 基础文件名（不包含扩展名），如 'search_task_CZtest06'
-            
-        Returns:
-            截图文件路径，如果未找到则返回None
+            mode: off: 不使用检查点；
+                  state: 每个变体使用恢复了 storage_state 的新浏览器上下文，变体之间互不影响；
+                  page: 每个变体在当前上下文中新开页面打开检查点URL（共享cookie等存储，开销最小）；
+                  开启并行执行（configure_parallel）时总是使用新的上下文
         """
-        key = f"{base_name}_path"
-        return self.screenshot_files.get(key)
-    
-    def verify_screenshot_exists(self, base_name: str) -> bool:
+        if mode is not None:
+            self.variant_checkpoint = checkpoint_mode(mode)
+            self.logger.info("变体检查点模式设置为: {}", self.variant_checkpoint)
+
+    def get_checkpoint_config(self) -> dict:
+        """获取变体检查点配置"""
+        return {'variant_checkpoint': self.variant_checkpoint}
+
+    def _execute_from_checkpoint(self, test_cases: Iterable[VariantPlan], prefix: int, mode: str) -> RunResult:
         """
-        验证指定基础文件名的截图是否存在
+        公共前置步骤只执行一次，各变体从检查点开始执行其余步骤
         
         Args:
-            base_name: 基础文件名（不包含扩展名）
+            test_cases: 已编译的测试用例变体列表，或按数据源逐条生成的 VariantStream
+            prefix: 公共前置步骤数
+            mode: state/page
             
         Returns:
-            截图文件是否存在
+            合并后的执行结果，prefix_steps 为前置步骤的执行结果
         """
-        screenshot_path = self.get_screenshot_by_base_name(base_name)
-        if screenshot_path:
-            return os.path.exists(screenshot_path)
-        return False
-    
-    def get_all_screenshot_paths(self) -> Dict[int, str]:
+        first, remaining = self._split_first_variant(test_cases)
+        if first is None:
+            return RunResult.from_cases([])
+
+        # 公共前置步骤不属于某个变体，结果文件中 variant 为空
+        self._current_variant = ('', '')
+        with self._report_step(f"执行公共前置步骤（{prefix} 步）"):
+            prefix_result = self._execute_compiled_steps(first.steps[:prefix])
+        if not prefix_result.success:
+            self.logger.warning("公共前置步骤执行失败，各变体完整执行全部步骤: {}", prefix_result.error_message)
+            return self._execute_multiple_test_cases(remaining)
+
+        checkpoint = self._save_checkpoint()
+        self.logger.info("公共前置步骤 {} 步执行完成，各变体从检查点开始: {}", prefix, checkpoint['url'])
+        forked = self._fork_variants(remaining, prefix)
+        if self._parallel_available():
+            result = self._execute_multiple_test_cases(forked, start_url=checkpoint['url'])
+        else:
+            total = variant_count(forked)
+            test_case_results = [self._execute_forked_variant(i, total, variant, checkpoint, mode)
+                                 for i, variant in enumerate(forked)]
+            result = self._summarize_variants(test_case_results)
+        result.prefix_steps = prefix_result.steps
+        return result
+
+    def _save_checkpoint(self) -> Dict[str, Any]:
+        """检查点：当前URL和上下文的 storage_state（cookie、localStorage）"""
+        return {'url': self.page.url, 'storage_state': self.page.context.storage_state()}
+
+    @staticmethod
+    def _split_first_variant(test_cases: Iterable[VariantPlan]) -> Tuple[Optional[VariantPlan], Iterable[VariantPlan]]:
         """
-        获取所有截图文件路径
-        
+        取出第一个变体（用于执行公共前置步骤）
+
         Returns:
-            步骤编号到截图路径的映射字典
+            (第一个变体, 全部变体)，数据源驱动时取出的变体重新接到迭代器前面
         """
-        return self.screenshot_files.copy()
-    
-    def _execute_single_step(self, action: str, selector: str, value: Any, expected: Any, step_num: int) -> bool:
+        variants = iter(test_cases)
+        first = next(variants, None)
+        return first, (test_cases if variant_count(test_cases) is not None else chain([first], variants))
+
+    @staticmethod
+    def _fork_variants(test_cases: Iterable[VariantPlan], prefix: int) -> Iterable[VariantPlan]:
+        """去掉公共前置步骤的变体，步骤编号不变；变体列表返回元组，数据源驱动的变体逐条处理"""
+        forked = (replace(variant, steps=variant.steps[prefix:]) for variant in test_cases)
+        return tuple(forked) if variant_count(test_cases) is not None else forked
+
+    def _execute_forked_variant(self, index: int, total: Optional[int], variant: VariantPlan,
+                                checkpoint: Dict[str, Any], mode: str) -> CaseResult:
         """
-        执行单个步骤（被allure.step装饰器包装）
+        从检查点打开新页面执行变体
         
         Args:
-            action: 操作类型
-            selector: 元素选择器
-            value: 操作值
-            expected: 期望值
-            step_num: 步骤编号
+            index: 变体序号（从0开始）
+            total: 变体总数，数据源驱动时为None
+            variant: 去掉公共前置步骤的变体
+            checkpoint: _save_checkpoint 的返回值
+            mode: state/page
             
         Returns:
-            执行结果
+            该变体的测试用例结果
         """
+        browser = self.page.context.browser
+        context = None
         try:
-            # 动作分流
-            if action in ['navigate']:
-                self.logger.info(f"步骤 {step_num}: 导航到 {selector or '页面'}")
-                url = self.pages_dict.get(selector, selector)
-                self.base_page.navigate_to(url)
-            elif action in ['click']:
-                self.logger.info(f"步骤 {step_num}: 点击元素 {selector}")
-                self.base_page.click(selector)
-            elif action in ['hover']:
-                self.logger.info(f"步骤 {step_num}: 悬停元素 {selector}")
-                self.base_page.hover(selector)
-            elif action in ['input']:
-                # 确保value是字符串类型
-                if value is not None:
-                    value_str = str(value)
-                else:
-                    value_str = ""
-                self.logger.info(f"步骤 {step_num}: 输入到元素 {selector}，内容: {value_str}")
-                self.base_page.input_text(selector, value_str)
-                
-                # 输入完成后等待一小段时间，让可能的输入事件处理完成
-                self.logger.info(f"步骤 {step_num}: 输入完成，等待输入事件处理...")
-                try:
-                    self.base_page.wait_for_time(0.2)
-                    self.logger.info(f"步骤 {step_num}: 输入事件处理完成")
-                except Exception as e:
-                    self.logger.warning(f"步骤 {step_num}: 等待输入事件处理时出现异常（继续执行）: {e}")
-            elif action in ['wait']:
-                # 修复wait步骤的value处理
-                if value is not None:
-                    wait_time = value
-                elif selector and selector.isdigit():
-                    wait_time = selector
-                else:
-                    wait_time = 1000  # 默认等待1秒
-                
-                self.logger.info(f"步骤 {step_num}: 等待 {wait_time} 毫秒")
-                self.base_page.wait_for_time(float(wait_time)/1000)
-            elif action in ['take_screenshot']:
-                # 使用YAML文件中指定的文件路径，只处理相对路径转换
-                base_path = value if value is not None else selector
-                
-                # 确保路径在 test-results/screenshot 下
-                if not base_path.startswith('test-results/'):
-                    if base_path.startswith('screenshot/'):
-                        path = base_path.replace('screenshot/', 'test-results/screenshot/')
-                    else:
-                        path = f"test-results/screenshot/{base_path}"
-                else:
-                    path = base_path
-                
-                # 确保目录存在
-                os.makedirs(os.path.dirname(path), exist_ok=True)
-                
-                self.logger.info(f"步骤 {step_num}: 截图保存到 {path}")
-                self.base_page.take_screenshot(path)
-                self.screenshot_files[step_num] = path  # 记录截图文件路径
-                
-                # 记录基于基础文件名的路径，方便后续引用
-                if base_path.endswith('.png') or base_path.endswith('.jpg'):
-                    base_name = os.path.splitext(os.path.basename(base_path))[0]
-                    self.screenshot_files[f"{base_name}_path"] = path
-            elif action in ['press_key']:
-                # 处理按键操作
-                if value is not None:
-                    key = str(value)
-                else:
-                    key = "Enter"  # 默认按键
-                self.logger.info(f"步骤 {step_num}: 按下按键 {key}")
-                self.base_page.press_key(key)
-                
-                # 如果是 Enter 键，等待页面数据刷新
-                if key.lower() == 'enter':
-                    self.logger.info(f"步骤 {step_num}: 按下Enter键后等待页面数据刷新...")
-                    try:
-                        # 等待网络空闲，确保接口请求完成
-                        self.base_page.wait_for_network_idle()
-                        self.logger.info(f"步骤 {step_num}: 页面数据刷新完成")
-                        
-                        # 等待一小段时间让DOM更新完成
-                        self.base_page.wait_for_time(0.3)
-                        self.logger.info(f"步骤 {step_num}: DOM更新完成")
-                    except Exception as e:
-                        self.logger.warning(f"步骤 {step_num}: 等待页面数据刷新时出现异常（继续执行）: {e}")
-            elif action in ['press_enter']:
-                self.logger.info(f"步骤 {step_num}: 按下Enter键")
-                self.base_page.press_enter()
-                
-                # 按下Enter键后等待页面数据刷新
-                self.logger.info(f"步骤 {step_num}: 按下Enter键后等待页面数据刷新...")
-                try:
-                    # 等待网络空闲，确保接口请求完成
-                    self.base_page.wait_for_network_idle()
-                    self.logger.info(f"步骤 {step_num}: 页面数据刷新完成")
-                    
-                    # 等待一小段时间让DOM更新完成
-                    self.base_page.wait_for_time(0.3)
-                    self.logger.info(f"步骤 {step_num}: DOM更新完成")
-                except Exception as e:
-                    self.logger.warning(f"步骤 {step_num}: 等待页面数据刷新时出现异常（继续执行）: {e}")
-            elif action in ['press_tab']:
-                self.logger.info(f"步骤 {step_num}: 按下Tab键")
-                self.base_page.press_tab()
-            elif action in ['press_escape']:
-                self.logger.info(f"步骤 {step_num}: 按下Escape键")
-                self.base_page.press_escape()
-            elif action in ['type_text']:
-                self.logger.info(f"步骤 {step_num}: 输入文本: {value}")
-                self.base_page.type_text(str(value) if value else "")
-            elif action in ['clear_and_input']:
-                self.logger.info(f"步骤 {step_num}: 清空并输入文本到元素 {selector}，内容: {value}")
-                self.base_page.clear_and_input(selector, str(value) if value else "")
-            elif action in ['select_option_by_label']:
-                self.logger.info(f"步骤 {step_num}: 通过标签选择下拉框 {selector} 的选项: {value}")
-                self.base_page.select_option_by_label(selector, str(value) if value else "")
-            elif action in ['wait_for_network_idle']:
-                self.logger.info(f"步骤 {step_num}: 等待网络空闲")
-                self.base_page.wait_for_network_idle()
-            elif action in ['scroll_to_element']:
-                self.logger.info(f"步骤 {step_num}: 滚动到元素 {selector}")
-                self.base_page.scroll_to_element(selector)
-            elif action in ['scroll_to_bottom']:
-                self.logger.info(f"步骤 {step_num}: 滚动到页面底部")
-                self.base_page.scroll_to_bottom()
-            elif action in ['scroll_to_top']:
-                self.logger.info(f"步骤 {step_num}: 滚动到页面顶部")
-                self.base_page.scroll_to_top()
-            elif action in ['execute_script']:
-                self.logger.info(f"步骤 {step_num}: 执行JavaScript脚本: {value}")
-                self.base_page.execute_script(str(value) if value else "")
-            elif action in ['refresh_page']:
-                self.logger.info(f"步骤 {step_num}: 刷新页面")
-                self.base_page.refresh_page()
-            elif action in ['go_back']:
-                self.logger.info(f"步骤 {step_num}: 返回上一页")
-                self.base_page.go_back()
-            elif action in ['go_forward']:
-                self.logger.info(f"步骤 {step_num}: 前进到下一页")
-                self.base_page.go_forward()
-            elif action in ['get_text']:
-                self.logger.info(f"步骤 {step_num}: 获取元素 {selector} 的文本")
-                text = self.base_page.get_text(selector)
-                self.logger.info(f"步骤 {step_num}: 获取到的文本: {text}")
-            elif action in ['get_attribute']:
-                self.logger.info(f"步骤 {step_num}: 获取元素 {selector} 的属性 {value}")
-                attribute = self.base_page.get_attribute(selector, str(value) if value else "")
-                self.logger.info(f"步骤 {step_num}: 获取到的属性值: {attribute}")
-            elif action in ['get_value']:
-                self.logger.info(f"步骤 {step_num}: 获取元素 {selector} 的值")
-                actual_value = self.base_page.get_value(selector)
-                self.logger.info(f"步骤 {step_num}: 获取到的值: {actual_value}")
-            elif action in ['is_visible']:
-                self.logger.info(f"步骤 {step_num}: 检查元素 {selector} 是否可见")
-                visible = self.base_page.is_visible(selector)
-                self.logger.info(f"步骤 {step_num}: 元素可见性: {visible}")
-            elif action in ['is_enabled']:
-                self.logger.info(f"步骤 {step_num}: 检查元素 {selector} 是否启用")
-                enabled = self.base_page.is_enabled(selector)
-                self.logger.info(f"步骤 {step_num}: 元素启用状态: {enabled}")
-            elif action in ['get_page_title']:
-                self.logger.info(f"步骤 {step_num}: 获取页面标题")
-                title = self.base_page.get_page_title()
-                self.logger.info(f"步骤 {step_num}: 页面标题: {title}")
-            elif action in ['get_current_url']:
-                self.logger.info(f"步骤 {step_num}: 获取当前URL")
-                url = self.base_page.get_current_url()
-                self.logger.info(f"步骤 {step_num}: 当前URL: {url}")
-            elif action in ['get_dialog_text']:
-                self.logger.info(f"步骤 {step_num}: 获取对话框文本")
-                text = self.base_page.get_dialog_text()
-                self.logger.info(f"步骤 {step_num}: 对话框文本: {text}")
-            elif action in ['assert']:
-                # 增强断言步骤的执行和日志记录
-                self.logger.info(f"步骤 {step_num}: 执行断言 - 选择器: {selector}, 期望: {expected}, 值: {value}")
-                
-                # 断言前智能等待：等待网络空闲和页面稳定
-                if expected in ['包含', '等于']:
-                    self.logger.info(f"步骤 {step_num}: 断言前等待页面数据稳定...")
-                    try:
-                        # 等待网络空闲，确保接口请求完成
-                        self.base_page.wait_for_network_idle()
-                        self.logger.info(f"步骤 {step_num}: 网络空闲，等待完成")
-                        
-                        # 使用智能等待方法等待元素内容稳定
-                        if expected == '包含' and value:
-                            self.logger.info(f"步骤 {step_num}: 等待元素内容包含期望值: {value}")
-                            self._wait_for_element_content_stable(selector, expected_content=value)
-                        else:
-                            self.logger.info(f"步骤 {step_num}: 等待元素内容稳定")
-                            self._wait_for_element_content_stable(selector)
-                        
-                        self.logger.info(f"步骤 {step_num}: 页面数据稳定，开始执行断言")
-                    except Exception as e:
-                        self.logger.warning(f"步骤 {step_num}: 等待页面稳定时出现异常（继续执行）: {e}")
-                
-                # 支持多种断言格式
-                if expected == '属性':
-                    # 断言属性包含：默认断言 class 属性包含 value 作为子串
-                    self.logger.info(f"步骤 {step_num}: 断言元素属性包含子串 - 选择器: {selector}, 属性: class, 子串: {value}")
-                    locator = self.page.locator(selector)
-                    substring = str(value) if value is not None else ''
-                    self.page_assertion.assert_element_attribute_contains(locator, 'class', substring)
-                elif expected == '包含':
-                    actual_text = self.base_page.get_text(selector)
-                    self.logger.info(f"步骤 {step_num}: 断言元素文本包含 '{value}', 实际文本: '{actual_text}'")
-                    Assertion.assert_in(value, actual_text, f"断言元素文本包含: {value}")
-                elif expected == '等于':
-                    actual_text = self.base_page.get_text(selector)
-                    self.logger.info(f"步骤 {step_num}: 断言元素文本等于 '{value}', 实际文本: '{actual_text}'")
-                    Assertion.assert_equal(actual_text, value, f"断言元素文本等于: {value}")
-                elif expected == '可见':
-                    self.logger.info(f"步骤 {step_num}: 断言元素可见 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_visible(locator)
-                elif expected == '不可见':
-                    self.logger.info(f"步骤 {step_num}: 断言元素不可见 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_hidden(locator)
-                elif expected == '启用':
-                    self.logger.info(f"步骤 {step_num}: 断言元素启用 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_enabled(locator)
-                elif expected == '禁用':
-                    self.logger.info(f"步骤 {step_num}: 断言元素禁用 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_disabled(locator)
-                elif expected == '已勾选':
-                    self.logger.info(f"步骤 {step_num}: 断言元素已勾选 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_checked(locator)
-                elif expected == '未勾选':
-                    self.logger.info(f"步骤 {step_num}: 断言元素未勾选 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_not_checked(locator)
-                elif expected == 'assert_element_visible':
-                    # 支持 assert_element_visible 格式
-                    self.logger.info(f"步骤 {step_num}: 断言元素可见 - 选择器: {selector}")
-                    locator = self.page.locator(selector)
-                    self.page_assertion.assert_element_is_visible(locator)
-                else:
-                    self.logger.error(f"不支持的断言类型: {expected}")
-                    return False
-                
-                self.logger.info(f"步骤 {step_num}: 断言执行成功")
+            if mode == 'state' and browser is not None:
+                context = browser.new_context(**self._variant_context_options(checkpoint['storage_state']))
+                page = context.new_page()
             else:
-                self.logger.error(f"不支持的动作: {action}")
-                return False
-            return True
+                # page 模式，或持久化上下文（没有 browser）时在当前上下文中新开页面
+                page = self.page.context.new_page()
+            try:
+                page.goto(checkpoint['url'])
+                executor = self._spawn_executor(page)
+                result = executor._execute_variant(index, total, variant)
+                self._adopt_variant_output(executor.screenshot_files, executor.report_buffer.take())
+                return result
+            finally:
+                if context is None:
+                    page.close()
         except Exception as e:
-            self.logger.error(f"步骤 {step_num} 执行失败: {e}")
-            return False
+            return self._variant_failed(variant, e)
+        finally:
+            if context is not None:
+                context.close()
+
+    def _spawn_executor(self, page: Page) -> 'BaseExecutor':
+        """为并行变体创建绑定到新页面的执行器，继承当前执行器的配置"""
+        executor = type(self)(page, self.pages_dict, locations_path=self.locations_path, locator_files=self.locator_files)
+        executor.configure_smart_wait(self.enable_smart_wait, self.smart_wait_timeout, self.smart_wait_interval,
+                                      self.smart_wait_mode, self.smart_wait_quiet_window)
+        executor.configure_request_tracking(**self.get_request_tracking_config())
+        executor.configure_wait_audit(self.enable_wait_audit)
+        executor._current_case = self._current_case
+        executor.metrics_store = self.metrics_store
+        executor.allure_mode = self.allure_mode
+        # 共用截图写入任务，用例结束时统一等待
+        executor.screenshot_pipeline = self.screenshot_pipeline
+        executor.screenshot_format = self.screenshot_format
+        executor.screenshot_quality = self.screenshot_quality
+        # 共用结果文件
+        executor.result_sink = self.result_sink
+        executor.compact_results = self.compact_results
+        return executor
 
-    def _execute_multiple_test_cases(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _execute_variants_in_parallel(self, test_cases: Iterable[VariantPlan], start_url: Optional[str] = None) -> List[CaseResult]:
         """
-        执行多个测试用例（数据驱动测试）
+        在多个浏览器上下文中并发执行变体
+        变体通过有界队列分发给工作线程，数据源驱动的变体边读取边执行，不预先读取全部行
         
         Args:
-            test_cases: 测试用例列表
+            test_cases: 已编译的测试用例变体列表，或按数据源逐条生成的 VariantStream
+            start_url: 新页面先打开的URL（从检查点执行）
             
         Returns:
-            包含执行结果的字典
+            按原顺序排列的测试用例结果列表
         """
-        all_success = True
-        test_case_results = []
-        error_messages = []
-        
-        for i, case_data in enumerate(test_cases):
-            case_name = case_data['case_name']
-            case_steps = case_data['steps']
-            input_value = case_data.get('input_value', '')
-            
-            # 设置当前输入值，供截图等方法使用
-            self.current_input_value = str(input_value) if input_value else "default"
-            
-            self.logger.info(f"执行第 {i+1}/{len(test_cases)} 个测试用例，输入值: {input_value}")
-            
-            # 为每个测试用例添加Allure步骤
-            step_description = f"执行测试用例 {i+1}/{len(test_cases)} (输入值: {input_value})"
-            
-            @allure.step(step_description)
-            def execute_single_case():
+        total = variant_count(test_cases)
+        workers = self.parallel_workers if total is None else min(self.parallel_workers, total)
+        browser_name = self._get_browser_name()
+        context_options = self._variant_context_options(self.page.context.storage_state())
+
+        jobs = queue.Queue(maxsize=workers * 2)
+        # 按序号记录结果；variants 只保留用例名和输入值，用于补全未返回结果的变体
+        variants: List[tuple] = []
+        results: Dict[int, CaseResult] = {}
+        screenshot_files: Dict[int, Dict[Any, str]] = {}
+        reports: Dict[int, AllureBuffer] = {}
+
+        self.logger.info("并行执行 {} 个测试用例，工作线程数: {}，浏览器: {}",
+                         total if total is not None else '数据源中的', workers, browser_name)
+        threads = [
+            threading.Thread(
+                target=self._parallel_worker,
+                args=(jobs, total, results, screenshot_files, reports, browser_name, context_options, start_url),
+                name=f"variant-worker-{n}",
+                daemon=True,
+            )
+            for n in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        workers_alive = True
+        try:
+            for index, variant in enumerate(test_cases):
+                variants.append((variant.case_name, variant.input_value))
+                # 工作线程全部退出后继续读取剩余变体，合并时记为失败，不从结果中丢失
+                if workers_alive and not self._put_job(jobs, (index, variant), threads):
+                    workers_alive = False
+                    self.logger.error("并行工作线程已全部退出，剩余变体不再执行，记为失败")
+        finally:
+            # 读取数据源出错时也要让工作线程退出并关闭浏览器
+            for _ in threads:
+                self._put_job(jobs, None, threads)
+            for thread in threads:
+                thread.join()
+
+        # 按原顺序合并结果、截图记录与 deferred 模式的Allure步骤
+        merged = []
+        for index, (case_name, input_value) in enumerate(variants):
+            self._adopt_variant_output(screenshot_files.get(index, {}), reports.get(index))
+            result = results.get(index)
+            if result is None:
+                result = self._finish_case(CaseResult.failed(case_name, input_value, '未返回测试用例结果'))
+            merged.append(result)
+        return merged
+
+    @staticmethod
+    def _put_job(jobs: queue.Queue, job: Any, threads: List[threading.Thread]) -> bool:
+        """放入任务，队列已满时等待；工作线程全部退出（如浏览器启动失败）时返回False"""
+        while True:
+            try:
+                jobs.put(job, timeout=1)
+                return True
+            except queue.Full:
+                if not any(thread.is_alive() for thread in threads):
+                    return False
+
+    def _parallel_worker(self, jobs: queue.Queue, total: Optional[int], results: dict, screenshot_files: dict,
+                         reports: dict, browser_name: str, context_options: Dict[str, Any],
+                         start_url: Optional[str] = None) -> None:
+        """并行工作线程：启动独立的浏览器，为每个变体创建新的上下文执行，取到None时退出"""
+        from playwright.sync_api import sync_playwright
+
+        try:
+            with sync_playwright() as playwright:
+                browser = getattr(playwright, browser_name).launch(**self.parallel_launch_options)
                 try:
-                    # 执行当前测试用例的步骤
-                    case_result = self._execute_steps_with_details(case_steps)
-                    return case_result
-                except Exception as e:
-                    error_msg = f"测试用例 {case_name} (输入值: {input_value}) 执行异常: {e}"
-                    self.logger.error(error_msg)
-                    return {
-                        'test_cases': [{
-                            'case_name': case_name,
-                            'input_value': input_value,
-                            'success': False,
-                            'steps': [],
-                            'error_message': error_msg,
-                            'duration_ms': 0
-                        }],
-                        'error_message': error_msg
-                    }
-            
-            # 执行当前测试用例
-            case_result = execute_single_case()
-            
-            # 更新测试用例信息
-            if case_result['test_cases']:
-                test_case_result = case_result['test_cases'][0]
-                test_case_result['case_name'] = case_name
-                test_case_result['input_value'] = input_value
-                
-                if not test_case_result['success']:
-                    all_success = False
-                    error_messages.append(f"测试用例 {case_name} (输入值: {input_value}): {test_case_result['error_message']}")
-                
-                test_case_results.append(test_case_result)
-            else:
-                # 如果没有返回测试用例结果，创建一个失败的结果
-                failed_result = {
-                    'case_name': case_name,
-                    'input_value': input_value,
-                    'success': False,
-                    'steps': [],
-                    'error_message': '未返回测试用例结果',
-                    'duration_ms': 0
-                }
-                test_case_results.append(failed_result)
-                all_success = False
-                error_messages.append(f"测试用例 {case_name} (输入值: {input_value}): 未返回测试用例结果")
-        
-        return {
-            'test_cases': test_case_results,
-            'error_message': '; '.join(error_messages) if error_messages else ''
-        }
+                    while True:
+                        job = jobs.get()
+                        if job is None:
+                            break
+                        index, variant = job
+                        context = browser.new_context(**context_options)
+                        try:
+                            page = context.new_page()
+                            if start_url:
+                                page.goto(start_url)
+                            executor = self._spawn_executor(page)
+                            results[index] = executor._execute_variant(index, total, variant)
+                            screenshot_files[index] = executor.screenshot_files
+                            reports[index] = executor.report_buffer.take()
+                        except Exception as e:
+                            results[index] = self._variant_failed(variant, e)
+                        finally:
+                            context.close()
+                finally:
+                    browser.close()
+        except Exception as e:
+            self.logger.error(f"并行工作线程异常: {e}")
 
     def _execute_action(self, action: Dict[str, Any], step_name: str, action_index: int) -> bool:
         """
@@ -905,14 +1838,8 @@ class BaseExecutor:
             执行结果
         """
         try:
-            action_type = action.get('action', '')
-            target = action.get('target', '')
-            value = action.get('value', '')
-            expected = action.get('expected', '')
-            description = action.get('description', '')
-            timeout = action.get('timeout', 30000)
-            
-            self.logger.info(f"  执行操作 {action_index}: {action_type} - {description}")
+            action_type, target, value, expected, description, timeout = self._parse_action(action)
+            self._step_log("  执行操作 {}: {} - {}", action_index, action_type, description)
             
             # 判断是操作还是断言
             if action_type.startswith('assert'):
@@ -923,6 +1850,12 @@ class BaseExecutor:
         except Exception as e:
             self.logger.error(f"执行操作失败: {e}")
             return False
+
+    @staticmethod
+    def _parse_action(action: Dict[str, Any]) -> Tuple[str, str, Any, Any, str, int]:
+        """旧格式操作字典的 (action, target, value, expected, description, timeout)，timeout 默认30秒"""
+        return (action.get('action', ''), action.get('target', ''), action.get('value', ''),
+                action.get('expected', ''), action.get('description', ''), action.get('timeout', 30000))
     
     def _execute_operation(self, action_type: str, target: str, value: Any, timeout: int, description: str) -> bool:
         """
@@ -1093,7 +2026,9 @@ class BaseExecutor:
     
     def _handle_take_screenshot(self, target: str, value: str, timeout: int, description: str):
         """处理截图操作"""
-        self.base_page.take_screenshot(value)
+        image_format = resolve_image_format(value)
+        image = self.base_page.capture_screenshot(image_type=capture_options(image_format, None)[0])
+        self.screenshot_pipeline.submit(value, image, image_format)
     
     def _handle_execute_script(self, target: str, value: str, timeout: int, description: str):
         """处理执行脚本操作"""
@@ -1110,7 +2045,7 @@ class BaseExecutor:
     def _handle_get_dialog_text(self, target: str, value: Any, timeout: int, description: str):
         """处理获取对话框文本操作"""
         text = self.base_page.get_dialog_text()
-        self.logger.info(f"获取对话框文本: {text}")
+        self._step_log("获取对话框文本: {}", text)
         if value:
             Assertion.assert_equal(text, value, description)
     
@@ -1118,47 +2053,47 @@ class BaseExecutor:
     def _handle_get_text(self, target: str, value: Any, timeout: int, description: str):
         """处理获取文本操作"""
         text = self.base_page.get_text(target)
-        self.logger.info(f"获取文本 - 选择器: {target}, 文本: {text}")
+        self._step_log("获取文本 - 选择器: {}, 文本: {}", target, text)
         if value:
             Assertion.assert_equal(text, value, description)
     
     def _handle_get_attribute(self, target: str, value: str, timeout: int, description: str):
         """处理获取属性操作"""
         attribute = self.base_page.get_attribute(target, value)
-        self.logger.info(f"获取属性 - 选择器: {target}, 属性: {attribute}")
+        self._step_log("获取属性 - 选择器: {}, 属性: {}", target, attribute)
         if value:
             Assertion.assert_equal(attribute, value, description)
     
     def _handle_get_value(self, target: str, value: Any, timeout: int, description: str):
         """处理获取值操作"""
         actual_value = self.base_page.get_value(target)
-        self.logger.info(f"获取值 - 选择器: {target}, 值: {actual_value}")
+        self._step_log("获取值 - 选择器: {}, 值: {}", target, actual_value)
         if value:
             Assertion.assert_equal(actual_value, value, description)
     
     def _handle_is_visible(self, target: str, value: Any, timeout: int, description: str):
         """处理断言元素可见操作"""
         actual = self.base_page.is_visible(target)
-        self.logger.info(f"断言元素可见 - 选择器: {target}, 实际: {actual}")
+        self._step_log("断言元素可见 - 选择器: {}, 实际: {}", target, actual)
         Assertion.assert_true(actual, description)
     
     def _handle_is_enabled(self, target: str, value: Any, timeout: int, description: str):
         """处理断言元素启用操作"""
         actual = self.base_page.is_enabled(target)
-        self.logger.info(f"断言元素启用 - 选择器: {target}, 实际: {actual}")
+        self._step_log("断言元素启用 - 选择器: {}, 实际: {}", target, actual)
         Assertion.assert_true(actual, description)
     
     def _handle_get_page_title(self, target: str, value: Any, timeout: int, description: str):
         """处理获取页面标题操作"""
         title = self.base_page.get_page_title()
-        self.logger.info(f"获取页面标题: {title}")
+        self._step_log("获取页面标题: {}", title)
         if value:
             Assertion.assert_equal(title, value, description)
     
     def _handle_get_current_url(self, target: str, value: Any, timeout: int, description: str):
         """处理获取当前URL操作"""
         url = self.base_page.get_current_url()
-        self.logger.info(f"获取当前URL: {url}")
+        self._step_log("获取当前URL: {}", url)
         if value:
             Assertion.assert_equal(url, value, description)
     
@@ -1277,22 +2212,25 @@ class BaseExecutor:
         如果未明确给出属性名，则默认断言 class 属性包含 value
         """
         locator = self.page.locator(target)
-        # 允许 expected/value 互换写法；若未提供属性名，默认 'class'
-        # 情况1：expected 是属性名，value 是子串
-        # 情况2：expected 为空，value 是子串（默认 class）
-        # 情况3：expected 是子串（误放到 expected），value 为空（默认 class）
-        if expected and value:
-            attribute_name = str(expected)
-            substring = str(value)
-        elif expected and not value:
-            attribute_name = 'class'
-            substring = str(expected)
-        else:
-            attribute_name = 'class'
-            substring = str(value) if value is not None else ''
+        attribute_name, substring = self._attribute_assertion_args(expected, value)
         self.page_assertion.assert_element_attribute_contains(locator, attribute_name, substring, description, timeout)
+
+    @staticmethod
+    def _attribute_assertion_args(expected: Any, value: Any) -> Tuple[str, str]:
+        """
+        断言属性包含的 (属性名, 子串)
+        允许 expected/value 互换写法；若未提供属性名，默认 'class'
+        情况1：expected 是属性名，value 是子串
+        情况2：expected 为空，value 是子串（默认 class）
+        情况3：expected 是子串（误放到 expected），value 为空（默认 class）
+        """
+        if expected and value:
+            return str(expected), str(value)
+        if expected and not value:
+            return 'class', str(expected)
+        return 'class', str(value) if value is not None else ''
     
-    def execute_all_test_cases(self, yaml_file_path: str) -> Dict[str, Any]:
+    def execute_all_test_cases(self, yaml_file_path: str) -> Dict[str, RunResult]:
         """
         执行YAML文件中的所有测试用例
         
@@ -1300,21 +2238,17 @@ class BaseExecutor:
             yaml_file_path: YAML文件路径
             
         Returns:
-            测试结果字典，键为测试用例名，值为执行结果字典
+            测试结果字典，键为测试用例名，值为执行结果 RunResult
         """
         try:
             test_data = self.load_test_case(yaml_file_path)
             results = {}
             
             for test_case_name in test_data.keys():
-                self.logger.info(f"开始执行测试用例: {test_case_name}")
+                self.logger.info("开始执行测试用例: {}", test_case_name)
                 result = self.execute_test_case(test_case_name, test_data)
                 results[test_case_name] = result
-                
-                if result['success']:
-                    self.logger.info(f"测试用例 {test_case_name} 执行成功")
-                else:
-                    self.logger.error(f"测试用例 {test_case_name} 执行失败: {result.get('error_message', '')}")
+                self._log_case_outcome(test_case_name, result)
             
             return results
             
@@ -1322,6 +2256,13 @@ class BaseExecutor:
             self.logger.error(f"执行所有测试用例失败: {e}")
             return {}
 
+    def _log_case_outcome(self, test_case_name: str, result: RunResult) -> None:
+        """记录 execute_all_test_cases 中每个用例的执行结果"""
+        if result.success:
+            self.logger.info("测试用例 {} 执行成功", test_case_name)
+        else:
+            self.logger.error(f"测试用例 {test_case_name} 执行失败: {result.error_message}")
+
     @staticmethod
     def resolve_selector(locations_dict: dict, path: str) -> str:
         """
@@ -1333,7 +2274,7 @@ class BaseExecutor:
             node = node[key]
         return node
 
-    def _execute_steps_with_details(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _execute_steps_with_details(self, steps: List[Dict[str, Any]]) -> RunResult:
         """
         执行步骤列表并返回详细信息
         
@@ -1341,168 +2282,94 @@ class BaseExecutor:
             steps: 步骤列表
             
         Returns:
-            包含执行结果的字典
+            执行结果，test_cases 中只有一个测试用例
+        """
+        return RunResult.from_case(self._execute_compiled_steps(self._compile_steps(steps)))
+
+    def _execute_compiled_steps(self, steps: tuple, case_name: str = 'single_case', input_value: Any = '') -> CaseResult:
+        """
+        执行已编译的步骤并返回详细信息
+        
+        Args:
+            steps: CompiledStep 元组
+            case_name: 测试用例名称
+            input_value: 数据驱动输入值
+            
+        Returns:
+            测试用例结果，步骤失败时停止执行
         """
         start_time = time.time()
-        test_case_result = {
-            'case_name': 'single_case',
-            'input_value': '',
-            'success': True,
-            'steps': [],
-            'error_message': '',
-            'duration_ms': 0
-        }
+        test_case_result = CaseResult(case_name, input_value)
         
-        for i, step in enumerate(steps, 1):
+        for index, step in enumerate(steps):
             step_start_time = time.time()
-            step_result = {
-                'step_num': i,
-                'action': '',
-                'selector': '',
-                'value': None,
-                'expected': None,
-                'success': False,
-                'error_message': '',
-                'duration_ms': 0
-            }
-            
-            try:
-                if not isinstance(step, dict):
-                    step_result['error_message'] = f"步骤格式错误: {step}"
-                    test_case_result['steps'].append(step_result)
-                    test_case_result['success'] = False
-                    test_case_result['error_message'] = step_result['error_message']
-                    break
-                
-                # 兼容 input: xxx + value: yyy 这种格式
-                if len(step) > 1:
-                    action = list(step.keys())[0]
-                    params = {k: v for k, v in step.items()}
-                else:
-                    action, params = list(step.items())[0]
-
-                # 处理参数 - 修复wait步骤的参数解析
-                if isinstance(params, dict):
-                    # 对于input操作，优先从selector字段获取元素路径
-                    if action == 'input':
-                        element_path = params.get('selector') or params.get('element') or params.get('target') or params.get('locator')
-                    elif action == 'assert':
-                        # 对于断言操作，从selector字段获取元素路径
-                        element_path = params.get('selector') or params.get('element') or params.get('target') or params.get('locator')
-                    else:
-                        element_path = params.get(action) or params.get('element') or params.get('target') or params.get('locator')
-                    value = params.get('value')
-                    expected = params.get('expected')
-                else:
-                    # 对于非字典参数（如 wait: 1000）
-                    if action == 'wait':
-                        # wait步骤特殊处理：params就是等待时间
-                        element_path = None
-                        value = params
-                        expected = None
-                    else:
-                        element_path = params
-                        value = step.get('value')
-                        expected = step.get('expected')
-                
-                # 设置步骤结果基本信息
-                step_result['action'] = action
-                step_result['value'] = value
-                step_result['expected'] = expected
-                
-                # 调试日志
-                self.logger.debug(f"步骤 {i}: action={action}, element_path={element_path}, value={value}")
-                
-                # 判断是否为元素路径
-                def is_element_path(path: str) -> bool:
-                    return isinstance(path, str) and 'Path' in path
-
-                selector = None
-                if element_path and is_element_path(element_path):
-                    try:
-                        self.logger.info(f"步骤 {i}: 解析Path路径: {element_path}")
-                        t1 = re.search(r'Path\((.*?)\)', element_path)
-                        tmp_path = t1.group(1) if t1 else None
-                        self.logger.info(f"步骤 {i}: 提取的路径: {tmp_path}")
-                        
-                        # 支持 .f(...) 形式动态传参
-                        t2 = re.search(r'\.f\((.*?)\)', element_path)
-                        tmp_value = t2.group(1) if t2 else None
-                        if tmp_value:
-                            self.logger.info(f"步骤 {i}: 动态参数: {tmp_value}")
-
-                        selector = self.resolve_selector(self.locations_dict, tmp_path)
-                        self.logger.info(f"步骤 {i}: 解析后的selector: {selector}")
-                        
-                        if tmp_value is not None:
-                            selector = selector.format(tmp_value)
-                            self.logger.info(f"步骤 {i}: 格式化后的selector: {selector}")
-                    except Exception as e:
-                        step_result['error_message'] = f"元素路径解析失败: {element_path}, 错误: {e}"
-                        step_result['duration_ms'] = (time.time() - step_start_time) * 1000
-                        test_case_result['steps'].append(step_result)
-                        test_case_result['success'] = False
-                        test_case_result['error_message'] = step_result['error_message']
-                        break
-                elif element_path:
-                    # 对于非Path格式的元素路径，直接使用
-                    selector = element_path
-                    self.logger.info(f"步骤 {i}: 直接使用element_path作为selector: {selector}")
-                else:
-                    self.logger.warning(f"步骤 {i}: element_path为空，action={action}")
-                
-                step_result['selector'] = selector
-                self.logger.info(f"步骤 {i}: 最终selector: {selector}")
-                
-                # 检查selector是否为空
-                if action in ['click', 'hover', 'input', 'clear_and_input', 'select', 'select_option_by_label', 'check', 'uncheck', 'upload', 'double_click', 'right_click', 'wait_for_element', 'wait_for_element_hidden', 'scroll_to_element', 'execute_script', 'get_text', 'get_attribute', 'get_value', 'is_visible', 'is_enabled', 'assert'] and not selector:
-                    step_result['error_message'] = f"步骤 {i}: {action} 操作的selector为空，element_path={element_path}"
-                    step_result['duration_ms'] = (time.time() - step_start_time) * 1000
-                    test_case_result['steps'].append(step_result)
-                    test_case_result['success'] = False
-                    test_case_result['error_message'] = step_result['error_message']
-                    break
-                
-                # 使用allure.step装饰器记录每个步骤
-                step_description = self._get_step_description(action, selector, value, expected, i)
-                
-                @allure.step(step_description)
-                def execute_single_step():
-                    return self._execute_single_step(action, selector, value, expected, i)
-                
-                # 执行步骤
-                if execute_single_step():
-                    step_result['success'] = True
-                else:
-                    step_result['error_message'] = f"步骤 {i} 执行失败"
-                    test_case_result['success'] = False
-                    test_case_result['error_message'] = step_result['error_message']
-                
-            except Exception as e:
-                step_result['error_message'] = f"步骤 {i} 执行异常: {e}"
-                test_case_result['success'] = False
-                test_case_result['error_message'] = step_result['error_message']
-            
-            # 计算步骤执行时长
-            step_result['duration_ms'] = (time.time() - step_start_time) * 1000
-            test_case_result['steps'].append(step_result)
+            step_result = self._start_step(steps, index)
+
+            # 编译期已发现的错误（格式错误、路径解析失败、selector为空）
+            if not step.error:
+                try:
+                    # 使用allure.step记录每个步骤
+                    with self._report_step(step.description) as report, \
+                            trace_span(step.action, 'step', step_num=step.step_num, selector=step.selector):
+                        if self._run_compiled_step(step):
+                            step_result.success = True
+                        else:
+                            step_result.error_message = self._step_error(step.step_num)
+                            if report is not None:
+                                report.fail(step_result.error_message)
+                except Exception as e:
+                    step_result.error_message = self._step_error(step.step_num, e)
             
             # 如果步骤失败，停止执行
-            if not step_result['success']:
+            if not self._end_step(test_case_result, step_result, step_start_time):
                 break
         
         # 计算总执行时长
-        test_case_result['duration_ms'] = (time.time() - start_time) * 1000
-        
-        return {
-            'test_cases': [test_case_result],
-            'error_message': test_case_result['error_message']
-        }
+        test_case_result.duration_ms = (time.time() - start_time) * 1000
+        return test_case_result
+
+    def _start_step(self, steps: tuple, index: int) -> StepResult:
+        """
+        开始执行第 index 个已编译步骤
+
+        Returns:
+            该步骤的结果，编译期已发现的错误记录在 error_message 中
+        """
+        step = steps[index]
+        if self.enable_wait_audit:
+            # 审计静态等待时需要知道下一步骤的目标元素
+            self._audit_step = step
+            self._audit_next_step = steps[index + 1] if index + 1 < len(steps) else None
+        return StepResult(step.step_num, step.action, step.selector, step.value, step.expected, error_message=step.error)
+
+    @staticmethod
+    def _step_error(step_num: int, error: Optional[Exception] = None) -> str:
+        """步骤执行失败（处理器返回False、不支持的动作）或抛出异常时的错误信息"""
+        return f"步骤 {step_num} 执行异常: {error}" if error is not None else f"步骤 {step_num} 执行失败"
+
+    def _end_step(self, test_case_result: CaseResult, step_result: StepResult, step_start_time: float) -> bool:
+        """
+        记录步骤执行时长和结果，步骤失败时错误信息记入用例结果
+
+        Returns:
+            是否继续执行后续步骤
+        """
+        step_result.duration_ms = (time.time() - step_start_time) * 1000
+        test_case_result.steps.append(step_result)
+        self._sink_step(step_result)
+        if not step_result.success:
+            test_case_result.success = False
+            test_case_result.error_message = step_result.error_message
+            return False
+        return True
 
     def _wait_for_element_content_stable(self, selector: str, expected_content: str = None, timeout: int = None, check_interval: float = None) -> bool:
         """
         智能等待元素内容稳定
         
+        mutation模式下在页面内挂载 MutationObserver，子树静默 smart_wait_quiet_window 毫秒或出现期望内容即返回；
+        选择器无法在页面内解析（如 text=、>> 链式）或页面禁止脚本执行时回退为轮询
+        
         Args:
             selector: 元素选择器
             expected_content: 期望的内容（可选，如果提供则等待内容匹配）
@@ -1518,13 +2385,29 @@ class BaseExecutor:
             
         timeout = timeout or self.smart_wait_timeout
         check_interval = check_interval or self.smart_wait_interval
-        
+
+        if self.smart_wait_mode == 'mutation':
+            self._step_log("开始等待元素内容稳定(mutation): {}, 超时: {}ms, 静默窗口: {}ms", selector, timeout, self.smart_wait_quiet_window)
+            try:
+                stable = self.base_page.wait_for_content_stable(selector, expected_content, self.smart_wait_quiet_window, timeout)
+            except Exception as e:
+                self.logger.warning(f"MutationObserver等待不可用，回退为轮询: {e}")
+            else:
+                if not stable:
+                    self.logger.warning(f"等待元素内容稳定超时: {selector}")
+                return stable
+
+        with trace_span('content_stable_poll', 'smart_wait'):
+            return self._poll_element_content_stable(selector, expected_content, timeout, check_interval)
+
+    def _poll_element_content_stable(self, selector: str, expected_content: Optional[str], timeout: int, check_interval: float) -> bool:
+        """轮询 get_text，连续两次内容相同视为稳定"""
         start_time = time.time()
         last_content = None
         stable_count = 0
         required_stable_count = 2  # 需要连续2次内容相同才认为稳定
         
-        self.logger.info(f"开始等待元素内容稳定: {selector}, 超时: {timeout}ms, 检查间隔: {check_interval}s")
+        self._step_log("开始等待元素内容稳定: {}, 超时: {}ms, 检查间隔: {}s", selector, timeout, check_interval)
         
         while (time.time() - start_time) * 1000 < timeout:
             try:
@@ -1532,14 +2415,14 @@ class BaseExecutor:
                 
                 # 如果提供了期望内容，检查是否匹配
                 if expected_content and expected_content in current_content:
-                    self.logger.info(f"元素内容已匹配期望值: {expected_content}")
+                    self._step_log("元素内容已匹配期望值: {}", expected_content)
                     return True
                 
                 # 检查内容是否稳定（连续两次相同）
                 if current_content == last_content:
                     stable_count += 1
                     if stable_count >= required_stable_count:
-                        self.logger.info(f"元素内容已稳定: {current_content}")
+                        self._step_log("元素内容已稳定: {}", current_content)
                         return True
                 else:
                     stable_count = 0
@@ -1554,26 +2437,39 @@ class BaseExecutor:
         self.logger.warning(f"等待元素内容稳定超时: {selector}")
         return False
 
-    def configure_smart_wait(self, enable: bool = None, timeout: int = None, interval: float = None) -> None:
+    def configure_smart_wait(self, enable: bool = None, timeout: int = None, interval: float = None,
+                             mode: str = None, quiet_window: int = None) -> None:
         """
         配置智能等待参数
         
         Args:
             enable: 是否启用智能等待
             timeout: 超时时间（毫秒）
-            interval: 检查间隔（秒）
+            interval: 检查间隔（秒），poll模式使用
+            mode: 'mutation'（默认，页面内MutationObserver）或 'poll'（轮询get_text）
+            quiet_window: mutation模式下元素子树静默多久视为稳定（毫秒）
         """
         if enable is not None:
             self.enable_smart_wait = enable
-            self.logger.info(f"智能等待已{'启用' if enable else '禁用'}")
+            self.logger.info("智能等待已{}", '启用' if enable else '禁用')
         
         if timeout is not None:
             self.smart_wait_timeout = timeout
-            self.logger.info(f"智能等待超时时间设置为: {timeout}ms")
+            self.logger.info("智能等待超时时间设置为: {}ms", timeout)
         
         if interval is not None:
             self.smart_wait_interval = interval
-            self.logger.info(f"智能等待检查间隔设置为: {interval}s")
+            self.logger.info("智能等待检查间隔设置为: {}s", interval)
+
+        if mode is not None:
+            if mode not in ('mutation', 'poll'):
+                raise ValueError(f"不支持的智能等待模式: {mode}")
+            self.smart_wait_mode = mode
+            self.logger.info("智能等待模式设置为: {}", mode)
+
+        if quiet_window is not None:
+            self.smart_wait_quiet_window = quiet_window
+            self.logger.info("智能等待静默窗口设置为: {}ms", quiet_window)
     
     def get_smart_wait_config(self) -> dict:
         """
@@ -1585,6 +2481,8 @@ class BaseExecutor:
         return {
             'enable_smart_wait': self.enable_smart_wait,
             'smart_wait_timeout': self.smart_wait_timeout,
-            'smart_wait_interval': self.smart_wait_interval
+            'smart_wait_interval': self.smart_wait_interval,
+            'smart_wait_mode': self.smart_wait_mode,
+            'smart_wait_quiet_window': self.smart_wait_quiet_window
         }
 
@@ -3,10 +3,179 @@ BasePage类 - Playwright UI自动化基础页面类
 提供常见的UI自动化通用功能，其他页面可以继承并使用
 """
 
-from playwright.sync_api import Page, expect, TimeoutError
-from typing import Optional, Union, List
+from playwright.sync_api import Error, Page, expect, TimeoutError
+from typing import Callable, Dict, Optional, Union, List, Tuple
 import time
 import logging
+import weakref
+
+
+# 内容稳定等待：首次调用时为目标元素挂载 MutationObserver，之后每次轮询只比较最后一次变更的时间，
+# 子树静默达到 quietMs 或文本包含 expected 时返回，整个等待在页面内完成，只需一次 wait_for_function 往返
+CONTENT_STABLE_SCRIPT = """({selector, xpath, expected, quietMs}) => {
+    const el = xpath
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    if (!el) return false;
+    const key = '__uiContentStable';
+    let state = el[key];
+    if (!state) {
+        state = el[key] = {last: performance.now()};
+        state.observer = new MutationObserver(() => { state.last = performance.now(); });
+        state.observer.observe(el, {childList: true, subtree: true, characterData: true});
+    }
+    const done = (expected && (el.textContent || '').includes(expected)) || performance.now() - state.last >= quietMs;
+    if (done) {
+        state.observer.disconnect();
+        delete el[key];
+    }
+    return done;
+}"""
+
+# 内容稳定等待超时后断开 MutationObserver，避免观察器留在元素上直到页面关闭
+CONTENT_STABLE_CLEANUP_SCRIPT = """({selector, xpath}) => {
+    const el = xpath
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    const state = el && el.__uiContentStable;
+    if (state) {
+        state.observer.disconnect();
+        delete el.__uiContentStable;
+    }
+}"""
+
+# 输入值稳定等待：记录输入框的值和最后一次变化的时间，值保持 quietMs 不变时返回；
+# 不要求与输入内容相同，格式化、掩码输入框改写了值也能及时返回；token 区分每次等待，上次超时遗留的状态不影响本次
+INPUT_SETTLED_SCRIPT = """({selector, xpath, quietMs, token}) => {
+    const el = xpath
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    if (!el) return true;
+    const key = '__uiInputSettled';
+    const now = performance.now();
+    const value = el.value ?? el.textContent;
+    let state = el[key];
+    if (!state || state.token !== token) {
+        state = el[key] = {token, value, since: now};
+    } else if (state.value !== value) {
+        state.value = value;
+        state.since = now;
+    }
+    const done = now - state.since >= quietMs;
+    if (done) delete el[key];
+    return done;
+}"""
+
+# 等待下一帧渲染，页面在后台不渲染时最多等待100毫秒
+NEXT_FRAME_SCRIPT = "() => new Promise(resolve => { requestAnimationFrame(() => resolve()); setTimeout(resolve, 100); })"
+
+# Playwright 专有的选择器语法，页面内无法直接解析
+_ENGINE_PREFIXES = ('text=', 'id=', 'role=', 'data-testid=', 'internal:', 'nth=', 'visible=')
+
+
+def dom_selector(selector: str) -> Optional[Tuple[str, bool]]:
+    """
+    将选择器转换为页面内可直接解析的形式
+
+    Args:
+        selector: Playwright选择器
+
+    Returns:
+        (选择器, 是否为XPath)；Playwright专有语法（text=、>> 链式等）返回None
+    """
+    if '>>' in selector or selector.startswith(_ENGINE_PREFIXES):
+        return None
+    if selector.startswith('xpath='):
+        return selector[len('xpath='):], True
+    if selector.startswith('css='):
+        return selector[len('css='):], False
+    if selector.startswith(('/', '(', './', '..')):
+        return selector, True
+    return selector, False
+
+
+def screenshot_options(image_type: str, quality: Optional[int]) -> Dict[str, object]:
+    """
+    截图参数（BasePage、AsyncBasePage 共用）
+
+    Args:
+        image_type: png 或 jpeg
+        quality: jpeg质量（0-100），png 时忽略
+
+    Returns:
+        page.screenshot / locator.screenshot 的关键字参数
+    """
+    options = {'type': image_type}
+    if quality is not None and image_type == 'jpeg':
+        options['quality'] = quality
+    return options
+
+
+def element_clip(selector: str, box: Optional[Dict[str, float]], clip: Dict[str, float]) -> Dict[str, float]:
+    """
+    元素内的截取区域转换为页面坐标
+
+    Args:
+        selector: 元素选择器（用于错误信息）
+        box: 元素的 bounding_box，不可见时为None
+        clip: 相对于元素左上角的截取区域 {x, y, width, height}，未指定宽高时取元素的宽高
+
+    Returns:
+        页面坐标的截取区域
+
+    Raises:
+        ValueError: 元素不可见
+    """
+    if box is None:
+        raise ValueError(f"元素不可见，无法截图: {selector}")
+    return {
+        'x': box['x'] + clip.get('x', 0),
+        'y': box['y'] + clip.get('y', 0),
+        'width': clip.get('width', box['width']),
+        'height': clip.get('height', box['height']),
+    }
+
+
+# 页面 -> 跳转守卫，navigate_to 跳转后调用（如登录态缓存在跳转到登录页时重新登录，见 utils/login_state.py）
+_NAVIGATION_GUARDS: 'weakref.WeakKeyDictionary[Page, Callable[[Page, str], bool]]' = weakref.WeakKeyDictionary()
+
+
+def register_navigation_guard(page: Page, guard: Callable[[Page, str], bool]) -> None:
+    """
+    为页面注册跳转守卫，同一页面只保留最后注册的守卫
+
+    Args:
+        page: Playwright的Page对象
+        guard: guard(page, url)，navigate_to 跳转到 url 后调用，返回是否重新跳转
+    """
+    _NAVIGATION_GUARDS[page] = guard
+
+
+def get_navigation_guard(page: Page) -> Optional[Callable[[Page, str], bool]]:
+    return _NAVIGATION_GUARDS.get(page)
+
+
+# 页面 -> 页面类注册的事件处理器 [(事件, 处理器)]，页面池归还页面时移除（见 base/PagePool.py）
+_PAGE_LISTENERS: 'weakref.WeakKeyDictionary[Page, List[Tuple[str, Callable]]]' = weakref.WeakKeyDictionary()
+
+
+def add_page_listener(page: Page, event: str, handler: Callable) -> None:
+    """注册事件处理器（page.on）并记录，之后可由 remove_page_listeners 移除"""
+    page.on(event, handler)
+    _PAGE_LISTENERS.setdefault(page, []).append((event, handler))
+
+
+def remove_page_listeners(page: Page) -> int:
+    """
+    移除 add_page_listener 为页面注册的全部事件处理器（如 accept_dialog 的 dialog 处理器）
+
+    Returns:
+        移除的处理器数量
+    """
+    listeners = _PAGE_LISTENERS.pop(page, [])
+    for event, handler in listeners:
+        page.remove_listener(event, handler)
+    return len(listeners)
 
 
 class BasePage:
@@ -31,8 +200,12 @@ class BasePage:
         Args:
             url: 目标URL
         """
-        self.logger.info(f"导航到页面: {url}")
+        self.logger.info("导航到页面: %s", url)
         self.page.goto(url)
+        # 使用缓存登录态的页面跳转到登录页时（登录态失效）重新登录
+        guard = get_navigation_guard(self.page)
+        if guard is not None:
+            guard(self.page, url)
     
     def click(self, selector: str, timeout: int = 30000) -> None:
         """
@@ -42,7 +215,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"点击元素: {selector}")
+        self.logger.info("点击元素: %s", selector)
         self.page.click(selector, timeout=timeout)
     
     def input_text(self, selector: str, text: str, timeout: int = 30000) -> None:
@@ -54,7 +227,7 @@ class BasePage:
             text: 要输入的文本
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"在元素 {selector} 中输入文本: {text}")
+        self.logger.info("在元素 %s 中输入文本: %s", selector, text)
         self.page.fill(selector, text, timeout=timeout)
     
     def clear_and_input(self, selector: str, text: str, timeout: int = 30000) -> None:
@@ -66,7 +239,7 @@ class BasePage:
             text: 要输入的文本
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"清空并输入文本到元素 {selector}: {text}")
+        self.logger.info("清空并输入文本到元素 %s: %s", selector, text)
         self.page.fill(selector, "", timeout=timeout)
         self.page.fill(selector, text, timeout=timeout)
     
@@ -79,7 +252,7 @@ class BasePage:
             value: 要选择的选项值
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"选择下拉框 {selector} 的选项: {value}")
+        self.logger.info("选择下拉框 %s 的选项: %s", selector, value)
         self.page.select_option(selector, value, timeout=timeout)
     
     def select_option_by_label(self, selector: str, label: str, timeout: int = 30000) -> None:
@@ -91,7 +264,7 @@ class BasePage:
             label: 要选择的选项标签
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"通过标签选择下拉框 {selector} 的选项: {label}")
+        self.logger.info("通过标签选择下拉框 %s 的选项: %s", selector, label)
         self.page.select_option(selector, label=label, timeout=timeout)
     
     def check_checkbox(self, selector: str, timeout: int = 30000) -> None:
@@ -102,7 +275,7 @@ class BasePage:
             selector: 复选框选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"勾选复选框: {selector}")
+        self.logger.info("勾选复选框: %s", selector)
         self.page.check(selector, timeout=timeout)
     
     def uncheck_checkbox(self, selector: str, timeout: int = 30000) -> None:
@@ -113,7 +286,7 @@ class BasePage:
             selector: 复选框选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"取消勾选复选框: {selector}")
+        self.logger.info("取消勾选复选框: %s", selector)
         self.page.uncheck(selector, timeout=timeout)
     
     def upload_file(self, selector: str, file_path: str, timeout: int = 30000) -> None:
@@ -125,7 +298,7 @@ class BasePage:
             file_path: 文件路径
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"上传文件到 {selector}: {file_path}")
+        self.logger.info("上传文件到 %s: %s", selector, file_path)
         self.page.set_input_files(selector, file_path, timeout=timeout)
     
     def hover(self, selector: str, timeout: int = 30000) -> None:
@@ -136,7 +309,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"鼠标悬停在元素: {selector}")
+        self.logger.info("鼠标悬停在元素: %s", selector)
         self.page.hover(selector, timeout=timeout)
     
     def double_click(self, selector: str, timeout: int = 30000) -> None:
@@ -147,7 +320,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"双击元素: {selector}")
+        self.logger.info("双击元素: %s", selector)
         self.page.dblclick(selector, timeout=timeout)
     
     def right_click(self, selector: str, timeout: int = 30000) -> None:
@@ -158,7 +331,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"右键点击元素: {selector}")
+        self.logger.info("右键点击元素: %s", selector)
         self.page.click(selector, button="right", timeout=timeout)
     
     # ==================== 等待方法 ====================
@@ -171,7 +344,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"等待元素出现: {selector}")
+        self.logger.info("等待元素出现: %s", selector)
         self.page.wait_for_selector(selector, timeout=timeout)
     
     def wait_for_element_hidden(self, selector: str, timeout: int = 30000) -> None:
@@ -182,7 +355,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"等待元素隐藏: {selector}")
+        self.logger.info("等待元素隐藏: %s", selector)
         self.page.wait_for_selector(selector, state="hidden", timeout=timeout)
     
     def wait_for_load_state(self, state: str = "networkidle", timeout: int = 30000) -> None:
@@ -193,7 +366,7 @@ class BasePage:
             state: 加载状态 ("load", "domcontentloaded", "networkidle")
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"等待页面加载状态: {state}")
+        self.logger.info("等待页面加载状态: %s", state)
         self.page.wait_for_load_state(state, timeout=timeout)
     
     def wait_for_time(self, seconds: float) -> None:
@@ -203,9 +376,99 @@ class BasePage:
         Args:
             seconds: 等待秒数
         """
-        self.logger.info(f"等待 {seconds} 秒")
+        self.logger.info("等待 %s 秒", seconds)
         time.sleep(seconds)
     
+    def wait_for_content_stable(self, selector: str, expected_text: Optional[str] = None, quiet_ms: int = 500,
+                                timeout: int = 10000, polling: int = 50) -> bool:
+        """
+        基于 MutationObserver 等待元素内容稳定
+        
+        Args:
+            selector: 元素选择器（CSS或XPath）
+            expected_text: 期望包含的文本，出现后立即返回
+            quiet_ms: 子树无变更持续多久视为稳定（毫秒）
+            timeout: 超时时间（毫秒）
+            polling: 页面内检查间隔（毫秒）
+            
+        Returns:
+            是否在超时前稳定
+            
+        Raises:
+            ValueError: 选择器无法在页面内解析
+        """
+        target = dom_selector(selector)
+        if target is None:
+            raise ValueError(f"选择器不支持页面内解析: {selector}")
+        try:
+            self.page.wait_for_function(
+                CONTENT_STABLE_SCRIPT,
+                arg={'selector': target[0], 'xpath': target[1], 'expected': expected_text or '', 'quietMs': quiet_ms},
+                timeout=timeout,
+                polling=polling,
+            )
+            return True
+        except TimeoutError:
+            try:
+                self.page.evaluate(CONTENT_STABLE_CLEANUP_SCRIPT, {'selector': target[0], 'xpath': target[1]})
+            except Error:
+                # 页面已跳转或关闭，观察器随原页面释放
+                pass
+            return False
+    
+    def wait_for_input_settled(self, selector: str, quiet_ms: int = 50, timeout: int = 300) -> bool:
+        """
+        等待输入框的值稳定（输入事件处理完成），值在 quiet_ms 内不再变化即返回
+        
+        Args:
+            selector: 元素选择器
+            quiet_ms: 值保持不变的时间（毫秒）
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            是否在超时前稳定；选择器无法在页面内解析时等待下一帧后返回True
+        """
+        target = dom_selector(selector)
+        if target is None:
+            self.wait_for_next_frame()
+            return True
+        try:
+            self.page.wait_for_function(
+                INPUT_SETTLED_SCRIPT,
+                arg={'selector': target[0], 'xpath': target[1], 'quietMs': quiet_ms, 'token': str(time.monotonic_ns())},
+                timeout=timeout,
+                polling=25,
+            )
+            return True
+        except TimeoutError:
+            return False
+    
+    def wait_for_next_frame(self) -> None:
+        """等待浏览器完成下一帧渲染（页面在后台不渲染时最多等待100毫秒）"""
+        self.page.evaluate(NEXT_FRAME_SCRIPT)
+    
+    def wait_until_actionable(self, selector: str, timeout: int) -> Optional[float]:
+        """
+        等待元素可操作（可见且启用）
+        
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            
+        Returns:
+            元素变为可操作所用的毫秒数，超时或无法检测（选择器无效、元素被移除）时返回None
+        """
+        start = time.monotonic()
+        try:
+            element = self.page.wait_for_selector(selector, state="visible", timeout=timeout)
+            while not element.is_enabled():
+                if (time.monotonic() - start) * 1000 >= timeout:
+                    return None
+                self.page.wait_for_timeout(50)
+        except Exception:
+            return None
+        return (time.monotonic() - start) * 1000
+    
     # ==================== 获取元素信息 ====================
     
     def get_text(self, selector: str, timeout: int = 30000) -> str:
@@ -219,7 +482,7 @@ class BasePage:
         Returns:
             元素文本内容
         """
-        self.logger.info(f"获取元素文本: {selector}")
+        self.logger.info("获取元素文本: %s", selector)
         return self.page.text_content(selector, timeout=timeout)
     
     def get_attribute(self, selector: str, attribute: str, timeout: int = 30000) -> Optional[str]:
@@ -234,14 +497,14 @@ class BasePage:
         Returns:
             属性值
         """
-        self.logger.info(f"获取元素 {selector} 的属性 {attribute}")
+        self.logger.info("获取元素 %s 的属性 %s", selector, attribute)
         return self.page.get_attribute(selector, attribute, timeout=timeout)
 
     def get_locator_attribute(self, selector: str, attribute: str, timeout: int = 30000) -> Optional[str]:
         """
         通过 Locator API 获取元素属性值（支持超时）
         """
-        self.logger.info(f"通过Locator获取元素 {selector} 的属性 {attribute}")
+        self.logger.info("通过Locator获取元素 %s 的属性 %s", selector, attribute)
         locator = self.page.locator(selector)
         return locator.get_attribute(attribute, timeout=timeout)
     
@@ -256,7 +519,7 @@ class BasePage:
         Returns:
             输入框的值
         """
-        self.logger.info(f"获取输入框的值: {selector}")
+        self.logger.info("获取输入框的值: %s", selector)
         return self.page.input_value(selector, timeout=timeout)
     
     def is_visible(self, selector: str, timeout: int = 5000) -> bool:
@@ -303,7 +566,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"断言元素可见: {selector}")
+        self.logger.info("断言元素可见: %s", selector)
         expect(self.page.locator(selector)).to_be_visible(timeout=timeout)
     
     def assert_element_hidden(self, selector: str, timeout: int = 30000) -> None:
@@ -314,7 +577,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"断言元素隐藏: {selector}")
+        self.logger.info("断言元素隐藏: %s", selector)
         expect(self.page.locator(selector)).to_be_hidden(timeout=timeout)
     
     def assert_text_contains(self, selector: str, text: str, timeout: int = 30000) -> None:
@@ -326,7 +589,7 @@ class BasePage:
             text: 期望包含的文本
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"断言元素 {selector} 包含文本: {text}")
+        self.logger.info("断言元素 %s 包含文本: %s", selector, text)
         expect(self.page.locator(selector)).to_contain_text(text, timeout=timeout)
     
     def assert_text_equals(self, selector: str, text: str, timeout: int = 30000) -> None:
@@ -338,7 +601,7 @@ class BasePage:
             text: 期望的文本
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"断言元素 {selector} 文本等于: {text}")
+        self.logger.info("断言元素 %s 文本等于: %s", selector, text)
         expect(self.page.locator(selector)).to_have_text(text, timeout=timeout)
     
     def assert_value_equals(self, selector: str, value: str, timeout: int = 30000) -> None:
@@ -350,7 +613,7 @@ class BasePage:
             value: 期望的值
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"断言元素 {selector} 的值等于: {value}")
+        self.logger.info("断言元素 %s 的值等于: %s", selector, value)
         expect(self.page.locator(selector)).to_have_value(value, timeout=timeout)
     
     def assert_url_contains(self, url_part: str) -> None:
@@ -360,7 +623,7 @@ class BasePage:
         Args:
             url_part: URL的一部分
         """
-        self.logger.info(f"断言URL包含: {url_part}")
+        self.logger.info("断言URL包含: %s", url_part)
         expect(self.page).to_have_url(f"**{url_part}**")
     
     def assert_title_contains(self, title_part: str) -> None:
@@ -370,7 +633,7 @@ class BasePage:
         Args:
             title_part: 标题的一部分
         """
-        self.logger.info(f"断言页面标题包含: {title_part}")
+        self.logger.info("断言页面标题包含: %s", title_part)
         expect(self.page).to_have_title(f"**{title_part}**")
     
     # ==================== 键盘操作 ====================
@@ -382,7 +645,7 @@ class BasePage:
         Args:
             key: 按键名称
         """
-        self.logger.info(f"按下按键: {key}")
+        self.logger.info("按下按键: %s", key)
         self.page.keyboard.press(key)
     
     def type_text(self, text: str) -> None:
@@ -392,7 +655,7 @@ class BasePage:
         Args:
             text: 要输入的文本
         """
-        self.logger.info(f"输入文本: {text}")
+        self.logger.info("输入文本: %s", text)
         self.page.keyboard.type(text)
     
     def press_enter(self) -> None:
@@ -424,16 +687,44 @@ class BasePage:
         self.logger.info("前进到下一页")
         self.page.go_forward()
     
-    def take_screenshot(self, path: str) -> None:
+    def take_screenshot(self, path: str) -> bytes:
         """
         截图
         
         Args:
             path: 截图保存路径
+            
+        Returns:
+            截图内容（同时已写入文件）
         """
-        self.logger.info(f"截图保存到: {path}")
-        self.page.screenshot(path=path)
+        self.logger.info("截图保存到: %s", path)
+        return self.page.screenshot(path=path)
     
+    def capture_screenshot(self, selector: str = None, clip: Dict[str, float] = None, full_page: bool = False,
+                           image_type: str = 'png', quality: int = None) -> bytes:
+        """
+        截图并返回图片数据，不写文件
+        
+        Args:
+            selector: 元素选择器，指定时只截取该元素
+            clip: 截取区域 {x, y, width, height}，同时指定selector时坐标相对于元素左上角
+            full_page: 截取整个页面（未指定selector和clip时有效）
+            image_type: png 或 jpeg
+            quality: jpeg质量（0-100）
+            
+        Returns:
+            图片数据
+        """
+        options = screenshot_options(image_type, quality)
+        if selector and clip:
+            clip = element_clip(selector, self.page.locator(selector).bounding_box(), clip)
+            return self.page.screenshot(clip=clip, **options)
+        if selector:
+            return self.page.locator(selector).screenshot(**options)
+        if clip:
+            return self.page.screenshot(clip=clip, **options)
+        return self.page.screenshot(full_page=full_page, **options)
+
     def get_page_title(self) -> str:
         """
         获取页面标题
@@ -462,7 +753,7 @@ class BasePage:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
         """
-        self.logger.info(f"滚动到元素: {selector}")
+        self.logger.info("滚动到元素: %s", selector)
         self.page.locator(selector).scroll_into_view_if_needed(timeout=timeout)
     
     def scroll_to_bottom(self) -> None:
@@ -485,7 +776,7 @@ class BasePage:
         Returns:
             脚本执行结果
         """
-        self.logger.info(f"执行JavaScript脚本: {script}")
+        self.logger.info("执行JavaScript脚本: %s", script)
         return self.page.evaluate(script)
     
     def wait_for_network_idle(self, timeout: int = 30000) -> None:
@@ -501,12 +792,12 @@ class BasePage:
     def accept_dialog(self) -> None:
         """接受对话框"""
         self.logger.info("接受对话框")
-        self.page.on("dialog", lambda dialog: dialog.accept())
+        add_page_listener(self.page, "dialog", lambda dialog: dialog.accept())
     
     def dismiss_dialog(self) -> None:
         """取消对话框"""
         self.logger.info("取消对话框")
-        self.page.on("dialog", lambda dialog: dialog.dismiss())
+        add_page_listener(self.page, "dialog", lambda dialog: dialog.dismiss())
     
     def get_dialog_text(self) -> str:
         """
@@ -516,5 +807,5 @@ class BasePage:
             对话框文本
         """
         dialog_text = []
-        self.page.on("dialog", lambda dialog: dialog_text.append(dialog.message))
+        add_page_listener(self.page, "dialog", lambda dialog: dialog_text.append(dialog.message))
         return dialog_text[0] if dialog_text else ""
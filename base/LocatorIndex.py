@@ -0,0 +1,132 @@
+"""
+LocatorIndex - 进程级定位器索引
+将 页面.模块.元素 形式的定位器文件展平为字典，每个文件在进程内只解析一次，
+文件mtime变化后自动重新加载；支持按名称注册多个定位器文件
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.yaml_loader import safe_load
+
+
+class LocatorIndex:
+    """单个定位器文件的展平索引"""
+
+    def __init__(self, path: str, mtime: float, tree: Dict[str, Any]):
+        """
+        Args:
+            path: 定位器文件绝对路径
+            mtime: 加载时文件的修改时间
+            tree: 定位器文件原始的嵌套字典
+        """
+        self.path = path
+        self.mtime = mtime
+        self.tree = tree or {}
+        self._selectors: Dict[str, Any] = {}
+        # 含 {} 占位符的定位器，预先绑定 str.format 供 .f() 传参使用
+        self._templates: Dict[str, Callable[..., str]] = {}
+        self._flatten(self.tree, '')
+
+    def _flatten(self, node: Dict[str, Any], prefix: str) -> None:
+        for key, value in node.items():
+            full_key = f"{prefix}.{key}" if prefix else str(key)
+            if isinstance(value, dict):
+                self._flatten(value, full_key)
+                continue
+            self._selectors[full_key] = value
+            if isinstance(value, str) and '{' in value:
+                self._templates[full_key] = value.format
+
+    def resolve(self, path: str, *args: Any) -> Any:
+        """
+        解析定位器
+
+        Args:
+            path: '页面.模块.元素' 路径
+            args: .f(...) 传入的动态参数
+
+        Returns:
+            selector
+
+        Raises:
+            KeyError: 路径不存在
+        """
+        selector = self._selectors[path]
+        if not args:
+            return selector
+        template = self._templates.get(path)
+        return template(*args) if template else selector
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._selectors
+
+    def __len__(self) -> int:
+        return len(self._selectors)
+
+
+_INDEXES: Dict[str, LocatorIndex] = {}
+_NAMED_FILES: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def get_locator_index(locations_path: str) -> LocatorIndex:
+    """
+    获取定位器文件的索引，同一进程内按 (路径, mtime) 复用
+
+    Args:
+        locations_path: 定位器文件路径
+
+    Returns:
+        LocatorIndex
+    """
+    abs_path = os.path.abspath(locations_path)
+    mtime = os.path.getmtime(abs_path)
+    index = _INDEXES.get(abs_path)
+    if index is not None and index.mtime == mtime:
+        return index
+
+    with _lock:
+        index = _INDEXES.get(abs_path)
+        if index is None or index.mtime != mtime:
+            with open(abs_path, 'r', encoding='utf-8') as f:
+                tree = safe_load(f)
+            index = LocatorIndex(abs_path, mtime, tree)
+            _INDEXES[abs_path] = index
+    return index
+
+
+def register_locator_file(name: str, locations_path: str) -> None:
+    """
+    注册具名定位器文件，YAML中可通过 Path(名称:页面.模块.元素) 引用
+
+    Args:
+        name: 定位器文件名称
+        locations_path: 定位器文件路径
+    """
+    _NAMED_FILES[name] = os.path.abspath(locations_path)
+
+
+def get_registered_locator_files() -> Dict[str, str]:
+    """获取已注册的具名定位器文件"""
+    return dict(_NAMED_FILES)
+
+
+def split_locator_path(path: str) -> Tuple[Optional[str], str]:
+    """
+    拆分 '名称:页面.模块.元素'
+
+    Returns:
+        (定位器文件名称或None, 页面.模块.元素)
+    """
+    name, sep, rest = path.partition(':')
+    if sep and name and '.' not in name:
+        return name, rest
+    return None, path
+
+
+def clear_locator_indexes() -> None:
+    """清空进程内的定位器索引缓存"""
+    with _lock:
+        _INDEXES.clear()
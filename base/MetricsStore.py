@@ -0,0 +1,300 @@
+"""
+MetricsStore - 步骤耗时历史
+把每次执行的步骤耗时追加到本地 SQLite 数据库，按 运行ID、用例、操作、定位器（Path(...) 中的键，不是展开后的XPath）、浏览器 记录，
+可跨多次运行按操作或定位器统计 p50/p95/p99，在某个定位器或页面整体变慢时及早发现
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from base.StepPlan import FORMAT_PATTERN, PATH_PATTERN, is_element_path
+
+
+# 设置为数据库文件路径时开启记录
+METRICS_DB_ENV = 'UI_METRICS_DB'
+# 指定运行ID，未设置时 xdist 的各worker共用 PYTEST_XDIST_TESTRUNUID，否则每个进程生成一个
+RUN_ID_ENV = 'UI_RUN_ID'
+# 可统计的分组列
+GROUP_COLUMNS = {
+    'action': 'action',
+    'selector': 'selector_key',
+    'case': 'case_name',
+    'browser': 'browser',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS step_metrics (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    worker TEXT,
+    browser TEXT,
+    case_name TEXT,
+    input_value TEXT,
+    step_num INTEGER,
+    action TEXT NOT NULL,
+    selector_key TEXT,
+    success INTEGER NOT NULL,
+    duration_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_step_metrics_run ON step_metrics (run_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_step_metrics_action ON step_metrics (action, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_step_metrics_selector ON step_metrics (selector_key, duration_ms);
+"""
+
+_INSERT = """
+INSERT INTO step_metrics (run_id, recorded_at, worker, browser, case_name, input_value, step_num,
+                          action, selector_key, success, duration_ms)
+VALUES (:run_id, :recorded_at, :worker, :browser, :case_name, :input_value, :step_num,
+        :action, :selector_key, :success, :duration_ms)
+"""
+
+_process_run_id: Optional[str] = None
+
+
+def default_run_id() -> str:
+    """当前运行ID: UI_RUN_ID > PYTEST_XDIST_TESTRUNUID > 进程内生成"""
+    global _process_run_id
+    run_id = os.environ.get(RUN_ID_ENV) or os.environ.get('PYTEST_XDIST_TESTRUNUID')
+    if run_id:
+        return run_id
+    if _process_run_id is None:
+        _process_run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    return _process_run_id
+
+
+def selector_key(element_path: Any, selector: Any = None) -> Optional[str]:
+    """
+    步骤的定位器键
+
+    Path(页面.模块.元素).f(参数) 记为 '页面.模块.元素'（不含参数，同一定位器的不同参数合并统计），
+    直接写的选择器原样记录，没有元素的步骤（wait、navigate 等）为None
+    """
+    if is_element_path(element_path):
+        match = PATH_PATTERN.search(FORMAT_PATTERN.sub('', element_path))
+        if match:
+            return match.group(1)
+    if isinstance(element_path, str) and element_path and selector:
+        return element_path
+    return None
+
+
+class MetricsStore:
+    """步骤耗时数据库，同一进程内线程安全；多个 xdist worker 可写同一个文件（WAL模式）"""
+
+    def __init__(self, db_path: Union[str, Path], run_id: Optional[str] = None):
+        """
+        Args:
+            db_path: 数据库文件路径
+            run_id: 运行ID，为None时使用 default_run_id()
+        """
+        self.db_path = Path(db_path)
+        self.run_id = run_id or default_run_id()
+        self.worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record_steps(self, case_name: str, input_value: Any, steps: Iterable[Dict[str, Any]],
+                     browser: Optional[str] = None) -> int:
+        """
+        追加一个用例（变体）的步骤耗时，一次事务写入
+
+        Args:
+            case_name: 用例名称
+            input_value: 数据驱动输入值
+            steps: 步骤记录，需包含 step_num、action、selector_key、success、duration_ms
+            browser: 浏览器名称（chromium/firefox/webkit）
+
+        Returns:
+            写入的行数
+        """
+        now = time.time()
+        input_value = None if input_value in (None, '') else str(input_value)
+        rows = [
+            {
+                'run_id': self.run_id, 'recorded_at': now, 'worker': self.worker, 'browser': browser,
+                'case_name': case_name, 'input_value': input_value, 'step_num': step.get('step_num'),
+                'action': step['action'], 'selector_key': step.get('selector_key'),
+                'success': 1 if step.get('success') else 0, 'duration_ms': step['duration_ms'],
+            }
+            for step in steps
+        ]
+        if not rows:
+            return 0
+        with self._lock, self.conn:
+            self.conn.executemany(_INSERT, rows)
+        return len(rows)
+
+    def run_ids(self, limit: Optional[int] = None) -> List[str]:
+        """按开始时间倒序排列的运行ID"""
+        sql = 'SELECT run_id FROM step_metrics GROUP BY run_id ORDER BY MIN(recorded_at) DESC'
+        params: Sequence[Any] = ()
+        if limit:
+            sql += ' LIMIT ?'
+            params = (limit,)
+        with self._lock:
+            return [row['run_id'] for row in self.conn.execute(sql, params)]
+
+    def percentiles(self, by: str = 'action', run_ids: Optional[Sequence[str]] = None, last_runs: Optional[int] = None,
+                    action: Optional[str] = None, browser: Optional[str] = None,
+                    success_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        按分组统计耗时分位数（nearest-rank）
+
+        Args:
+            by: 分组方式 action/selector/case/browser
+            run_ids: 只统计这些运行，为None时统计全部（或最近 last_runs 次）
+            last_runs: 只统计最近N次运行
+            action: 只统计该操作（如按定位器统计 click 耗时）
+            browser: 只统计该浏览器
+            success_only: 只统计成功的步骤（失败步骤的耗时多为超时，会拉高分位数）
+
+        Returns:
+            [{'key', 'count', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}]，按 p95 倒序
+        """
+        column = GROUP_COLUMNS.get(by)
+        if column is None:
+            raise ValueError(f"不支持的分组方式: {by}，可选值: {', '.join(GROUP_COLUMNS)}")
+        if run_ids is None and last_runs:
+            run_ids = self.run_ids(last_runs)
+
+        conditions = [f"{column} IS NOT NULL"]
+        params: List[Any] = []
+        if run_ids is not None:
+            if not run_ids:
+                return []
+            conditions.append(f"run_id IN ({', '.join('?' * len(run_ids))})")
+            params.extend(run_ids)
+        if action is not None:
+            conditions.append('action = ?')
+            params.append(action)
+        if browser is not None:
+            conditions.append('browser = ?')
+            params.append(browser)
+        if success_only:
+            conditions.append('success = 1')
+
+        sql = f"""
+            SELECT key, COUNT(*) AS count, AVG(duration_ms) AS avg_ms,
+                   MIN(CASE WHEN rn >= 0.50 * cnt THEN duration_ms END) AS p50_ms,
+                   MIN(CASE WHEN rn >= 0.95 * cnt THEN duration_ms END) AS p95_ms,
+                   MIN(CASE WHEN rn >= 0.99 * cnt THEN duration_ms END) AS p99_ms,
+                   MAX(duration_ms) AS max_ms
+            FROM (
+                SELECT {column} AS key, duration_ms,
+                       ROW_NUMBER() OVER (PARTITION BY {column} ORDER BY duration_ms) AS rn,
+                       COUNT(*) OVER (PARTITION BY {column}) AS cnt
+                FROM step_metrics
+                WHERE {' AND '.join(conditions)}
+            )
+            GROUP BY key
+            ORDER BY p95_ms DESC
+        """
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def regressions(self, run_id: Optional[str] = None, by: str = 'selector', baseline_runs: int = 10,
+                    factor: float = 3.0, min_count: int = 3) -> List[Dict[str, Any]]:
+        """
+        找出本次运行中明显变慢的定位器/操作：本次 p50 超过之前若干次运行 p50 的 factor 倍
+
+        Args:
+            run_id: 要检查的运行，为None时为当前运行
+            by: 分组方式 action/selector/case/browser
+            baseline_runs: 作为基线的之前运行次数
+            factor: 判定为变慢的倍数
+            min_count: 本次与基线的最少样本数，样本太少时不判定
+
+        Returns:
+            [{'key', 'p50_ms', 'baseline_p50_ms', 'ratio'}]，按倍数倒序
+        """
+        run_id = run_id or self.run_id
+        history = self.run_ids()
+        if run_id not in history:
+            return []
+        baseline = history[history.index(run_id) + 1:][:baseline_runs]
+        if not baseline:
+            return []
+
+        current = {row['key']: row for row in self.percentiles(by, run_ids=[run_id]) if row['count'] >= min_count}
+        slower = []
+        for row in self.percentiles(by, run_ids=baseline):
+            now = current.get(row['key'])
+            if now is None or row['count'] < min_count or not row['p50_ms']:
+                continue
+            ratio = now['p50_ms'] / row['p50_ms']
+            if ratio >= factor:
+                slower.append({'key': row['key'], 'p50_ms': now['p50_ms'], 'baseline_p50_ms': row['p50_ms'],
+                               'ratio': round(ratio, 2)})
+        return sorted(slower, key=lambda r: r['ratio'], reverse=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_STORES: Dict[str, MetricsStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_metrics_store(db_path: Optional[Union[str, Path]] = None) -> Optional[MetricsStore]:
+    """
+    获取数据库对应的 MetricsStore，同一文件在进程内只打开一次
+
+    Args:
+        db_path: 数据库文件路径，为None时使用环境变量 UI_METRICS_DB
+
+    Returns:
+        MetricsStore；未指定路径且未设置环境变量时返回None
+    """
+    db_path = db_path or os.environ.get(METRICS_DB_ENV)
+    if not db_path:
+        return None
+    key = os.path.abspath(db_path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = MetricsStore(key)
+        return store
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='步骤耗时统计')
+    parser.add_argument('db', help='数据库文件路径')
+    parser.add_argument('--by', default='action', choices=list(GROUP_COLUMNS))
+    parser.add_argument('--last-runs', type=int, default=None, help='只统计最近N次运行')
+    parser.add_argument('--action', default=None, help='只统计该操作')
+    parser.add_argument('--regressions', action='store_true', help='检查最近一次运行相对之前运行变慢的项')
+    parser.add_argument('--factor', type=float, default=3.0)
+    args = parser.parse_args()
+
+    metrics = MetricsStore(args.db, run_id='-')
+    if args.regressions:
+        runs = metrics.run_ids(1)
+        for item in (metrics.regressions(runs[0], by=args.by, factor=args.factor) if runs else []):
+            print(f"{item['key']}: p50 {item['p50_ms']:.0f}ms, 基线 {item['baseline_p50_ms']:.0f}ms, {item['ratio']}x")
+    else:
+        for item in metrics.percentiles(args.by, last_runs=args.last_runs, action=args.action):
+            print(f"{item['key']}: n={item['count']} p50={item['p50_ms']:.0f}ms "
+                  f"p95={item['p95_ms']:.0f}ms p99={item['p99_ms']:.0f}ms max={item['max_ms']:.0f}ms")
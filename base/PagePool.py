@@ -0,0 +1,169 @@
+"""
+PagePool - 复用浏览器上下文和页面
+每个进程（xdist worker）一个浏览器，预先创建上下文和页面；用例结束后清理存储并打开 about:blank 归还，
+不再每个用例新建/关闭上下文，上下文使用指定次数后关闭重建，避免内存持续增长
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from playwright.sync_api import Browser, BrowserContext, Error, Page
+
+from base.BasePage import remove_page_listeners
+
+
+# 设置为 1/true 时测试夹具从页面池获取页面
+PAGE_POOL_ENV = 'UI_PAGE_POOL'
+# 预先创建的上下文数
+PAGE_POOL_SIZE_ENV = 'UI_PAGE_POOL_SIZE'
+# 上下文使用多少个用例后重建
+PAGE_POOL_RECYCLE_ENV = 'UI_PAGE_POOL_RECYCLE'
+# 设置为 0/false 时归还页面同时清除 cookie 和 localStorage（每个用例重新登录）
+PAGE_POOL_KEEP_LOGIN_ENV = 'UI_PAGE_POOL_KEEP_LOGIN'
+DEFAULT_POOL_SIZE = 1
+DEFAULT_RECYCLE_AFTER = 50
+
+# 清理当前源的存储，about:blank 等页面无法访问存储时忽略
+_CLEAR_STORAGE_JS = """(clearLocal) => {
+    try { sessionStorage.clear(); } catch (e) {}
+    if (clearLocal) { try { localStorage.clear(); } catch (e) {} }
+}"""
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name, '').strip().lower()
+    if not value:
+        return default
+    return value not in ('0', 'false', 'no', 'off')
+
+
+def page_pool_enabled() -> bool:
+    """按环境变量 UI_PAGE_POOL 判断是否使用页面池，默认关闭"""
+    return _env_flag(PAGE_POOL_ENV, False)
+
+
+@dataclass
+class PooledPage:
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+    user: Optional[str] = None  # 已登录的用户，清除登录态后为None
+    created: float = field(default_factory=time.time)
+
+
+class PagePool:
+    """
+    单个浏览器的上下文/页面池，只在一个线程中使用（pytest 夹具）
+
+    acquire 取出预热的页面，release 清理后放回；上下文达到 recycle_after 次使用或用例失败后关闭，
+    并补充新的上下文
+    """
+
+    def __init__(self, browser: Browser, context_options: Optional[Dict[str, Any]] = None, size: Optional[int] = None,
+                 recycle_after: Optional[int] = None, keep_login: Optional[bool] = None,
+                 recycle_on_failure: bool = True, storage_state: Optional[Callable[[], str]] = None):
+        """
+        Args:
+            browser: 浏览器
+            context_options: 传给 browser.new_context 的参数
+            size: 预先创建的上下文数，为None时按环境变量 UI_PAGE_POOL_SIZE（默认1）
+            recycle_after: 上下文使用多少个用例后重建，为None时按环境变量 UI_PAGE_POOL_RECYCLE（默认50）
+            keep_login: 归还时保留 cookie 和 localStorage（登录态），为None时按环境变量 UI_PAGE_POOL_KEEP_LOGIN（默认保留）；
+                        sessionStorage 总是清除
+            recycle_on_failure: 用例失败后不复用该上下文（页面可能停留在弹窗等异常状态）
+            storage_state: 新建上下文时调用，返回 storage_state 文件路径（如 LoginStateCache.storage_state）
+        """
+        self.browser = browser
+        self.context_options = dict(context_options or {})
+        self.size = max(1, size if size is not None else int(os.environ.get(PAGE_POOL_SIZE_ENV) or DEFAULT_POOL_SIZE))
+        self.recycle_after = max(1, recycle_after if recycle_after is not None
+                                 else int(os.environ.get(PAGE_POOL_RECYCLE_ENV) or DEFAULT_RECYCLE_AFTER))
+        self.keep_login = _env_flag(PAGE_POOL_KEEP_LOGIN_ENV, True) if keep_login is None else keep_login
+        self.recycle_on_failure = recycle_on_failure
+        self.storage_state = storage_state
+        self.stats = {'created': 0, 'acquired': 0, 'recycled': 0, 'reset_failed': 0}
+        self._idle: List[PooledPage] = []
+        self._leased: Dict[int, PooledPage] = {}  # id(page) -> PooledPage
+        self.logger = logger.bind(name=self.__class__.__name__)
+
+    def _create(self) -> PooledPage:
+        options = dict(self.context_options)
+        if self.storage_state is not None:
+            options['storage_state'] = self.storage_state()
+        context = self.browser.new_context(**options)
+        entry = PooledPage(context, context.new_page())
+        self.stats['created'] += 1
+        return entry
+
+    def warm(self) -> None:
+        """补充空闲上下文到 size 个"""
+        while len(self._idle) + len(self._leased) < self.size:
+            self._idle.append(self._create())
+
+    def acquire(self) -> PooledPage:
+        """取出一个页面，没有空闲页面时新建"""
+        entry = self._idle.pop() if self._idle else self._create()
+        self._leased[id(entry.page)] = entry
+        self.stats['acquired'] += 1
+        return entry
+
+    def lease_of(self, page: Page) -> Optional[PooledPage]:
+        """页面对应的池条目，不是从页面池取出的页面返回None"""
+        return self._leased.get(id(page))
+
+    def release(self, entry: PooledPage, failed: bool = False) -> None:
+        """
+        归还页面：清理后放回池中，达到使用次数或用例失败时关闭上下文并补充新的上下文
+
+        Args:
+            entry: acquire 返回的条目
+            failed: 用例是否失败
+        """
+        self._leased.pop(id(entry.page), None)
+        entry.uses += 1
+        if entry.uses >= self.recycle_after or (failed and self.recycle_on_failure) or not self._reset(entry):
+            self._close(entry)
+            self.stats['recycled'] += 1
+        else:
+            self._idle.append(entry)
+        self.warm()
+
+    def _reset(self, entry: PooledPage) -> bool:
+        """清理存储、关闭用例中打开的其他页面并回到 about:blank，失败时返回False"""
+        try:
+            if entry.page.is_closed():
+                return False
+            for page in entry.context.pages:
+                if page is not entry.page:
+                    page.close()
+            # 用例中 accept_dialog 等注册的处理器不能带到下一个用例；
+            # RequestTracker 按页面挂载一次的 request 处理器不经 add_page_listener 注册，保留
+            remove_page_listeners(entry.page)
+            if not self.keep_login:
+                entry.context.clear_cookies()
+                entry.user = None
+            if entry.page.url != 'about:blank':
+                entry.page.evaluate(_CLEAR_STORAGE_JS, not self.keep_login)
+            entry.page.goto('about:blank')
+            return True
+        except Error as e:
+            self.stats['reset_failed'] += 1
+            self.logger.warning("页面池清理页面失败，重建上下文: {}", e)
+            return False
+
+    def _close(self, entry: PooledPage) -> None:
+        try:
+            entry.context.close()
+        except Error as e:
+            self.logger.warning("页面池关闭上下文失败: {}", e)
+
+    def close(self) -> None:
+        """关闭池中全部上下文"""
+        for entry in self._idle + list(self._leased.values()):
+            self._close(entry)
+        self._idle.clear()
+        self._leased.clear()
+        self.logger.info("页面池关闭: {}", self.stats)
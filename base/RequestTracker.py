@@ -0,0 +1,211 @@
+"""
+RequestTracker - 页面请求跟踪
+通过 page.on('request'/'requestfinished'/'requestfailed') 统计未完成的 XHR/fetch 请求，
+用于代替 networkidle 等待：只要关心的接口请求全部返回即可继续，不受轮询、websocket 等长连接影响
+"""
+
+import asyncio
+import re
+import time
+import weakref
+from collections import OrderedDict
+from fnmatch import translate
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# 默认只统计的资源类型
+DEFAULT_RESOURCE_TYPES = ('xhr', 'fetch')
+# 请求全部完成后还需保持静默的时间（毫秒），用于覆盖按键/点击后请求尚未发出的间隙
+DEFAULT_IDLE_MS = 100
+# 页面URL到规则的缓存条数上限，超过时淘汰最久未使用的页面
+RULE_CACHE_SIZE = 256
+
+
+class UrlRule:
+    """URL 包含/排除规则，模式为 fnmatch 通配符（如 */api/*）"""
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        self.include = [p for p in (include or []) if p]
+        self.exclude = [p for p in (exclude or []) if p]
+        self._include = self._compile(self.include)
+        self._exclude = self._compile(self.exclude)
+
+    @staticmethod
+    def _compile(patterns: List[str]):
+        if not patterns:
+            return None
+        return re.compile('|'.join(f"(?:{translate(p)})" for p in patterns))
+
+    def matches(self, url: str) -> bool:
+        if self._include is not None and not self._include.match(url):
+            return False
+        return self._exclude is None or not self._exclude.match(url)
+
+
+class RequestTracker:
+    """
+    跟踪单个页面上未完成的请求
+
+    规则按当前页面URL选择: page_rules 中最长的URL前缀优先，未匹配时使用默认规则
+    """
+
+    def __init__(self, page: Any, resource_types: Iterable[str] = DEFAULT_RESOURCE_TYPES,
+                 include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                 page_rules: Optional[Dict[str, Dict[str, List[str]]]] = None, idle_ms: int = DEFAULT_IDLE_MS):
+        """
+        Args:
+            page: Playwright的Page对象
+            resource_types: 统计的资源类型
+            include: 默认包含的URL通配符，为空表示全部包含
+            exclude: 默认排除的URL通配符
+            page_rules: 按页面配置的规则 {页面URL前缀: {'include': [...], 'exclude': [...]}}
+            idle_ms: 请求全部完成后需要保持静默的时间（毫秒）
+        """
+        self.page = page
+        self.resource_types = frozenset(resource_types)
+        self.idle_ms = idle_ms
+        self.total_requests = 0
+        self._pending = set()
+        self._last_activity = time.monotonic()
+        self.configure(include, exclude, page_rules)
+        page.on('request', self._on_request)
+        page.on('requestfinished', self._on_request_done)
+        page.on('requestfailed', self._on_request_done)
+
+    def configure(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                  page_rules: Optional[Dict[str, Dict[str, List[str]]]] = None) -> None:
+        """
+        设置URL规则
+
+        Args:
+            include: 默认包含的URL通配符
+            exclude: 默认排除的URL通配符
+            page_rules: 按页面配置的规则 {页面URL前缀: {'include': [...], 'exclude': [...]}}
+        """
+        self._default_rule = UrlRule(include, exclude)
+        self._page_rules: List[Tuple[str, UrlRule]] = sorted(
+            ((prefix, UrlRule(rule.get('include'), rule.get('exclude'))) for prefix, rule in (page_rules or {}).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        # 前缀中没有查询参数、锚点时，同一路径不同查询参数的页面共用一条缓存
+        self._match_query = any('?' in prefix or '#' in prefix for prefix, _ in self._page_rules)
+        self._rule_cache: 'OrderedDict[str, UrlRule]' = OrderedDict()
+
+    def rule_for(self, page_url: str) -> UrlRule:
+        """获取页面URL对应的规则"""
+        key = page_url if self._match_query else page_url.split('#', 1)[0].split('?', 1)[0]
+        rule = self._rule_cache.get(key)
+        if rule is not None:
+            self._rule_cache.move_to_end(key)
+            return rule
+        rule = next((r for prefix, r in self._page_rules if key.startswith(prefix)), self._default_rule)
+        self._rule_cache[key] = rule
+        if len(self._rule_cache) > RULE_CACHE_SIZE:
+            self._rule_cache.popitem(last=False)
+        return rule
+
+    def _on_request(self, request: Any) -> None:
+        if request.resource_type not in self.resource_types:
+            return
+        if not self.rule_for(self.page.url).matches(request.url):
+            return
+        self._pending.add(request)
+        self.total_requests += 1
+        self._last_activity = time.monotonic()
+
+    def _on_request_done(self, request: Any) -> None:
+        if request in self._pending:
+            self._pending.discard(request)
+            self._last_activity = time.monotonic()
+
+    @property
+    def pending_count(self) -> int:
+        """未完成的请求数"""
+        return len(self._pending)
+
+    def pending_urls(self) -> List[str]:
+        """未完成的请求URL"""
+        return [request.url for request in self._pending]
+
+    def is_idle(self, idle_ms: Optional[int] = None) -> bool:
+        """没有未完成的请求，且距最后一次请求活动已超过 idle_ms"""
+        idle_ms = self.idle_ms if idle_ms is None else idle_ms
+        return not self._pending and (time.monotonic() - self._last_activity) * 1000 >= idle_ms
+
+    def _start_wait(self) -> float:
+        # 静默时间从调用时开始计算，给刚触发的操作留出发出请求的时间
+        now = time.monotonic()
+        self._last_activity = max(self._last_activity, now)
+        return now
+
+    def wait_for_idle(self, timeout: int = 30000, idle_ms: Optional[int] = None, poll_ms: int = 25) -> bool:
+        """
+        等待关心的请求全部完成
+
+        Args:
+            timeout: 超时时间（毫秒）
+            idle_ms: 静默时间（毫秒），为None时使用配置值
+            poll_ms: 检查间隔（毫秒），等待期间由Playwright派发请求事件
+
+        Returns:
+            是否在超时前完成
+        """
+        start = self._start_wait()
+        while not self.is_idle(idle_ms):
+            if (time.monotonic() - start) * 1000 >= timeout:
+                return False
+            self.page.wait_for_timeout(poll_ms)
+        return True
+
+
+class AsyncRequestTracker(RequestTracker):
+    """用于 playwright.async_api 页面的请求跟踪，等待期间让出事件循环"""
+
+    async def wait_for_idle(self, timeout: int = 30000, idle_ms: Optional[int] = None, poll_ms: int = 25) -> bool:
+        """
+        等待关心的请求全部完成
+
+        Args:
+            timeout: 超时时间（毫秒）
+            idle_ms: 静默时间（毫秒），为None时使用配置值
+            poll_ms: 检查间隔（毫秒）
+
+        Returns:
+            是否在超时前完成
+        """
+        start = self._start_wait()
+        while not self.is_idle(idle_ms):
+            if (time.monotonic() - start) * 1000 >= timeout:
+                return False
+            await asyncio.sleep(poll_ms / 1000)
+        return True
+
+
+_TRACKERS: 'weakref.WeakKeyDictionary[Any, RequestTracker]' = weakref.WeakKeyDictionary()
+
+
+def get_request_tracker(page: Any, tracker_class: type = RequestTracker, **options: Any) -> RequestTracker:
+    """
+    获取页面的请求跟踪器，同一页面只挂载一次事件监听
+
+    Args:
+        page: Playwright的Page对象
+        tracker_class: RequestTracker 或 AsyncRequestTracker
+        options: 传给跟踪器的参数（resource_types、include、exclude、page_rules、idle_ms）
+
+    Returns:
+        RequestTracker
+    """
+    tracker = _TRACKERS.get(page)
+    if tracker is None:
+        tracker = tracker_class(page, **options)
+        _TRACKERS[page] = tracker
+        return tracker
+    if 'resource_types' in options:
+        tracker.resource_types = frozenset(options['resource_types'])
+    if 'idle_ms' in options:
+        tracker.idle_ms = options['idle_ms']
+    if any(key in options for key in ('include', 'exclude', 'page_rules')):
+        tracker.configure(options.get('include'), options.get('exclude'), options.get('page_rules'))
+    return tracker
@@ -0,0 +1,151 @@
+"""
+ResultSink - 执行结果流式写入
+每个步骤、每条用例（变体）执行完成时立即追加一行 JSON 到结果文件（JSON Lines），按条数/时间批量 fsync；
+开启后执行器返回的结果只保留精简的摘要，大量数据驱动变体时进程内存不再随步骤数增长，
+进程异常退出时已写入的结果仍然可用
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+# 结果目录，设置为 1/true 时使用项目根目录下的 results；不设置时不写入
+RESULT_SINK_ENV = 'UI_RESULT_SINK'
+# 每写入多少条记录 fsync 一次
+RESULT_FSYNC_EVERY_ENV = 'UI_RESULT_FSYNC_EVERY'
+DEFAULT_FSYNC_EVERY = 200
+# 距上次 fsync 超过多少秒时在下一条记录后 fsync
+DEFAULT_FSYNC_INTERVAL = 1.0
+# pytest-playwright 每个进程开始时会清空 test-results，结果默认写到项目根目录下的 results
+DEFAULT_RESULT_DIR = Path(__file__).parent.parent / 'results'
+
+
+def _default(value: Any) -> str:
+    # 步骤的 value/expected 可能是任意对象（如截图选项中的 Path），按字符串写入
+    return str(value)
+
+
+class ResultSink:
+    """
+    进程内共享的结果文件，可在多个线程中同时写入（并行变体）
+
+    每个进程（xdist worker）写自己的文件，避免多个进程的缓冲写入交错
+    """
+
+    def __init__(self, path: Union[str, Path], fsync_every: Optional[int] = None,
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL):
+        """
+        Args:
+            path: 结果文件路径，打开时清空
+            fsync_every: 每写入多少条记录 fsync 一次，为None时按环境变量 UI_RESULT_FSYNC_EVERY（默认200）
+            fsync_interval: 距上次 fsync 超过该秒数时立即 fsync
+        """
+        self.path = Path(path)
+        self.fsync_every = max(1, fsync_every if fsync_every is not None
+                               else int(os.environ.get(RESULT_FSYNC_EVERY_ENV) or DEFAULT_FSYNC_EVERY))
+        self.fsync_interval = fsync_interval
+        self.stats = {'records': 0, 'fsyncs': 0}
+        self._pending = 0
+        self._last_sync = time.time()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """追加一条记录，达到批量条数或时间间隔时 fsync"""
+        line = json.dumps(record, ensure_ascii=False, default=_default) + '\n'
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self.stats['records'] += 1
+            self._pending += 1
+            if self._pending >= self.fsync_every or time.time() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.time()
+        self.stats['fsyncs'] += 1
+
+    def flush(self) -> None:
+        """写入并 fsync 缓冲中的记录"""
+        with self._lock:
+            if not self._file.closed and self._pending:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._pending:
+                self._sync()
+            self._file.close()
+
+
+def read_results(path: Union[str, Path], record_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    读取结果文件，忽略进程异常退出时可能写了一半的最后一行
+
+    Args:
+        path: 结果文件路径
+        record_type: 只返回该类型的记录（step/case/test_case）
+    """
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record_type is None or record.get('type') == record_type:
+                records.append(record)
+    return records
+
+
+_SINKS: Dict[str, ResultSink] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def result_sink_dir() -> Optional[Path]:
+    """按环境变量 UI_RESULT_SINK 获取结果目录，未设置时为None"""
+    value = os.environ.get(RESULT_SINK_ENV, '').strip()
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return DEFAULT_RESULT_DIR if value.lower() in ('1', 'true', 'yes', 'on') else Path(value)
+
+
+def get_result_sink(result_dir: Optional[Union[str, Path]] = None) -> Optional[ResultSink]:
+    """
+    获取当前进程的结果文件 <结果目录>/results_<worker>.jsonl，同一目录在进程内只打开一次
+
+    Args:
+        result_dir: 结果目录，为None时使用环境变量 UI_RESULT_SINK
+
+    Returns:
+        ResultSink；未指定目录且未设置环境变量时返回None
+    """
+    result_dir = result_dir or result_sink_dir()
+    if result_dir is None:
+        return None
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    key = os.path.abspath(os.path.join(result_dir, f"results_{worker}.jsonl"))
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            sink = _SINKS[key] = ResultSink(key)
+        return sink
+
+
+@atexit.register
+def _close_sinks() -> None:
+    with _SINKS_LOCK:
+        for sink in _SINKS.values():
+            sink.close()
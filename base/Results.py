@@ -0,0 +1,164 @@
+"""
+Results - 步骤、用例（变体）与整体执行结果
+每个步骤都会创建一条结果，数据驱动变体多时一次运行可达几十万条；结果使用带 __slots__ 的 dataclass，
+不再为每个步骤创建8个键的字典，汇总成功/失败数时直接读取属性。
+结果对象兼容原来的字典用法（result['success']、result.get('error_message')、'prefix_steps' in result），
+需要普通字典（如写入JSON）时调用 to_dict()
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _plain(value: Any) -> Any:
+    """结果对象及其列表转换为字典"""
+    if isinstance(value, _ResultMapping):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _ResultMapping:
+    """按键读写字段，兼容原来的字典结果"""
+
+    __slots__ = ()
+    # 值为None时视为不存在的键（原字典结果中按需添加的键）
+    _OPTIONAL = ()
+
+    def keys(self) -> List[str]:
+        return [name for name in self.__slots__
+                if name not in self._OPTIONAL or getattr(self, name) is not None]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None or key not in self._OPTIONAL:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} 不支持的键: {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self) -> List[tuple]:
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为与原来结构相同的字典（嵌套的步骤、用例结果一并转换）"""
+        return {key: _plain(getattr(self, key)) for key in self.keys()}
+
+
+@dataclass(slots=True)
+class StepResult(_ResultMapping):
+    """单个步骤的执行结果"""
+
+    step_num: int
+    action: str
+    selector: Any
+    value: Any
+    expected: Any
+    success: bool = False
+    error_message: str = ''
+    duration_ms: float = 0
+
+
+@dataclass(slots=True)
+class CaseResult(_ResultMapping):
+    """一条用例（数据驱动时为一个变体）的执行结果"""
+
+    case_name: str = 'single_case'
+    input_value: Any = ''
+    success: bool = True
+    steps: List[StepResult] = field(default_factory=list)
+    error_message: str = ''
+    duration_ms: float = 0
+    # 精简结果中执行的步骤数（steps 只保留失败的步骤），完整结果中为None
+    step_count: Optional[int] = None
+
+    _OPTIONAL = ('step_count',)
+
+    @classmethod
+    def failed(cls, case_name: str, input_value: Any, error_message: str) -> 'CaseResult':
+        """未能执行的用例结果"""
+        return cls(case_name, input_value, False, [], error_message, 0)
+
+    @property
+    def executed_steps(self) -> int:
+        """执行的步骤数"""
+        return self.step_count if self.step_count is not None else len(self.steps)
+
+    def failed_steps(self) -> List[StepResult]:
+        return [step for step in self.steps if not step.success]
+
+    def compact(self) -> 'CaseResult':
+        """精简结果：steps 只保留失败的步骤，step_count 记录执行的步骤数"""
+        return replace(self, steps=self.failed_steps(), step_count=self.executed_steps)
+
+    def summary_dict(self) -> Dict[str, Any]:
+        """不含步骤明细的字典（结果文件中的 case 记录）"""
+        return {'case_name': self.case_name, 'input_value': self.input_value, 'success': self.success,
+                'error_message': self.error_message, 'duration_ms': self.duration_ms,
+                'step_count': self.executed_steps}
+
+
+@dataclass(slots=True)
+class RunResult(_ResultMapping):
+    """一个YAML用例的执行结果，包含全部变体"""
+
+    success: bool = False
+    test_cases: List[CaseResult] = field(default_factory=list)
+    total_success: int = 0
+    total_failed: int = 0
+    error_message: str = ''
+    duration_ms: float = 0
+    # 按检查点执行时只执行一次的公共前置步骤
+    prefix_steps: Optional[List[StepResult]] = None
+    # 开启结果流式写入时的结果文件
+    result_file: Optional[str] = None
+
+    _OPTIONAL = ('prefix_steps', 'result_file')
+
+    @classmethod
+    def from_cases(cls, test_cases: List[CaseResult], error_message: str = '') -> 'RunResult':
+        """按用例结果统计成功、失败数"""
+        total_success = 0
+        for case in test_cases:
+            total_success += case.success
+        total_failed = len(test_cases) - total_success
+        return cls(total_failed == 0, test_cases, total_success, total_failed, error_message)
+
+    @classmethod
+    def from_case(cls, case_result: CaseResult) -> 'RunResult':
+        """只有一个用例的结果（单个用例或只执行指定变体），错误信息即该用例的错误信息"""
+        return cls.from_cases([case_result], case_result.error_message)
+
+    @classmethod
+    def failed(cls, error_message: str, duration_ms: float = 0) -> 'RunResult':
+        """未能执行的用例结果"""
+        return cls(False, [], 0, 0, error_message, duration_ms)
+
+    def failed_cases(self) -> List[CaseResult]:
+        return [case for case in self.test_cases if not case.success]
+
+    def iter_steps(self) -> Iterator[StepResult]:
+        """依次返回各用例的步骤结果（精简结果中只有失败的步骤）"""
+        for case in self.test_cases:
+            yield from case.steps
+
+    def step_count(self) -> int:
+        """全部用例执行的步骤数（不含公共前置步骤）"""
+        return sum(case.executed_steps for case in self.test_cases)
@@ -0,0 +1,191 @@
+"""
+ScreenshotPipeline - 后台截图写入
+截图步骤只从浏览器取回图片数据，格式转换（WebP）和写文件交给进程内共享的线程池，
+用例结束时通过 flush 等待全部写入完成，步骤不再阻塞在磁盘I/O上
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# 设置为 0/false 时截图在步骤中同步写入
+SCREENSHOT_BACKGROUND_ENV = 'UI_SCREENSHOT_BACKGROUND'
+# 写入线程数
+SCREENSHOT_WORKERS_ENV = 'UI_SCREENSHOT_WORKERS'
+DEFAULT_WORKERS = 2
+# 支持的格式，扩展名 -> 格式
+IMAGE_FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg', '.webp': 'webp'}
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def screenshot_background_enabled() -> bool:
+    """按环境变量 UI_SCREENSHOT_BACKGROUND 判断是否后台写入，默认开启"""
+    return os.environ.get(SCREENSHOT_BACKGROUND_ENV, '').lower() not in ('0', 'false', 'no', 'off')
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.environ.get(SCREENSHOT_WORKERS_ENV) or DEFAULT_WORKERS)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot-writer')
+        return _pool
+
+
+def resolve_image_format(path: str, image_format: Optional[str] = None) -> str:
+    """
+    截图格式：显式指定的格式优先，否则按扩展名判断，默认 png
+
+    Returns:
+        'png'、'jpeg' 或 'webp'
+    """
+    if image_format:
+        image_format = image_format.lower()
+        image_format = 'jpeg' if image_format == 'jpg' else image_format
+        if image_format not in ('png', 'jpeg', 'webp'):
+            raise ValueError(f"不支持的截图格式: {image_format}，可选值: png、jpeg、webp")
+        return image_format
+    return IMAGE_FORMATS.get(os.path.splitext(path)[1].lower(), 'png')
+
+
+def capture_options(image_format: str, quality: Optional[int]) -> Tuple[str, Optional[int]]:
+    """
+    浏览器截图参数：浏览器只能输出 png/jpeg，WebP 先取无损PNG再在后台转换
+
+    Returns:
+        (浏览器输出格式, jpeg质量)
+    """
+    if image_format == 'jpeg':
+        return 'jpeg', int(quality) if quality is not None else None
+    return 'png', None
+
+
+def webp_supported() -> bool:
+    """WebP 转换需要安装 Pillow"""
+    return Image is not None
+
+
+def encode_image(data: bytes, image_format: str, quality: Optional[int] = None) -> bytes:
+    """把浏览器输出的PNG转换为WebP，其他格式原样返回"""
+    if image_format != 'webp':
+        return data
+    if Image is None:
+        raise ImportError("WebP截图需要安装 Pillow: pip install Pillow")
+    output = BytesIO()
+    with Image.open(BytesIO(data)) as image:
+        image.save(output, format='WEBP', quality=int(quality) if quality is not None else 80)
+    return output.getvalue()
+
+
+def write_image(path: str, data: bytes, image_format: str = 'png', quality: Optional[int] = None) -> str:
+    """转换格式并写入文件（先写临时文件再替换，不会留下写了一半的截图）"""
+    data = encode_image(data, image_format, quality)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ScreenshotPipeline:
+    """
+    一个执行器（及其并行变体）的截图写入任务，线程池在进程内共享
+
+    submit 立即返回，flush 等待此前提交的全部任务完成；写入完成后 resolved 记录截图路径实际保存的文件
+    """
+
+    def __init__(self, background: Optional[bool] = None, store=None):
+        """
+        Args:
+            background: 是否后台写入，为None时按环境变量 UI_SCREENSHOT_BACKGROUND（默认开启）
+            store: 按内容寻址的截图存储（ScreenshotStore），为None时按截图路径写文件
+        """
+        self.background = screenshot_background_enabled() if background is None else background
+        self.store = store
+        self.resolved: Dict[str, str] = {}  # 截图路径 -> 实际保存的文件
+        self._pending: List[Tuple[str, Future]] = []
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, data: bytes, image_format: str = 'png', quality: Optional[int] = None) -> Optional[Future]:
+        """
+        提交写入任务；未开启后台写入时直接写入
+
+        Args:
+            path: 截图文件路径
+            data: 浏览器输出的图片数据
+            image_format: 目标格式 png/jpeg/webp
+            quality: jpeg/webp 质量（0-100）
+
+        Returns:
+            后台任务，同步写入时为None
+        """
+        writer = self.store.put if self.store is not None else write_image
+        if not self.background:
+            self.resolved[path] = writer(path, data, image_format, quality)
+            return None
+        future = _get_pool().submit(writer, path, data, image_format, quality)
+        future.add_done_callback(lambda done: self._resolve(path, done))
+        with self._lock:
+            self._pending.append((path, future))
+        return future
+
+    def _resolve(self, path: str, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self.resolved[path] = future.result()
+
+    def resolve(self, path: Optional[str]) -> Optional[str]:
+        """截图路径对应的实际文件，尚未写入完成时返回原路径"""
+        with self._lock:
+            return self.resolved.get(path, path)
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for _, future in self._pending if not future.done())
+
+    def take_pending(self) -> List[Tuple[str, Future]]:
+        """取出尚未等待的任务"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def flush(self, timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        等待已提交的截图全部写入
+
+        Args:
+            timeout: 最长等待秒数，为None时一直等待
+
+        Returns:
+            写入失败的截图 {路径: 错误信息}
+        """
+        pending = self.take_pending()
+        if not pending:
+            return {}
+        wait([future for _, future in pending], timeout=timeout)
+        return collect_errors(pending)
+
+
+def collect_errors(pending: List[Tuple[str, Future]]) -> Dict[str, str]:
+    """已完成任务中写入失败的截图 {路径: 错误信息}，未完成的记为超时"""
+    errors = {}
+    for path, future in pending:
+        if not future.done():
+            errors[path] = '写入超时'
+        elif future.exception() is not None:
+            errors[path] = str(future.exception())
+    return errors
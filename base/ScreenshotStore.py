@@ -0,0 +1,181 @@
+"""
+ScreenshotStore - 按内容寻址的截图存储
+截图按内容哈希保存为 blobs/<哈希前2位>/<哈希>.<扩展名>，内容相同的截图（数据驱动的各个变体、重跑）只写一次；
+截图名称（YAML 中的文件路径）到 blob 的对应关系追加写入 manifest.jsonl
+
+开启相似度去重（UI_SCREENSHOT_SIMILARITY > 0，需要安装 Pillow）时，按感知哈希（dHash）把
+尺寸相同、差异位数不超过阈值的截图视为同一张，复用已保存的 blob
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from base.ScreenshotPipeline import Image, write_image
+
+
+# files（默认）: 按YAML中的路径保存截图文件；cas: 按内容哈希保存
+SCREENSHOT_STORE_ENV = 'UI_SCREENSHOT_STORE'
+SCREENSHOT_STORE_MODES = ('files', 'cas')
+# 相似度去重阈值：感知哈希（256位）允许不同的位数，0（默认）只合并内容完全相同的截图
+SIMILARITY_ENV = 'UI_SCREENSHOT_SIMILARITY'
+DEFAULT_STORE_ROOT = 'test-results/screenshot'
+# dHash 尺寸，HASH_SIZE x HASH_SIZE 位
+HASH_SIZE = 16
+FORMAT_EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+
+_stores: Dict[str, 'ScreenshotStore'] = {}
+_stores_lock = threading.Lock()
+
+
+def screenshot_store_mode() -> str:
+    """按环境变量 UI_SCREENSHOT_STORE 获取截图存储方式"""
+    mode = os.environ.get(SCREENSHOT_STORE_ENV, '').strip().lower()
+    return mode if mode in SCREENSHOT_STORE_MODES else 'files'
+
+
+def perceptual_hash(data: bytes) -> Optional[Tuple[int, Tuple[int, int]]]:
+    """
+    计算截图的差值哈希（dHash）
+
+    Returns:
+        (哈希, (宽, 高))，未安装 Pillow 或无法解码时为None
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(BytesIO(data)) as image:
+            size = image.size
+            pixels = list(image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE)).getdata())
+    except Exception:
+        return None
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value, size
+
+
+class ScreenshotStore:
+    """
+    进程内共享的截图存储，可在多个线程中同时写入
+
+    put 返回截图实际保存的 blob 路径；ScreenshotPipeline 记录截图路径到 blob 路径的对应关系，
+    执行器的 screenshot_files、get_screenshot_by_base_name 据此返回 blob 路径
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_ROOT, similarity: Optional[int] = None):
+        """
+        Args:
+            root: 存储目录，blob 保存在 root/blobs 下，名称对应关系写入 root/manifest.jsonl
+            similarity: 相似度去重阈值，为None时按环境变量 UI_SCREENSHOT_SIMILARITY（默认0，不做相似度去重）
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.manifest_path = self.root / 'manifest.jsonl'
+        if similarity is None:
+            similarity = int(os.environ.get(SIMILARITY_ENV) or 0)
+        self.similarity = similarity if Image is not None else 0
+        self.stats = {'stored': 0, 'duplicates': 0, 'similar': 0}
+        self._lock = threading.Lock()
+        self._blobs: Dict[Tuple[str, str], str] = {}  # (sha256, 格式) -> blob 路径
+        self._hashes: List[Tuple[int, Tuple[int, int], str, str]] = []  # (dHash, 尺寸, 格式, blob 路径)
+        self._load_manifest()
+
+    def _load_manifest(self) -> None:
+        """读取已有的名称对应关系（重跑时复用上次保存的 blob）"""
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not os.path.exists(entry.get('blob', '')):
+                    continue
+                self._blobs[(entry['sha256'], entry['format'])] = entry['blob']
+                if entry.get('phash') is not None:
+                    self._hashes.append((int(entry['phash'], 16), tuple(entry['size']), entry['format'], entry['blob']))
+
+    def blob_path(self, digest: str, image_format: str) -> str:
+        return str(self.blob_dir / digest[:2] / f"{digest}{FORMAT_EXTENSIONS.get(image_format, '.png')}")
+
+    def _find_similar(self, phash: Tuple[int, Tuple[int, int]], image_format: str) -> Optional[str]:
+        value, size = phash
+        for known, known_size, known_format, blob in self._hashes:
+            if known_size == size and known_format == image_format and bin(known ^ value).count('1') <= self.similarity:
+                return blob
+        return None
+
+    def put(self, path: str, data: bytes, image_format: str = 'png', quality: Optional[int] = None) -> str:
+        """
+        保存截图，内容相同（或足够相似）的截图已保存时不再写入
+
+        Args:
+            path: 截图名称（YAML 中的文件路径）
+            data: 浏览器输出的图片数据
+            image_format: 目标格式 png/jpeg/webp
+            quality: jpeg/webp 质量（0-100）
+
+        Returns:
+            blob 路径
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        phash = perceptual_hash(data) if self.similarity > 0 else None
+        with self._lock:
+            blob = self._blobs.get((digest, image_format))
+            outcome = 'duplicates'
+            if blob is None and phash is not None:
+                blob = self._find_similar(phash, image_format)
+                outcome = 'similar'
+            if blob is None:
+                blob = self.blob_path(digest, image_format)
+                outcome = 'stored'
+                if phash is not None:
+                    self._hashes.append((phash[0], phash[1], image_format, blob))
+            self._blobs[(digest, image_format)] = blob
+            self.stats[outcome] += 1
+
+        # 内容相同但 blob 已被删除（如清理了 test-results）时重新写入
+        if outcome != 'similar' and not os.path.exists(blob):
+            write_image(blob, data, image_format, quality)
+        self._append_manifest({
+            'name': path,
+            'blob': blob,
+            'sha256': digest,
+            'format': image_format,
+            'phash': f"{phash[0]:x}" if phash else None,
+            'size': list(phash[1]) if phash else None,
+            'time': round(time.time(), 3),
+        })
+        return blob
+
+    def _append_manifest(self, entry: Dict) -> None:
+        # 每条记录一次追加写入一行，多个 xdist worker 可以写同一个文件
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+def default_screenshot_store() -> Optional[ScreenshotStore]:
+    """UI_SCREENSHOT_STORE=cas 时返回默认目录的截图存储，否则为None"""
+    return get_screenshot_store() if screenshot_store_mode() == 'cas' else None
+
+
+def get_screenshot_store(root: str = DEFAULT_STORE_ROOT) -> ScreenshotStore:
+    """获取进程内共享的截图存储（同一目录只创建一次）"""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ScreenshotStore(root)
+        return store
@@ -0,0 +1,612 @@
+"""
+StepPlan - 用例执行计划
+将YAML测试用例编译为不可变的执行计划，计划按 (文件, mtime, 用例名) 在进程内缓存，
+执行阶段只需按顺序调用已绑定的处理方法，不再重复解析步骤字典和元素路径
+"""
+
+import os
+import random
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import combinations, islice, product
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sized, Tuple, Union
+
+from loguru import logger
+
+from utils.data_source import describe_source, is_data_source, iter_data_source
+
+
+# Path(页面.模块.元素) 与 .f(参数) 的预编译正则
+PATH_PATTERN = re.compile(r'Path\((.*?)\)')
+FORMAT_PATTERN = re.compile(r'\.f\((.*?)\)')
+# 变体ID中需要替换的字符
+VARIANT_ID_PATTERN = re.compile(r'[^\w\-.]+')
+
+# 必须提供selector的操作
+SELECTOR_REQUIRED_ACTIONS = frozenset([
+    'click', 'hover', 'input', 'clear_and_input', 'select', 'select_option_by_label', 'check', 'uncheck',
+    'upload', 'double_click', 'right_click', 'wait_for_element', 'wait_for_element_hidden',
+    'scroll_to_element', 'execute_script', 'get_text', 'get_attribute', 'get_value', 'is_visible',
+    'is_enabled', 'assert',
+])
+
+# value 为列表或外部数据源时按取值展开为多个变体的操作
+PARAMETERIZED_ACTIONS = ('input', 'clear_and_input')
+# 多个参数化步骤的组合方式：笛卡尔积、按位置配对、两两组合覆盖
+MATRIX_MODES = ('product', 'zip', 'pairwise')
+# 数据驱动变体的公共前置步骤检查点：off（默认）每个变体完整执行；state 前置步骤执行一次后保存URL和
+# storage_state，每个变体在新的上下文中恢复；page 在同一上下文中新开页面打开保存的URL
+CHECKPOINT_ENV = 'UI_VARIANT_CHECKPOINT'
+CHECKPOINT_MODES = ('off', 'state', 'page')
+# 检查点只保存URL和 storage_state，不复制页面DOM；只有跳转、等待和只读的前置步骤（以及 assert_* 断言）
+# 可以由打开检查点URL重现，点击、输入、执行脚本等改变页面状态的步骤在变体的新页面中不存在
+CHECKPOINT_SAFE_ACTIONS = frozenset([
+    'navigate', 'refresh_page', 'go_back', 'go_forward',
+    'wait', 'wait_for_element', 'wait_for_element_hidden', 'wait_for_load_state', 'wait_for_network_idle',
+    'get_text', 'get_attribute', 'get_value', 'is_visible', 'is_enabled', 'get_page_title', 'get_current_url',
+    'get_dialog_text', 'take_screenshot', 'assert',
+])
+
+# 步骤描述模板，用于Allure报告
+STEP_DESCRIPTIONS = {
+    'navigate': "步骤{step_num}: 导航到 {target}",
+    'click': "步骤{step_num}: 点击元素 {selector}",
+    'hover': "步骤{step_num}: 悬停元素 {selector}",
+    'input': "步骤{step_num}: 输入文本到元素 {selector}，内容: {value}",
+    'clear_and_input': "步骤{step_num}: 清空并输入文本到元素 {selector}，内容: {value}",
+    'select': "步骤{step_num}: 选择下拉框 {selector} 的选项: {value}",
+    'select_option_by_label': "步骤{step_num}: 通过标签选择下拉框 {selector} 的选项: {value}",
+    'check': "步骤{step_num}: 勾选复选框 {selector}",
+    'uncheck': "步骤{step_num}: 取消勾选复选框 {selector}",
+    'upload': "步骤{step_num}: 上传文件到 {selector}，文件: {value}",
+    'double_click': "步骤{step_num}: 双击元素 {selector}",
+    'right_click': "步骤{step_num}: 右键点击元素 {selector}",
+    'wait': "步骤{step_num}: 等待 {wait} 毫秒",
+    'wait_for_element': "步骤{step_num}: 等待元素出现 {selector}",
+    'wait_for_element_hidden': "步骤{step_num}: 等待元素隐藏 {selector}",
+    'wait_for_load_state': "步骤{step_num}: 等待页面加载状态: {value}",
+    'wait_for_network_idle': "步骤{step_num}: 等待网络空闲",
+    'scroll_to_element': "步骤{step_num}: 滚动到元素 {selector}",
+    'scroll_to_bottom': "步骤{step_num}: 滚动到页面底部",
+    'scroll_to_top': "步骤{step_num}: 滚动到页面顶部",
+    'press_key': "步骤{step_num}: 按下按键 {key}",
+    'press_enter': "步骤{step_num}: 按下Enter键",
+    'press_tab': "步骤{step_num}: 按下Tab键",
+    'press_escape': "步骤{step_num}: 按下Escape键",
+    'type_text': "步骤{step_num}: 输入文本: {value}",
+    'refresh_page': "步骤{step_num}: 刷新页面",
+    'go_back': "步骤{step_num}: 返回上一页",
+    'go_forward': "步骤{step_num}: 前进到下一页",
+    'take_screenshot': "步骤{step_num}: 截图保存到 {screenshot}",
+    'execute_script': "步骤{step_num}: 执行JavaScript脚本: {value}",
+    'accept_dialog': "步骤{step_num}: 接受对话框",
+    'dismiss_dialog': "步骤{step_num}: 取消对话框",
+    'get_dialog_text': "步骤{step_num}: 获取对话框文本",
+    'get_text': "步骤{step_num}: 获取元素 {selector} 的文本",
+    'get_attribute': "步骤{step_num}: 获取元素 {selector} 的属性 {value}",
+    'get_value': "步骤{step_num}: 获取元素 {selector} 的值",
+    'is_visible': "步骤{step_num}: 检查元素 {selector} 是否可见",
+    'is_enabled': "步骤{step_num}: 检查元素 {selector} 是否启用",
+    'get_page_title': "步骤{step_num}: 获取页面标题",
+    'get_current_url': "步骤{step_num}: 获取当前URL",
+    'assert': "步骤{step_num}: 断言元素 {selector} {expected} {assert_value}",
+}
+
+
+def describe_step(action: str, selector: Any, value: Any, expected: Any, step_num: int) -> str:
+    """
+    生成步骤描述，用于Allure报告
+
+    Args:
+        action: 操作类型
+        selector: 元素选择器
+        value: 操作值
+        expected: 期望值
+        step_num: 步骤编号
+
+    Returns:
+        步骤描述字符串
+    """
+    template = STEP_DESCRIPTIONS.get(action)
+    if template is None:
+        return f"步骤{step_num}: 执行{action}操作"
+    return template.format(
+        step_num=step_num,
+        selector=selector,
+        value=value,
+        expected=expected,
+        target=selector or '页面',
+        wait=value or 1000,
+        key=value or 'Enter',
+        screenshot=(value.get('value') or value.get('path') or value.get('take_screenshot'))
+        if isinstance(value, dict) else (value or selector),
+        assert_value=value or '',
+    )
+
+
+def parse_step(step: Dict[str, Any]) -> Tuple[str, Any, Any, Any]:
+    """
+    解析单个YAML步骤
+
+    Args:
+        step: 步骤字典，兼容 `click: xxx`、`input: {selector, value}`、`input: xxx + value: yyy` 等写法
+
+    Returns:
+        (action, element_path, value, expected)
+    """
+    # 兼容 input: xxx + value: yyy 这种格式
+    if len(step) > 1:
+        action = next(iter(step))
+        params = step
+    else:
+        action, params = next(iter(step.items()))
+
+    if isinstance(params, dict):
+        # 对于input/clear_and_input/assert/take_screenshot操作，优先从selector字段获取元素路径
+        # （assert 与原 _execute_steps_with_details 一致，take_screenshot 的 selector 为截图的元素）
+        if action in ('input', 'clear_and_input', 'assert', 'take_screenshot'):
+            element_path = params.get('selector') or params.get('element') or params.get('target') or params.get('locator')
+        else:
+            element_path = params.get(action) or params.get('element') or params.get('target') or params.get('locator')
+        if action == 'take_screenshot':
+            # 截图选项（value/path 文件路径、clip、format、quality、full_page）整体作为value
+            return action, element_path, params, None
+        return action, element_path, params.get('value'), params.get('expected')
+
+    # 对于非字典参数（如 wait: 1000），wait的params就是等待时间
+    if action == 'wait':
+        return action, None, params, None
+    return action, params, step.get('value'), step.get('expected')
+
+
+def find_parameterized_steps(steps: List[Any]) -> List[Tuple[int, str, Any]]:
+    """
+    查找参数化的步骤（value 为列表或外部数据源的 input/clear_and_input 步骤）
+
+    Returns:
+        [(步骤位置, 操作, 值列表或数据源引用)]
+    """
+    parameterized = []
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            continue
+        for action in PARAMETERIZED_ACTIONS:
+            params = step.get(action)
+            if isinstance(params, dict) and (isinstance(params.get('value'), list) or is_data_source(params.get('value'))):
+                parameterized.append((index, action, params['value']))
+                break
+    return parameterized
+
+
+def checkpoint_mode(value: Any = None) -> str:
+    """
+    检查点模式：value（用例的 checkpoint 配置）优先，为None时按环境变量 UI_VARIANT_CHECKPOINT，默认off
+
+    Raises:
+        ValueError: 模式不支持
+    """
+    if value is None:
+        value = os.environ.get(CHECKPOINT_ENV, '').strip() or 'off'
+    elif value is True or value is False:
+        value = 'state' if value else 'off'
+    mode = str(value).lower()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"不支持的checkpoint模式: {mode}，可选值: {'、'.join(CHECKPOINT_MODES)}")
+    return mode
+
+
+def common_prefix_length(test_case: Dict[str, Any]) -> int:
+    """各变体共同的前置步骤数（第一个参数化步骤之前的步骤），没有参数化步骤时为0"""
+    parameterized = find_parameterized_steps(test_case.get('steps', []))
+    return parameterized[0][0] if parameterized else 0
+
+
+def checkpoint_unsafe_steps(test_case: Dict[str, Any]) -> Tuple[str, ...]:
+    """
+    公共前置步骤中不能由检查点重现的步骤（不在 CHECKPOINT_SAFE_ACTIONS 中的操作）
+
+    Returns:
+        步骤说明，如 ('步骤2 click',)
+    """
+    steps = test_case.get('steps', [])
+    unsafe = []
+    for index, step in enumerate(steps[:common_prefix_length(test_case)]):
+        action = parse_step(step)[0] if isinstance(step, dict) and step else str(step)
+        if action not in CHECKPOINT_SAFE_ACTIONS and not action.startswith('assert_'):
+            unsafe.append(f"步骤{index + 1} {action}")
+    return tuple(unsafe)
+
+
+def has_data_source(test_case: Dict[str, Any]) -> bool:
+    """用例的参数化步骤是否引用外部数据源（value: {source: ...}），此时变体逐条生成，数量在读完数据源前未知"""
+    return any(is_data_source(values) for _, _, values in find_parameterized_steps(test_case.get('steps', [])))
+
+
+def matrix_options(test_case: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    用例的 matrix 配置，可以是模式名或字典:
+        matrix: zip
+        matrix: {mode: pairwise, limit: 50, sample: 20, seed: 1}
+
+    Returns:
+        {'mode', 'limit', 'sample', 'seed'}
+
+    Raises:
+        ValueError: 模式不支持
+    """
+    config = test_case.get('matrix') or {}
+    if isinstance(config, str):
+        config = {'mode': config}
+    mode = str(config.get('mode') or 'product').lower()
+    if mode not in MATRIX_MODES:
+        raise ValueError(f"不支持的matrix模式: {mode}，可选值: {'、'.join(MATRIX_MODES)}")
+    limit, sample = config.get('limit'), config.get('sample')
+    return {
+        'mode': mode,
+        'limit': int(limit) if limit is not None else None,
+        'sample': int(sample) if sample is not None else None,
+        'seed': config.get('seed', 0),
+    }
+
+
+def _lazy_product(sources: List[Callable[[], Iterator[Any]]], prefix: Tuple[Any, ...] = ()) -> Iterator[Tuple[Any, ...]]:
+    """笛卡尔积：最外层逐个读取，内层每轮重新迭代（数据源重新读取），不需要事先保存全部值"""
+    if not sources:
+        yield prefix
+        return
+    for value in sources[0]():
+        yield from _lazy_product(sources[1:], prefix + (value,))
+
+
+def pairwise_combinations(axes: List[List[Any]]) -> Iterator[Tuple[Any, ...]]:
+    """
+    两两组合覆盖（pairwise / all-pairs）：任意两个参数的每对取值至少出现在一个组合中，
+    组合数约为最大两个参数取值数之积，远小于笛卡尔积；贪心生成，结果固定
+
+    Args:
+        axes: 每个参数的取值列表
+
+    Returns:
+        组合迭代器
+    """
+    sizes = [len(values) for values in axes]
+    if len(axes) < 2 or 0 in sizes:
+        yield from product(*axes)
+        return
+
+    def pair(k: int, v: int, m: int, w: int) -> Tuple[int, int, int, int]:
+        return (k, v, m, w) if k < m else (m, w, k, v)
+
+    # 未覆盖的取值对 (参数i, 取值序号, 参数j, 取值序号)，i < j
+    uncovered = {(i, a, j, b) for i, j in combinations(range(len(axes)), 2)
+                 for a in range(sizes[i]) for b in range(sizes[j])}
+    order = sorted(uncovered)
+    position = 0
+    while uncovered:
+        # 以第一个未覆盖的取值对为起点，其余参数依次取覆盖最多未覆盖取值对的值
+        while order[position] not in uncovered:
+            position += 1
+        i, a, j, b = order[position]
+        row: List[Optional[int]] = [None] * len(axes)
+        row[i], row[j] = a, b
+        for k in range(len(axes)):
+            if row[k] is None:
+                row[k] = max(range(sizes[k]), key=lambda v: sum(
+                    pair(k, v, m, row[m]) in uncovered for m in range(len(axes)) if row[m] is not None))
+        for p, q in combinations(range(len(axes)), 2):
+            uncovered.discard((p, row[p], q, row[q]))
+        yield tuple(axes[k][row[k]] for k in range(len(axes)))
+
+
+def sample_combinations(axes: List[List[Any]], mode: str, count: int, seed: Any = 0) -> Iterator[Tuple[Any, ...]]:
+    """
+    从组合中随机抽取 count 个（按原顺序返回）；笛卡尔积按序号换算，不生成全部组合
+
+    Args:
+        axes: 每个参数的取值列表
+        mode: product/zip/pairwise
+        count: 抽取数量
+        seed: 随机种子，相同种子抽取结果相同（xdist 各 worker 收集结果一致）
+    """
+    rng = random.Random(seed)
+    if mode == 'product':
+        sizes = [len(values) for values in axes]
+        total = 1
+        for size in sizes:
+            total *= size
+        for index in sorted(rng.sample(range(total), min(count, total))):
+            combination = []
+            for values, size in zip(reversed(axes), reversed(sizes)):
+                index, offset = divmod(index, size)
+                combination.append(values[offset])
+            yield tuple(reversed(combination))
+        return
+    combos = list(zip(*axes)) if mode == 'zip' else list(pairwise_combinations(axes))
+    for index in sorted(rng.sample(range(len(combos)), min(count, len(combos)))):
+        yield combos[index]
+
+
+def expand_matrix(axes: List[Any], options: Dict[str, Any], base_dir: Optional[str] = None) -> Iterator[Tuple[Any, ...]]:
+    """
+    按 matrix 配置组合各参数的取值
+
+    product（默认）和 zip 逐个生成组合，数据源按需读取；pairwise 和 sample 需要全部取值，数据源先读入列表。
+    limit 在最后截取前 N 个组合
+
+    Args:
+        axes: 每个参数的值列表或数据源引用
+        options: matrix_options 的返回值
+        base_dir: YAML文件所在目录，用于解析数据源的相对路径
+
+    Returns:
+        组合迭代器，每个组合按参数顺序排列
+    """
+    sources = [(lambda spec=values: iter_data_source(spec, base_dir)) if is_data_source(values)
+               else (lambda values=values: iter(values)) for values in axes]
+    mode = options['mode']
+    if options['sample'] is not None:
+        combos = sample_combinations([list(source()) for source in sources], mode, options['sample'], options['seed'])
+    elif mode == 'product':
+        combos = _lazy_product(sources)
+    elif mode == 'zip':
+        lengths = {len(values) for values in axes if isinstance(values, list)}
+        if len(lengths) > 1:
+            logger.warning("matrix zip 各参数的取值数量不同 {}，按最短的组合", sorted(lengths))
+        combos = zip(*(source() for source in sources))
+    else:
+        combos = pairwise_combinations([list(source()) for source in sources])
+    if options['limit'] is not None:
+        combos = islice(combos, options['limit'])
+    return combos
+
+
+def iter_test_cases(test_case_name: str, test_case: Dict[str, Any], log=logger,
+                    base_dir: Optional[str] = None, quiet: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    逐条生成测试用例，处理input value为列表或外部数据源的情况，支持loop_steps
+
+    多个参数化步骤按 matrix 配置组合（默认笛卡尔积，见 expand_matrix）；
+    各用例共享原始步骤字典，只有参数化步骤替换为带当前值的副本，数据源的值在迭代时逐行读取
+
+    Args:
+        test_case_name: 测试用例名称
+        test_case: 原始测试用例数据
+        log: 日志记录器
+        base_dir: YAML文件所在目录，用于解析数据源的相对路径
+        quiet: 日志全部降为debug（pytest 收集阶段展开变体时使用）
+
+    Returns:
+        测试用例迭代器，每个元素是一个独立的测试用例
+    """
+    steps = test_case.get('steps', [])
+    loop_steps_config = test_case.get('loop_steps') or {}  # 获取loop_steps配置
+    log_info = log.debug if quiet else log.info
+
+    log_info(f"开始生成测试用例: {test_case_name}")
+    log_info(f"原始步骤数量: {len(steps)}")
+    log_info(f"loop_steps配置: {loop_steps_config}")
+
+    # 检查是否有需要循环的input步骤
+    parameterized = find_parameterized_steps(steps)
+    for _, _, values in parameterized:
+        if is_data_source(values):
+            log_info(f"找到数据源input步骤: {describe_source(values)}")
+        else:
+            log_info(f"找到循环input步骤，值列表: {values}")
+
+    if not parameterized:
+        # 无循环步骤，直接使用原始测试用例
+        # 复制一份再标记，避免修改在多个测试之间共享的YAML数据
+        log_info("无循环步骤，使用原始测试用例")
+        yield dict(test_case, input_value='')  # 无输入值
+        return
+
+    options = matrix_options(test_case)
+    if len(parameterized) > 1:
+        log_info(f"参数化步骤数量: {len(parameterized)}，组合方式: {options}")
+    # 参数化步骤之间的原始步骤只切分一次，各用例共享
+    segments = []
+    start = 0
+    for index, _, _ in parameterized:
+        segments.append(tuple(steps[start:index]))
+        start = index + 1
+    tail = tuple(steps[start:])
+    # 数据源的行数可能很多，逐条日志降为debug
+    log_case = log.debug if quiet or has_data_source(test_case) else log.info
+    base_name = test_case.get('case_name', test_case_name)
+
+    combos = expand_matrix([values for _, _, values in parameterized], options, base_dir)
+    for i, combination in enumerate(combos):
+        modified_steps = []
+        for segment, (index, action, _), value in zip(segments, parameterized, combination):
+            modified_steps.extend(segment)
+            # 参数化步骤替换为单个值
+            modified_steps.append(dict(steps[index], **{action: dict(steps[index][action], value=value)}))
+            # 添加该值对应的loop_steps步骤
+            if isinstance(value, Hashable) and value in loop_steps_config:
+                loop_steps_for_value = loop_steps_config[value]
+                if isinstance(loop_steps_for_value, list):
+                    log_case(f"为输入值 {value} 添加 {len(loop_steps_for_value)} 个loop_steps步骤")
+                    modified_steps.extend(loop_steps_for_value)
+                else:
+                    log.warning(f"循环值 {value} 的loop_steps格式不正确，应为列表")
+            elif loop_steps_config:
+                log_case(f"未找到输入值 {value} 对应的loop_steps配置")
+        modified_steps.extend(tail)
+
+        input_value = combination[0] if len(combination) == 1 else ', '.join(str(value) for value in combination)
+        log_case(f"生成测试用例 {i+1}: {base_name}_{i+1}, 输入值: {input_value}, 步骤数量: {len(modified_steps)}")
+        yield dict(test_case, case_name=f"{base_name}_{i+1}", input_value=input_value, steps=modified_steps)
+
+
+def generate_test_cases(test_case_name: str, test_case: Dict[str, Any], log=logger,
+                        base_dir: Optional[str] = None, quiet: bool = False) -> List[Dict[str, Any]]:
+    """
+    生成测试用例列表，处理input value为列表的情况，支持loop_steps
+
+    Args:
+        test_case_name: 测试用例名称
+        test_case: 原始测试用例数据
+        log: 日志记录器
+        base_dir: YAML文件所在目录，用于解析数据源的相对路径
+        quiet: 日志全部降为debug
+
+    Returns:
+        测试用例列表，每个元素是一个独立的测试用例
+    """
+    test_cases = list(iter_test_cases(test_case_name, test_case, log, base_dir, quiet))
+    (log.debug if quiet else log.info)(f"总共生成 {len(test_cases)} 个测试用例")
+    return test_cases
+
+
+def variant_id(index: int, input_value: Any) -> str:
+    """
+    生成数据驱动变体的稳定ID（用于pytest参数化），优先使用输入值，输入值为空时使用序号
+
+    Args:
+        index: 变体序号（从0开始）
+        input_value: 变体的输入值
+
+    Returns:
+        变体ID
+    """
+    text = VARIANT_ID_PATTERN.sub('_', str(input_value if input_value is not None else '')).strip('_')
+    return text[:60] if text else f"variant{index + 1}"
+
+
+def variant_ids(test_case_name: str, test_case: Dict[str, Any], base_dir: Optional[str] = None) -> List[str]:
+    """
+    pytest 收集阶段展开数据驱动变体使用的变体ID，逐条生成变体，不保留变体的步骤
+
+    Args:
+        test_case_name: 测试用例名称
+        test_case: 原始测试用例数据
+        base_dir: YAML文件所在目录
+
+    Returns:
+        按变体顺序排列的ID；引用外部数据源（行数在执行时才能确定）或只有一个变体时返回空列表
+    """
+    if has_data_source(test_case):
+        return []
+    ids = [variant_id(i, case.get('input_value'))
+           for i, case in enumerate(iter_test_cases(test_case_name, test_case, base_dir=base_dir, quiet=True))]
+    return ids if len(ids) > 1 else []
+
+
+def is_element_path(path: Any) -> bool:
+    """判断是否为 Path(...) 形式的元素路径"""
+    return isinstance(path, str) and 'Path' in path
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """编译后的单个步骤"""
+
+    step_num: int
+    action: str
+    element_path: Any
+    selector: Any
+    value: Any
+    expected: Any
+    # 未绑定的处理方法，执行时以 handler(executor, selector, value, expected, step_num) 调用
+    handler: Optional[Callable] = None
+    # 编译期发现的错误（格式错误、路径解析失败、selector为空），执行到该步骤时报告
+    error: str = ''
+    # YAML中的原始步骤字典，用于把执行结果对应回用例文件（如静态等待审计的改写）
+    source: Any = field(default=None, compare=False, repr=False)
+
+    @cached_property
+    def description(self) -> str:
+        """步骤描述，首次访问时生成"""
+        return describe_step(self.action, self.selector, self.value, self.expected, self.step_num)
+
+
+@dataclass(frozen=True)
+class VariantPlan:
+    """一条可独立执行的用例（数据驱动时每个输入值对应一条）"""
+
+    case_name: str
+    input_value: Any
+    steps: Tuple[CompiledStep, ...]
+
+
+class VariantStream:
+    """
+    外部数据源驱动的变体序列
+    每次迭代重新读取数据源并逐条编译变体，不在内存中保存全部变体；没有长度，按序号取变体时顺序读取到该行
+    """
+
+    def __init__(self, factory: Callable[[], Iterator[VariantPlan]]):
+        """
+        Args:
+            factory: 无参函数，返回新的变体迭代器
+        """
+        self._factory = factory
+
+    def __iter__(self) -> Iterator[VariantPlan]:
+        return self._factory()
+
+    def __getitem__(self, index: int) -> VariantPlan:
+        if index < 0:
+            raise IndexError(f"数据源变体不支持负数序号: {index}")
+        for variant in islice(self, index, None):
+            return variant
+        raise IndexError(f"变体序号超出数据源行数: {index}")
+
+
+def variant_count(variants: Union[Tuple[VariantPlan, ...], VariantStream]) -> Optional[int]:
+    """变体数量，数据源驱动的变体序列返回None"""
+    return len(variants) if isinstance(variants, Sized) else None
+
+
+def variant_progress(index: int, total: Optional[int]) -> str:
+    """变体进度文本，如 3/10；总数未知时只有序号"""
+    return f"{index + 1}/{total}" if total is not None else str(index + 1)
+
+
+@dataclass(frozen=True)
+class CasePlan:
+    """一个YAML用例的完整执行计划"""
+
+    name: str
+    # 内联值列表编译为元组；引用外部数据源时为 VariantStream，执行时逐条读取
+    variants: Union[Tuple[VariantPlan, ...], VariantStream]
+    # 各变体共同的前置步骤数，按检查点执行时只执行一次
+    prefix: int = 0
+    # 用例的 checkpoint 配置，为None时使用执行器的配置
+    checkpoint: Optional[str] = None
+    # 公共前置步骤中不能由检查点重现的步骤（checkpoint_unsafe_steps）
+    unsafe_prefix: Tuple[str, ...] = ()
+
+
+class PlanCache:
+    """
+    进程级执行计划缓存
+    键为 (文件, 用例名, ...)，值记录文件的mtime，文件修改后自动失效
+    """
+
+    def __init__(self):
+        self._plans: Dict[Hashable, Tuple[float, CasePlan]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, mtime: float) -> Optional[CasePlan]:
+        entry = self._plans.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        return None
+
+    def put(self, key: Hashable, mtime: float, plan: CasePlan) -> None:
+        with self._lock:
+            self._plans[key] = (mtime, plan)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+PLAN_CACHE = PlanCache()
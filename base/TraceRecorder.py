@@ -0,0 +1,176 @@
+"""
+TraceRecorder - Chrome Trace Event 导出
+把用例、变体、步骤及内部阶段（定位器解析、智能等待、浏览器调用、截图）的耗时记录为
+Chrome Trace Event（JSON Array格式），可直接用 chrome://tracing 或 https://ui.perfetto.dev 打开
+
+每个进程（xdist worker）写一个文件，事件边记录边分批写入，不在内存中累积
+"""
+
+import asyncio
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+# 设置为 1/true 时开启记录
+TRACE_ENV = 'UI_TRACE'
+# 默认输出目录: test-results/trace/trace_<worker>.json
+DEFAULT_TRACE_DIR = Path(__file__).parent.parent / 'test-results' / 'trace'
+# 缓冲的事件数达到该值时写入文件
+FLUSH_EVENTS = 500
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class TraceRecorder:
+    """进程级 Trace Event 记录器"""
+
+    def __init__(self, enabled: Optional[bool] = None, output_path: Optional[Union[str, Path]] = None):
+        if enabled is None:
+            enabled = os.environ.get(TRACE_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+        self.enabled = enabled
+        self.worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        self.output_path = Path(output_path) if output_path else DEFAULT_TRACE_DIR / f"trace_{self.worker}.json"
+        self._pid = os.getpid()
+        # 墙上时间作为起点、perf_counter计算偏移，多个worker的文件时间轴一致
+        self._origin_us = time.time() * 1_000_000
+        self._origin_perf = time.perf_counter()
+        self._buffer: List[Dict[str, Any]] = []
+        self._tids: Dict[int, int] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return self._origin_us + (time.perf_counter() - self._origin_perf) * 1_000_000
+
+    def _current_tid(self) -> int:
+        # 同一线程内并发的协程各自占一条轨道，避免span交错嵌套
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        tid = self._tids.get(key)
+        if tid is None:
+            with self._lock:
+                tid = self._tids.setdefault(key, len(self._tids) + 1)
+            label = task.get_name() if task is not None else threading.current_thread().name
+            self._emit({'ph': 'M', 'name': 'thread_name', 'pid': self._pid, 'tid': tid, 'args': {'name': label}})
+        return tid
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str, **args: Any) -> Iterator[None]:
+        """
+        记录一个时间段（Complete Event）
+
+        Args:
+            name: 名称
+            cat: 类别，如 case、variant、step、selector、smart_wait、browser、screenshot
+            args: 附加信息，显示在事件详情中
+        """
+        tid = self._current_tid()
+        start = self._now_us()
+        try:
+            yield
+        except BaseException as e:
+            args['error'] = repr(e)
+            raise
+        finally:
+            self._emit({
+                'name': name, 'cat': cat, 'ph': 'X', 'ts': round(start, 3),
+                'dur': round(self._now_us() - start, 3), 'pid': self._pid, 'tid': tid, 'args': args,
+            })
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) >= FLUSH_EVENTS:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        if self._file is None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.output_path, 'w', encoding='utf-8')
+            self._file.write('[\n')
+            process = {'ph': 'M', 'name': 'process_name', 'pid': self._pid, 'args': {'name': f"worker {self.worker}"}}
+            self._file.write(json.dumps(process, ensure_ascii=False))
+        for event in self._buffer:
+            self._file.write(',\n')
+            self._file.write(json.dumps(event, ensure_ascii=False, default=str))
+        self._file.flush()
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        """把缓冲的事件写入文件"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> Optional[Path]:
+        """
+        写入剩余事件并结束JSON数组
+
+        Returns:
+            trace文件路径，没有记录任何事件时返回None
+        """
+        with self._lock:
+            self._flush_locked()
+            if self._file is None:
+                return None
+            self._file.write('\n]\n')
+            self._file.close()
+            self._file = None
+            return self.output_path
+
+
+TRACE_RECORDER = TraceRecorder()
+atexit.register(TRACE_RECORDER.close)
+
+
+def trace_span(name: str, cat: str, **args: Any):
+    """记录一个时间段，未开启记录时返回空的上下文管理器"""
+    if not TRACE_RECORDER.enabled:
+        return _NULL_SPAN
+    return TRACE_RECORDER.span(name, cat, **args)
+
+
+class TracedProxy:
+    """
+    记录被代理对象（BasePage、PageAssertion）每个方法调用的耗时
+    wait_for* 方法记为 smart_wait，截图记为 screenshot，其余记为 browser
+    """
+
+    def __init__(self, target: Any):
+        self._target = target
+
+    @property
+    def target(self) -> Any:
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr) or not TRACE_RECORDER.enabled:
+            return attr
+        if name.startswith('wait_for'):
+            cat = 'smart_wait'
+        elif 'screenshot' in name:
+            cat = 'screenshot'
+        else:
+            cat = 'browser'
+
+        if asyncio.iscoroutinefunction(attr):
+            async def traced_async(*args, **kwargs):
+                with TRACE_RECORDER.span(name, cat):
+                    return await attr(*args, **kwargs)
+            return traced_async
+
+        def traced(*args, **kwargs):
+            with TRACE_RECORDER.span(name, cat):
+                return attr(*args, **kwargs)
+        return traced
@@ -0,0 +1,201 @@
+"""
+WaitAudit - 静态等待审计
+审计模式下执行 `wait: N` 步骤时，同时检测下一步骤的目标元素何时变为可操作（可见且启用），
+记录每个静态等待浪费的毫秒数，并可生成把静态等待替换为 wait_for_element 的YAML副本
+"""
+
+import copy
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+from base.StepPlan import SELECTOR_REQUIRED_ACTIONS
+from utils.yaml_loader import load_yaml_file
+
+
+# 设置为 1/report 时开启审计并在测试结束时输出报告，设置为 rewrite 时同时生成改写后的YAML副本
+WAIT_AUDIT_ENV = 'UI_WAIT_AUDIT'
+# 作用于元素的步骤（execute_script 的参数是脚本，不是元素）
+ELEMENT_ACTIONS = SELECTOR_REQUIRED_ACTIONS - {'execute_script'}
+# wait_for_element 未指定超时时间时的默认值（毫秒），静态等待更长时保留原等待时长作为超时
+DEFAULT_ELEMENT_TIMEOUT = 30000
+
+
+def wait_audit_mode() -> Optional[str]:
+    """
+    当前的审计模式
+
+    Returns:
+        None（未开启）、'report' 或 'rewrite'
+    """
+    value = os.environ.get(WAIT_AUDIT_ENV, '').strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return None
+    return 'rewrite' if value == 'rewrite' else 'report'
+
+
+@dataclass
+class WaitAuditRecord:
+    """一次静态等待的审计结果"""
+
+    yaml_file: Optional[str]
+    case_name: str
+    input_value: Any
+    step_num: int
+    wait_ms: float
+    next_action: Optional[str]
+    next_element: Any
+    # 下一步骤目标元素变为可操作所用的时间，等待结束前未就绪或无法检测时为None
+    ready_ms: Optional[float]
+    wasted_ms: float
+    suggestion: Optional[Dict[str, Any]]
+    # YAML中的原始步骤字典，仅用于改写，不输出到报告
+    source: Any = None
+
+    def to_report(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('source')
+        return data
+
+
+def suggest_replacement(wait_ms: float, next_action: Optional[str], next_element: Any,
+                        ready_ms: Optional[float]) -> Optional[Dict[str, Any]]:
+    """
+    为静态等待生成替换步骤
+
+    Returns:
+        替换的YAML步骤；下一步骤没有目标元素或等待期间未就绪时返回None（保留原等待）
+    """
+    if ready_ms is None or next_action not in ELEMENT_ACTIONS or not next_element:
+        return None
+    step = {'wait_for_element': next_element}
+    if wait_ms > DEFAULT_ELEMENT_TIMEOUT:
+        step['value'] = int(wait_ms)
+    return step
+
+
+class WaitAuditor:
+    """进程级审计记录"""
+
+    def __init__(self):
+        self.records: List[WaitAuditRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: WaitAuditRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        生成审计报告
+
+        Returns:
+            {'total_wait_ms', 'total_wasted_ms', 'waits': [...]}，waits 按浪费时间倒序
+        """
+        with self._lock:
+            records = list(self.records)
+        waits = sorted((r.to_report() for r in records), key=lambda r: r['wasted_ms'], reverse=True)
+        return {
+            'total_wait_ms': sum(r.wait_ms for r in records),
+            'total_wasted_ms': sum(r.wasted_ms for r in records),
+            'waits': waits,
+        }
+
+    def write_report(self, output_path: Union[str, Path]) -> str:
+        """
+        写入JSON格式的审计报告
+
+        Args:
+            output_path: 报告文件路径
+
+        Returns:
+            报告文件路径
+        """
+        output_path = str(output_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2, default=str)
+        return output_path
+
+    def yaml_files(self) -> List[str]:
+        """审计记录涉及的用例文件"""
+        with self._lock:
+            return sorted({r.yaml_file for r in self.records if r.yaml_file})
+
+    def write_patched_yaml(self, yaml_file: Union[str, Path], output_path: Union[str, Path]) -> Optional[str]:
+        """
+        生成把静态等待替换为 wait_for_element 的用例副本，原文件不修改
+
+        同一个等待步骤在多个变体中审计结果不一致（某次未就绪）时不替换
+
+        Args:
+            yaml_file: 原用例文件
+            output_path: 副本路径
+
+        Returns:
+            副本路径；没有可替换的等待时返回None
+        """
+        abs_path = os.path.abspath(yaml_file)
+        data = load_yaml_file(abs_path)
+        locations = _step_locations(data)
+
+        suggestions: Dict[Tuple, Optional[Dict[str, Any]]] = {}
+        with self._lock:
+            records = [r for r in self.records if r.yaml_file == abs_path]
+        for r in records:
+            location = locations.get(id(r.source))
+            if location is None:
+                continue
+            if location in suggestions and suggestions[location] != r.suggestion:
+                suggestions[location] = None
+            else:
+                suggestions.setdefault(location, r.suggestion)
+
+        patched = copy.deepcopy(data)
+        replaced = 0
+        for (case_name, container, key, index), suggestion in suggestions.items():
+            if suggestion is None:
+                continue
+            steps = patched[case_name][container]
+            if key is not None:
+                steps = steps[key]
+            steps[index] = dict(suggestion)
+            replaced += 1
+        if not replaced:
+            return None
+
+        output_path = str(output_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(patched, f, allow_unicode=True, sort_keys=False)
+        return output_path
+
+
+def _step_locations(data: Any) -> Dict[int, Tuple]:
+    """原始步骤字典的id -> (用例名, 'steps'/'loop_steps', loop值或None, 下标)"""
+    locations = {}
+    if not isinstance(data, dict):
+        return locations
+    for case_name, case in data.items():
+        if not isinstance(case, dict):
+            continue
+        for index, step in enumerate(case.get('steps') or []):
+            locations[id(step)] = (case_name, 'steps', None, index)
+        loop_steps = case.get('loop_steps') or {}
+        if isinstance(loop_steps, dict):
+            for value, steps in loop_steps.items():
+                for index, step in enumerate(steps if isinstance(steps, list) else []):
+                    locations[id(step)] = (case_name, 'loop_steps', value, index)
+    return locations
+
+
+WAIT_AUDITOR = WaitAuditor()
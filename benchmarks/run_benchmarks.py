@@ -0,0 +1,273 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+执行器基准测试
+在本机用 http.server 提供 benchmarks/fixture 下的静态页面（不访问网络），用 BaseExecutor 执行 scenarios.yml 中的场景，
+输出每秒步骤数、单步耗时以及单步框架开销（步骤耗时中不在浏览器调用/等待内的部分），结果按提交保存为JSON便于对比
+
+用法:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks -k bench_click --scale 0.1 --browser firefox
+"""
+
+import argparse
+import functools
+import json
+import math
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from base.BaseExecutor import BaseExecutor
+
+
+BENCH_DIR = Path(__file__).parent
+FIXTURE_DIR = BENCH_DIR / 'fixture'
+LOCATIONS_PATH = BENCH_DIR / 'locations.yaml'
+SCENARIOS_PATH = BENCH_DIR / 'scenarios.yml'
+OUTPUT_DIR = ROOT_DIR / 'test-results' / 'benchmarks'
+
+# (场景名, 重复次数)
+SCENARIOS = (
+    ('bench_click', 100),
+    ('bench_input', 5),
+    ('bench_assert', 20),
+)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """不输出访问日志的静态文件服务"""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def start_fixture_server(directory: Path = FIXTURE_DIR) -> ThreadingHTTPServer:
+    """
+    在 127.0.0.1 的随机端口上提供静态页面
+
+    Returns:
+        已在后台线程中运行的服务，server.server_address[1] 为端口
+    """
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, name='fixture-server', daemon=True).start()
+    return server
+
+
+class CallTimer:
+    """累计被包装对象方法调用的耗时，嵌套调用只计算最外层"""
+
+    def __init__(self):
+        self.total_ms = 0.0
+        self.calls = 0
+        self._depth = 0
+
+    def reset(self) -> None:
+        self.total_ms = 0.0
+        self.calls = 0
+
+    def wrap(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if self._depth:
+                return func(*args, **kwargs)
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.total_ms += (time.perf_counter() - start) * 1000
+                self.calls += 1
+                self._depth -= 1
+        return timed
+
+    def proxy(self, target: Any) -> Any:
+        timer = self
+
+        class TimedProxy:
+            def __getattr__(self, name):
+                attr = getattr(target, name)
+                return timer.wrap(attr) if callable(attr) else attr
+
+        return TimedProxy()
+
+
+def instrument(executor: BaseExecutor) -> CallTimer:
+    """统计执行器在浏览器调用（BasePage、PageAssertion）和接口请求等待中的耗时"""
+    timer = CallTimer()
+    executor.base_page = timer.proxy(executor.base_page)
+    executor.page_assertion = timer.proxy(executor.page_assertion)
+    executor._wait_for_requests_drained = timer.wrap(executor._wait_for_requests_drained)
+    return timer
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+def raw_click_baseline(page: Any, executor: BaseExecutor, case_name: str, test_data: Dict[str, Any],
+                       repeat: int) -> Optional[float]:
+    """
+    只包含点击的场景，直接用 Playwright 点击相同的元素作为基线
+
+    Returns:
+        每次点击的平均毫秒数；场景包含其他操作时返回None
+    """
+    plan = executor.compile_test_case(case_name, test_data)
+    selectors = [step.selector for variant in plan.variants for step in variant.steps]
+    if not selectors or any(step.action != 'click' for variant in plan.variants for step in variant.steps):
+        return None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for selector in selectors:
+            page.click(selector)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(selectors))
+
+
+def run_scenario(executor: BaseExecutor, timer: CallTimer, case_name: str, test_data: Dict[str, Any],
+                 repeat: int) -> Dict[str, Any]:
+    """
+    重复执行一个场景并统计
+
+    Returns:
+        场景统计结果
+    """
+    durations: List[float] = []
+    failures = 0
+    errors = []
+    timer.reset()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            result = executor.execute_test_case(case_name, test_data)
+        except pytest.fail.Exception as e:
+            # 断言失败以 pytest.fail 抛出，记为失败后继续
+            failures += 1
+            errors.append(str(e))
+            continue
+        for case in result['test_cases']:
+            durations.extend(step['duration_ms'] for step in case['steps'])
+            if not case['success']:
+                failures += 1
+                errors.append(case['error_message'])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    steps = len(durations) or 1
+    return {
+        'scenario': case_name,
+        'repeat': repeat,
+        'steps': len(durations),
+        'failures': failures,
+        'errors': errors[:5],
+        'seconds': round(elapsed_ms / 1000, 3),
+        'steps_per_sec': round(len(durations) / (elapsed_ms / 1000), 2) if elapsed_ms else 0.0,
+        'step_ms_avg': round(elapsed_ms / steps, 3),
+        'step_ms_p50': round(statistics.median(durations), 3) if durations else 0.0,
+        'step_ms_p95': round(_percentile(durations, 0.95), 3) if durations else 0.0,
+        'browser_ms_per_step': round(timer.total_ms / steps, 3),
+        'overhead_ms_per_step': round((elapsed_ms - timer.total_ms) / steps, 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scenarios=SCENARIOS, browser_name: str = 'chromium', headless: bool = True,
+                   scale: float = 1.0, latency: int = 30) -> Dict[str, Any]:
+    """
+    启动本地页面和浏览器，依次执行基准场景
+
+    Args:
+        scenarios: (场景名, 重复次数) 列表
+        browser_name: chromium/firefox/webkit
+        headless: 是否无头模式
+        scale: 重复次数的缩放比例，用于快速试跑
+        latency: 页面查询接口的模拟延迟（毫秒）
+
+    Returns:
+        {'commit', 'browser', 'scenarios': [...]}
+    """
+    server = start_fixture_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html?latency={latency}"
+    results = []
+    try:
+        with sync_playwright() as p:
+            browser = getattr(p, browser_name).launch(headless=headless)
+            page = browser.new_page()
+            executor = BaseExecutor(page, {'bench_page': url}, locations_path=str(LOCATIONS_PATH))
+            test_data = executor.load_test_case(str(SCENARIOS_PATH))
+            timer = instrument(executor)
+            for case_name, repeat in scenarios:
+                repeat = max(1, int(repeat * scale))
+                page.goto(url)
+                # 预热：编译执行计划、建立连接，不计入结果
+                executor.execute_test_case(case_name, test_data)
+                page.goto(url)
+                result = run_scenario(executor, timer, case_name, test_data, repeat)
+                page.goto(url)
+                raw_ms = raw_click_baseline(page, executor, case_name, test_data, repeat)
+                if raw_ms is not None:
+                    result['raw_ms_per_step'] = round(raw_ms, 3)
+                    result['overhead_vs_raw_ms'] = round(result['step_ms_avg'] - raw_ms, 3)
+                results.append(result)
+            browser.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {'commit': _git_commit(), 'browser': browser_name, 'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'scenarios': results}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"commit: {report['commit']}  browser: {report['browser']}")
+    print(f"{'场景':<14}{'步骤':>7}{'失败':>5}{'步骤/秒':>10}{'平均ms':>9}{'p95ms':>9}{'浏览器ms':>10}{'开销ms':>9}{'原生ms':>9}")
+    for r in report['scenarios']:
+        raw = r.get('raw_ms_per_step')
+        print(f"{r['scenario']:<16}{r['steps']:>7}{r['failures']:>6}{r['steps_per_sec']:>12}{r['step_ms_avg']:>10}"
+              f"{r['step_ms_p95']:>10}{r['browser_ms_per_step']:>11}{r['overhead_ms_per_step']:>10}"
+              f"{raw if raw is not None else '-':>10}")
+        for error in r['errors']:
+            print(f"    {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='执行器基准测试（本地静态页面，不访问网络）')
+    parser.add_argument('-k', '--keyword', help='只执行名称包含关键字的场景', type=str)
+    parser.add_argument('--browser', default='chromium', choices=['chromium', 'firefox', 'webkit'])
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    parser.add_argument('--scale', type=float, default=1.0, help='重复次数缩放比例，如 0.1')
+    parser.add_argument('--latency', type=int, default=30, help='页面查询接口的模拟延迟（毫秒）')
+    parser.add_argument('-o', '--output', help='结果JSON路径，默认 test-results/benchmarks/bench_<commit>.json')
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.keyword or args.keyword in s[0]]
+    report = run_benchmarks(scenarios, args.browser, not args.headed, args.scale, args.latency)
+    print_report(report)
+
+    output = Path(args.output) if args.output else OUTPUT_DIR / f"bench_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"结果已写入: {output}")
+
+
+if __name__ == '__main__':
+    main()
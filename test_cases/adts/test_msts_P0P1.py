@@ -18,23 +18,27 @@ os.makedirs(log_dir, exist_ok=True)
 
 @allure.feature('测试***demo')
 class TestBaseExecutor:
+    # yaml_case 标记在收集阶段读取的用例文件，相对本文件所在目录
+    yaml_file = '../../test_data/adts/test_anliku.yml'
 
     @pytest.fixture(autouse=True)
     def setup(self, page: Page, pages: dict):
         self.page = page
-        locations_path = str(Path(__file__).parent.parent.parent / 'config' / 'msfs_locations.yaml')
+        locations_path = str(Path(__file__).parent.parent.parent / 'config' / 'adts_locations.yaml')
         self.executor = BaseExecutor(page, pages, locations_path=locations_path)
         self.logger = logger.bind(name=self.__class__.__name__)
-        self.test_data_path = os.path.join(os.path.dirname(__file__), "../../test_data/msfs/test_anliku.yml")
+        self.test_data_path = os.path.join(os.path.dirname(__file__), self.yaml_file)
 
     @pytest.mark.P2
     @allure.story('***查询')
     @allure.title('***查询-模糊查询正确')
     @allure.description('***查询-模糊查询-查看结果是否正确')
-    def test_02(self):
-        result = self.executor.execute_test_case('msfs_search_02', self.executor.load_test_case(self.test_data_path))
+    @pytest.mark.yaml_case('msfs_search_02')
+    def test_02(self, yaml_variant):
+        # input value 为列表时每个输入值收集为一个独立的用例，只有一个值时 yaml_variant 为None，执行整个用例
+        result = self.executor.execute_test_case('msfs_search_02', self.executor.load_test_case(self.test_data_path),
+                                                 variant=yaml_variant)
         assert result['success'] is True, f"测试用例执行失败: {result.get('error_message', '')}"
-        allure.attach.file("test-results/screenshot/search_CZtest.png", name="***模糊查询-截图01", attachment_type=allure.attachment_type.PNG)
 
     @pytest.mark.P2
     @allure.story('***导入')
@@ -43,7 +47,6 @@ class TestBaseExecutor:
     def test_03(self):
         result = self.executor.execute_test_case('msfs_import_03', self.executor.load_test_case(self.test_data_path))
         assert result['success'] is True, f"测试用例执行失败: {result.get('error_message', '')}"
-        allure.attach.file("test-results/screenshot/import01.png", name="***导入-截图01", attachment_type=allure.attachment_type.PNG)
 
     @pytest.mark.P1
     @allure.story('***导入')
@@ -52,8 +55,6 @@ class TestBaseExecutor:
     def test_05(self):
         result = self.executor.execute_test_case('msfs_import_05', self.executor.load_test_case(self.test_data_path))
         assert result['success'] is True, f"测试用例执行失败: {result.get('error_message', '')}"
-        allure.attach.file("test-results/screenshot/import03.png", name="***导入-截图01", attachment_type=allure.attachment_type.PNG)
-        allure.attach.file("test-results/screenshot/import_success.png", name="***导入-截图01", attachment_type=allure.attachment_type.PNG)
 
     @pytest.mark.P1
     @allure.story('***列表')
@@ -62,4 +63,3 @@ class TestBaseExecutor:
     def test_09(self):
         result = self.executor.execute_test_case('msfs_list_09', self.executor.load_test_case(self.test_data_path))
         assert result['success'] is True, f"测试用例执行失败: {result.get('error_message', '')}"
-        allure.attach.file("test-results/screenshot/remove_success.png", name="***导入-截图01", attachment_type=allure.attachment_type.PNG)
@@ -2,23 +2,211 @@
 import pytest
 import time
 import random
+from pathlib import Path
+from base.StepPlan import variant_ids
 from utils.config_reader import WebUIConfReader, ConfigReader
 from utils.adts_login_page import LoginPage
+from utils.yaml_loader import load_yaml_file
+from utils.wait_savings import WAIT_SAVINGS, legacy_sleeps_enabled
+from base.WaitAudit import WAIT_AUDITOR, wait_audit_mode
+from base.TraceRecorder import TRACE_RECORDER
+from base.PagePool import PagePool, page_pool_enabled
+from utils.login_state import LoginStateCache, login_cache_enabled
+from utils.log_config import setup_logging
+from loguru import logger
+import os
 
 
+def pytest_configure(config):
+    # 每个进程（含各 xdist worker）配置一次执行器日志
+    setup_logging()
+
 
 @pytest.fixture(scope='session')
 def pages():
     return WebUIConfReader().config['pages']
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # 记录各阶段结果（item.rep_setup/rep_call），页面池据此判断用例是否失败
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.fixture(scope='session')
+def login_user():
+    """pwd.conf 中的登录用户 (username, password)"""
+    reader = ConfigReader()
+    return (reader.get_ini_conf(file_path='pwd.conf', section='EIIR', key='username'),
+            reader.get_ini_conf(file_path='pwd.conf', section='EIIR', key='password'))
+
+
+@pytest.fixture(scope='session')
+def login_cache(browser, browser_context_args, pages, login_user):
+    """
+    登录态缓存（见 utils/login_state.py）：每个 worker 只登录一次，新建的上下文使用保存的 storage_state；
+    默认关闭（为None，每个用例通过登录页登录），UI_LOGIN_CACHE=1 或 web_ui.conf [login] cache = true 时开启
+    """
+    login_config = WebUIConfReader().config.get('login', {})
+    if not login_cache_enabled(login_config):
+        return None
+    username, password = login_user
+    return LoginStateCache(browser, pages['uuam_to_adts'], username, password,
+                           context_options=browser_context_args, ttl=login_config.get('ttl'),
+                           login_pages=[pages['uuam_to_adts'], pages.get('login_page')])
+
+
+@pytest.fixture(scope='session')
+def page_pool(browser, browser_context_args, login_cache, pytestconfig):
+    """
+    UI_PAGE_POOL=1 时每个 worker 复用预热的浏览器上下文和页面（见 base/PagePool.py），否则为None
+
+    开启 --tracing/--video/--screenshot 时不使用页面池，这些产物由 pytest-playwright 按每个用例的上下文记录
+    """
+    if not page_pool_enabled():
+        yield None
+        return
+    artifacts = [name for name in ('tracing', 'video', 'screenshot') if pytestconfig.getoption(name, 'off') != 'off']
+    if artifacts:
+        logger.warning("已开启 {}，不使用页面池", '/'.join(artifacts))
+        yield None
+        return
+    pool = PagePool(browser, browser_context_args,
+                    storage_state=login_cache.storage_state if login_cache is not None else None)
+    pool.warm()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def page(request, page_pool, login_cache):
+    """
+    测试页面：开启页面池时从池中取出，用例结束后清理存储、回到 about:blank 放回池中；
+    否则与 pytest-playwright 的 page 相同，每个用例新建上下文
+    开启登录态缓存时上下文由缓存的 storage_state 创建，跳转到登录页时自动重新登录
+    """
+    if page_pool is None:
+        if login_cache is None:
+            yield request.getfixturevalue('context').new_page()
+            return
+        page = request.getfixturevalue('new_context')(storage_state=login_cache.storage_state()).new_page()
+        login_cache.attach(page)
+        yield page
+        return
+    entry = page_pool.acquire()
+    if login_cache is not None:
+        login_cache.attach(entry.page)
+        if entry.uses == 0:
+            # 新建的上下文使用了缓存的登录态
+            entry.user = login_cache.username
+    yield entry.page
+    report = getattr(request.node, 'rep_call', None)
+    page_pool.release(entry, failed=report is None or report.failed)
+
+
 @pytest.fixture(autouse=True)
-def login(page, pages):
-    username = ConfigReader().get_ini_conf(file_path='pwd.conf', section='EIIR', key='username')
-    password = ConfigReader().get_ini_conf(file_path='pwd.conf', section='EIIR', key='password')
+def login(page, pages, page_pool, login_cache, login_user):
+    username, password = login_user
+    lease = page_pool.lease_of(page) if page_pool is not None else None
+    if lease is not None:
+        if lease.user == username:
+            # 页面池中的上下文已经登录过（或使用了缓存的登录态）
+            return
+    elif login_cache is not None:
+        # 上下文由缓存的登录态创建
+        return
     LoginPage(pages['uuam_to_adts'], page).login(username, password)
-    time.sleep(1)
+    if lease is not None:
+        lease.user = username
+    if legacy_sleeps_enabled():
+        time.sleep(1)
+    else:
+        with WAIT_SAVINGS.measure('login_fixture', 1):
+            page.wait_for_load_state()
+
+
+@pytest.fixture
+def yaml_variant():
+    """
+    数据驱动变体序号，传给 executor.execute_test_case(..., variant=yaml_variant)
+    用例带有 yaml_case 标记且存在多个变体时由 pytest_generate_tests 参数化，否则为None（执行全部变体）
+    """
+    return None
+
+
+def pytest_generate_tests(metafunc):
+    """
+    收集阶段把 YAML 数据驱动用例展开为独立的pytest用例，便于 xdist 按变体分发、--lf 只重跑失败的变体
+
+    用法:
+        yaml_file = '../../test_data/adts/test_anliku.yml'  # 类属性或模块变量，相对测试文件所在目录
+
+        @pytest.mark.yaml_case('msfs_search_02')            # 也可以 yaml_case('msfs_search_02', file='...')
+        def test_02(self, yaml_variant):
+            self.executor.execute_test_case('msfs_search_02', test_data, variant=yaml_variant)
+
+    示例见 test_cases/adts/test_msts_P0P1.py::TestBaseExecutor::test_02
+    """
+    if 'yaml_variant' not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker('yaml_case')
+    if marker is None or not marker.args:
+        return
+
+    case_name = marker.args[0]
+    yaml_file = marker.kwargs.get('file') or getattr(metafunc.cls, 'yaml_file', None) or getattr(metafunc.module, 'yaml_file', None)
+    if not yaml_file:
+        raise pytest.UsageError(f"{metafunc.definition.nodeid}: yaml_case 标记未指定YAML文件（file参数或yaml_file属性）")
+
+    yaml_path = Path(yaml_file)
+    if not yaml_path.is_absolute():
+        yaml_path = Path(metafunc.module.__file__).parent / yaml_path
+    test_case = (load_yaml_file(yaml_path) or {}).get(case_name)
+    if not test_case:
+        # 用例不存在时不展开，执行阶段由 execute_test_case 报告错误
+        return
+
+    # 外部数据源的变体在执行时逐行读取，不在收集阶段展开；每个变体的生成日志为debug，这里只记录一条
+    ids = variant_ids(case_name, test_case, base_dir=str(yaml_path.parent))
+    if not ids:
+        return
+    logger.info("{}: {} 展开为 {} 个用例", metafunc.definition.nodeid, case_name, len(ids))
+    metafunc.parametrize('yaml_variant', list(range(len(ids))), ids=ids)
+
+
+def pytest_sessionfinish(session):
+    # xdist worker 把固定等待节省的时间传回主进程汇总
+    workeroutput = getattr(session.config, 'workeroutput', None)
+    if workeroutput is not None:
+        workeroutput['wait_savings'] = WAIT_SAVINGS.snapshot()
+    _write_wait_audit()
+    TRACE_RECORDER.close()
+
 
+def _write_wait_audit():
+    """UI_WAIT_AUDIT 开启时输出静态等待审计报告，rewrite 模式同时生成改写后的用例副本"""
+    mode = wait_audit_mode()
+    if mode is None or not WAIT_AUDITOR.records:
+        return
+    output_dir = Path(__file__).parent.parent / 'test-results' / 'wait_audit'
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    WAIT_AUDITOR.write_report(output_dir / f"wait_audit_{worker}.json")
+    if mode == 'rewrite':
+        for yaml_file in WAIT_AUDITOR.yaml_files():
+            name = Path(yaml_file)
+            WAIT_AUDITOR.write_patched_yaml(yaml_file, output_dir / f"{name.stem}.{worker}.patched{name.suffix}")
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    WAIT_SAVINGS.merge(getattr(node, 'workeroutput', {}).get('wait_savings', {}))
 
 
+def pytest_terminal_summary(terminalreporter):
+    stats = WAIT_SAVINGS.snapshot()
+    if not stats:
+        return
+    terminalreporter.write_sep('-', f"条件等待代替固定等待，共节省 {WAIT_SAVINGS.total_saved:.1f} 秒")
+    for name, (count, saved) in sorted(stats.items()):
+        terminalreporter.write_line(f"{name}: {count} 次, 节省 {saved:.1f} 秒")
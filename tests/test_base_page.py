@@ -0,0 +1,78 @@
+"""BasePage 中不依赖真实浏览器的等待逻辑（使用桩页面）"""
+
+from playwright.sync_api import TimeoutError
+
+from base.BasePage import (CONTENT_STABLE_CLEANUP_SCRIPT, INPUT_SETTLED_SCRIPT, NEXT_FRAME_SCRIPT, BasePage,
+                           remove_page_listeners)
+
+
+class StubPage:
+
+    def __init__(self, settle=True):
+        self.settle = settle
+        self.calls = []
+        self.listeners = []
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    def wait_for_function(self, script, arg=None, timeout=None, polling=None):
+        self.calls.append(('wait_for_function', script, arg, timeout))
+        if not self.settle:
+            raise TimeoutError('timeout')
+
+    def evaluate(self, script, arg=None):
+        self.calls.append(('evaluate', script) if arg is None else ('evaluate', script, arg))
+
+
+def test_input_settled_uses_short_timeout():
+    page = StubPage()
+    assert BasePage(page).wait_for_input_settled('//input[@name="phone"]') is True
+    _, script, arg, timeout = page.calls[0]
+    assert script == INPUT_SETTLED_SCRIPT
+    assert (arg['selector'], arg['xpath'], arg['quietMs'], timeout) == ('//input[@name="phone"]', True, 50, 300)
+
+
+def test_input_settled_timeout_returns_false():
+    assert BasePage(StubPage(settle=False)).wait_for_input_settled('#phone') is False
+
+
+def test_input_settled_engine_selector_waits_one_frame():
+    page = StubPage()
+    assert BasePage(page).wait_for_input_settled('text=手机号 >> input') is True
+    assert page.calls == [('evaluate', NEXT_FRAME_SCRIPT)]
+
+
+def test_input_settled_tokens_differ():
+    page = StubPage()
+    base_page = BasePage(page)
+    base_page.wait_for_input_settled('#a')
+    base_page.wait_for_input_settled('#a')
+    assert page.calls[0][2]['token'] != page.calls[1][2]['token']
+
+
+def test_dialog_handlers_are_tracked():
+    page = StubPage()
+    page.on('request', print)
+    base_page = BasePage(page)
+    base_page.accept_dialog()
+    base_page.get_dialog_text()
+    assert [event for event, _ in page.listeners] == ['request', 'dialog', 'dialog']
+    assert remove_page_listeners(page) == 2
+    assert page.listeners == [('request', print)]
+    assert remove_page_listeners(page) == 0
+
+
+def test_content_stable_timeout_disconnects_observer():
+    page = StubPage(settle=False)
+    assert BasePage(page).wait_for_content_stable('#result', timeout=100) is False
+    assert page.calls[-1] == ('evaluate', CONTENT_STABLE_CLEANUP_SCRIPT, {'selector': '#result', 'xpath': False})
+
+
+def test_content_stable_success_skips_cleanup():
+    page = StubPage()
+    assert BasePage(page).wait_for_content_stable('//div[@id="result"]') is True
+    assert [call[0] for call in page.calls] == ['wait_for_function']
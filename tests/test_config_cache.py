@@ -0,0 +1,146 @@
+"""配置文件缓存与通过缓存读取的 ConfigReader"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from utils import config_cache
+from utils.config_cache import OBJECT_SIZE_FACTOR, ConfigFileCache, estimate_size
+from utils.config_reader import ConfigReader
+
+
+class CountingLoader:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+
+def _write(path, text, mtime_offset=0):
+    path.write_text(text, encoding='utf-8')
+    if mtime_offset:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+    return path
+
+
+def test_estimate_size():
+    assert estimate_size({'a': 1}, 100) == 100 * OBJECT_SIZE_FACTOR
+    assert estimate_size('', 0) == OBJECT_SIZE_FACTOR
+    frame = pd.DataFrame({'a': range(10)})
+    assert estimate_size(frame, 1) == int(frame.memory_usage(deep=True).sum())
+
+
+def test_hit_and_miss(tmp_path):
+    path = _write(tmp_path / 'a.yaml', 'a: 1')
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    assert cache.get(path, 'yaml', loader) == 'a: 1'
+    assert cache.get(str(path), 'yaml', loader) == 'a: 1'
+    assert loader.calls == 1
+    assert (cache.stats['hits'], cache.stats['misses']) == (1, 1)
+
+
+def test_kind_and_options_are_part_of_key(tmp_path):
+    path = _write(tmp_path / 'a.conf', 'x')
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    cache.get(path, 'ini', loader, ('utf-8',))
+    cache.get(path, 'ini', loader, ('gbk',))
+    cache.get(path, 'json', loader, ('utf-8',))
+    assert loader.calls == 3
+    assert cache.info()['entries'] == 3
+
+
+def test_reload_after_modification(tmp_path):
+    path = _write(tmp_path / 'a.yaml', 'a: 1')
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    cache.get(path, 'yaml', loader)
+    _write(path, 'a: 2', mtime_offset=1_000_000)
+    assert cache.get(path, 'yaml', loader) == 'a: 2'
+    assert loader.calls == 2
+    assert cache.info()['entries'] == 1
+    assert cache.total_bytes == 4 * OBJECT_SIZE_FACTOR
+
+
+def test_lru_eviction_under_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_cache, 'OBJECT_SIZE_FACTOR', 1)
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    cache.budget_bytes = 25
+    paths = [_write(tmp_path / f'{n}.txt', 'x' * 10) for n in range(3)]
+    cache.get(paths[0], 'text', loader)
+    cache.get(paths[1], 'text', loader)
+    cache.get(paths[0], 'text', loader)
+    cache.get(paths[2], 'text', loader)
+    assert cache.stats['evictions'] == 1
+    assert cache.info()['bytes'] == 20
+    cache.get(paths[0], 'text', loader)
+    cache.get(paths[1], 'text', loader)
+    assert loader.calls == 4
+
+
+def test_oversize_result_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_cache, 'OBJECT_SIZE_FACTOR', 1)
+    path = _write(tmp_path / 'big.txt', 'x' * 100)
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    cache.budget_bytes = 50
+    cache.get(path, 'text', loader)
+    cache.get(path, 'text', loader)
+    assert loader.calls == 2
+    assert cache.info()['entries'] == 0 and cache.total_bytes == 0
+
+
+def test_invalidate_and_clear(tmp_path):
+    first, second = _write(tmp_path / 'a.txt', 'a'), _write(tmp_path / 'b.txt', 'b')
+    cache, loader = ConfigFileCache(budget_mb=1), CountingLoader()
+    cache.get(first, 'text', loader)
+    cache.get(first, 'other', loader)
+    cache.get(second, 'text', loader)
+    cache.invalidate(first)
+    assert cache.info()['entries'] == 1 and cache.total_bytes == OBJECT_SIZE_FACTOR
+    cache.clear()
+    assert cache.info()['entries'] == 0 and cache.total_bytes == 0
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ConfigFileCache(budget_mb=1).get(tmp_path / 'missing.yaml', 'yaml', CountingLoader())
+
+
+def test_budget_from_env(monkeypatch):
+    monkeypatch.setenv(config_cache.CONFIG_CACHE_BUDGET_ENV, '2')
+    assert ConfigFileCache().budget_bytes == 2 * 1024 * 1024
+
+
+class TestConfigReader:
+
+    def test_ini_reads_through_cache(self, tmp_path):
+        _write(tmp_path / 'pwd.conf', '[EIIR]\nusername = u\npassword = p\n')
+        reader = ConfigReader(tmp_path)
+        assert reader.get_ini_conf('pwd.conf', 'EIIR', 'username') == 'u'
+        hits = config_cache.CONFIG_FILE_CACHE.stats['hits']
+        assert reader.get_ini_conf('pwd.conf', 'EIIR', 'password') == 'p'
+        assert config_cache.CONFIG_FILE_CACHE.stats['hits'] == hits + 1
+        assert reader.load_ini('pwd.conf') == {'EIIR': {'username': 'u', 'password': 'p'}}
+        with pytest.raises(KeyError, match='EIIR.missing'):
+            reader.get_ini_conf('pwd.conf', 'EIIR', 'missing')
+
+    def test_ini_keys_are_case_insensitive(self, tmp_path):
+        _write(tmp_path / 'a.conf', '[DEFAULT]\nHost = h\n[S]\nUserName = u\nurl = http://%(host)s/\n')
+        reader = ConfigReader(tmp_path)
+        assert reader.get_ini_conf('a.conf', 'S', 'UserName') == 'u'
+        assert reader.get_ini_conf('a.conf', 'S', 'username') == 'u'
+        assert reader.get_ini_conf('a.conf', 'S', 'HOST') == 'h'
+        assert reader.get_ini_conf('a.conf', 'S', 'URL') == 'http://h/'
+        with pytest.raises(KeyError, match='配置节不存在'):
+            reader.get_ini_conf('a.conf', 's', 'username')
+
+    def test_excel_returns_copy(self, tmp_path):
+        pd.DataFrame({'name': ['a', 'b']}).to_excel(tmp_path / 'data.xlsx', index=False)
+        reader = ConfigReader(tmp_path)
+        frame = reader.load_excel('data.xlsx')
+        frame['extra'] = 1
+        assert list(reader.load_excel('data.xlsx').columns) == ['name']
@@ -0,0 +1,177 @@
+"""外部数据源的逐行读取"""
+
+import json
+
+import pytest
+from openpyxl import Workbook
+
+from utils import data_source
+from utils.data_source import describe_source, is_data_source, iter_data_source, resolve_source_path, source_format
+
+ROWS = [['name', 'age'], ['alice', 30], ['bob', None], ['carol', 25], ['dave', 41]]
+NAMES = ['alice', 'bob', 'carol', 'dave']
+AGES = [30, 25, 41]
+
+
+def _excel(path):
+    workbook = Workbook()
+    workbook.active.title = 'users'
+    for row in ROWS:
+        workbook.active.append(row)
+    workbook.save(path)
+
+
+def _csv(path):
+    path.write_text('\n'.join(','.join('' if cell is None else str(cell) for cell in row) for row in ROWS) + '\n',
+                    encoding='utf-8')
+
+
+def _jsonl_arrays(path):
+    path.write_text('\n'.join(json.dumps(row) for row in ROWS) + '\n', encoding='utf-8')
+
+
+def _jsonl_objects(path):
+    names = ROWS[0]
+    path.write_text('\n'.join(json.dumps(dict(zip(names, row))) for row in ROWS[1:]) + '\n\n', encoding='utf-8')
+
+
+def _parquet(path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    pq.write_table(pa.table({name: [row[i] for row in ROWS[1:]] for i, name in enumerate(ROWS[0])}), path)
+
+
+WRITERS = {
+    'users.xlsx': _excel,
+    'users.csv': _csv,
+    'arrays.jsonl': _jsonl_arrays,
+    'objects.jsonl': _jsonl_objects,
+    'users.parquet': _parquet,
+}
+
+
+@pytest.fixture(params=list(WRITERS))
+def source(request, tmp_path):
+    path = tmp_path / request.param
+    WRITERS[request.param](path)
+    return path
+
+
+def _read(path, **spec):
+    return list(iter_data_source({'source': path.name, **spec}, base_dir=path.parent))
+
+
+class TestReaders:
+
+    def test_default_first_column(self, source):
+        assert _read(source) == NAMES
+
+    def test_column_by_name(self, source):
+        assert [int(value) for value in _read(source, column='age')] == AGES
+
+    def test_column_by_index(self, source):
+        if source.name == 'objects.jsonl':
+            with pytest.raises(ValueError, match='键名'):
+                _read(source, column=1)
+        else:
+            assert [int(value) for value in _read(source, column=1)] == AGES
+
+    @pytest.mark.parametrize('skip, limit, expected', [(1, None, NAMES[1:]), (0, 2, NAMES[:2]), (1, 2, NAMES[1:3]),
+                                                       (0, 0, []), (10, None, [])])
+    def test_skip_limit(self, source, skip, limit, expected):
+        assert _read(source, skip=skip, limit=limit) == expected
+
+    def test_missing_column(self, source):
+        if source.name == 'objects.jsonl':
+            assert _read(source, column='missing') == []
+        else:
+            with pytest.raises(KeyError, match='missing'):
+                _read(source, column='missing')
+
+
+class TestWithoutHeader:
+
+    @pytest.mark.parametrize('name', ['users.xlsx', 'users.csv', 'arrays.jsonl'])
+    def test_header_row_is_data(self, tmp_path, name):
+        path = tmp_path / name
+        WRITERS[name](path)
+        assert _read(path, header=False) == ['name'] + NAMES
+        with pytest.raises(ValueError, match='列序号'):
+            _read(path, header=False, column='age')
+
+
+class TestFormats:
+
+    def test_excel_sheet_by_name(self, tmp_path):
+        path = tmp_path / 'users.xlsx'
+        _excel(path)
+        assert _read(path, sheet='users', column='name', limit=1) == ['alice']
+
+    def test_tsv(self, tmp_path):
+        path = tmp_path / 'users.tsv'
+        path.write_text('name\tage\nalice\t30\n', encoding='utf-8')
+        assert _read(path, column='age') == ['30']
+
+    def test_jsonl_scalars(self, tmp_path):
+        path = tmp_path / 'values.ndjson'
+        path.write_text('"a"\n""\n2\nnull\n', encoding='utf-8')
+        assert _read(path) == ['a', 2]
+
+    def test_jsonl_invalid_line(self, tmp_path):
+        path = tmp_path / 'bad.jsonl'
+        path.write_text('{"a": 1}\n{oops\n', encoding='utf-8')
+        with pytest.raises(ValueError, match='第 2 行'):
+            _read(path)
+
+    def test_jsonl_mixed_records(self, tmp_path):
+        path = tmp_path / 'mixed.jsonl'
+        path.write_text('["name"]\n["a"]\n{"name": "b"}\n', encoding='utf-8')
+        with pytest.raises(ValueError, match='第 3 行'):
+            _read(path)
+
+    def test_empty_jsonl(self, tmp_path):
+        path = tmp_path / 'empty.jsonl'
+        path.write_text('\n', encoding='utf-8')
+        assert _read(path) == []
+
+    def test_parquet_requires_pyarrow(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_source, 'pq', None)
+        path = tmp_path / 'users.parquet'
+        path.write_bytes(b'PAR1')
+        with pytest.raises(ImportError, match='pip install pyarrow'):
+            _read(path)
+
+    def test_source_format(self, tmp_path):
+        assert source_format({}, tmp_path / 'a.XLSX') == 'excel'
+        assert source_format({'format': 'CSV'}, tmp_path / 'a.txt') == 'csv'
+        with pytest.raises(ValueError, match='a.txt'):
+            source_format({}, tmp_path / 'a.txt')
+
+    def test_each_iteration_reopens_file(self, tmp_path):
+        path = tmp_path / 'users.csv'
+        _csv(path)
+        values = iter_data_source({'source': str(path), 'limit': 1})
+        path.write_text('name\nzoe\n', encoding='utf-8')
+        assert list(values) == ['zoe']
+
+
+class TestSpec:
+
+    def test_is_data_source(self):
+        assert is_data_source({'source': 'a.csv'})
+        assert not is_data_source(['a'])
+        assert not is_data_source({'sheet': 0})
+
+    def test_describe_source(self):
+        assert describe_source({'source': 'a.xlsx', 'sheet': 0, 'column': 'name'}) == 'a.xlsx, sheet=0, column=name'
+
+    def test_resolve_relative_to_yaml_dir(self, tmp_path):
+        path = tmp_path / 'data' / 'users.csv'
+        path.parent.mkdir()
+        path.write_text('name\n', encoding='utf-8')
+        assert resolve_source_path('data/users.csv', tmp_path) == path
+        assert resolve_source_path(str(path)) == path
+
+    def test_resolve_missing(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match='missing.csv'):
+            resolve_source_path('missing.csv', tmp_path)
@@ -0,0 +1,108 @@
+"""同步、异步执行器共用的不涉及页面操作的方法"""
+
+import pytest
+from loguru import logger
+
+from base.BaseExecutor import BaseExecutor
+from base.BasePage import element_clip, screenshot_options
+from base.Results import CaseResult, RunResult
+from base.StepPlan import CasePlan, VariantPlan
+
+
+def _variants(count):
+    return [VariantPlan(f'c_{n}', f'v{n}', ()) for n in range(1, count + 1)]
+
+
+class TestCaseHelpers:
+
+    def test_from_case(self):
+        result = RunResult.from_case(CaseResult('c', 'x', False, [], 'boom'))
+        assert (result.success, result.total_success, result.total_failed) == (False, 0, 1)
+        assert result.error_message == 'boom'
+
+    @pytest.mark.parametrize('checkpoint, default, prefix, expected', [
+        (None, 'off', 2, None),
+        (None, 'state', 2, 'state'),
+        ('page', 'off', 2, 'page'),
+        ('page', 'state', 0, None),
+        ('off', 'state', 2, None),
+    ])
+    def test_variant_checkpoint_mode(self, checkpoint, default, prefix, expected):
+        executor = BaseExecutor.__new__(BaseExecutor)
+        executor.variant_checkpoint = default
+        plan = CasePlan('c', tuple(_variants(2)), prefix, checkpoint)
+        assert executor._variant_checkpoint_mode(plan) == expected
+
+    @pytest.mark.parametrize('checkpoint', [None, 'page', 'state'])
+    def test_unsafe_prefix_checkpoint(self, checkpoint):
+        executor = BaseExecutor.__new__(BaseExecutor)
+        executor.variant_checkpoint = 'state'
+        executor.logger = logger
+        messages = []
+        sink = logger.add(messages.append, level='WARNING')
+        try:
+            plan = CasePlan('c', tuple(_variants(2)), 2, checkpoint, ('步骤2 click',))
+            assert executor._variant_checkpoint_mode(plan) is None
+        finally:
+            logger.remove(sink)
+        assert len(messages) == 1 and '步骤2 click' in messages[0]
+
+    def test_split_first_variant_list(self):
+        variants = tuple(_variants(3))
+        first, remaining = BaseExecutor._split_first_variant(variants)
+        assert first is variants[0]
+        assert remaining is variants
+
+    def test_split_first_variant_stream(self):
+        variants = _variants(3)
+        first, remaining = BaseExecutor._split_first_variant(iter(variants))
+        assert first is variants[0]
+        assert list(remaining) == variants
+
+    def test_split_first_variant_empty(self):
+        first, _ = BaseExecutor._split_first_variant(())
+        assert first is None
+
+
+class TestStepHelpers:
+
+    @pytest.mark.parametrize('selector, value, expected', [
+        (None, 500, 500),
+        ('300', None, '300'),
+        ('Path(P.M.box)', None, 1000),
+        (None, None, 1000),
+    ])
+    def test_wait_time(self, selector, value, expected):
+        assert BaseExecutor._wait_time(selector, value) == expected
+
+    @pytest.mark.parametrize('expected, value, args', [
+        ('data-state', 'open', ('data-state', 'open')),
+        ('active', None, ('class', 'active')),
+        (None, 'active', ('class', 'active')),
+        (None, None, ('class', '')),
+    ])
+    def test_attribute_assertion_args(self, expected, value, args):
+        assert BaseExecutor._attribute_assertion_args(expected, value) == args
+
+    def test_parse_action_defaults(self):
+        assert BaseExecutor._parse_action({'action': 'click', 'target': '#a'}) == ('click', '#a', '', '', '', 30000)
+
+    def test_step_error(self):
+        assert BaseExecutor._step_error(3) == "步骤 3 执行失败"
+        assert BaseExecutor._step_error(3, ValueError('x')) == "步骤 3 执行异常: x"
+
+
+class TestScreenshotHelpers:
+
+    def test_screenshot_options(self):
+        assert screenshot_options('png', 80) == {'type': 'png'}
+        assert screenshot_options('jpeg', 80) == {'type': 'jpeg', 'quality': 80}
+        assert screenshot_options('jpeg', None) == {'type': 'jpeg'}
+
+    def test_element_clip(self):
+        box = {'x': 10, 'y': 20, 'width': 100, 'height': 50}
+        assert element_clip('#a', box, {'x': 5, 'width': 30}) == {'x': 15, 'y': 20, 'width': 30, 'height': 50}
+
+    def test_element_clip_hidden(self):
+        with pytest.raises(ValueError, match='#a'):
+            element_clip('#a', None, {})
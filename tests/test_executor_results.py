@@ -0,0 +1,128 @@
+"""同步/异步执行器返回相同结构的结果（使用不依赖浏览器的桩页面）"""
+
+import asyncio
+
+import pytest
+
+from base import ResultSink
+from base.AsyncBaseExecutor import AsyncBaseExecutor
+from base.BaseExecutor import BaseExecutor
+from base.ResultSink import read_results
+from base.Results import RunResult
+from base.StepPlan import VariantPlan
+
+LOCATIONS = "P:\n  M:\n    box: //input\n"
+STEPS = [{'navigate': 'http://example.test/a'}, {'click': 'Path(P.M.nope)'}]
+
+
+class StubPage:
+    url = 'about:blank'
+    context = None
+
+    def on(self, *args, **kwargs):
+        pass
+
+    def goto(self, url, **kwargs):
+        self.url = url
+
+    def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+
+class AsyncStubPage(StubPage):
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def locations(tmp_path):
+    path = tmp_path / 'loc.yaml'
+    path.write_text(LOCATIONS, encoding='utf-8')
+    return str(path)
+
+
+def _shape(value):
+    """结果结构：字典的键和嵌套结构，忽略具体的值"""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shape(item) for item in value]
+    return type(value).__name__
+
+
+def _run_both(locations, method, *args):
+    sync_executor = BaseExecutor(StubPage(), {}, locations_path=locations)
+    async_executor = AsyncBaseExecutor(AsyncStubPage(), {}, locations_path=locations)
+    for executor in (sync_executor, async_executor):
+        executor.configure_smart_wait(enable=False)
+    return getattr(sync_executor, method)(*args), asyncio.run(getattr(async_executor, method)(*args))
+
+
+def test_execute_steps_with_details_same_shape(locations):
+    sync_result, async_result = _run_both(locations, '_execute_steps_with_details', STEPS)
+    assert isinstance(sync_result, RunResult) and isinstance(async_result, RunResult)
+    assert _shape(sync_result.to_dict()) == _shape(async_result.to_dict())
+    for result in (sync_result, async_result):
+        assert result['success'] is False
+        assert [step['success'] for step in result['test_cases'][0]['steps']] == [True, False]
+        assert result['error_message'] == result['test_cases'][0]['error_message']
+
+
+def test_execute_test_case_same_shape(locations):
+    test_data = {'c': {'steps': [{'navigate': 'http://example.test/a'},
+                                 {'input': {'selector': 'Path(P.M.nope)', 'value': ['x', 'y']}}]}}
+    sync_result, async_result = _run_both(locations, 'execute_test_case', 'c', test_data)
+    assert _shape(sync_result.to_dict()) == _shape(async_result.to_dict())
+    for result in (sync_result, async_result):
+        assert (result['total_success'], result['total_failed']) == (0, 2)
+        assert [case['input_value'] for case in result['test_cases']] == ['x', 'y']
+
+
+def test_missing_case_same_result(locations):
+    sync_result, async_result = _run_both(locations, 'execute_test_case', 'missing', {'c': {'steps': STEPS}})
+    assert sync_result.to_dict() == async_result.to_dict()
+    assert sync_result.error_message == "未找到测试用例: missing"
+
+
+@pytest.mark.parametrize('executor_type, page_type', [(BaseExecutor, StubPage), (AsyncBaseExecutor, AsyncStubPage)])
+def test_result_sink_compact_results(locations, tmp_path, monkeypatch, executor_type, page_type):
+    monkeypatch.setattr(ResultSink, '_SINKS', {})
+    executor = executor_type(page_type(), {}, locations_path=locations)
+    executor.configure_smart_wait(enable=False)
+    executor.configure_result_sink(str(tmp_path))
+    test_data = {'c': {'steps': [{'navigate': 'http://example.test/a'},
+                                 {'input': {'selector': 'Path(P.M.nope)', 'value': ['x', 'y']}}]}}
+    result = executor.execute_test_case('c', test_data)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    executor.result_sink.close()
+
+    assert result['result_file'] == str(executor.result_sink.path)
+    for case in result['test_cases']:
+        assert case['step_count'] == 2
+        assert [step['step_num'] for step in case['steps']] == [2]
+    records = read_results(executor.result_sink.path)
+    assert [record['type'] for record in records] == ['step', 'step', 'case', 'step', 'step', 'case', 'test_case']
+    assert [record['input_value'] for record in read_results(executor.result_sink.path, 'case')] == ['x', 'y']
+
+
+def test_parallel_variants_recorded_when_workers_exit(locations, monkeypatch):
+    # 工作线程全部退出（如浏览器启动失败）时，未执行的变体仍记为失败，不从结果中丢失
+    class Context:
+        def storage_state(self):
+            return {}
+
+    page = StubPage()
+    page.context = Context()
+    executor = BaseExecutor(page, {}, locations_path=locations)
+    executor.configure_parallel(workers=2)
+    monkeypatch.setattr(executor, '_parallel_worker', lambda *args: None)
+    variants = [VariantPlan(f'c_{n}', str(n), ()) for n in range(1, 21)]
+
+    results = executor._execute_variants_in_parallel(iter(variants))
+    assert [case.input_value for case in results] == [str(n) for n in range(1, 21)]
+    assert RunResult.from_cases(results).total_failed == 20
@@ -0,0 +1,58 @@
+"""LocatorIndex 定位器索引"""
+
+import os
+
+import pytest
+
+from base.LocatorIndex import LocatorIndex, clear_locator_indexes, get_locator_index, split_locator_path
+
+
+@pytest.fixture
+def locations_file(tmp_path):
+    path = tmp_path / 'loc.yaml'
+    path.write_text("P:\n  M:\n    box: //input\n    item: //li[{}]\n  N:\n    link: a#{}-{}\n", encoding='utf-8')
+    yield path
+    clear_locator_indexes()
+
+
+def test_flatten_and_resolve():
+    index = LocatorIndex('x', 0, {'P': {'M': {'box': '//input', 'item': '//li[{}]'}}})
+    assert len(index) == 2
+    assert 'P.M.box' in index and 'P.M' not in index
+    assert index.resolve('P.M.box') == '//input'
+    assert index.resolve('P.M.item', 3) == '//li[3]'
+    # 没有占位符的定位器忽略参数
+    assert index.resolve('P.M.box', 3) == '//input'
+
+
+def test_resolve_missing_path():
+    with pytest.raises(KeyError):
+        LocatorIndex('x', 0, {}).resolve('P.M.nope')
+
+
+def test_empty_tree():
+    assert len(LocatorIndex('x', 0, None)) == 0
+
+
+def test_get_locator_index_reuses_until_mtime_changes(locations_file):
+    first = get_locator_index(str(locations_file))
+    assert get_locator_index(str(locations_file)) is first
+    assert first.resolve('P.N.link', 'a', 'b') == 'a#a-b'
+
+    locations_file.write_text("P:\n  M:\n    box: //textarea\n", encoding='utf-8')
+    stat = locations_file.stat()
+    os.utime(locations_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    second = get_locator_index(str(locations_file))
+    assert second is not first
+    assert second.resolve('P.M.box') == '//textarea'
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('P.M.box', (None, 'P.M.box')),
+    ('other:P.M.box', ('other', 'P.M.box')),
+    # 名称中不能包含 '.'，否则视为普通路径（如选择器中的冒号）
+    ('P.M:box', (None, 'P.M:box')),
+    (':P.M.box', (None, ':P.M.box')),
+])
+def test_split_locator_path(path, expected):
+    assert split_locator_path(path) == expected
@@ -0,0 +1,99 @@
+"""登录态缓存的开关与缓存文件（不依赖浏览器）"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from base.BasePage import get_navigation_guard
+from utils import login_state
+from utils.login_state import LOGIN_CACHE_ENV, LOGIN_TTL_ENV, LoginStateCache, login_cache_enabled
+
+
+@pytest.fixture(autouse=True)
+def clear_env(monkeypatch):
+    monkeypatch.delenv(LOGIN_CACHE_ENV, raising=False)
+
+
+def test_disabled_by_default():
+    assert login_cache_enabled() is False
+    assert login_cache_enabled({}) is False
+
+
+def test_config_enables():
+    assert login_cache_enabled({'cache': True}) is True
+
+
+@pytest.mark.parametrize('value, config, expected', [
+    ('1', {'cache': False}, True),
+    ('true', {}, True),
+    ('0', {'cache': True}, False),
+    ('off', {'cache': True}, False),
+])
+def test_env_overrides_config(monkeypatch, value, config, expected):
+    monkeypatch.setenv(LOGIN_CACHE_ENV, value)
+    assert login_cache_enabled(config) is expected
+
+
+def test_state_file_freshness(monkeypatch, tmp_path):
+    monkeypatch.delenv(LOGIN_TTL_ENV, raising=False)
+    monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+    browser = SimpleNamespace(browser_type=SimpleNamespace(name='chromium'))
+    cache = LoginStateCache(browser, 'http://example.test/login', 'user', 'pwd', ttl=60, state_dir=tmp_path)
+    assert 'user' not in cache.state_path.name and cache.state_path.name.endswith('_chromium_main.json')
+    assert not cache.is_fresh()
+    cache.state_path.write_text('{}', encoding='utf-8')
+    assert cache.is_fresh()
+    old = time.time() - 120
+    os.utime(cache.state_path, (old, old))
+    assert not cache.is_fresh()
+    cache.invalidate()
+    assert not cache.state_path.exists()
+    cache.invalidate()
+
+
+class FakePage:
+
+    def __init__(self, url):
+        self.url = url
+        self.gotos = []
+        self.goto = self.gotos.append
+
+
+class TestReloginGuard:
+
+    @pytest.fixture
+    def cache(self, monkeypatch, tmp_path):
+        browser = SimpleNamespace(browser_type=SimpleNamespace(name='chromium'))
+        cache = LoginStateCache(browser, 'http://example.test/sso', 'user', 'pwd', state_dir=tmp_path,
+                                login_pages=['http://example.test/sso', 'http://example.test/'])
+        logins = []
+        monkeypatch.setattr(login_state, 'LoginPage', lambda url, page: SimpleNamespace(
+            login=lambda username, password: logins.append((url, page.url))))
+        monkeypatch.setattr(cache, 'save', lambda page: None)
+        cache.logins = logins
+        return cache
+
+    def test_redirect_to_login_page_relogins(self, cache):
+        page = FakePage('http://example.test/?redirect=%2Fcase%2Flist')
+        assert cache.relogin_if_redirected(page, 'http://example.test/#/case/list') is True
+        assert cache.logins == [('http://example.test/sso', page.url)]
+        assert page.gotos == ['http://example.test/#/case/list']
+        assert cache.stats['relogins'] == 1
+
+    def test_page_with_password_field_is_not_login(self, cache):
+        # 修改密码等页面也有密码输入框，只按URL判断
+        page = FakePage('http://example.test/#/user/password')
+        assert cache.relogin_if_redirected(page, 'http://example.test/#/user/password') is False
+        assert cache.logins == [] and page.gotos == []
+
+    def test_navigating_to_login_page_itself(self, cache):
+        page = FakePage('http://example.test/sso')
+        assert cache.relogin_if_redirected(page, 'http://example.test/sso/') is False
+        assert cache.logins == []
+
+    def test_attach_registers_navigation_guard(self, cache):
+        page = FakePage('about:blank')
+        cache.attach(page)
+        assert get_navigation_guard(page) == cache.relogin_if_redirected
@@ -0,0 +1,108 @@
+"""页面池的借出、归还与重建（使用桩浏览器）"""
+
+from base.BasePage import BasePage
+from base.PagePool import PagePool
+
+
+class StubPage:
+
+    def __init__(self, context):
+        self.context = context
+        self.url = 'about:blank'
+        self.closed = False
+        self.listeners = []
+        self.evaluated = []
+
+    def is_closed(self):
+        return self.closed
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    def evaluate(self, script, arg=None):
+        self.evaluated.append(arg)
+
+    def goto(self, url):
+        self.url = url
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class StubContext:
+
+    def __init__(self, options):
+        self.options = options
+        self.pages = []
+        self.closed = False
+        self.cookies_cleared = False
+
+    def new_page(self):
+        page = StubPage(self)
+        self.pages.append(page)
+        return page
+
+    def clear_cookies(self):
+        self.cookies_cleared = True
+
+    def close(self):
+        self.closed = True
+
+
+class StubBrowser:
+
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = StubContext(options)
+        self.contexts.append(context)
+        return context
+
+
+def test_release_resets_and_reuses_page():
+    pool = PagePool(StubBrowser(), size=1, recycle_after=5, keep_login=True)
+    pool.warm()
+    entry = pool.acquire()
+    assert pool.lease_of(entry.page) is entry
+    entry.page.on('request', print)
+    BasePage(entry.page).accept_dialog()
+    entry.page.url = 'http://example.test/a'
+    entry.context.new_page()
+
+    pool.release(entry)
+    assert pool.lease_of(entry.page) is None
+    assert entry.page.listeners == [('request', print)]
+    assert entry.context.pages == [entry.page]
+    assert (entry.page.url, entry.page.evaluated) == ('about:blank', [False])
+    assert not entry.context.cookies_cleared
+    assert pool.acquire() is entry
+
+
+def test_failed_case_recycles_context():
+    browser = StubBrowser()
+    pool = PagePool(browser, size=1, recycle_after=5)
+    pool.warm()
+    entry = pool.acquire()
+    pool.release(entry, failed=True)
+    assert entry.context.closed
+    assert len(browser.contexts) == 2
+    assert pool.stats['recycled'] == 1
+
+
+def test_recycle_after_uses_and_clear_login():
+    browser = StubBrowser()
+    pool = PagePool(browser, size=1, recycle_after=2, keep_login=False,
+                    storage_state=lambda: 'state.json')
+    entry = pool.acquire()
+    entry.user = 'user'
+    pool.release(entry)
+    assert entry.context.cookies_cleared and entry.user is None
+    assert entry.context.options == {'storage_state': 'state.json'}
+    assert pool.acquire() is entry
+    pool.release(entry)
+    assert entry.context.closed and pool.stats['created'] == 2
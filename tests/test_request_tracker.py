@@ -0,0 +1,83 @@
+"""RequestTracker 的URL规则与请求计数（使用不依赖浏览器的桩页面）"""
+
+import pytest
+
+from base import RequestTracker as request_tracker_module
+from base.RequestTracker import RequestTracker, UrlRule
+
+
+class StubPage:
+    url = 'http://example.test/'
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+class StubRequest:
+
+    def __init__(self, url, resource_type='xhr'):
+        self.url = url
+        self.resource_type = resource_type
+
+
+PAGE_RULES = {
+    'http://example.test/': {'exclude': ['*/poll*']},
+    'http://example.test/search': {'include': ['*/api/*']},
+}
+
+
+@pytest.fixture
+def page():
+    return StubPage()
+
+
+def test_url_rule():
+    rule = UrlRule(include=['*/api/*'], exclude=['*/api/poll*'])
+    assert rule.matches('http://example.test/api/list')
+    assert not rule.matches('http://example.test/static/a.js')
+    assert not rule.matches('http://example.test/api/poll?t=1')
+    assert UrlRule().matches('anything')
+
+
+def test_longest_prefix_wins(page):
+    tracker = RequestTracker(page, page_rules=PAGE_RULES)
+    assert tracker.rule_for('http://example.test/search/list').include == ['*/api/*']
+    assert tracker.rule_for('http://example.test/home').exclude == ['*/poll*']
+    assert tracker.rule_for('http://other.test/').include == []
+
+
+def test_query_strings_share_cache_entry(page):
+    tracker = RequestTracker(page, page_rules=PAGE_RULES)
+    for n in range(50):
+        tracker.rule_for(f'http://example.test/search?q={n}#top')
+    assert list(tracker._rule_cache) == ['http://example.test/search']
+
+
+def test_prefix_with_query_matches_full_url(page):
+    tracker = RequestTracker(page, page_rules={'http://example.test/p?tab=a': {'include': ['*/a/*']}})
+    assert tracker.rule_for('http://example.test/p?tab=a').include == ['*/a/*']
+    assert tracker.rule_for('http://example.test/p?tab=b').include == []
+
+
+def test_rule_cache_bounded(page, monkeypatch):
+    monkeypatch.setattr(request_tracker_module, 'RULE_CACHE_SIZE', 3)
+    tracker = RequestTracker(page, page_rules=PAGE_RULES)
+    for n in range(10):
+        tracker.rule_for(f'http://example.test/item/{n}')
+    assert list(tracker._rule_cache) == [f'http://example.test/item/{n}' for n in (7, 8, 9)]
+
+
+def test_pending_requests(page):
+    tracker = RequestTracker(page, page_rules=PAGE_RULES)
+    page.url = 'http://example.test/search'
+    api, script = StubRequest('http://example.test/api/list'), StubRequest('http://example.test/a.js', 'script')
+    page.handlers['request'](api)
+    page.handlers['request'](script)
+    page.handlers['request'](StubRequest('http://example.test/other'))
+    assert tracker.pending_count == 1 and tracker.pending_urls() == [api.url]
+    page.handlers['requestfinished'](api)
+    assert tracker.pending_count == 0
+    assert tracker.is_idle(idle_ms=0)
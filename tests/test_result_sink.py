@@ -0,0 +1,127 @@
+"""结果文件的流式写入与读取"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from base import ResultSink as result_sink
+from base.ResultSink import ResultSink, get_result_sink, read_results, result_sink_dir
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = ResultSink(tmp_path / 'out' / 'results.jsonl', fsync_every=3, fsync_interval=3600)
+    yield sink
+    sink.close()
+
+
+class TestResultSink:
+
+    def test_write_and_read(self, sink):
+        sink.write({'type': 'step', 'step_num': 1, 'value': Path('a.png')})
+        sink.write({'type': 'case', 'case_name': '查询'})
+        sink.close()
+        assert read_results(sink.path) == [{'type': 'step', 'step_num': 1, 'value': 'a.png'},
+                                           {'type': 'case', 'case_name': '查询'}]
+        assert read_results(sink.path, 'case') == [{'type': 'case', 'case_name': '查询'}]
+
+    def test_open_truncates(self, tmp_path):
+        path = tmp_path / 'results.jsonl'
+        path.write_text('{"type": "old"}\n', encoding='utf-8')
+        ResultSink(path).close()
+        assert read_results(path) == []
+
+    def test_fsync_batching(self, sink):
+        for n in range(7):
+            sink.write({'n': n})
+        assert sink.stats == {'records': 7, 'fsyncs': 2}
+        sink.flush()
+        assert sink.stats['fsyncs'] == 3
+        sink.flush()
+        assert sink.stats['fsyncs'] == 3
+        assert len(read_results(sink.path)) == 7
+
+    def test_fsync_interval(self, tmp_path):
+        sink = ResultSink(tmp_path / 'results.jsonl', fsync_every=100, fsync_interval=0)
+        try:
+            sink.write({'n': 1})
+            sink.write({'n': 2})
+            assert sink.stats['fsyncs'] == 2
+        finally:
+            sink.close()
+
+    def test_fsync_every_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('UI_RESULT_FSYNC_EVERY', '5')
+        sink = ResultSink(tmp_path / 'results.jsonl')
+        sink.close()
+        assert sink.fsync_every == 5
+
+    def test_close_syncs_and_ignores_later_writes(self, sink):
+        sink.write({'n': 1})
+        sink.close()
+        assert sink.stats['fsyncs'] == 1
+        sink.write({'n': 2})
+        sink.close()
+        sink.flush()
+        assert read_results(sink.path) == [{'n': 1}]
+
+    def test_concurrent_writes_keep_lines_intact(self, sink):
+        def write(worker):
+            for n in range(200):
+                sink.write({'worker': worker, 'n': n})
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.close()
+        records = read_results(sink.path)
+        assert len(records) == sink.stats['records'] == 800
+        assert {(r['worker'], r['n']) for r in records} == {(w, n) for w in range(4) for n in range(200)}
+
+
+class TestReadResults:
+
+    def test_skips_partial_last_line(self, tmp_path):
+        path = tmp_path / 'results.jsonl'
+        path.write_text('{"type": "step", "n": 1}\n{"type": "case", "n": 2}\n{"type": "st', encoding='utf-8')
+        assert read_results(path) == [{'type': 'step', 'n': 1}, {'type': 'case', 'n': 2}]
+        assert read_results(path, 'step') == [{'type': 'step', 'n': 1}]
+
+
+class TestGetResultSink:
+
+    @pytest.fixture(autouse=True)
+    def _isolated_registry(self, monkeypatch):
+        monkeypatch.setattr(result_sink, '_SINKS', {})
+        yield
+        for sink in result_sink._SINKS.values():
+            sink.close()
+
+    @pytest.mark.parametrize('value, expected', [
+        ('', None), ('0', None), ('off', None), ('false', None),
+        ('1', result_sink.DEFAULT_RESULT_DIR), ('TRUE', result_sink.DEFAULT_RESULT_DIR),
+        ('out/results', Path('out/results')),
+    ])
+    def test_result_sink_dir(self, monkeypatch, value, expected):
+        monkeypatch.setenv('UI_RESULT_SINK', value)
+        assert result_sink_dir() == expected
+
+    def test_disabled_without_dir(self, monkeypatch):
+        monkeypatch.delenv('UI_RESULT_SINK', raising=False)
+        assert get_result_sink() is None
+
+    def test_one_sink_per_dir_and_worker(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+        sink = get_result_sink(tmp_path)
+        assert sink.path == tmp_path / 'results_gw1.jsonl'
+        assert get_result_sink(str(tmp_path)) is sink
+        monkeypatch.setenv('UI_RESULT_SINK', str(tmp_path))
+        assert get_result_sink() is sink
+        assert get_result_sink(tmp_path / 'other') is not sink
+
+    def test_main_process_file(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+        assert get_result_sink(tmp_path).path.name == 'results_main.jsonl'
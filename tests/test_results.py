@@ -0,0 +1,110 @@
+"""结果对象的字典兼容用法与汇总"""
+
+import pytest
+
+from base.Results import CaseResult, RunResult, StepResult
+
+
+def _step(step_num, success=True):
+    return StepResult(step_num, 'click', '//btn', None, None, success, '' if success else 'boom', 1.5)
+
+
+def _case(name, *successes):
+    steps = [_step(n, success) for n, success in enumerate(successes, 1)]
+    return CaseResult(name, name, all(successes), steps, '' if all(successes) else 'boom', 3)
+
+
+class TestMapping:
+
+    def test_item_access(self):
+        step = _step(1)
+        assert step['success'] is True
+        assert step.get('error_message') == ''
+        step['error_message'] = 'x'
+        assert step.error_message == 'x'
+
+    def test_unknown_key(self):
+        step = _step(1)
+        assert step.get('nope', 'default') == 'default'
+        assert 'nope' not in step
+        with pytest.raises(KeyError):
+            step['nope']
+        with pytest.raises(KeyError, match='nope'):
+            step['nope'] = 1
+
+    def test_keys_match_original_dict(self):
+        assert list(_step(1)) == ['step_num', 'action', 'selector', 'value', 'expected', 'success',
+                                  'error_message', 'duration_ms']
+        assert list(_case('a', True)) == ['case_name', 'input_value', 'success', 'steps', 'error_message', 'duration_ms']
+        assert list(RunResult()) == ['success', 'test_cases', 'total_success', 'total_failed', 'error_message',
+                                     'duration_ms']
+
+    def test_optional_keys(self):
+        result = RunResult.from_cases([_case('a', True)])
+        assert 'prefix_steps' not in result and result.get('prefix_steps') is None
+        with pytest.raises(KeyError):
+            result['result_file']
+        result.prefix_steps = [_step(1)]
+        result['result_file'] = 'results.jsonl'
+        assert 'prefix_steps' in result
+        assert list(result)[-2:] == ['prefix_steps', 'result_file']
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            _step(1).extra = 1
+
+    def test_to_dict_nested(self):
+        result = RunResult.from_cases([_case('a', True, False)])
+        result.prefix_steps = [_step(1)]
+        data = result.to_dict()
+        assert type(data) is dict
+        assert type(data['test_cases'][0]) is dict
+        assert type(data['test_cases'][0]['steps'][1]) is dict
+        assert data['test_cases'][0]['steps'][1]['error_message'] == 'boom'
+        assert data['prefix_steps'] == [dict(_step(1).items())]
+        assert dict(result.items())['test_cases'] is result.test_cases
+
+
+class TestCaseResult:
+
+    def test_failed(self):
+        case = CaseResult.failed('c', 'x', '未找到')
+        assert (case.success, case.steps, case.error_message, case.executed_steps) == (False, [], '未找到', 0)
+
+    def test_compact(self):
+        case = _case('a', True, False, True)
+        compact = case.compact()
+        assert [step.step_num for step in compact.steps] == [2]
+        assert compact.step_count == compact.executed_steps == 3
+        assert 'step_count' in compact and 'step_count' not in case
+        # 原结果不变
+        assert len(case.steps) == 3
+
+    def test_summary_dict(self):
+        assert _case('a', True, False).compact().summary_dict() == {
+            'case_name': 'a', 'input_value': 'a', 'success': False, 'error_message': 'boom', 'duration_ms': 3,
+            'step_count': 2}
+
+    def test_failed_steps(self):
+        assert [step.step_num for step in _case('a', False, True, False).failed_steps()] == [1, 3]
+
+
+class TestRunResult:
+
+    def test_from_cases(self):
+        result = RunResult.from_cases([_case('a', True), _case('b', False), _case('c', True)])
+        assert (result.success, result.total_success, result.total_failed) == (False, 2, 1)
+        assert [case.case_name for case in result.failed_cases()] == ['b']
+
+    def test_from_no_cases(self):
+        result = RunResult.from_cases([], 'empty')
+        assert (result.success, result.total_success, result.total_failed, result.error_message) == (True, 0, 0, 'empty')
+
+    def test_failed(self):
+        result = RunResult.failed('boom', 12)
+        assert (result.success, result.test_cases, result.error_message, result.duration_ms) == (False, [], 'boom', 12)
+
+    def test_step_totals(self):
+        result = RunResult.from_cases([_case('a', True, True), _case('b', True, False).compact()])
+        assert result.step_count() == 4
+        assert [step.step_num for step in result.iter_steps()] == [1, 2, 2]
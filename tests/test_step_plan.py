@@ -0,0 +1,224 @@
+"""StepPlan 中不依赖浏览器的解析与变体展开"""
+
+from itertools import combinations, product
+
+import pytest
+from loguru import logger
+
+from base.StepPlan import (checkpoint_mode, checkpoint_unsafe_steps, common_prefix_length, expand_matrix, generate_test_cases, matrix_options,
+                           pairwise_combinations, parse_step, sample_combinations, variant_id, variant_ids)
+
+
+class TestParseStep:
+
+    def test_scalar_params(self):
+        assert parse_step({'click': 'Path(P.M.btn)'}) == ('click', 'Path(P.M.btn)', None, None)
+
+    def test_scalar_params_with_sibling_value(self):
+        # select: xxx + value: yyy
+        step = {'select': 'Path(P.M.box)', 'value': 'abc', 'expected': 'x'}
+        assert parse_step(step) == ('select', 'Path(P.M.box)', 'abc', 'x')
+
+    def test_wait_scalar_is_value(self):
+        assert parse_step({'wait': 500}) == ('wait', None, 500, None)
+
+    def test_dict_params_use_action_key(self):
+        step = {'click': {'click': 'Path(P.M.btn)', 'selector': 'ignored'}}
+        assert parse_step(step)[1] == 'Path(P.M.btn)'
+
+    def test_dict_params_fallback_keys(self):
+        for key in ('element', 'target', 'locator'):
+            assert parse_step({'hover': {key: 'Path(P.M.x)'}})[1] == 'Path(P.M.x)'
+
+    def test_input_dict_reads_selector(self):
+        step = {'input': {'selector': 'Path(P.M.box)', 'value': 'abc'}}
+        assert parse_step(step) == ('input', 'Path(P.M.box)', 'abc', None)
+
+    def test_clear_and_input_dict_reads_selector(self):
+        step = {'clear_and_input': {'selector': 'Path(P.M.box)', 'value': 'abc'}}
+        assert parse_step(step) == ('clear_and_input', 'Path(P.M.box)', 'abc', None)
+
+    def test_assert_dict_reads_selector(self):
+        # 与原 _execute_steps_with_details 一致（旧的 _execute_steps 只对 input 读取 selector）
+        step = {'assert': {'selector': 'Path(P.M.msg)', 'expected': 'visible'}}
+        assert parse_step(step) == ('assert', 'Path(P.M.msg)', None, 'visible')
+
+    def test_assert_dict_still_accepts_element(self):
+        step = {'assert': {'element': 'Path(P.M.msg)', 'expected': 'text_contains', 'value': 'ok'}}
+        assert parse_step(step) == ('assert', 'Path(P.M.msg)', 'ok', 'text_contains')
+
+    def test_take_screenshot_dict_returns_options_as_value(self):
+        step = {'take_screenshot': {'selector': 'Path(P.M.panel)', 'path': 'a.png', 'full_page': True}}
+        action, element_path, value, expected = parse_step(step)
+        assert (action, element_path, expected) == ('take_screenshot', 'Path(P.M.panel)', None)
+        assert value == step['take_screenshot']
+
+    def test_take_screenshot_scalar_is_path(self):
+        assert parse_step({'take_screenshot': 'a.png'}) == ('take_screenshot', 'a.png', None, None)
+
+
+def _search_case(values):
+    return {'case_name': 'search', 'steps': [
+        {'navigate': 'home'},
+        {'input': {'selector': 'Path(P.M.box)', 'value': values}},
+        {'click': 'Path(P.M.btn)'},
+    ]}
+
+
+class TestVariantIds:
+
+    def test_variant_id_from_input_value(self):
+        assert variant_id(0, 'a b/c') == 'a_b_c'
+        assert variant_id(2, '') == 'variant3'
+        assert variant_id(1, None) == 'variant2'
+        assert len(variant_id(0, 'x' * 100)) == 60
+
+    def test_list_values_expand(self):
+        assert variant_ids('c', _search_case(['abc', 'de f'])) == ['abc', 'de_f']
+
+    def test_single_variant_not_expanded(self):
+        assert variant_ids('c', _search_case('abc')) == []
+        assert variant_ids('c', _search_case(['abc'])) == []
+
+    def test_data_source_not_expanded(self):
+        assert variant_ids('c', _search_case({'source': 'missing.csv'})) == []
+
+    def test_ids_match_generated_variants(self):
+        case = _search_case(['x', 'y', 'z'])
+        generated = generate_test_cases('c', case, quiet=True)
+        assert variant_ids('c', case) == [variant_id(i, v['input_value']) for i, v in enumerate(generated)]
+        assert [v['case_name'] for v in generated] == ['search_1', 'search_2', 'search_3']
+
+    def test_collection_logs_below_info(self):
+        messages = []
+        sink = logger.add(messages.append, level='INFO')
+        try:
+            variant_ids('c', _search_case([str(i) for i in range(50)]))
+        finally:
+            logger.remove(sink)
+        assert messages == []
+
+
+def _covered_pairs(axes, combos):
+    """组合中未覆盖的取值对"""
+    missing = set()
+    for i, j in combinations(range(len(axes)), 2):
+        seen = {(combo[i], combo[j]) for combo in combos}
+        missing |= {(i, a, j, b) for a in axes[i] for b in axes[j] if (a, b) not in seen}
+    return missing
+
+
+def _matrix(axes, config=None):
+    return list(expand_matrix(axes, matrix_options({'matrix': config})))
+
+
+class TestMatrix:
+
+    def test_product_order(self):
+        assert _matrix([[1, 2], ['a', 'b']]) == [(1, 'a'), (1, 'b'), (2, 'a'), (2, 'b')]
+
+    def test_zip(self):
+        assert _matrix([[1, 2, 3], ['a', 'b', 'c']], 'zip') == [(1, 'a'), (2, 'b'), (3, 'c')]
+
+    def test_zip_uneven_uses_shortest(self):
+        assert _matrix([[1, 2, 3], ['a']], 'zip') == [(1, 'a')]
+
+    @pytest.mark.parametrize('sizes', [(2, 2), (3, 3, 3), (4, 3, 2, 2), (5, 5, 5, 5, 5)])
+    def test_pairwise_covers_every_pair(self, sizes):
+        axes = [[f'{k}{v}' for v in range(size)] for k, size in enumerate(sizes)]
+        combos = list(pairwise_combinations(axes))
+        assert _covered_pairs(axes, combos) == set()
+        assert len(combos) <= len(list(product(*axes)))
+        assert len(set(combos)) == len(combos)
+
+    def test_pairwise_smaller_than_product(self):
+        axes = [list(range(3))] * 4
+        assert len(list(pairwise_combinations(axes))) < 81
+
+    def test_pairwise_deterministic(self):
+        axes = [list(range(4)), list('abc'), [True, False]]
+        assert list(pairwise_combinations(axes)) == list(pairwise_combinations(axes))
+
+    def test_pairwise_single_axis(self):
+        assert list(pairwise_combinations([[1, 2]])) == [(1,), (2,)]
+
+    def test_limit(self):
+        assert _matrix([[1, 2], ['a', 'b']], {'limit': 3}) == [(1, 'a'), (1, 'b'), (2, 'a')]
+        assert len(_matrix([list(range(4))] * 3, {'mode': 'pairwise', 'limit': 5})) == 5
+
+    @pytest.mark.parametrize('mode', ['product', 'zip', 'pairwise'])
+    def test_sample_is_subset_in_order(self, mode):
+        axes = [list(range(6)), list(range(6))]
+        full = _matrix(axes, mode)
+        sampled = _matrix(axes, {'mode': mode, 'sample': 4, 'seed': 7})
+        assert len(sampled) == 4
+        assert sampled == [combo for combo in full if combo in sampled]
+
+    @pytest.mark.parametrize('mode', ['product', 'zip', 'pairwise'])
+    def test_sample_seed_determinism(self, mode):
+        axes = [list(range(10)), list(range(10))]
+        first = list(sample_combinations(axes, mode, 5, seed='run-1'))
+        assert first == list(sample_combinations(axes, mode, 5, seed='run-1'))
+        assert any(list(sample_combinations(axes, mode, 5, seed=seed)) != first for seed in range(5))
+
+    def test_sample_larger_than_total(self):
+        assert _matrix([[1, 2], ['a']], {'sample': 10}) == [(1, 'a'), (2, 'a')]
+
+    def test_sample_then_limit(self):
+        assert len(_matrix([list(range(10))] * 2, {'sample': 8, 'limit': 3})) == 3
+
+    @pytest.mark.parametrize('config', [None, 'zip', 'pairwise', {'sample': 3}, {'mode': 'pairwise', 'sample': 3}])
+    def test_empty_values_give_no_variants(self, config):
+        assert _matrix([[1, 2], [], ['a']], config) == []
+
+    def test_clear_and_input_axis(self):
+        case = _search_case(['a', 'b'])
+        case['steps'].append({'clear_and_input': {'selector': 'Path(P.M.other)', 'value': ['x', 'y']}})
+        variants = generate_test_cases('c', case, quiet=True)
+        assert len(variants) == 4
+        assert [parse_step(variant['steps'][3])[1:3] for variant in variants[:2]] == [
+            ('Path(P.M.other)', 'x'), ('Path(P.M.other)', 'y')]
+
+    def test_empty_values_generate_no_cases(self):
+        case = _search_case([])
+        case['steps'].append({'input': {'selector': 'Path(P.M.other)', 'value': ['a', 'b']}})
+        assert generate_test_cases('c', case, quiet=True) == []
+
+    def test_matrix_options(self):
+        assert matrix_options({}) == {'mode': 'product', 'limit': None, 'sample': None, 'seed': 0}
+        assert matrix_options({'matrix': {'mode': 'ZIP', 'limit': '5'}})['limit'] == 5
+        with pytest.raises(ValueError, match='matrix'):
+            matrix_options({'matrix': 'random'})
+
+
+class TestCheckpoint:
+
+    def test_checkpoint_mode(self, monkeypatch):
+        monkeypatch.delenv('UI_VARIANT_CHECKPOINT', raising=False)
+        assert checkpoint_mode() == 'off'
+        assert checkpoint_mode(True) == 'state'
+        assert checkpoint_mode(False) == 'off'
+        assert checkpoint_mode('PAGE') == 'page'
+        monkeypatch.setenv('UI_VARIANT_CHECKPOINT', 'page')
+        assert checkpoint_mode() == 'page'
+        assert checkpoint_mode('off') == 'off'
+        with pytest.raises(ValueError, match='checkpoint'):
+            checkpoint_mode('dom')
+
+    def test_common_prefix_length(self):
+        assert common_prefix_length(_search_case(['a', 'b'])) == 1
+        assert common_prefix_length({'steps': [{'click': 'Path(P.M.btn)'}]}) == 0
+
+    def test_safe_prefix(self):
+        case = _search_case(['a', 'b'])
+        case['steps'][1:1] = [{'wait_for_element': 'Path(P.M.box)'}, {'assert_element_is_visible': 'Path(P.M.box)'},
+                              {'assert': {'selector': 'Path(P.M.box)', 'expected': 'visible'}}, {'wait': 200}]
+        assert checkpoint_unsafe_steps(case) == ()
+
+    def test_unsafe_prefix(self):
+        case = _search_case(['a', 'b'])
+        case['steps'][1:1] = [{'click': 'Path(P.M.open)'}, {'execute_script': {'execute_script': 'x', 'value': '1'}}]
+        assert checkpoint_unsafe_steps(case) == ('步骤2 click', '步骤3 execute_script')
+
+    def test_steps_after_parameterized_step_ignored(self):
+        assert checkpoint_unsafe_steps(_search_case(['a', 'b'])) == ()
@@ -0,0 +1,50 @@
+"""固定等待替换为条件等待的统计与开关"""
+
+import pytest
+
+from utils import wait_savings
+from utils.wait_savings import LEGACY_SLEEPS_ENV, WaitSavings, legacy_sleeps_enabled, set_legacy_sleeps
+
+
+@pytest.fixture(autouse=True)
+def reset_legacy_sleeps(monkeypatch):
+    monkeypatch.delenv(LEGACY_SLEEPS_ENV, raising=False)
+    yield
+    set_legacy_sleeps(None)
+
+
+def test_record_and_merge():
+    savings = WaitSavings()
+    savings.record('input', 0.2, 0.05)
+    savings.record('input', 0.2, 0.3)
+    savings.merge({'input': (1, 0.1), 'enter': (2, 0.4)})
+    stats = savings.snapshot()
+    assert stats['input'][0] == 3 and stats['input'][1] == pytest.approx(0.15)
+    assert stats['enter'] == (2, 0.4)
+    assert savings.total_saved == pytest.approx(0.55)
+    savings.clear()
+    assert savings.snapshot() == {}
+
+
+def test_measure_records_on_exception(monkeypatch):
+    ticks = iter([10.0, 10.25])
+    monkeypatch.setattr(wait_savings.time, 'monotonic', lambda: next(ticks))
+    savings = WaitSavings()
+    with pytest.raises(RuntimeError):
+        with savings.measure('login_submit', 1):
+            raise RuntimeError('登录失败')
+    assert savings.snapshot()['login_submit'] == (1, 0.75)
+
+
+@pytest.mark.parametrize('value, expected', [('', False), ('1', True), ('true', True), ('off', False)])
+def test_legacy_sleeps_env(monkeypatch, value, expected):
+    monkeypatch.setenv(LEGACY_SLEEPS_ENV, value)
+    assert legacy_sleeps_enabled() is expected
+
+
+def test_set_legacy_sleeps_overrides_env(monkeypatch):
+    monkeypatch.setenv(LEGACY_SLEEPS_ENV, '1')
+    set_legacy_sleeps(False)
+    assert legacy_sleeps_enabled() is False
+    set_legacy_sleeps(None)
+    assert legacy_sleeps_enabled() is True
@@ -0,0 +1,67 @@
+"""YAML 文件缓存"""
+
+import os
+import pickle
+
+from utils.yaml_loader import DISK_CACHE_VERSION, YamlFileCache, safe_load
+
+
+def _touch(path, seconds=1):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def test_safe_load():
+    assert safe_load("a:\n  - 1\n  - x\n") == {'a': [1, 'x']}
+
+
+def test_cache_hit_until_file_changes(tmp_path):
+    path = tmp_path / 'case.yaml'
+    path.write_text("a: 1\n", encoding='utf-8')
+    cache = YamlFileCache(disk_cache=False)
+    first = cache.load(path)
+    assert first == {'a': 1}
+    assert cache.load(str(path)) is first
+
+    path.write_text("a: 2\n", encoding='utf-8')
+    _touch(path)
+    assert cache.load(path) == {'a': 2}
+
+
+def test_clear(tmp_path):
+    path = tmp_path / 'case.yaml'
+    path.write_text("a: 1\n", encoding='utf-8')
+    cache = YamlFileCache(disk_cache=False)
+    first = cache.load(path)
+    cache.clear()
+    assert cache.load(path) is not first
+
+
+def test_disk_cache_written_and_reused(tmp_path):
+    path = tmp_path / 'case.yaml'
+    path.write_text("a: 1\n", encoding='utf-8')
+    YamlFileCache(disk_cache=True).load(path)
+    cache_path = YamlFileCache.disk_cache_path(str(path))
+    assert os.path.basename(cache_path) == '.case.yaml.cache.pkl'
+    with open(cache_path, 'rb') as f:
+        cached = pickle.load(f)
+    assert cached['version'] == DISK_CACHE_VERSION and cached['data'] == {'a': 1}
+
+    # 新进程（新的缓存实例）从磁盘缓存读取，不解析YAML
+    cached['data'] = {'a': 'from-pickle'}
+    with open(cache_path, 'wb') as f:
+        pickle.dump(cached, f)
+    assert YamlFileCache(disk_cache=True).load(path) == {'a': 'from-pickle'}
+
+
+def test_stale_or_corrupt_disk_cache_ignored(tmp_path):
+    path = tmp_path / 'case.yaml'
+    path.write_text("a: 1\n", encoding='utf-8')
+    YamlFileCache(disk_cache=True).load(path)
+    path.write_text("a: 22\n", encoding='utf-8')
+    _touch(path)
+    assert YamlFileCache(disk_cache=True).load(path) == {'a': 22}
+
+    with open(YamlFileCache.disk_cache_path(str(path)), 'wb') as f:
+        f.write(b'not a pickle')
+    assert YamlFileCache(disk_cache=True).load(path) == {'a': 22}
@@ -1,21 +1,66 @@
 import time
 
-from playwright.sync_api import Page
+from loguru import logger
+from playwright.sync_api import Page, TimeoutError
 from utils.config_reader import WebUIConfReader
+from utils.wait_savings import WAIT_SAVINGS, legacy_sleeps_enabled
+
+
+# 提交登录后的结果：登录表单被移除为成功，出现可见的错误提示时返回提示文本
+LOGIN_RESULT_SCRIPT = """(errorSelector) => {
+    if (!document.querySelector('input[type="password"]')) return {success: true};
+    const error = errorSelector
+        ? [...document.querySelectorAll(errorSelector)].find(el => el.getClientRects().length && el.textContent.trim())
+        : null;
+    return error ? {success: false, message: error.textContent.trim()} : false;
+}"""
 
 
 class LoginPage:
     def __init__(self, base_url, page: Page):
         self.base_url = base_url
         self.page = page
-        self.pages = (WebUIConfReader().config)["pages"]
+        config = WebUIConfReader().config
+        self.pages = config["pages"]
+        # 登录错误提示（用户名或密码错误等）的选择器，出现时立即失败
+        self.error_selector = config.get('login', {}).get('error_selector', '')
         self.s = lambda css: self.page.query_selector(css)
 
-    def login(self, username, password):
+    def login(self, username, password, timeout=10000):
         self.page.goto(self.base_url)
-        time.sleep(1)
-        self.page.locator('input[type="text"]').first.fill(username)
-        self.page.locator('input[type="password"]').fill(password)
-        self.page.locator('input[type="password"]').press('Enter')
-        time.sleep(1)
-        return self.page 
\ No newline at end of file
+        username_input = self.page.locator('input[type="text"]').first
+        password_input = self.page.locator('input[type="password"]')
+        if legacy_sleeps_enabled():
+            time.sleep(1)
+        else:
+            with WAIT_SAVINGS.measure('login_page', 1):
+                username_input.wait_for(state='visible', timeout=timeout)
+        username_input.fill(username)
+        password_input.fill(password)
+        password_input.press('Enter')
+        if legacy_sleeps_enabled():
+            time.sleep(1)
+        else:
+            with WAIT_SAVINGS.measure('login_submit', 1):
+                self._wait_for_login_redirect(timeout)
+        return self.page
+
+    def _wait_for_login_redirect(self, timeout):
+        """
+        登录成功后登录表单被移除（跳转或路由切换）；页面出现登录错误提示时立即失败，不等待到超时
+
+        Raises:
+            RuntimeError: 登录失败（页面显示错误提示）
+        """
+        try:
+            handle = self.page.wait_for_function(LOGIN_RESULT_SCRIPT, arg=self.error_selector, timeout=timeout)
+        except TimeoutError:
+            logger.warning(f"等待登录跳转超时，当前页面: {self.page.url}")
+            return
+        result = handle.json_value()
+        if not result['success']:
+            raise RuntimeError(f"登录失败: {result['message']}")
+        try:
+            self.page.wait_for_load_state(timeout=timeout)
+        except TimeoutError:
+            logger.warning(f"等待登录跳转超时，当前页面: {self.page.url}")
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+
+# 缓存内存预算（MB），估算的缓存总大小超过预算时淘汰最近最少使用的文件
+CONFIG_CACHE_BUDGET_ENV = 'UI_CONFIG_CACHE_MB'
+DEFAULT_BUDGET_MB = 256
+# 解析后的Python对象（JSON/YAML/INI）按文件大小的倍数估算占用内存
+OBJECT_SIZE_FACTOR = 8
+
+
+def estimate_size(value: Any, file_size: int) -> int:
+    """
+    估算缓存对象占用的内存：DataFrame 按 memory_usage(deep=True)，其他对象按文件大小估算
+    """
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return max(file_size, 1) * OBJECT_SIZE_FACTOR
+
+
+class ConfigFileCache:
+    """
+    进程级配置文件缓存
+    按 (路径, 读取方式, 读取参数) 缓存解析结果，文件 mtime 或大小变化后重新读取；
+    估算的缓存总大小超过内存预算时按最近最少使用（LRU）淘汰，单个超过预算的结果不缓存
+
+    注意: 返回的对象在调用方之间共享，应视为只读
+    """
+
+    def __init__(self, budget_mb: int = None):
+        if budget_mb is None:
+            budget_mb = int(os.environ.get(CONFIG_CACHE_BUDGET_ENV) or DEFAULT_BUDGET_MB)
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries: 'OrderedDict[Tuple, Tuple[Tuple[int, int], Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: Union[str, Path], kind: str, loader: Callable[[str], Any],
+            options: Tuple[Hashable, ...] = ()) -> Any:
+        """
+        读取文件，缓存有效时直接返回缓存的结果
+
+        Args:
+            file_path: 文件路径
+            kind: 读取方式，如 'yaml'、'json'、'ini'、'excel'
+            loader: loader(绝对路径)，缓存无效时调用
+            options: 影响读取结果的参数（编码、sheet 等），作为缓存键的一部分
+
+        Returns:
+            loader 的返回值
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (abs_path, kind, options)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+
+        # 解析（如大的Excel）不持有锁，其他文件的读取不受影响
+        value = loader(abs_path)
+        size = estimate_size(value, stat.st_size)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            if size <= self.budget_bytes:
+                self._entries[key] = (signature, value, size)
+                self.total_bytes += size
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.budget_bytes and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def invalidate(self, file_path: Union[str, Path]) -> None:
+        """删除指定文件的全部缓存"""
+        abs_path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == abs_path]:
+                self.total_bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        """缓存状态：文件数、估算大小、命中/未命中/淘汰次数"""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.total_bytes,
+                    'budget_bytes': self.budget_bytes, **self.stats}
+
+
+CONFIG_FILE_CACHE = ConfigFileCache()
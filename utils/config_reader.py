@@ -8,12 +8,17 @@ import configparser
 from pathlib import Path
 import pandas as pd
 from typing import Any, Dict, List, Union, Optional
+from utils.config_cache import CONFIG_FILE_CACHE
+from utils.yaml_loader import safe_load
 
 
 class ConfigReader:
     """
     统一的配置数据读取工具类
     支持从JSON、YAML、INI配置文件和Excel文件中获取数据
+
+    解析结果保存在进程级缓存中（utils/config_cache.py），文件修改后自动重新读取，
+    返回的JSON/YAML数据在调用方之间共享，应视为只读
     """
     
     def __init__(self, base_path: Optional[Union[str, Path]] = None):
@@ -29,10 +34,12 @@ class ConfigReader:
         """
         full_path = self._get_full_path(file_path)
         
+        def load(path: str) -> Any:
+            with open(path, 'r', encoding=encoding) as f:
+                return json.load(f)
+        
         try:
-            with open(full_path, 'r', encoding=encoding) as f:
-                data = json.load(f)
-            return data
+            return CONFIG_FILE_CACHE.get(full_path, 'json', load, (encoding,))
         except FileNotFoundError:
             raise FileNotFoundError(f"JSON文件不存在: {full_path}")
         except json.JSONDecodeError as e:
@@ -44,10 +51,12 @@ class ConfigReader:
         """
         full_path = self._get_full_path(file_path)
         
+        def load(path: str) -> Any:
+            with open(path, 'r', encoding=encoding) as f:
+                return safe_load(f.read())
+        
         try:
-            with open(full_path, 'r', encoding=encoding) as f:
-                data = yaml.safe_load(f.read())
-            return data
+            return CONFIG_FILE_CACHE.get(full_path, 'yaml', load, (encoding,))
         except FileNotFoundError:
             raise FileNotFoundError(f"YAML文件不存在: {full_path}")
         except yaml.YAMLError as e:
@@ -69,15 +78,7 @@ class ConfigReader:
         Raises:
             KeyError: section或key不存在
         """
-        full_path = self._get_full_path(file_path)
-        
-        try:
-            config = configparser.ConfigParser()
-            config.read(full_path, encoding=encoding)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"INI文件不存在: {full_path}")
-        except configparser.Error as e:
-            raise configparser.Error(f"INI格式错误: {e}")
+        config = self._load_ini_parser(file_path, encoding)
 
         if not config.has_section(section):
             raise KeyError(f"配置节不存在: {section}")
@@ -87,11 +88,37 @@ class ConfigReader:
         
         return config.get(section, key)
     
+    def load_ini(self, file_path: Union[str, Path], encoding: str = 'utf-8') -> Dict[str, Dict[str, str]]:
+        """
+        从INI、CONF配置文件中获取全部配置 {section: {key: value}}，键名为小写（ConfigParser 的 optionxform）
+        """
+        config = self._load_ini_parser(file_path, encoding)
+        return {name: dict(config.items(name)) for name in config.sections()}
+
+    def _load_ini_parser(self, file_path: Union[str, Path], encoding: str = 'utf-8') -> configparser.ConfigParser:
+        """
+        读取INI、CONF配置文件，解析后的 ConfigParser 按文件缓存（调用方共享，不要修改），
+        键名大小写、DEFAULT节和插值仍由 ConfigParser 处理
+        """
+        full_path = self._get_full_path(file_path)
+
+        def load(path: str) -> configparser.ConfigParser:
+            config = configparser.ConfigParser()
+            config.read(path, encoding=encoding)
+            return config
+
+        try:
+            return CONFIG_FILE_CACHE.get(full_path, 'ini', load, (encoding,))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"INI文件不存在: {full_path}")
+        except configparser.Error as e:
+            raise configparser.Error(f"INI格式错误: {e}")
+    
     def get_ini_conf_list(self, file_path: Union[str, Path], section: str, key: str, encoding: str = 'utf-8') -> List[str]:
         """
         从INI、CONF配置文件中获取列表格式的值
         """
-        value = self.get_ini_value(file_path, section, key, encoding)
+        value = self.get_ini_conf(file_path, section, key, encoding)
         # 移除方括号并分割
         clean_value = value.strip('[]')
         return [item.strip() for item in clean_value.split(',')]
@@ -101,17 +128,17 @@ class ConfigReader:
                    usecols: Optional[Union[str, List[str], List[int]]] = None) -> pd.DataFrame:
         """
         从Excel文件中获取数据
+        返回缓存的 DataFrame 的浅拷贝，新增/替换列不会影响缓存，不要原地修改单元格
         """
         full_path = self._get_full_path(file_path)
         
+        def load(path: str) -> pd.DataFrame:
+            return pd.read_excel(path, sheet_name=sheet_name, header=header, usecols=usecols)
+        
+        options = tuple(self._hashable(value) for value in (sheet_name, header, usecols))
         try:
-            df = pd.read_excel(
-                full_path,
-                sheet_name=sheet_name,
-                header=header,
-                usecols=usecols
-            )
-            return df
+            df = CONFIG_FILE_CACHE.get(full_path, 'excel', load, options)
+            return df.copy(deep=False) if isinstance(df, pd.DataFrame) else df
         except FileNotFoundError:
             raise FileNotFoundError(f"Excel文件不存在: {full_path}")
         except Exception as e:
@@ -152,6 +179,11 @@ class ConfigReader:
         
         return data[page_name][module_name]
     
+    @staticmethod
+    def _hashable(value: Any) -> Any:
+        """读取参数转换为可作为缓存键的形式"""
+        return tuple(value) if isinstance(value, list) else value
+    
     def _get_full_path(self, file_path: Union[str, Path]) -> Path:
         """
         获取文件的完整路径
@@ -205,9 +237,46 @@ class WebUIConfReader:
         }
         if config.has_section('pages'):
             web_ui_config['pages'] = dict(config.items('pages'))
+        if config.has_section('request_tracker'):
+            web_ui_config['request_tracker'] = self._read_request_tracker(config, web_ui_config.get('pages', {}))
+        web_ui_config['login'] = {
+            'cache': config.getboolean('login', 'cache', fallback=False),
+            'ttl': config.getint('login', 'ttl', fallback=1800),
+            'error_selector': ', '.join(item.strip() for item in config.get('login', 'error_selector', fallback='').split('||')
+                                        if item.strip()),
+        }
         
         return web_ui_config
 
+    @staticmethod
+    def _read_request_tracker(config: configparser.ConfigParser, pages: Dict[str, str]) -> Dict[str, Any]:
+        """
+        读取[request_tracker]配置，按页面配置的规则转换为 {页面URL: {'include': [...], 'exclude': [...]}}
+        """
+        section = config['request_tracker']
+
+        def patterns(value: str) -> List[str]:
+            return [item.strip() for item in value.split('||') if item.strip()]
+
+        tracker_config = {
+            'enable': section.getboolean('enable', fallback=True),
+            'resource_types': patterns(section.get('resource_types', 'xhr||fetch')),
+            'idle_ms': section.getint('idle_ms', fallback=100),
+            'timeout': section.getint('timeout', fallback=30000),
+            'include': patterns(section.get('include', '')),
+            'exclude': patterns(section.get('exclude', '')),
+            'page_rules': {},
+        }
+        for key, value in section.items():
+            page_name, sep, kind = key.rpartition('.')
+            if not sep or kind not in ('include', 'exclude'):
+                continue
+            if page_name not in pages:
+                raise KeyError(f"request_tracker 配置的页面不存在: {page_name}")
+            rule = tracker_config['page_rules'].setdefault(pages[page_name], {'include': [], 'exclude': []})
+            rule[kind] = patterns(value)
+        return tracker_config
+
 
 # 使用示例
 if __name__ == '__main__':
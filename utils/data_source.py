@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+外部数据源
+YAML 用例的 input value 可以引用外部文件代替内联的值列表，例如
+    value: {source: data/users.xlsx, sheet: 0, column: name}
+支持 Excel（xlsx/xlsm）、CSV、JSONL 和 Parquet，逐行读取（openpyxl read_only、csv 模块、按行读取 JSONL、
+pyarrow 按批读取），变体在执行时逐条生成，读取和编译变体的内存占用不随行数增长。
+
+执行结果仍按变体保存在返回的 RunResult 中：未开启结果流式写入时保存每个变体的全部步骤结果，内存随行数增长；
+需要接近恒定的内存时设置 UI_RESULT_SINK（见 base/ResultSink.py），步骤明细写入结果文件，每个变体只保留
+一条摘要（并行执行时另按序号保存各变体的用例名和输入值）
+"""
+
+import csv
+import json
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from openpyxl import load_workbook
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+# 扩展名 -> 数据源格式
+SOURCE_FORMATS = {'.xlsx': 'excel', '.xlsm': 'excel', '.csv': 'csv', '.tsv': 'csv',
+                  '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+# Parquet 每批读取的行数
+PARQUET_BATCH_SIZE = 1024
+
+
+def is_data_source(value: Any) -> bool:
+    """input value 是否为外部数据源引用（包含 source 的字典）"""
+    return isinstance(value, dict) and 'source' in value
+
+
+def resolve_source_path(source: Union[str, Path], base_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    数据源文件路径：相对路径依次按 YAML 文件所在目录、项目根目录、当前目录查找
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    path = Path(source)
+    if path.is_absolute():
+        candidates = [path]
+    else:
+        candidates = [Path(directory) / path for directory in (base_dir, PROJECT_ROOT, Path.cwd()) if directory]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"数据源文件不存在: {source}")
+
+
+def source_format(spec: Dict[str, Any], path: Path) -> str:
+    """数据源格式：spec 中的 format 优先，否则按扩展名判断"""
+    fmt = (spec.get('format') or SOURCE_FORMATS.get(path.suffix.lower(), '')).lower()
+    if fmt not in ('excel', 'csv', 'jsonl', 'parquet'):
+        raise ValueError(f"不支持的数据源格式: {path.name}，可选格式: excel(xlsx)、csv、jsonl、parquet")
+    return fmt
+
+
+def describe_source(spec: Dict[str, Any]) -> str:
+    """数据源的简短描述，用于日志"""
+    parts = [str(spec.get('source'))]
+    for key in ('sheet', 'column'):
+        if spec.get(key) is not None:
+            parts.append(f"{key}={spec[key]}")
+    return ', '.join(parts)
+
+
+def _column_index(column: Any, header: Optional[Sequence[Any]]) -> int:
+    """列名或列序号（从0开始）-> 列序号，未指定列时取第一列"""
+    if column is None:
+        return 0
+    if isinstance(column, int):
+        return column
+    if header is None:
+        raise ValueError(f"数据源没有表头，column 需要使用列序号: {column}")
+    names = [str(name).strip() if name is not None else '' for name in header]
+    if str(column) not in names:
+        raise KeyError(f"数据源中不存在列: {column}，可选列: {names}")
+    return names.index(str(column))
+
+
+def _select(rows: Iterator[Sequence[Any]], column: Any, header: bool) -> Iterator[Any]:
+    """从逐行读取的记录中取出指定列，跳过空单元格"""
+    names = next(rows, None) if header else None
+    index = _column_index(column, names)
+    for row in rows:
+        value = row[index] if index < len(row) else None
+        if value is None or value == '':
+            continue
+        yield value
+
+
+def _iter_excel(path: Path, spec: Dict[str, Any]) -> Iterator[Any]:
+    # read_only 模式按需解析工作表XML，不加载整个工作簿
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = spec.get('sheet', 0)
+        worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+        yield from _select(worksheet.iter_rows(values_only=True), spec.get('column'), spec.get('header', True))
+    finally:
+        workbook.close()
+
+
+def _iter_csv(path: Path, spec: Dict[str, Any]) -> Iterator[Any]:
+    delimiter = spec.get('delimiter') or ('\t' if path.suffix.lower() == '.tsv' else ',')
+    with open(path, newline='', encoding=spec.get('encoding', 'utf-8-sig')) as f:
+        yield from _select(csv.reader(f, delimiter=delimiter), spec.get('column'), spec.get('header', True))
+
+
+def _jsonl_records(path: Path, spec: Dict[str, Any]) -> Iterator[Tuple[int, Any]]:
+    """逐行解析 JSONL，返回 (行号, 记录)，跳过空行"""
+    with open(path, encoding=spec.get('encoding', 'utf-8')) as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"数据源 {path.name} 第 {line_num} 行不是有效的JSON: {e}")
+
+
+def _jsonl_rows(path: Path, records: Iterator[Tuple[int, Any]]) -> Iterator[Sequence[Any]]:
+    for line_num, record in records:
+        if not isinstance(record, list):
+            raise ValueError(f"数据源 {path.name} 第 {line_num} 行不是数组，第一行为数组时每行都需要是数组")
+        yield record
+
+
+def _iter_jsonl(path: Path, spec: Dict[str, Any]) -> Iterator[Any]:
+    records = _jsonl_records(path, spec)
+    first = next(records, None)
+    if first is None:
+        return
+    records = chain([first], records)
+    column = spec.get('column')
+    if isinstance(first[1], list):
+        # 数组记录与CSV相同：header 为True（默认）时第一行为表头，column 可以使用列名
+        yield from _select(_jsonl_rows(path, records), column, spec.get('header', True))
+        return
+    if isinstance(first[1], dict) and isinstance(column, int):
+        raise ValueError(f"数据源 {path.name} 的记录为JSON对象，column 需要使用键名: {column}")
+    for line_num, record in records:
+        if isinstance(record, dict):
+            value = record.get(column) if column is not None else next(iter(record.values()), None)
+        elif isinstance(record, list):
+            raise ValueError(f"数据源 {path.name} 第 {line_num} 行是数组，第一行不是数组时不支持数组记录")
+        else:
+            value = record
+        if value is None or value == '':
+            continue
+        yield value
+
+
+def _iter_parquet(path: Path, spec: Dict[str, Any]) -> Iterator[Any]:
+    if pq is None:
+        raise ImportError("Parquet数据源需要安装 pyarrow: pip install pyarrow")
+    parquet_file = pq.ParquetFile(path)
+    column = spec.get('column')
+    if column is None or isinstance(column, int):
+        column = parquet_file.schema_arrow.names[column or 0]
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE, columns=[column]):
+        for value in batch.column(0).to_pylist():
+            if value is None or value == '':
+                continue
+            yield value
+
+
+_READERS = {'excel': _iter_excel, 'csv': _iter_csv, 'jsonl': _iter_jsonl, 'parquet': _iter_parquet}
+
+
+def iter_data_source(spec: Dict[str, Any], base_dir: Optional[Union[str, Path]] = None) -> Iterator[Any]:
+    """
+    逐行读取数据源中一列的值
+
+    Args:
+        spec: 数据源引用，可选键:
+              source - 文件路径（必填），相对路径按 YAML 文件所在目录、项目根目录查找
+              format - excel/csv/jsonl/parquet，默认按扩展名判断
+              sheet - Excel 工作表序号（从0开始）或名称，默认0
+              column - 列名或列序号（从0开始），默认第一列；JSONL 对象记录为记录的键
+              header - Excel/CSV/JSONL 数组记录的第一行是否为表头，默认True
+              encoding、delimiter - CSV/JSONL 的编码与分隔符
+              skip、limit - 跳过前几行、最多读取几行（不含表头和空单元格）
+        base_dir: YAML 文件所在目录
+
+    Returns:
+        值的迭代器，每次调用重新打开文件；空单元格跳过
+    """
+    path = resolve_source_path(spec['source'], base_dir)
+    values = _READERS[source_format(spec, path)](path, spec)
+    skip, limit = int(spec.get('skip') or 0), spec.get('limit')
+    if skip or limit is not None:
+        values = islice(values, skip, None if limit is None else skip + int(limit))
+    return values
+
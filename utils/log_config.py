@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+进程级日志配置
+每个进程（xdist worker）只配置一次文件日志，执行器不再各自 remove/add 日志处理器
+
+- 步骤详情使用 STEP 级别（介于 DEBUG 和 INFO 之间），默认不输出；UI_LOG_LEVEL=STEP 时输出
+- 日志参数使用 loguru 的 {} 占位符，低于输出级别时不格式化；计算代价高的参数使用 opt(lazy=True)
+- 主日志不输出异常时的变量值（diagnose），带异常的失败记录另外写入 executor_failures 日志并输出变量值
+"""
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+
+# 日志输出级别，默认 INFO；设置为 STEP 输出每个步骤的详情，DEBUG 输出全部
+LOG_LEVEL_ENV = 'UI_LOG_LEVEL'
+DEFAULT_LOG_LEVEL = 'INFO'
+# 步骤详情的日志级别
+STEP = 'STEP'
+STEP_LEVEL_NO = 15
+LOG_DIR = Path(__file__).parent.parent / 'test-results' / 'logs'
+
+_lock = threading.Lock()
+_configured_pid: Optional[int] = None
+_handler_ids = []
+
+try:
+    logger.level(STEP)
+except ValueError:
+    logger.level(STEP, no=STEP_LEVEL_NO, color='<cyan>')
+
+
+def _log_file(prefix: str) -> Path:
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    suffix = f"_{worker}" if worker else ''
+    return LOG_DIR / f"{prefix}_{datetime.now().strftime('%Y%m%d')}{suffix}.log"
+
+
+def setup_logging(level: Optional[str] = None, force: bool = False) -> None:
+    """
+    配置执行器日志，同一进程只生效一次（xdist 的每个 worker 各自配置，写入各自的文件）
+
+    - test-results/logs/executor_detail_YYYYMMDD[_gwN].log: 指定级别及以上的日志
+    - test-results/logs/executor_failures_YYYYMMDD[_gwN].log: 带异常的失败记录，包含异常时的变量值
+
+    移除 loguru 默认的控制台输出，保留其他已添加的处理器（如 run_web_ui_test.py 的运行日志）
+
+    Args:
+        level: 输出级别，为None时使用环境变量 UI_LOG_LEVEL，默认 INFO
+        force: 重新配置（如修改输出级别）
+    """
+    global _configured_pid
+    with _lock:
+        if _configured_pid == os.getpid() and not force:
+            return
+        level = (level or os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LOG_LEVEL).upper()
+
+        for handler_id in _handler_ids:
+            try:
+                logger.remove(handler_id)
+            except ValueError:
+                pass
+        _handler_ids.clear()
+        if _configured_pid is None:
+            # loguru 默认的控制台处理器（id 0）
+            try:
+                logger.remove(0)
+            except ValueError:
+                pass
+
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        _handler_ids.append(logger.add(
+            str(_log_file('executor_detail')),
+            rotation="00:00",
+            encoding="utf-8",
+            retention="7 days",
+            enqueue=True,
+            level=level,
+            backtrace=False,
+            diagnose=False,
+        ))
+        _handler_ids.append(logger.add(
+            str(_log_file('executor_failures')),
+            rotation="00:00",
+            encoding="utf-8",
+            retention="7 days",
+            enqueue=True,
+            level="ERROR",
+            filter=lambda record: record['exception'] is not None,
+            backtrace=True,
+            diagnose=True,
+        ))
+        _configured_pid = os.getpid()
+
+
+def set_log_level(level: str) -> None:
+    """
+    修改执行器日志的输出级别
+
+    Args:
+        level: 如 'STEP'（输出步骤详情）、'INFO'、'DEBUG'
+    """
+    setup_logging(level, force=True)
@@ -0,0 +1,143 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+登录态缓存
+每个用户在每个进程（xdist worker）中只通过登录页登录一次，登录后的 storage_state（cookie、localStorage）
+保存到 .auth 目录（pytest-playwright 每次运行开始时会清空 test-results），有效期内新建的浏览器上下文
+直接使用，下次运行时未过期的登录态也可以复用；
+页面跳转后停留在登录页（登录态失效）时，由 BasePage.navigate_to 调用的跳转守卫重新登录并更新缓存；
+默认关闭，web_ui.conf [login] cache = true 或环境变量 UI_LOGIN_CACHE=1 时开启。
+登录守卫只在同步API的 BasePage 中调用，AsyncBasePage 的页面不会在登录态失效时重新登录
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from loguru import logger
+from playwright.sync_api import Browser, Page
+
+from base.BasePage import register_navigation_guard
+from utils.adts_login_page import LoginPage
+
+
+# 设置为 1/true 时使用登录态缓存，0/false 时每个用例通过登录页登录，覆盖 web_ui.conf [login] cache
+LOGIN_CACHE_ENV = 'UI_LOGIN_CACHE'
+# 登录态有效期（秒），覆盖 web_ui.conf [login] ttl
+LOGIN_TTL_ENV = 'UI_LOGIN_TTL'
+DEFAULT_TTL = 1800
+STATE_DIR = Path(__file__).parent.parent / '.auth'
+
+
+def login_route(url: str) -> str:
+    """比较登录页时使用的URL：去掉查询参数（重定向参数等）和末尾的 /"""
+    return url.split('?', 1)[0].rstrip('/')
+
+
+def login_cache_enabled(login_config: Optional[Dict[str, Any]] = None) -> bool:
+    """环境变量 UI_LOGIN_CACHE 优先，其次 web_ui.conf [login] cache，默认关闭"""
+    value = os.environ.get(LOGIN_CACHE_ENV, '').strip().lower()
+    if value:
+        return value in ('1', 'true', 'yes', 'on')
+    return bool((login_config or {}).get('cache', False))
+
+
+class LoginStateCache:
+    """单个用户在当前进程中的登录态，只在一个线程中使用（pytest 夹具）"""
+
+    def __init__(self, browser: Browser, login_url: str, username: str, password: str,
+                 context_options: Optional[Dict[str, Any]] = None, ttl: Optional[int] = None,
+                 state_dir: Optional[Path] = None, login_pages: Optional[Iterable[str]] = None):
+        """
+        Args:
+            browser: 用于登录的浏览器
+            login_url: 登录入口（LoginPage 打开的页面）
+            username: 用户名
+            password: 密码
+            context_options: 登录时新建上下文的参数（与用例的上下文一致）
+            ttl: 登录态有效期（秒，web_ui.conf [login] ttl），环境变量 UI_LOGIN_TTL 优先，默认1800
+            state_dir: storage_state 保存目录，默认项目根目录下的 .auth
+            login_pages: 登录态失效时应用重定向到的登录页URL（web_ui.conf [pages] login_page），默认为 login_url
+        """
+        self.browser = browser
+        self.login_url = login_url
+        self.username = username
+        self.password = password
+        self.context_options = {key: value for key, value in (context_options or {}).items() if key != 'storage_state'}
+        self.ttl = int(os.environ.get(LOGIN_TTL_ENV) or ttl or DEFAULT_TTL)
+        self.login_routes = {login_route(url) for url in (login_pages or [login_url]) if url}
+        # 文件名不包含用户名，按用户名、浏览器和 worker 区分
+        key = hashlib.sha1(f"{username}@{login_url}".encode('utf-8')).hexdigest()[:12]
+        worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        self.state_path = Path(state_dir or STATE_DIR) / f"state_{key}_{browser.browser_type.name}_{worker}.json"
+        self.stats = {'logins': 0, 'reused': 0, 'relogins': 0}
+        self.logger = logger.bind(name=self.__class__.__name__)
+
+    def is_fresh(self) -> bool:
+        """缓存的登录态存在且未过期"""
+        try:
+            return time.time() - self.state_path.stat().st_mtime < self.ttl
+        except FileNotFoundError:
+            return False
+
+    def storage_state(self) -> str:
+        """
+        有效的 storage_state 文件路径，缓存不存在或已过期时先登录
+
+        Returns:
+            传给 browser.new_context(storage_state=...) 的文件路径
+        """
+        if self.is_fresh():
+            self.stats['reused'] += 1
+            return str(self.state_path)
+        context = self.browser.new_context(**self.context_options)
+        try:
+            page = context.new_page()
+            LoginPage(self.login_url, page).login(self.username, self.password)
+            self.stats['logins'] += 1
+            self.save(page)
+        finally:
+            context.close()
+        self.logger.info("登录态已缓存: {}，有效期 {} 秒", self.state_path, self.ttl)
+        return str(self.state_path)
+
+    def save(self, page: Page) -> None:
+        """保存页面所在上下文的登录态（先写临时文件再替换）"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        page.context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, self.state_path)
+
+    def invalidate(self) -> None:
+        """删除缓存的登录态，下次 storage_state 时重新登录"""
+        try:
+            self.state_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def attach(self, page: Page) -> None:
+        """为使用缓存登录态的页面注册跳转守卫"""
+        register_navigation_guard(page, self.relogin_if_redirected)
+
+    def is_login_page(self, url: str) -> bool:
+        """url 是否为登录页（忽略查询参数和末尾的 /）"""
+        return login_route(url) in self.login_routes
+
+    def relogin_if_redirected(self, page: Page, url: str) -> bool:
+        """
+        跳转到 url 后被重定向到登录页时（登录态失效）重新登录、更新缓存并再次跳转；
+        只比较URL，页面上有密码输入框（修改密码等表单）不会触发重新登录
+
+        Returns:
+            是否重新登录
+        """
+        if self.is_login_page(url) or not self.is_login_page(page.url):
+            return False
+        self.logger.info("登录态已失效，重新登录: {}", page.url)
+        LoginPage(self.login_url, page).login(self.username, self.password)
+        self.stats['relogins'] += 1
+        self.save(page)
+        page.goto(url)
+        return True
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""
+固定等待替换为条件等待后的时间统计
+输入、按Enter、登录等原来固定 time.sleep 的位置改为等待具体条件（输入值稳定、接口返回、登录表单移除），
+WAIT_SAVINGS 按等待点记录每次条件等待相对原固定等待节省的时间，xdist 各 worker 的统计在会话结束时合并输出；
+环境变量 UI_LEGACY_SLEEPS=1 时恢复旧的固定等待，用于排查条件等待引起的问题
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+
+# 设置为 1/true 时恢复旧的固定等待（time.sleep），用于排查条件等待引起的问题
+LEGACY_SLEEPS_ENV = 'UI_LEGACY_SLEEPS'
+
+_legacy_sleeps: Optional[bool] = None
+
+
+def legacy_sleeps_enabled() -> bool:
+    """是否使用旧的固定等待"""
+    if _legacy_sleeps is not None:
+        return _legacy_sleeps
+    return os.environ.get(LEGACY_SLEEPS_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def set_legacy_sleeps(enable: Optional[bool]) -> None:
+    """
+    开启/关闭旧的固定等待
+
+    Args:
+        enable: True/False；None 表示恢复为按环境变量 UI_LEGACY_SLEEPS 判断
+    """
+    global _legacy_sleeps
+    _legacy_sleeps = enable
+
+
+class WaitSavings:
+    """
+    进程级统计：固定等待替换为条件等待后节省的时间
+    每次条件等待记录 (固定等待时长 - 实际等待时长)，条件等待比原固定等待更慢时记为负数
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, fixed_seconds: float, actual_seconds: float) -> None:
+        """
+        记录一次条件等待
+
+        Args:
+            name: 等待点名称，如 'input'、'enter'、'login'
+            fixed_seconds: 原固定等待时长（秒）
+            actual_seconds: 条件等待实际耗时（秒）
+        """
+        with self._lock:
+            count, saved = self._stats.get(name, (0, 0.0))
+            self._stats[name] = (count + 1, saved + fixed_seconds - actual_seconds)
+
+    @contextmanager
+    def measure(self, name: str, fixed_seconds: float) -> Iterator[None]:
+        """统计代码块（条件等待）相对固定等待节省的时间"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, fixed_seconds, time.monotonic() - start)
+
+    def merge(self, stats: Dict[str, Tuple[int, float]]) -> None:
+        """合并其他进程（xdist worker）的统计"""
+        with self._lock:
+            for name, (count, saved) in stats.items():
+                total_count, total_saved = self._stats.get(name, (0, 0.0))
+                self._stats[name] = (total_count + count, total_saved + saved)
+
+    def snapshot(self) -> Dict[str, Tuple[int, float]]:
+        """{等待点名称: (次数, 节省秒数)}"""
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def total_saved(self) -> float:
+        """节省的总秒数"""
+        return sum(saved for _, saved in self.snapshot().values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+WAIT_SAVINGS = WaitSavings()
@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import yaml
+
+try:
+    # libyaml 的 C 实现，解析速度约为纯Python实现的数倍
+    from yaml import CSafeLoader as FastSafeLoader
+except ImportError:
+    from yaml import SafeLoader as FastSafeLoader
+
+
+# 磁盘缓存格式版本，缓存结构变化时递增
+DISK_CACHE_VERSION = 1
+# 设置为 1/true 时启用磁盘缓存，也可通过 enable_disk_cache 开启
+DISK_CACHE_ENV = 'UI_YAML_DISK_CACHE'
+
+
+def safe_load(stream: Any) -> Any:
+    """
+    使用可用的最快 SafeLoader 解析YAML
+    """
+    return yaml.load(stream, Loader=FastSafeLoader)
+
+
+class YamlFileCache:
+    """
+    进程级YAML文件缓存
+    按 (路径, mtime, 文件大小) 缓存解析结果；可选在YAML旁生成预解析的pickle文件，
+    供后续运行和其他xdist worker复用
+
+    注意: 返回的对象在调用方之间共享，应视为只读
+    """
+
+    def __init__(self, disk_cache: Optional[bool] = None):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        if disk_cache is None:
+            disk_cache = os.environ.get(DISK_CACHE_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+        self.disk_cache = disk_cache
+
+    def load(self, file_path: Union[str, Path]) -> Any:
+        """
+        加载YAML文件
+
+        Args:
+            file_path: YAML文件路径
+
+        Returns:
+            解析后的数据
+        """
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(abs_path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            data = self._load_from_disk_cache(abs_path, signature) if self.disk_cache else None
+            if data is None:
+                with open(abs_path, 'r', encoding='utf-8') as f:
+                    data = safe_load(f)
+                if self.disk_cache:
+                    self._write_disk_cache(abs_path, signature, data)
+            self._entries[abs_path] = (signature, data)
+        return data
+
+    @staticmethod
+    def disk_cache_path(abs_path: str) -> str:
+        """磁盘缓存文件路径: 与YAML同目录的 .<文件名>.cache.pkl"""
+        directory, name = os.path.split(abs_path)
+        return os.path.join(directory, f".{name}.cache.pkl")
+
+    def _load_from_disk_cache(self, abs_path: str, signature: Tuple[int, int]) -> Any:
+        cache_path = self.disk_cache_path(abs_path)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(cached, dict):
+            return None
+        if cached.get('version') != DISK_CACHE_VERSION or tuple(cached.get('signature', ())) != signature:
+            return None
+        return cached.get('data')
+
+    def _write_disk_cache(self, abs_path: str, signature: Tuple[int, int], data: Any) -> None:
+        cache_path = self.disk_cache_path(abs_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': DISK_CACHE_VERSION, 'signature': signature, 'data': data}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            # 原子替换，多个xdist worker同时写入时不会读到半截文件
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+YAML_FILE_CACHE = YamlFileCache()
+
+
+def load_yaml_file(file_path: Union[str, Path]) -> Any:
+    """
+    通过进程级缓存加载YAML文件
+    """
+    return YAML_FILE_CACHE.load(file_path)
+
+
+def enable_disk_cache(enable: bool = True) -> None:
+    """开启/关闭YAML预解析磁盘缓存"""
+    YAML_FILE_CACHE.disk_cache = enable